@@ -2,8 +2,11 @@
 
 import httpx
 import json
+import time
 from typing import Optional, Iterator
 
+# Largest page the server's list_runs endpoint accepts
+RUN_PAGE_SIZE = 500
 
 class DjinnBotClient:
     """Client for communicating with the djinnbot API server.
@@ -133,16 +136,50 @@ class DjinnBotClient:
         self,
         pipeline_id: Optional[str] = None,
         status: Optional[str] = None,
+        limit: Optional[int] = None,
     ) -> list[dict]:
-        """List pipeline runs."""
-        params: dict = {}
+        """List pipeline runs, newest first.
+
+        Returns at most *limit* runs, or every matching run (following the
+        server's page cursors) when no limit is given.  Use
+        list_runs_page() to page through results yourself.
+        """
+        runs: list[dict] = []
+        cursor = None
+        while True:
+            remaining = None if limit is None else limit - len(runs)
+            page_size = RUN_PAGE_SIZE if remaining is None else min(remaining, RUN_PAGE_SIZE)
+            page = self.list_runs_page(pipeline_id, status, page_size, cursor)
+            runs.extend(page["runs"])
+            cursor = page.get("next_cursor")
+            if not cursor or (limit is not None and len(runs) >= limit):
+                return runs
+
+    def list_runs_page(
+        self,
+        pipeline_id: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> dict:
+        """List one page of pipeline runs.
+
+        Returns {runs: [...], next_cursor, has_more, counts, total}.
+        """
+        params: dict = {"limit": limit}
         if pipeline_id:
             params["pipeline_id"] = pipeline_id
         if status:
             params["status"] = status
+        if cursor:
+            params["cursor"] = cursor
         response = self.client.get("/v1/runs/", params=params)
         response.raise_for_status()
-        return response.json()
+        data = response.json()
+        if isinstance(data, list):
+            # Older servers return the full unpaginated list
+            return {"runs": data, "next_cursor": None, "has_more": False}
+        return data
 
     def get_run(self, run_id: str) -> dict:
         """Get a specific run with step details."""
@@ -202,27 +239,57 @@ class DjinnBotClient:
         response.raise_for_status()
         return response.json()
 
-    def stream_run_events(self, run_id: str) -> Iterator[dict]:
-        """Stream events for a run using SSE."""
+    def stream_run_events(
+        self,
+        run_id: str,
+        max_retries: Optional[int] = None,
+        backoff_max: float = 30.0,
+    ) -> Iterator[dict]:
+        """Stream events for a run using SSE.
+
+        Reconnects with exponential backoff when the connection drops,
+        sending the last received event id as Last-Event-ID so the server
+        resumes right after it instead of replaying the run.  Gives up
+        after *max_retries* consecutive failed attempts (None = never).
+        Heartbeats are not yielded.
+        """
         params = {}
         if self._token:
             params["token"] = self._token
-        with httpx.stream(
-            "GET",
-            f"{self.base_url}/v1/events/stream/{run_id}",
-            timeout=None,
-            params=params,
-            headers=self._build_headers(),
-        ) as response:
-            response.raise_for_status()
-            for line in response.iter_lines():
-                if line.startswith("data:"):
-                    data = line[5:].strip()
-                    if data:
-                        try:
-                            yield json.loads(data)
-                        except json.JSONDecodeError:
-                            continue
+        last_event_id: Optional[str] = None
+        failures = 0
+        while True:
+            headers = self._build_headers()
+            if last_event_id:
+                headers["Last-Event-ID"] = last_event_id
+            try:
+                with httpx.stream(
+                    "GET",
+                    f"{self.base_url}/v1/events/stream/{run_id}",
+                    timeout=httpx.Timeout(30.0, read=60.0),
+                    params=params,
+                    headers=headers,
+                ) as response:
+                    # 5xx (e.g. API restarting) is retried; other errors raise
+                    if not response.is_server_error:
+                        response.raise_for_status()
+                        for event_id, event_type, data in _iter_sse(response):
+                            failures = 0
+                            if event_id:
+                                last_event_id = event_id
+                            if event_type == "heartbeat" or not data:
+                                continue
+                            try:
+                                yield json.loads(data)
+                            except json.JSONDecodeError:
+                                continue
+            except httpx.TransportError:
+                pass
+            # Stream ended, dropped or failed: reconnect after a backoff
+            failures += 1
+            if max_retries is not None and failures > max_retries:
+                raise ConnectionError(f"Lost event stream for run {run_id}")
+            time.sleep(min(backoff_max, 0.5 * 2 ** (failures - 1)))
 
     # ── Steps ───────────────────────────────────────────────────────────
 
@@ -600,3 +667,26 @@ class DjinnBotClient:
                             yield json.loads(data)
                         except json.JSONDecodeError:
                             continue
+
+
+def _iter_sse(response: httpx.Response) -> Iterator[tuple[Optional[str], str, str]]:
+    """(id, event, data) for each event in an SSE response body."""
+    event_id: Optional[str] = None
+    event_type = "message"
+    data_lines: list[str] = []
+    for line in response.iter_lines():
+        if not line:
+            if data_lines or event_id:
+                yield event_id, event_type, "\n".join(data_lines)
+            event_id, event_type, data_lines = None, "message", []
+            continue
+        if line.startswith(":"):
+            continue
+        field, _, value = line.partition(":")
+        value = value[1:] if value.startswith(" ") else value
+        if field == "data":
+            data_lines.append(value)
+        elif field == "id":
+            event_id = value
+        elif field == "event":
+            event_type = value
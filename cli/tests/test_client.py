@@ -138,7 +138,16 @@ def test_start_run(respx_mock):
 @respx.mock(base_url="http://localhost:8000")
 def test_list_runs(respx_mock):
     respx_mock.get("/v1/runs/").mock(
-        return_value=httpx.Response(200, json=SAMPLE_RUN_LIST)
+        return_value=httpx.Response(
+            200,
+            json={
+                "runs": SAMPLE_RUN_LIST,
+                "next_cursor": None,
+                "has_more": False,
+                "counts": {"running": 1},
+                "total": 1,
+            },
+        )
     )
     client = DjinnBotClient()
     result = client.list_runs()
@@ -147,6 +156,43 @@ def test_list_runs(respx_mock):
     client.close()
 
 
+@respx.mock(base_url="http://localhost:8000")
+def test_list_runs_follows_cursors(respx_mock):
+    route = respx_mock.get("/v1/runs/")
+    route.side_effect = [
+        httpx.Response(
+            200,
+            json={"runs": [{"id": "run_a"}], "next_cursor": "c1", "has_more": True},
+        ),
+        httpx.Response(
+            200,
+            json={"runs": [{"id": "run_b"}], "next_cursor": None, "has_more": False},
+        ),
+    ]
+    client = DjinnBotClient()
+    result = client.list_runs()
+    assert [r["id"] for r in result] == ["run_a", "run_b"]
+    assert "cursor" not in str(route.calls[0].request.url)
+    assert "cursor=c1" in str(route.calls[1].request.url)
+    client.close()
+
+
+@respx.mock(base_url="http://localhost:8000")
+def test_list_runs_with_limit_stops_early(respx_mock):
+    route = respx_mock.get("/v1/runs/").mock(
+        return_value=httpx.Response(
+            200,
+            json={"runs": [{"id": "run_a"}], "next_cursor": "c1", "has_more": True},
+        )
+    )
+    client = DjinnBotClient()
+    result = client.list_runs(limit=1)
+    assert [r["id"] for r in result] == ["run_a"]
+    assert route.call_count == 1
+    assert "limit=1" in str(route.calls[0].request.url)
+    client.close()
+
+
 @respx.mock(base_url="http://localhost:8000")
 def test_list_runs_with_filters(respx_mock):
     respx_mock.get("/v1/runs/").mock(return_value=httpx.Response(200, json=[]))
@@ -567,6 +613,50 @@ def test_500_raises(respx_mock):
     client.close()
 
 
+# ── Run event stream ────────────────────────────────────────────────
+
+
+@respx.mock(base_url="http://localhost:8000")
+def test_stream_run_events_resumes_after_disconnect(respx_mock, monkeypatch):
+    monkeypatch.setattr("djinnbot.client.time.sleep", lambda _: None)
+    route = respx_mock.get("/v1/events/stream/run_abc123def456").mock(
+        side_effect=[
+            httpx.Response(
+                200,
+                text=(
+                    'id: 1-0\nevent: message\ndata: {"type": "STEP_STARTED"}\n\n'
+                    'event: heartbeat\ndata: {"status": "connected"}\n\n'
+                ),
+            ),
+            httpx.ConnectError("connection refused"),
+            httpx.Response(
+                200,
+                text='id: 2-0\nevent: message\ndata: {"type": "RUN_COMPLETE"}\n\n',
+            ),
+        ]
+    )
+    client = DjinnBotClient()
+    events = client.stream_run_events("run_abc123def456")
+    assert next(events) == {"type": "STEP_STARTED"}
+    assert next(events) == {"type": "RUN_COMPLETE"}
+    assert "last-event-id" not in route.calls[0].request.headers
+    assert route.calls[1].request.headers["last-event-id"] == "1-0"
+    assert route.calls[2].request.headers["last-event-id"] == "1-0"
+    client.close()
+
+
+@respx.mock(base_url="http://localhost:8000")
+def test_stream_run_events_gives_up_after_max_retries(respx_mock, monkeypatch):
+    monkeypatch.setattr("djinnbot.client.time.sleep", lambda _: None)
+    respx_mock.get("/v1/events/stream/run_abc123def456").mock(
+        return_value=httpx.Response(503)
+    )
+    client = DjinnBotClient()
+    with pytest.raises(ConnectionError):
+        list(client.stream_run_events("run_abc123def456", max_retries=2))
+    client.close()
+
+
 # ── Client lifecycle ────────────────────────────────────────────────
 
 
@@ -167,7 +167,7 @@ export function createSpawnExecutorTools(config: SpawnExecutorToolsConfig): Agen
 
             await new Promise(resolve => setTimeout(resolve, POLL_INTERVAL_MS));
 
-            const statusResponse = await authFetch(`${apiBase}/v1/runs/${runId}`, { signal });
+            const statusResponse = await authFetch(`${apiBase}/v1/runs/${runId}?fields=status,outputs`, { signal });
             if (!statusResponse.ok) {
               console.warn(`[spawn_executor] Failed to poll run ${runId}: ${statusResponse.status}`);
               continue;
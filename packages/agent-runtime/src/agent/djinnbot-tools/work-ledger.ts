@@ -62,6 +62,24 @@ function workLocksChannel(agentId: string): string {
   return `djinnbot:agent:${agentId}:work_locks:live`;
 }
 
+// Lock changes kept per agent so dashboard SSE clients can resume after a
+// reconnect (Last-Event-ID); the pub/sub channel is kept for live listeners.
+const WORK_LOCKS_STREAM_MAXLEN = '200';
+
+async function publishWorkLockEvent(
+  redis: RedisClient,
+  agentId: string,
+  event: Record<string, unknown>,
+): Promise<void> {
+  const channel = workLocksChannel(agentId);
+  const payload = JSON.stringify(event);
+  await redis
+    .multi()
+    .xadd(`${channel}:stream`, 'MAXLEN', '~', WORK_LOCKS_STREAM_MAXLEN, '*', 'data', payload)
+    .publish(channel, payload)
+    .exec();
+}
+
 // ── Tool factories ─────────────────────────────────────────────────────────
 
 export function createWorkLedgerTools(config: WorkLedgerToolsConfig): AgentTool[] {
@@ -103,7 +121,7 @@ export function createWorkLedgerTools(config: WorkLedgerToolsConfig): AgentTool[
           // Also track in the ledger set (for get_active_work queries)
           await redis.sadd(ledger, p.key);
           // Notify dashboard SSE subscribers of lock change
-          await redis.publish(workLocksChannel(agentId), JSON.stringify({
+          await publishWorkLockEvent(redis, agentId, {
             type: 'lock_acquired',
             agentId,
             key: p.key,
@@ -111,7 +129,7 @@ export function createWorkLedgerTools(config: WorkLedgerToolsConfig): AgentTool[
             description: p.description,
             acquiredAt: entry.acquiredAt,
             ttlSeconds: ttl,
-          }));
+          });
           return {
             content: [{
               type: 'text',
@@ -169,12 +187,12 @@ export function createWorkLedgerTools(config: WorkLedgerToolsConfig): AgentTool[
         if (!existingRaw) {
           await redis.srem(ledger, p.key);
           // Notify dashboard even for expired/already-released locks
-          await redis.publish(workLocksChannel(agentId), JSON.stringify({
+          await publishWorkLockEvent(redis, agentId, {
             type: 'lock_released',
             agentId,
             key: p.key,
             sessionId,
-          }));
+          });
           return {
             content: [{ type: 'text', text: `Lock "${p.key}" was already expired or released.` }],
             details: {},
@@ -197,12 +215,12 @@ export function createWorkLedgerTools(config: WorkLedgerToolsConfig): AgentTool[
         await redis.del(lk);
         await redis.srem(ledger, p.key);
         // Notify dashboard SSE subscribers of lock change
-        await redis.publish(workLocksChannel(agentId), JSON.stringify({
+        await publishWorkLockEvent(redis, agentId, {
           type: 'lock_released',
           agentId,
           key: p.key,
           sessionId,
-        }));
+        });
 
         return {
           content: [{ type: 'text', text: `Work lock released: "${p.key}"` }],
@@ -2,6 +2,14 @@ import type { PipelineRun, StepExecution, LoopState, LoopItem } from '../types/s
 import type { Task } from '../types/project.js';
 import { authFetch } from './auth-fetch.js';
 
+// get_run response keys mapped by getRun()
+const RUN_FIELDS = [
+  'id', 'pipeline_id', 'project_id', 'task', 'status', 'outputs', 'current_step',
+  'human_context', 'task_branch', 'workspace_type', 'key_user_id',
+  'initiated_by_user_id', 'model_override', 'key_resolution',
+  'created_at', 'updated_at', 'completed_at',
+].join(',');
+
 export interface ApiClientConfig {
   baseUrl: string;
   timeout?: number;
@@ -162,7 +170,8 @@ export class ApiClient {
 
   async getRun(runId: string): Promise<PipelineRun | null> {
     try {
-      const r = await this.request<any>('GET', `/v1/runs/${runId}`);
+      // Steps and workspace status aren't mapped — skip them server-side
+      const r = await this.request<any>('GET', `/v1/runs/${runId}?fields=${RUN_FIELDS}`);
       if (!r) return null;
 
       // Map API response (snake_case) to PipelineRun (camelCase)
@@ -198,8 +207,22 @@ export class ApiClient {
   }
 
   async listRuns(pipelineId?: string): Promise<PipelineRun[]> {
-    const query = pipelineId ? `?pipeline_id=${encodeURIComponent(pipelineId)}` : '';
-    const runs = await this.request<any[]>('GET', `/v1/runs/${query}`);
+    // list_runs is keyset-paginated; follow next_cursor to get every run
+    const runs: any[] = [];
+    let cursor: string | null = null;
+    do {
+      const params = new URLSearchParams({ limit: '500', include_outputs: 'true' });
+      if (pipelineId) params.set('pipeline_id', pipelineId);
+      if (cursor) params.set('cursor', cursor);
+      const page = await this.request<any>('GET', `/v1/runs/?${params}`);
+      if (Array.isArray(page)) {
+        runs.push(...page);
+        break;
+      }
+      runs.push(...(page.runs || []));
+      cursor = page.next_cursor ?? null;
+    } while (cursor);
+
     return runs.map(r => ({
       id: r.id,
       pipelineId: r.pipeline_id,
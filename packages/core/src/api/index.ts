@@ -2,3 +2,5 @@ export { ApiClient, createApiClient } from './client.js';
 export type { ApiClientConfig } from './client.js';
 export { authFetch, getAuthHeaders } from './auth-fetch.js';
 export { ensureAgentKey, ensureAgentKeys, getAgentApiKey } from './agent-key-manager.js';
+export { fetchPromptBundle } from './prompt-bundle.js';
+export type { PromptBundle } from './prompt-bundle.js';
@@ -0,0 +1,79 @@
+/**
+ * Prompt bundle client — fetches an agent's persona, config, skills
+ * manifest and MCP manifest from `/v1/agents/{id}/prompt-bundle` in one
+ * request.
+ *
+ * The last bundle and its ETag are cached per agent, and every fetch sends
+ * `If-None-Match`, so when nothing changed the API answers 304 with no body
+ * and the cached bundle is reused.
+ */
+
+export interface PromptBundle {
+  agentId: string;
+  version: number | null;
+  persona: Record<string, string>;
+  config: Record<string, unknown>;
+  skills: {
+    skills: { id: string; description: string; tags: string[] }[];
+    manifest_text: string;
+  };
+  mcp: {
+    grants: { server_id: string; server_name: string; tool_name: string; base_url: string }[];
+    manifest_text: string;
+  };
+}
+
+/** In-memory cache: `${apiBaseUrl}|${agentId}` → last bundle + ETag */
+const bundles = new Map<string, { etag: string; bundle: PromptBundle }>();
+
+/**
+ * Fetch the prompt bundle for an agent.
+ *
+ * Returns null when the API is unreachable or predates the bundle endpoint,
+ * so callers can fall back to the individual manifest endpoints.  A stale
+ * cached bundle is returned if a revalidation request fails.
+ */
+export async function fetchPromptBundle(
+  agentId: string,
+  apiBaseUrl: string,
+  apiToken?: string,
+): Promise<PromptBundle | null> {
+  const cacheKey = `${apiBaseUrl}|${agentId}`;
+  const cached = bundles.get(cacheKey);
+
+  const headers: Record<string, string> = {};
+  if (apiToken) headers.Authorization = `Bearer ${apiToken}`;
+  if (cached) headers['If-None-Match'] = cached.etag;
+
+  try {
+    const url = `${apiBaseUrl}/v1/agents/${encodeURIComponent(agentId)}/prompt-bundle`;
+    const init = { headers, signal: AbortSignal.timeout(5000) };
+    let res: Response;
+    if (apiToken) {
+      res = await fetch(url, init);
+    } else {
+      const { authFetch } = await import('./auth-fetch.js');
+      res = await authFetch(url, init);
+    }
+
+    if (res.status === 304 && cached) {
+      return cached.bundle;
+    }
+    if (!res.ok) {
+      if (res.status !== 404) {
+        console.warn(`[PromptBundle] bundle fetch for ${agentId} returned ${res.status}`);
+      }
+      return cached?.bundle ?? null;
+    }
+
+    const bundle = await res.json() as PromptBundle;
+    const etag = res.headers.get('etag');
+    if (etag) {
+      bundles.set(cacheKey, { etag, bundle });
+    }
+    return bundle;
+  } catch (err) {
+    console.warn(`[PromptBundle] Could not fetch prompt bundle for ${agentId}: ${err}`);
+    return cached?.bundle ?? null;
+  }
+}
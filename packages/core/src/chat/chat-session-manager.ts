@@ -1574,6 +1574,13 @@ export class ChatSessionManager {
     if (messageId) {
       session.currentMessageId = messageId;
       console.log(`[ChatSessionManager] Message ID linked for completion: ${messageId} (session=${sessionId})`);
+      // Lets subscribers attribute the following output tokens to this
+      // message (e.g. the ingest /chat proxy streaming one reply)
+      this.publishToChannel(sessionId, {
+        type: 'response_started',
+        timestamp: Date.now(),
+        data: { message_id: messageId },
+      });
     } else {
       console.warn(`[ChatSessionManager] sendMessage ${sessionId}: no messageId provided — response will NOT be persisted to DB`);
     }
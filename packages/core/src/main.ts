@@ -28,7 +28,7 @@ import { parseModelString } from './runtime/model-resolver.js';
 import { authFetch } from './api/auth-fetch.js';
 import { ensureAgentKeys } from './api/agent-key-manager.js';
 import { SwarmSessionManager, type SwarmSessionDeps } from './runtime/swarm-session.js';
-import { type SwarmRequest, type SwarmProgressEvent, swarmChannel, swarmStateKey } from './runtime/swarm-types.js';
+import { type SwarmRequest, type SwarmProgressEvent, swarmChannel, swarmStateKey, SWARM_INDEX_KEY } from './runtime/swarm-types.js';
 import { mountJuiceFS, ensureJfsDirs } from './container/juicefs.js';
 import { type RuntimeSettings, DEFAULT_RUNTIME_SETTINGS } from './container/runner.js';
 
@@ -345,7 +345,7 @@ function initSwarmManager(): SwarmSessionManager {
     },
 
     pollRun: async (runId) => {
-      const res = await authFetch(`${apiUrl}/v1/runs/${runId}`);
+      const res = await authFetch(`${apiUrl}/v1/runs/${runId}?fields=status,outputs`);
       if (!res.ok) {
         throw new Error(`Poll failed: ${res.status}`);
       }
@@ -420,8 +420,14 @@ function initSwarmManager(): SwarmSessionManager {
         created_at: state.createdAt,
         updated_at: state.updatedAt,
       };
-      // Persist for 1 hour (polling fallback + debugging)
-      await swarmRedis.setex(swarmStateKey(swarmId), 3600, JSON.stringify(snakeState));
+      // Persist for 1 hour (polling fallback + debugging), and register the
+      // swarm in the time-ordered index the API lists from (NX keeps the
+      // original creation time).
+      await swarmRedis
+        .multi()
+        .setex(swarmStateKey(swarmId), 3600, JSON.stringify(snakeState))
+        .zadd(SWARM_INDEX_KEY, 'NX', state.createdAt, swarmId)
+        .exec();
     },
 
     // Post-swarm branch integration: merge per-executor branches into canonical task branch
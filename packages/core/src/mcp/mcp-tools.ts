@@ -11,6 +11,7 @@
 import { Type } from '@sinclair/typebox';
 import type { TSchema, TObject, TProperties } from '@sinclair/typebox';
 import type { AgentTool, AgentToolResult } from '@mariozechner/pi-agent-core';
+import { fetchPromptBundle } from '../api/prompt-bundle.js';
 
 // ── Types ──────────────────────────────────────────────────────────────────────
 
@@ -327,24 +328,29 @@ export async function createMcpTools(
   }
 
   let manifest: McpManifestResponse;
-  try {
-    const res = await fetch(
-      `${apiBaseUrl}/v1/mcp/agents/${encodeURIComponent(agentId)}/manifest`,
-      {
-        headers: apiToken ? { Authorization: `Bearer ${apiToken}` } : {},
-        signal: AbortSignal.timeout(5000),
-      }
-    );
-    if (!res.ok) {
-      if (res.status !== 404) {
-        console.warn(`[McpTools] manifest fetch returned ${res.status}`);
+  const bundle = await fetchPromptBundle(agentId, apiBaseUrl, apiToken);
+  if (bundle) {
+    manifest = bundle.mcp;
+  } else {
+    try {
+      const res = await fetch(
+        `${apiBaseUrl}/v1/mcp/agents/${encodeURIComponent(agentId)}/manifest`,
+        {
+          headers: apiToken ? { Authorization: `Bearer ${apiToken}` } : {},
+          signal: AbortSignal.timeout(5000),
+        }
+      );
+      if (!res.ok) {
+        if (res.status !== 404) {
+          console.warn(`[McpTools] manifest fetch returned ${res.status}`);
+        }
+        return [];
       }
+      manifest = await res.json() as McpManifestResponse;
+    } catch (err) {
+      console.warn('[McpTools] Failed to fetch MCP manifest:', err);
       return [];
     }
-    manifest = await res.json() as McpManifestResponse;
-  } catch (err) {
-    console.warn('[McpTools] Failed to fetch MCP manifest:', err);
-    return [];
   }
 
   if (!manifest.grants || manifest.grants.length === 0) {
@@ -46,6 +46,11 @@ export class PersonaLoader {
    * Falls back gracefully to empty string if the API is unreachable.
    */
   private async fetchSkillManifest(agentId: string, apiBaseUrl: string): Promise<string> {
+    const { fetchPromptBundle } = await import('../api/prompt-bundle.js');
+    const bundle = await fetchPromptBundle(agentId, apiBaseUrl);
+    if (bundle) {
+      return bundle.skills.manifest_text ?? '';
+    }
     try {
       const url = `${apiBaseUrl}/v1/skills/agents/${agentId}/manifest`;
       const { authFetch } = await import('../api/auth-fetch.js');
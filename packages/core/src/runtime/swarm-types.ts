@@ -185,3 +185,6 @@ export function swarmChannel(swarmId: string): string {
 export function swarmStateKey(swarmId: string): string {
   return `djinnbot:swarm:${swarmId}:state`;
 }
+
+/** Sorted set of swarm IDs scored by creation time (ms), listed by the API. */
+export const SWARM_INDEX_KEY = 'djinnbot:swarms:index';
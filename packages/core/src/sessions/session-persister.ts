@@ -26,6 +26,9 @@ interface SessionLiveEvent {
 
 export class SessionPersister {
   private readonly liveChannel = 'djinnbot:sessions:live';
+  // Capped copy of the live channel that SSE clients resume from (Last-Event-ID)
+  private readonly liveStream = 'djinnbot:sessions:live:stream';
+  private readonly liveStreamMaxLen = '5000';
 
   constructor(
     private apiBaseUrl: string,
@@ -141,7 +144,12 @@ export class SessionPersister {
 
   private async publishLive(event: SessionLiveEvent): Promise<void> {
     try {
-      await this.redis.publish(this.liveChannel, JSON.stringify(event));
+      const payload = JSON.stringify(event);
+      await this.redis
+        .multi()
+        .xadd(this.liveStream, 'MAXLEN', '~', this.liveStreamMaxLen, '*', 'data', payload)
+        .publish(this.liveChannel, payload)
+        .exec();
     } catch (error) {
       console.error('[SessionPersister] Error publishing to live channel:', error);
     }
@@ -61,8 +61,10 @@ interface UsageItem {
 
 interface UsageListResponse {
   items: UsageItem[];
-  total: number;
+  /** Only returned for the first page */
+  total: number | null;
   hasMore: boolean;
+  nextCursor: string | null;
 }
 
 const KEY_SOURCE_LABELS: Record<string, { label: string; color: string; icon: typeof Key }> = {
@@ -172,7 +174,9 @@ export function ApiUsagePanel() {
   const [total, setTotal] = useState(0);
   const [hasMore, setHasMore] = useState(false);
   const [loading, setLoading] = useState(true);
-  const [offset, setOffset] = useState(0);
+  // Cursor each visited page was fetched with; the last one is the current page
+  const [cursors, setCursors] = useState<(string | null)[]>([null]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [expandedId, setExpandedId] = useState<string | null>(null);
   const limit = 50;
 
@@ -181,12 +185,15 @@ export function ApiUsagePanel() {
   const [statusFilter, setStatusFilter] = useState<string>('');
   const [keySourceFilter, setKeySourceFilter] = useState<string>('');
 
-  const fetchUsage = useCallback(async (currentOffset: number) => {
+  const offset = (cursors.length - 1) * limit;
+  const currentCursor = cursors[cursors.length - 1];
+
+  const fetchUsage = useCallback(async (cursor: string | null) => {
     setLoading(true);
     try {
       const params = new URLSearchParams();
       params.set('limit', String(limit));
-      params.set('offset', String(currentOffset));
+      if (cursor) params.set('cursor', cursor);
       if (typeFilter) params.set('type', typeFilter);
       if (statusFilter) params.set('status', statusFilter);
       if (keySourceFilter) params.set('key_source', keySourceFilter);
@@ -195,8 +202,9 @@ export function ApiUsagePanel() {
       if (!res.ok) throw new Error('Failed to fetch');
       const data: UsageListResponse = await res.json();
       setItems(data.items);
-      setTotal(data.total);
+      if (data.total !== null) setTotal(data.total);
       setHasMore(data.hasMore);
+      setNextCursor(data.nextCursor);
     } catch {
       toast.error('Failed to load API usage data');
     } finally {
@@ -205,8 +213,8 @@ export function ApiUsagePanel() {
   }, [typeFilter, statusFilter, keySourceFilter]);
 
   useEffect(() => {
-    setOffset(0);
-    fetchUsage(0);
+    setCursors([null]);
+    fetchUsage(null);
   }, [fetchUsage]);
 
   // Debounced refetch on SSE events (sessions starting/completing/failing)
@@ -214,9 +222,9 @@ export function ApiUsagePanel() {
   const debouncedRefresh = useCallback(() => {
     if (refreshTimerRef.current) clearTimeout(refreshTimerRef.current);
     refreshTimerRef.current = setTimeout(() => {
-      fetchUsage(offset);
+      fetchUsage(currentCursor);
     }, 800); // Debounce to avoid rapid re-fetches
-  }, [fetchUsage, offset]);
+  }, [fetchUsage, currentCursor]);
 
   // Live-updating event types that should trigger a refetch
   const handleSSE = useCallback((event: any) => {
@@ -247,15 +255,16 @@ export function ApiUsagePanel() {
   }, []);
 
   const handleNextPage = () => {
-    const newOffset = offset + limit;
-    setOffset(newOffset);
-    fetchUsage(newOffset);
+    if (!nextCursor) return;
+    setCursors((prev) => [...prev, nextCursor]);
+    fetchUsage(nextCursor);
   };
 
   const handlePrevPage = () => {
-    const newOffset = Math.max(0, offset - limit);
-    setOffset(newOffset);
-    fetchUsage(newOffset);
+    if (cursors.length <= 1) return;
+    const prev = cursors.slice(0, -1);
+    setCursors(prev);
+    fetchUsage(prev[prev.length - 1]);
   };
 
   return (
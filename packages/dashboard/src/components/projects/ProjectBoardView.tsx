@@ -75,11 +75,10 @@ export function ProjectBoardView({
 
   // Fetch active swarms and build task_id → swarm_id map
   useEffect(() => {
-    fetchSwarms()
+    fetchSwarms({ status: ['running'], limit: 200 })
       .then((data: any) => {
         const map = new Map<string, string>();
         for (const swarm of data.swarms || []) {
-          if (swarm.status !== 'running') continue;
           for (const task of swarm.tasks || []) {
             if (task.task_id && (task.status === 'running' || task.status === 'ready' || task.status === 'pending')) {
               map.set(task.task_id, swarm.swarm_id);
@@ -60,15 +60,9 @@ export function ProjectResolveView({ projectId, repoFullName: rawRepoFullName }:
 
   // Load recent resolve runs on first render
   useState(() => {
-    fetchRuns({ pipeline_id: 'resolve' })
+    fetchRuns({ pipeline_id: 'resolve', project_id: projectId, limit: 5 })
       .then((data) => {
-        const runs = Array.isArray(data) ? data : data.runs || [];
-        // Filter to this project's runs
-        setRecentRuns(
-          runs
-            .filter((r: any) => r.project_id === projectId)
-            .slice(0, 5),
-        );
+        setRecentRuns(Array.isArray(data) ? data : data.runs || []);
         setRunsLoaded(true);
       })
       .catch(() => setRunsLoaded(true));
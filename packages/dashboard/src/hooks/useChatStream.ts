@@ -1014,8 +1014,9 @@ export function useChatStream({
   );
 
   // ── SSE connection ────────────────────────────────────────────────────────
+  // Token deltas are coalesced server-side into ~one frame per animation frame
   const sseUrl = sessionId
-    ? `${API_BASE}/events/sessions/${sessionId}/events`
+    ? `${API_BASE}/events/sessions/${sessionId}/events?coalesce_ms=16`
     : '';
 
   const { status: sseStatus } = useSSE<StreamingSSEEvent>({
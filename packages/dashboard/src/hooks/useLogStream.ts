@@ -3,7 +3,10 @@
  *
  * Connects to the admin log SSE endpoints and accumulates log lines
  * in a circular buffer. Handles reconnection, backfill, and named
- * SSE events (event: log, event: connected, event: error).
+ * SSE events (event: logs, event: connected, event: dropped, event: error).
+ *
+ * The server coalesces lines into `logs` frames (a JSON array) and can
+ * filter by level, container and regex before sending.
  */
 
 import { useEffect, useRef, useState, useCallback } from 'react';
@@ -43,6 +46,20 @@ interface UseLogStreamOptions {
   enabled?: boolean;
   /** Whether the stream is paused (keeps connection, stops adding to buffer) */
   paused?: boolean;
+  /** Server-side filter: only these levels */
+  levels?: string[];
+  /** Server-side filter: only these containers (merged stream only) */
+  containers?: string[];
+  /** Server-side filter: case-insensitive regex on the line text */
+  search?: string;
+}
+
+interface LogPayload {
+  line: string;
+  level: string;
+  ts: string;
+  container: string;
+  service: string;
 }
 
 interface UseLogStreamReturn {
@@ -60,6 +77,9 @@ export function useLogStream({
   tail = 200,
   enabled = true,
   paused = false,
+  levels,
+  containers,
+  search,
 }: UseLogStreamOptions): UseLogStreamReturn {
   const [lines, setLines] = useState<LogLine[]>([]);
   const [status, setStatus] = useState<UseLogStreamReturn['status']>('closed');
@@ -68,6 +88,8 @@ export function useLogStream({
   const reconnectCountRef = useRef(0);
   const pausedRef = useRef(paused);
   const idCounterRef = useRef(0);
+  const levelsKey = levels?.join(',') ?? '';
+  const containersKey = containers?.join(',') ?? '';
 
   // Keep paused ref current without reconnecting
   useEffect(() => {
@@ -97,6 +119,11 @@ export function useLogStream({
         : `${API_BASE}/admin/logs/stream/${encodeURIComponent(source)}`;
 
       let url = `${streamPath}?tail=${tail}`;
+      if (levelsKey) url += `&level=${encodeURIComponent(levelsKey)}`;
+      if (containersKey && source === 'merged') {
+        url += `&container=${encodeURIComponent(containersKey)}`;
+      }
+      if (search) url += `&q=${encodeURIComponent(search)}`;
 
       // Add auth token (EventSource doesn't support custom headers)
       const token = getAccessToken();
@@ -113,41 +140,51 @@ export function useLogStream({
         reconnectCountRef.current = 0;
       });
 
-      // Handle named 'log' events
-      es.addEventListener('log', (event: MessageEvent) => {
-        if (pausedRef.current) return;
+      const appendLines = (batch: LogPayload[]) => {
+        if (pausedRef.current || batch.length === 0) return;
+        const now = Date.now();
+        const logLines: LogLine[] = batch.map((data) => ({
+          id: `${now}-${idCounterRef.current++}`,
+          line: data.line,
+          level: data.level || 'info',
+          ts: data.ts || '',
+          container: data.container || '',
+          service: data.service || '',
+        }));
+
+        setLines((prev) => {
+          const next = prev.concat(logLines);
+          // Trim to max buffer size
+          if (next.length > maxLines) {
+            return next.slice(next.length - maxLines);
+          }
+          return next;
+        });
+      };
+
+      // Handle batched 'logs' events (JSON array of lines)
+      es.addEventListener('logs', (event: MessageEvent) => {
+        try {
+          appendLines(JSON.parse(event.data) as LogPayload[]);
+        } catch {
+          // Ignore malformed events
+        }
+      });
 
+      // Handle single-line 'log' events (older servers)
+      es.addEventListener('log', (event: MessageEvent) => {
         try {
-          const data = JSON.parse(event.data) as {
-            line: string;
-            level: string;
-            ts: string;
-            container: string;
-            service: string;
-          };
-
-          const logLine: LogLine = {
-            id: `${Date.now()}-${idCounterRef.current++}`,
-            line: data.line,
-            level: data.level || 'info',
-            ts: data.ts || '',
-            container: data.container || '',
-            service: data.service || '',
-          };
-
-          setLines((prev) => {
-            const next = [...prev, logLine];
-            // Trim to max buffer size
-            if (next.length > maxLines) {
-              return next.slice(next.length - maxLines);
-            }
-            return next;
-          });
+          appendLines([JSON.parse(event.data) as LogPayload]);
         } catch {
           // Ignore malformed events
         }
       });
 
+      // The server dropped lines because this client fell behind
+      es.addEventListener('dropped', (event: MessageEvent) => {
+        console.warn('[useLogStream] Server dropped lines:', event.data);
+      });
+
       // Handle named 'error' events from the server
       es.addEventListener('error', (event: MessageEvent) => {
         // This is a server-sent error event, not an EventSource error
@@ -172,7 +209,7 @@ export function useLogStream({
     } catch {
       setStatus('error');
     }
-  }, [source, enabled, tail, maxLines]);
+  }, [source, enabled, tail, maxLines, levelsKey, containersKey, search]);
 
   const reconnect = useCallback(() => {
     reconnectCountRef.current = 0;
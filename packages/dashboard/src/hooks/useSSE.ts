@@ -1,5 +1,6 @@
-import { useEffect, useRef, useState, useCallback } from 'react';
+import { useEffect, useRef, useState, useCallback, useMemo } from 'react';
 import { getAccessToken } from '@/lib/auth';
+import { eventGateway, gatewayTopicForUrl } from '@/lib/eventGateway';
 
 interface UseSSEOptions<T> {
   url: string;
@@ -38,6 +39,15 @@ export function useSSE<T>({
   const reconnectTimerRef = useRef<ReturnType<typeof setTimeout> | null>(null);
   const onMessageRef = useRef(onMessage);
 
+  // Event URLs with a gateway topic share the tab's single gateway WebSocket
+  // instead of opening their own EventSource.  Streams resumed with
+  // getSinceParam (chat token streams) stay on SSE.
+  const gatewayTopic = useMemo(
+    () => (getSinceParam ? null : gatewayTopicForUrl(url)),
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+    [url],
+  );
+
   // Keep the callback ref updated without triggering reconnects
   useEffect(() => {
     onMessageRef.current = onMessage;
@@ -49,8 +59,34 @@ export function useSSE<T>({
     getSinceParamRef.current = getSinceParam;
   }, [getSinceParam]);
 
+  const handleData = useCallback((data: T) => {
+    // Only update lastMessage/lastEventTime for non-token events to avoid
+    // triggering a React re-render on every streaming token.
+    const type = (data as any)?.type;
+    if (type !== 'output' && type !== 'thinking') {
+      setLastMessage(data);
+      setLastEventTime(new Date());
+    }
+    onMessageRef.current?.(data);
+  }, []);
+
+  useEffect(() => {
+    if (!enabled || !gatewayTopic) return;
+    const offStatus = eventGateway.onStatus(setStatus);
+    const unsubscribe = eventGateway.subscribe(
+      gatewayTopic.topic,
+      (data) => handleData(data as T),
+      gatewayTopic.since,
+    );
+    return () => {
+      unsubscribe();
+      offStatus();
+      setStatus('closed');
+    };
+  }, [gatewayTopic, enabled, handleData]);
+
   const connect = useCallback(() => {
-    if (!enabled) return;
+    if (!enabled || gatewayTopic) return;
 
     if (eventSourceRef.current) {
       eventSourceRef.current.close();
@@ -77,19 +113,14 @@ export function useSSE<T>({
       };
 
       es.onmessage = (event) => {
+        let data: T;
         try {
-          const data = JSON.parse(event.data) as T;
-          // Only update lastMessage/lastEventTime for non-token events to avoid
-          // triggering a React re-render on every streaming token.
-          const type = (data as any)?.type;
-          if (type !== 'output' && type !== 'thinking') {
-            setLastMessage(data);
-            setLastEventTime(new Date());
-          }
-          onMessageRef.current?.(data);
+          data = JSON.parse(event.data) as T;
         } catch {
           onMessageRef.current?.(event.data as unknown as T);
+          return;
         }
+        handleData(data);
       };
 
       es.onerror = () => {
@@ -108,12 +139,16 @@ export function useSSE<T>({
     } catch {
       setStatus('error');
     }
-  }, [url, enabled, reconnectAttempts, reconnectInterval]);
+  }, [url, enabled, gatewayTopic, reconnectAttempts, reconnectInterval, handleData]);
 
   const reconnect = useCallback(() => {
+    if (gatewayTopic) {
+      eventGateway.reconnect();
+      return;
+    }
     reconnectCountRef.current = 0;
     connect();
-  }, [connect]);
+  }, [connect, gatewayTopic]);
 
   useEffect(() => {
     connect();
@@ -143,17 +143,35 @@ export async function fetchStatus() {
   return handleResponse(res, 'Failed to fetch status');
 }
 
-export async function fetchRuns(params?: { pipeline_id?: string; status?: string }): Promise<any> {
+export async function fetchRuns(params?: {
+  pipeline_id?: string;
+  status?: string;
+  project_id?: string;
+  limit?: number;
+  cursor?: string;
+}): Promise<any> {
   const searchParams = new URLSearchParams();
   if (params?.pipeline_id) searchParams.set('pipeline_id', params.pipeline_id);
   if (params?.status) searchParams.set('status', params.status);
+  if (params?.project_id) searchParams.set('project_id', params.project_id);
+  if (params?.limit) searchParams.set('limit', String(params.limit));
+  if (params?.cursor) searchParams.set('cursor', params.cursor);
   const query = searchParams.toString();
   const res = await authFetch(`${API_BASE}/runs/${query ? '?' + query : ''}`);
   return handleResponse(res, 'Failed to fetch runs');
 }
 
-export async function fetchSwarms(): Promise<any> {
-  const res = await authFetch(`${API_BASE}/internal/swarms`);
+export async function fetchSwarms(params?: {
+  status?: string[];
+  limit?: number;
+  cursor?: string;
+}): Promise<any> {
+  const searchParams = new URLSearchParams();
+  if (params?.status?.length) searchParams.set('status', params.status.join(','));
+  if (params?.limit) searchParams.set('limit', String(params.limit));
+  if (params?.cursor) searchParams.set('cursor', params.cursor);
+  const query = searchParams.toString();
+  const res = await authFetch(`${API_BASE}/internal/swarms${query ? '?' + query : ''}`);
   return handleResponse(res, 'Failed to fetch swarms');
 }
 
@@ -0,0 +1,212 @@
+// Client for the multiplexed event gateway (/v1/events/ws).
+//
+// One WebSocket per tab carries every live topic the dashboard listens to
+// (global pipeline events, runs, sessions, chat sessions, work locks,
+// lifecycle, LLM calls) instead of one EventSource per view.  useSSE routes
+// the matching URLs here (see gatewayTopicForUrl), so callers don't change.
+//
+// Server frames are binary: one header byte (0 = JSON, 1 = zlib-deflated
+// JSON) followed by a JSON array of events ({topic, id?, data}) and control
+// messages ({op, ...}).  Topics backed by Redis streams remember the last
+// event id and resume from it after a reconnect.
+
+import { wsBase } from '@/lib/api';
+import { getAccessToken } from '@/lib/auth';
+
+export type GatewayStatus = 'connecting' | 'connected' | 'error' | 'closed';
+
+type Listener = (data: unknown) => void;
+type StatusListener = (status: GatewayStatus) => void;
+
+interface GatewayMessage {
+  topic?: string;
+  id?: string;
+  data?: unknown;
+  op?: string;
+  count?: number;
+  error?: string;
+}
+
+const RECONNECT_BASE_MS = 800;
+const RECONNECT_MAX_MS = 15_000;
+// Keep the socket briefly after the last unsubscribe (e.g. route changes)
+const IDLE_CLOSE_MS = 5_000;
+
+const FRAME_DEFLATE = 1;
+
+class EventGatewayClient {
+  private ws: WebSocket | null = null;
+  private listeners = new Map<string, Set<Listener>>();
+  // Resume point per topic: last event id seen, or the initial `since`
+  private since = new Map<string, string>();
+  private statusListeners = new Set<StatusListener>();
+  private status: GatewayStatus = 'closed';
+  private reconnectDelay = RECONNECT_BASE_MS;
+  private reconnectTimer: ReturnType<typeof setTimeout> | null = null;
+  private idleTimer: ReturnType<typeof setTimeout> | null = null;
+  // Decompression is async; chain frames so events stay in order
+  private decodeChain: Promise<void> = Promise.resolve();
+
+  subscribe(topic: string, listener: Listener, since?: string): () => void {
+    let topicListeners = this.listeners.get(topic);
+    if (!topicListeners) {
+      topicListeners = new Set();
+      this.listeners.set(topic, topicListeners);
+      if (since) this.since.set(topic, since);
+      this.send({ op: 'subscribe', topic, since });
+    }
+    topicListeners.add(listener);
+    this.ensureConnected();
+
+    return () => {
+      const current = this.listeners.get(topic);
+      if (!current?.delete(listener) || current.size > 0) return;
+      this.listeners.delete(topic);
+      this.since.delete(topic);
+      this.send({ op: 'unsubscribe', topic });
+      if (this.listeners.size === 0) this.scheduleIdleClose();
+    };
+  }
+
+  onStatus(listener: StatusListener): () => void {
+    this.statusListeners.add(listener);
+    listener(this.status);
+    return () => {
+      this.statusListeners.delete(listener);
+    };
+  }
+
+  reconnect(): void {
+    this.reconnectDelay = RECONNECT_BASE_MS;
+    this.ws?.close();
+    this.ws = null;
+    this.ensureConnected();
+  }
+
+  private setStatus(status: GatewayStatus): void {
+    this.status = status;
+    this.statusListeners.forEach((listener) => listener(status));
+  }
+
+  private send(message: Record<string, unknown>): void {
+    if (this.ws?.readyState === WebSocket.OPEN) {
+      this.ws.send(JSON.stringify(message));
+    }
+  }
+
+  private ensureConnected(): void {
+    if (this.idleTimer) {
+      clearTimeout(this.idleTimer);
+      this.idleTimer = null;
+    }
+    if (this.ws || this.reconnectTimer || this.listeners.size === 0) return;
+
+    const token = getAccessToken();
+    const url = token
+      ? `${wsBase()}/v1/events/ws?token=${encodeURIComponent(token)}`
+      : `${wsBase()}/v1/events/ws`;
+    const ws = new WebSocket(url);
+    ws.binaryType = 'arraybuffer';
+    this.ws = ws;
+    this.setStatus('connecting');
+
+    ws.addEventListener('open', () => {
+      this.reconnectDelay = RECONNECT_BASE_MS;
+      this.setStatus('connected');
+      for (const topic of this.listeners.keys()) {
+        ws.send(JSON.stringify({ op: 'subscribe', topic, since: this.since.get(topic) }));
+      }
+    });
+
+    ws.addEventListener('message', (event) => {
+      if (!(event.data instanceof ArrayBuffer)) return;
+      const frame = event.data;
+      this.decodeChain = this.decodeChain
+        .then(() => decodeFrame(frame))
+        .then((messages) => messages.forEach((msg) => this.dispatch(msg)))
+        .catch((err) => console.error('[EventGateway] Bad frame:', err));
+    });
+
+    ws.addEventListener('close', (ev) => {
+      if (this.ws !== ws) return;
+      this.ws = null;
+      if (this.listeners.size === 0) {
+        this.setStatus('closed');
+        return;
+      }
+      this.setStatus('error');
+      // 4401: credentials rejected — retrying with the same token won't help
+      if (ev.code === 4401) return;
+      this.reconnectTimer = setTimeout(() => {
+        this.reconnectTimer = null;
+        this.ensureConnected();
+      }, this.reconnectDelay);
+      this.reconnectDelay = Math.min(this.reconnectDelay * 2, RECONNECT_MAX_MS);
+    });
+  }
+
+  private scheduleIdleClose(): void {
+    if (this.idleTimer) clearTimeout(this.idleTimer);
+    this.idleTimer = setTimeout(() => {
+      this.idleTimer = null;
+      if (this.listeners.size > 0) return;
+      const ws = this.ws;
+      this.ws = null;
+      ws?.close();
+      this.setStatus('closed');
+    }, IDLE_CLOSE_MS);
+  }
+
+  private dispatch(msg: GatewayMessage): void {
+    if (msg.op) {
+      if (msg.op === 'dropped') {
+        console.warn(`[EventGateway] ${msg.count} event(s) dropped on ${msg.topic}`);
+      } else if (msg.op === 'error') {
+        console.warn(`[EventGateway] ${msg.topic ?? ''}: ${msg.error}`);
+      }
+      return;
+    }
+    if (!msg.topic) return;
+    const topicListeners = this.listeners.get(msg.topic);
+    if (!topicListeners) return;
+    if (msg.id) this.since.set(msg.topic, msg.id);
+    topicListeners.forEach((listener) => listener(msg.data));
+  }
+}
+
+async function decodeFrame(frame: ArrayBuffer): Promise<GatewayMessage[]> {
+  const bytes = new Uint8Array(frame);
+  let body: ArrayBuffer | Uint8Array = bytes.subarray(1);
+  if (bytes[0] === FRAME_DEFLATE) {
+    const stream = new Blob([body]).stream().pipeThrough(new DecompressionStream('deflate'));
+    body = await new Response(stream).arrayBuffer();
+  }
+  return JSON.parse(new TextDecoder().decode(body)) as GatewayMessage[];
+}
+
+/**
+ * The gateway topic (and initial resume point) serving an events SSE URL,
+ * or null if the URL has no gateway equivalent.
+ */
+export function gatewayTopicForUrl(url: string): { topic: string; since?: string } | null {
+  const match = url.match(/\/v1\/events\/([^?]*)(?:\?(.*))?$/);
+  if (!match) return null;
+  const [, path, query = ''] = match;
+  const since = new URLSearchParams(query).get('since') ?? undefined;
+  const parts = path.split('/');
+
+  if (path === 'stream') return { topic: 'global' };
+  if (parts[0] === 'stream' && parts.length === 2) {
+    // SSE replays the whole run unless since=$ (live only)
+    return { topic: `run:${parts[1]}`, since: since === '$' ? undefined : (since ?? '0-0') };
+  }
+  if (path === 'sessions') return { topic: 'sessions' };
+  if (parts[0] === 'sessions' && parts.length === 2) return { topic: `sessions:${parts[1]}` };
+  if (path === 'chat-sessions') return { topic: 'chat-sessions' };
+  if (parts[0] === 'work-locks' && parts.length === 2) return { topic: `work-locks:${parts[1]}` };
+  if (path === 'events') return { topic: 'lifecycle' };
+  if (path === 'llm-calls') return { topic: 'llm-calls' };
+  return null;
+}
+
+export const eventGateway = new EventGatewayClient();
@@ -47,7 +47,7 @@ function DashboardHome() {
         // Fetch status, runs, and agents in parallel
         const [status, runsResponse, agentList] = await Promise.all([
           fetchStatus().catch(() => ({})),
-          fetchRuns().catch(() => ({ runs: [] })),
+          fetchRuns({ limit: 4 }).catch(() => ({ runs: [] })),
           fetchAgents().catch(() => []),
         ]);
         
@@ -73,7 +73,7 @@ function DashboardHome() {
       clearTimeout(refreshTimeoutRef.current);
     }
     refreshTimeoutRef.current = setTimeout(() => {
-      fetchRuns()
+      fetchRuns({ limit: 4 })
         .then(response => {
           const runs = Array.isArray(response) ? response : response.runs || [];
           setRecentRuns(runs.slice(0, 4));
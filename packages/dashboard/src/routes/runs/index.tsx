@@ -38,6 +38,8 @@ function RunsList() {
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
   const [runs, setRuns] = useState<Run[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [showCleanup, setShowCleanup] = useState(false);
   const [confirmAction, setConfirmAction] = useState<{ title: string; desc: string; action: () => void } | null>(null);
   const [stoppingRuns, setStoppingRuns] = useState<Set<string>>(new Set());
@@ -48,17 +50,53 @@ function RunsList() {
   // Debounce ref for SSE updates
   const refreshTimeoutRef = useRef<ReturnType<typeof setTimeout> | null>(null);
 
+  // Replace the list with the newest page (initial load, bulk delete)
+  const resetToFirstPage = useCallback((response: any) => {
+    setRuns(Array.isArray(response) ? response : response.runs || []);
+    setNextCursor(Array.isArray(response) ? null : response.next_cursor ?? null);
+  }, []);
+
+  // Refresh the newest page without dropping older pages already loaded
+  const mergeFirstPage = useCallback((response: any) => {
+    const page: Run[] = Array.isArray(response) ? response : response.runs || [];
+    setRuns(prev => {
+      const oldest = page[page.length - 1];
+      const older = oldest
+        ? prev.filter(r => r.created_at < oldest.created_at && !page.some(p => p.id === r.id))
+        : [];
+      if (older.length === 0) {
+        setNextCursor(Array.isArray(response) ? null : response.next_cursor ?? null);
+      }
+      return [...page, ...older];
+    });
+  }, []);
+
   const debouncedRefresh = useCallback(() => {
     if (refreshTimeoutRef.current) {
       clearTimeout(refreshTimeoutRef.current);
     }
     refreshTimeoutRef.current = setTimeout(() => {
       fetchRuns()
-        .then(response => setRuns(Array.isArray(response) ? response : response.runs || []))
+        .then(mergeFirstPage)
         .catch(() => {});
       refreshTimeoutRef.current = null;
     }, 300);
-  }, []);
+  }, [mergeFirstPage]);
+
+  const loadMore = async () => {
+    if (!nextCursor || loadingMore) return;
+    setLoadingMore(true);
+    try {
+      const response = await fetchRuns({ cursor: nextCursor });
+      const page: Run[] = response.runs || [];
+      setRuns(prev => [...prev, ...page.filter(r => !prev.some(p => p.id === r.id))]);
+      setNextCursor(response.next_cursor ?? null);
+    } catch (err) {
+      setError(err instanceof Error ? err.message : 'Failed to load runs');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
 
   // Cleanup timeout on unmount
   useEffect(() => {
@@ -72,12 +110,19 @@ function RunsList() {
       try {
         setLoading(true);
         setError(null);
-        const [runsResponse, swarmsResponse] = await Promise.all([
+        // Every running swarm (however old) plus the most recent ones
+        const [runsResponse, runningSwarms, recentSwarms] = await Promise.all([
           fetchRuns(),
-          fetchSwarms().catch(() => ({ swarms: [] })),
+          fetchSwarms({ status: ['running'], limit: 200 }).catch(() => ({ swarms: [] })),
+          fetchSwarms({ limit: 20 }).catch(() => ({ swarms: [] })),
+        ]);
+        resetToFirstPage(runsResponse);
+        const running: any[] = runningSwarms.swarms || [];
+        const runningIds = new Set(running.map((s) => s.swarm_id));
+        setSwarms([
+          ...running,
+          ...(recentSwarms.swarms || []).filter((s: any) => !runningIds.has(s.swarm_id)),
         ]);
-        setRuns(Array.isArray(runsResponse) ? runsResponse : runsResponse.runs || []);
-        setSwarms(swarmsResponse.swarms || []);
       } catch (err) {
         setError(err instanceof Error ? err.message : 'Failed to load runs');
       } finally {
@@ -196,7 +241,7 @@ function RunsList() {
           const result = await bulkDeleteRuns(params);
           setShowCleanup(false);
           await fetchRuns()
-            .then(response => setRuns(Array.isArray(response) ? response : response.runs || []))
+            .then(resetToFirstPage)
             .catch(console.error);
           // Success - silently refresh the list
         } catch (err) {
@@ -425,6 +470,14 @@ function RunsList() {
                   </div>
                 </Link>
               ))}
+              {nextCursor && (
+                <div className="flex justify-center pt-2">
+                  <Button variant="outline" size="sm" onClick={loadMore} disabled={loadingMore}>
+                    {loadingMore && <Loader2 className="mr-2 h-4 w-4 animate-spin" />}
+                    Load more
+                  </Button>
+                </div>
+              )}
             </div>
           )}
         </CardContent>
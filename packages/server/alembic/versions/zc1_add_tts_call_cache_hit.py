@@ -0,0 +1,41 @@
+"""Add cache_hit column to tts_call_logs.
+
+Synthesis requests served from the TTS audio cache are logged with
+cache_hit=true (and zero cost) so usage views can separate them from
+billed provider calls.
+
+Revision ID: zc1_tts_cache_hit
+Revises: zc0_task_id_runs
+Create Date: 2026-03-06 10:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision: str = "zc1_tts_cache_hit"
+down_revision: Union[str, Sequence[str], None] = "zc0_task_id_runs"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    columns = {c["name"] for c in inspector.get_columns("tts_call_logs")}
+
+    if "cache_hit" not in columns:
+        op.add_column(
+            "tts_call_logs",
+            sa.Column(
+                "cache_hit", sa.Boolean(), nullable=False, server_default="false"
+            ),
+        )
+
+
+def downgrade() -> None:
+    op.drop_column("tts_call_logs", "cache_hit")
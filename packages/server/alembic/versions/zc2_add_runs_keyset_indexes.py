@@ -0,0 +1,44 @@
+"""Add keyset-pagination indexes to runs.
+
+list_runs now pages on (created_at, id) newest-first, optionally filtered
+by pipeline or status.  These composite indexes let each page be an index
+range scan instead of a sort over the whole table.
+
+Revision ID: zc2_runs_keyset_idx
+Revises: zc1_tts_cache_hit
+Create Date: 2026-03-06 14:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision: str = "zc2_runs_keyset_idx"
+down_revision: Union[str, Sequence[str], None] = "zc1_tts_cache_hit"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+_INDEXES = {
+    "idx_runs_created_id": ["created_at", "id"],
+    "idx_runs_pipeline_created_id": ["pipeline_id", "created_at", "id"],
+    "idx_runs_status_created_id": ["status", "created_at", "id"],
+}
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    existing = {idx["name"] for idx in inspector.get_indexes("runs")}
+
+    for name, columns in _INDEXES.items():
+        if name not in existing:
+            op.create_index(name, "runs", columns)
+
+
+def downgrade() -> None:
+    for name in _INDEXES:
+        op.drop_index(name, table_name="runs")
@@ -0,0 +1,106 @@
+"""Add llm_usage_rollups table.
+
+Hourly pre-aggregated totals of llm_call_logs per (user, agent, model,
+provider, key source).  Maintained at ingest time; summaries and usage
+charts read from here instead of scanning the raw log.  Existing rows are
+backfilled.
+
+Revision ID: zc3_llm_usage_rollups
+Revises: zc2_runs_keyset_idx
+Create Date: 2026-03-06 18:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision: str = "zc3_llm_usage_rollups"
+down_revision: Union[str, Sequence[str], None] = "zc2_runs_keyset_idx"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    if "llm_usage_rollups" in inspector.get_table_names():
+        return
+
+    op.create_table(
+        "llm_usage_rollups",
+        sa.Column("bucket_start", sa.BigInteger(), primary_key=True),
+        sa.Column("user_id", sa.String(64), primary_key=True, server_default=""),
+        sa.Column("agent_id", sa.String(128), primary_key=True),
+        sa.Column("model", sa.String(128), primary_key=True),
+        sa.Column("provider", sa.String(64), primary_key=True),
+        sa.Column("key_source", sa.String(32), primary_key=True, server_default=""),
+        sa.Column("call_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("input_tokens", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("output_tokens", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column(
+            "cache_read_tokens", sa.BigInteger(), nullable=False, server_default="0"
+        ),
+        sa.Column(
+            "cache_write_tokens", sa.BigInteger(), nullable=False, server_default="0"
+        ),
+        sa.Column("total_tokens", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("cost_input", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("cost_output", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("cost_total", sa.Float(), nullable=False, server_default="0"),
+        sa.Column(
+            "duration_ms_sum", sa.BigInteger(), nullable=False, server_default="0"
+        ),
+        sa.Column("duration_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.create_index(
+        "idx_llm_usage_rollups_agent_bucket",
+        "llm_usage_rollups",
+        ["agent_id", "bucket_start"],
+    )
+    op.create_index(
+        "idx_llm_usage_rollups_user_bucket",
+        "llm_usage_rollups",
+        ["user_id", "bucket_start"],
+    )
+
+    # Backfill from the raw log
+    op.execute(
+        """
+        INSERT INTO llm_usage_rollups (
+            bucket_start, user_id, agent_id, model, provider, key_source,
+            call_count, input_tokens, output_tokens, cache_read_tokens,
+            cache_write_tokens, total_tokens, cost_input, cost_output,
+            cost_total, duration_ms_sum, duration_count
+        )
+        SELECT
+            created_at - (created_at % 3600000),
+            COALESCE(user_id, ''),
+            agent_id,
+            model,
+            provider,
+            COALESCE(key_source, ''),
+            COUNT(*),
+            COALESCE(SUM(input_tokens), 0),
+            COALESCE(SUM(output_tokens), 0),
+            COALESCE(SUM(cache_read_tokens), 0),
+            COALESCE(SUM(cache_write_tokens), 0),
+            COALESCE(SUM(total_tokens), 0),
+            COALESCE(SUM(cost_input), 0),
+            COALESCE(SUM(cost_output), 0),
+            COALESCE(SUM(cost_total), 0),
+            COALESCE(SUM(duration_ms), 0),
+            COUNT(duration_ms)
+        FROM llm_call_logs
+        GROUP BY 1, 2, 3, 4, 5, 6
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_llm_usage_rollups_user_bucket", table_name="llm_usage_rollups")
+    op.drop_index("idx_llm_usage_rollups_agent_bucket", table_name="llm_usage_rollups")
+    op.drop_table("llm_usage_rollups")
@@ -0,0 +1,156 @@
+"""Partition the append-only log tables by month.
+
+llm_call_logs, session_events, memory_retrieval_log and tts_call_logs
+become RANGE-partitioned on their epoch-ms timestamp column (PostgreSQL
+only).  Existing rows are not copied: the old table is renamed to
+``{table}_legacy`` and attached as the partition for everything up to the
+end of the current month, reusing its indexes.  A ``{table}_default``
+partition catches anything no monthly partition covers yet.  Monthly
+partitions are created ahead of time (and expired ones dropped) by
+app.services.partition_manager at startup.
+
+The primary key becomes (id, timestamp column) since PostgreSQL requires
+the partition key in every unique constraint.
+
+Also adds the missing session_events timestamp index (all dialects).
+
+Revision ID: zc4_partition_log_tables
+Revises: zc3_llm_usage_rollups
+Create Date: 2026-03-09 10:00:00.000000
+"""
+
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import inspect, text
+
+
+# revision identifiers, used by Alembic.
+revision: str = "zc4_partition_log_tables"
+down_revision: Union[str, Sequence[str], None] = "zc3_llm_usage_rollups"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# table → partition key column
+_TABLES = {
+    "llm_call_logs": "created_at",
+    "session_events": "timestamp",
+    "memory_retrieval_log": "created_at",
+    "tts_call_logs": "created_at",
+}
+
+
+def _next_month_start_ms() -> int:
+    now = datetime.now(timezone.utc)
+    year, month = (now.year + 1, 1) if now.month == 12 else (now.year, now.month + 1)
+    return int(datetime(year, month, 1, tzinfo=timezone.utc).timestamp() * 1000)
+
+
+def _is_partitioned(conn, table: str) -> bool:
+    return (
+        conn.execute(
+            text(
+                "SELECT 1 FROM pg_partitioned_table "
+                "WHERE partrelid = to_regclass(:table)"
+            ),
+            {"table": table},
+        ).first()
+        is not None
+    )
+
+
+def _partition(conn, inspector, table: str, column: str, legacy_upper: int) -> None:
+    legacy = f"{table}_legacy"
+    pk_name = inspector.get_pk_constraint(table).get("name") or f"{table}_pkey"
+    indexes = inspector.get_indexes(table)
+    foreign_keys = inspector.get_foreign_keys(table)
+
+    # Move the existing table (and its index names) out of the way
+    op.execute(f'ALTER TABLE "{table}" RENAME TO "{legacy}"')
+    op.execute(f'ALTER TABLE "{legacy}" RENAME CONSTRAINT "{pk_name}" TO "{legacy}_pkey"')
+    for idx in indexes:
+        op.execute(f'ALTER INDEX "{idx["name"]}" RENAME TO "{idx["name"]}_legacy"')
+    # Foreign keys are re-created on the parent, which propagates them
+    for fk in foreign_keys:
+        op.execute(f'ALTER TABLE "{legacy}" DROP CONSTRAINT "{fk["name"]}"')
+
+    op.execute(
+        f'CREATE TABLE "{table}" (LIKE "{legacy}" INCLUDING DEFAULTS) '
+        f'PARTITION BY RANGE ("{column}")'
+    )
+    op.execute(f'ALTER TABLE "{table}" ADD PRIMARY KEY (id, "{column}")')
+    op.execute(
+        f'ALTER TABLE "{table}" ATTACH PARTITION "{legacy}" '
+        f"FOR VALUES FROM (MINVALUE) TO ({legacy_upper})"
+    )
+    op.execute(f'CREATE TABLE "{table}_default" PARTITION OF "{table}" DEFAULT')
+
+    # Matching indexes already on the legacy partition are attached, not rebuilt
+    for idx in indexes:
+        cols = ", ".join(f'"{c}"' for c in idx["column_names"])
+        op.execute(f'CREATE INDEX "{idx["name"]}" ON "{table}" ({cols})')
+    for fk in foreign_keys:
+        local = ", ".join(f'"{c}"' for c in fk["constrained_columns"])
+        remote = ", ".join(f'"{c}"' for c in fk["referred_columns"])
+        ondelete = fk.get("options", {}).get("ondelete")
+        op.execute(
+            f'ALTER TABLE "{table}" ADD CONSTRAINT "{fk["name"]}" '
+            f'FOREIGN KEY ({local}) REFERENCES "{fk["referred_table"]}" ({remote})'
+            + (f" ON DELETE {ondelete}" if ondelete else "")
+        )
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    tables = set(inspector.get_table_names())
+
+    if "session_events" in tables:
+        existing = {idx["name"] for idx in inspector.get_indexes("session_events")}
+        if "idx_session_events_timestamp" not in existing:
+            op.create_index(
+                "idx_session_events_timestamp", "session_events", ["timestamp"]
+            )
+
+    if conn.dialect.name != "postgresql":
+        return
+
+    legacy_upper = _next_month_start_ms()
+    for table, column in _TABLES.items():
+        if table not in tables or _is_partitioned(conn, table):
+            continue
+        _partition(conn, inspect(conn), table, column, legacy_upper)
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    if conn.dialect.name == "postgresql":
+        for table, column in _TABLES.items():
+            if not _is_partitioned(conn, table):
+                continue
+            inspector = inspect(conn)
+            indexes = inspector.get_indexes(table)
+            foreign_keys = inspector.get_foreign_keys(table)
+            op.execute(f'ALTER TABLE "{table}" RENAME TO "{table}_partitioned"')
+            op.execute(
+                f'CREATE TABLE "{table}" (LIKE "{table}_partitioned" INCLUDING DEFAULTS)'
+            )
+            op.execute(f'INSERT INTO "{table}" SELECT * FROM "{table}_partitioned"')
+            op.execute(f'DROP TABLE "{table}_partitioned" CASCADE')
+            op.execute(f'ALTER TABLE "{table}" ADD PRIMARY KEY (id)')
+            for idx in indexes:
+                cols = ", ".join(f'"{c}"' for c in idx["column_names"])
+                op.execute(f'CREATE INDEX "{idx["name"]}" ON "{table}" ({cols})')
+            for fk in foreign_keys:
+                local = ", ".join(f'"{c}"' for c in fk["constrained_columns"])
+                remote = ", ".join(f'"{c}"' for c in fk["referred_columns"])
+                ondelete = fk.get("options", {}).get("ondelete")
+                op.execute(
+                    f'ALTER TABLE "{table}" ADD CONSTRAINT "{fk["name"]}" '
+                    f'FOREIGN KEY ({local}) REFERENCES "{fk["referred_table"]}" ({remote})'
+                    + (f" ON DELETE {ondelete}" if ondelete else "")
+                )
+
+    op.drop_index("idx_session_events_timestamp", table_name="session_events")
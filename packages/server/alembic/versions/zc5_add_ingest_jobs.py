@@ -0,0 +1,62 @@
+"""Add ingest_jobs table.
+
+Durable queue for Dialog ingest payloads (meetings, notes, dictations).
+Each row holds the pre-split chunk prompts and per-chunk progress so
+workers can resume a job after a restart.
+
+Revision ID: zc5_ingest_jobs
+Revises: zc4_partition_log_tables
+Create Date: 2026-03-11 09:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision: str = "zc5_ingest_jobs"
+down_revision: Union[str, Sequence[str], None] = "zc4_partition_log_tables"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    if "ingest_jobs" in inspector.get_table_names():
+        return
+
+    op.create_table(
+        "ingest_jobs",
+        sa.Column("id", sa.String(64), primary_key=True),
+        sa.Column("user_id", sa.String(64), nullable=False),
+        sa.Column("kind", sa.String(32), nullable=False),
+        sa.Column("title", sa.String(512), nullable=True),
+        sa.Column("status", sa.String(16), nullable=False, server_default="queued"),
+        sa.Column("chunks", sa.Text(), nullable=False),
+        sa.Column("chunk_count", sa.Integer(), nullable=False),
+        sa.Column("chunks_done", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("replies", sa.Text(), nullable=False, server_default="[]"),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("session_id", sa.String(256), nullable=True),
+        sa.Column("created_at", sa.BigInteger(), nullable=False),
+        sa.Column("started_at", sa.BigInteger(), nullable=True),
+        sa.Column("heartbeat_at", sa.BigInteger(), nullable=True),
+        sa.Column("completed_at", sa.BigInteger(), nullable=True),
+    )
+    op.create_index(
+        "idx_ingest_jobs_status_created", "ingest_jobs", ["status", "created_at"]
+    )
+    op.create_index(
+        "idx_ingest_jobs_user_created", "ingest_jobs", ["user_id", "created_at"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_ingest_jobs_user_created", table_name="ingest_jobs")
+    op.drop_index("idx_ingest_jobs_status_created", table_name="ingest_jobs")
+    op.drop_table("ingest_jobs")
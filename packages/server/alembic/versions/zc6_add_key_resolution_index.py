@@ -0,0 +1,98 @@
+"""Add indexed key-resolution columns to chat_sessions and runs.
+
+key_user_id and key_sources hold the userId and the set of key source
+types from the key_resolution JSON so the admin usage view can filter and
+paginate in SQL.  Existing rows are backfilled in batches; new writes keep
+them in sync through KeyResolutionIndexMixin.
+
+Revision ID: zc6_key_resolution_index
+Revises: zc5_ingest_jobs
+Create Date: 2026-03-12 09:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect, text
+
+
+# revision identifiers, used by Alembic.
+revision: str = "zc6_key_resolution_index"
+down_revision: Union[str, Sequence[str], None] = "zc5_ingest_jobs"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_BATCH = 1000
+
+_INDEXES = {
+    "chat_sessions": [
+        ("idx_chat_sessions_created_id", ["created_at", "id"]),
+        ("idx_chat_sessions_key_user_created", ["key_user_id", "created_at", "id"]),
+    ],
+    "runs": [
+        (
+            "idx_runs_initiator_created_id",
+            ["initiated_by_user_id", "created_at", "id"],
+        ),
+    ],
+}
+
+
+def _backfill(conn, table: str) -> None:
+    from app.models.base import key_resolution_index
+
+    last_id = ""
+    while True:
+        rows = conn.execute(
+            text(
+                f"SELECT id, key_resolution FROM {table} "
+                "WHERE key_resolution IS NOT NULL AND id > :last_id "
+                "ORDER BY id LIMIT :batch"
+            ),
+            {"last_id": last_id, "batch": _BATCH},
+        ).all()
+        if not rows:
+            return
+        params = []
+        for row_id, raw in rows:
+            user_id, sources = key_resolution_index(raw)
+            params.append({"id": row_id, "user_id": user_id, "sources": sources})
+        conn.execute(
+            text(
+                f"UPDATE {table} SET key_user_id = :user_id, "
+                "key_sources = :sources WHERE id = :id"
+            ),
+            params,
+        )
+        last_id = rows[-1][0]
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = inspect(conn)
+
+    for table, indexes in _INDEXES.items():
+        columns = {c["name"] for c in inspector.get_columns(table)}
+        added = False
+        if "key_user_id" not in columns:
+            op.add_column(table, sa.Column("key_user_id", sa.String(64), nullable=True))
+            added = True
+        if "key_sources" not in columns:
+            op.add_column(table, sa.Column("key_sources", sa.String(256), nullable=True))
+            added = True
+        if added:
+            _backfill(conn, table)
+
+        existing = {ix["name"] for ix in inspector.get_indexes(table)}
+        for name, index_columns in indexes:
+            if name not in existing:
+                op.create_index(name, table, index_columns)
+
+
+def downgrade() -> None:
+    for table, indexes in _INDEXES.items():
+        for name, _ in indexes:
+            op.drop_index(name, table_name=table)
+        op.drop_column(table, "key_sources")
+        op.drop_column(table, "key_user_id")
@@ -18,7 +18,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.config import auth_settings
 from app.auth.jwt import decode_token, hash_token, TOKEN_TYPE_ACCESS
-from app.database import get_async_session
+from app.auth.principal_cache import principal_cache
+from app.database import AsyncSessionLocal
 from app.logging_config import get_logger
 from app.models.auth import User, APIKey
 from app.models.base import now_ms
@@ -69,14 +70,13 @@ def _is_engine_internal_token(token: str) -> bool:
 
 
 async def _resolve_api_key(
-    token: str,
+    token_hash: str,
     session: AsyncSession,
-) -> Optional[AuthUser]:
-    """Try to resolve a token as a database-stored API key.
+) -> Optional[tuple[AuthUser, APIKey]]:
+    """Try to resolve a token hash as a database-stored API key.
 
-    Returns AuthUser on match, None if the token isn't an API key.
+    Returns (AuthUser, APIKey) on match, None if the token isn't an API key.
     """
-    token_hash = hash_token(token)
     result = await session.execute(
         select(APIKey).where(APIKey.key_hash == token_hash, APIKey.is_active == True)
     )
@@ -88,9 +88,6 @@ async def _resolve_api_key(
     if api_key.expires_at and api_key.expires_at < now_ms():
         return None
 
-    # Update last_used_at (fire-and-forget, don't block auth)
-    api_key.last_used_at = now_ms()
-
     # Service keys act as admin with no real user behind them
     if api_key.is_service_key:
         return AuthUser(
@@ -101,7 +98,7 @@ async def _resolve_api_key(
             is_service=True,
             totp_verified=True,
             totp_enabled=False,
-        )
+        ), api_key
 
     # User-bound API key — look up the user
     if not api_key.user_id:
@@ -120,13 +117,16 @@ async def _resolve_api_key(
         # API keys bypass TOTP — the key itself is the second factor.
         totp_verified=True,
         totp_enabled=user.totp_enabled,
-    )
+    ), api_key
 
 
-async def _resolve_jwt(token: str, session: AsyncSession) -> Optional[AuthUser]:
+async def _resolve_jwt(
+    token: str, session: AsyncSession
+) -> Optional[tuple[AuthUser, Optional[float]]]:
     """Try to decode a token as a JWT and look up the user.
 
-    Returns AuthUser on success, None if the token is not a valid JWT.
+    Returns (AuthUser, exp timestamp) on success, None if the token is not
+    a valid JWT.
     """
     try:
         payload = decode_token(token)
@@ -166,15 +166,60 @@ async def _resolve_jwt(token: str, session: AsyncSession) -> Optional[AuthUser]:
         is_service=False,
         totp_verified=payload.get("totp_verified", False),
         totp_enabled=user.totp_enabled,
+    ), payload.get("exp")
+
+
+async def resolve_principal(token: str) -> AuthUser:
+    """Resolve a bearer token to an AuthUser, using the principal cache.
+
+    Raises 401 if the token is not a valid credential.
+    """
+    # 1. ENGINE_INTERNAL_TOKEN
+    if _is_engine_internal_token(token):
+        return AuthUser.service_user()
+
+    token_hash = hash_token(token)
+    cached = principal_cache.get(token_hash)
+    if cached is not None:
+        return cached
+
+    async with AsyncSessionLocal() as session:
+        # 2. JWT
+        resolved_jwt = await _resolve_jwt(token, session)
+        if resolved_jwt:
+            auth_user, exp = resolved_jwt
+            principal_cache.put(token_hash, auth_user, credential_expires_at=exp)
+            return auth_user
+
+        # 3. API key (DB lookup)
+        resolved_key = await _resolve_api_key(token_hash, session)
+        if resolved_key:
+            auth_user, api_key = resolved_key
+            principal_cache.put(
+                token_hash,
+                auth_user,
+                credential_expires_at=api_key.expires_at / 1000
+                if api_key.expires_at
+                else None,
+                api_key_id=api_key.id,
+            )
+            principal_cache.touch_api_key(api_key.id)
+            return auth_user
+
+    raise HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid or expired token",
+        headers={"WWW-Authenticate": "Bearer"},
     )
 
 
-async def get_current_user(
-    request: Request,
-    session: AsyncSession = Depends(get_async_session),
-) -> AuthUser:
+async def get_current_user(request: Request) -> AuthUser:
     """Resolve the current user from JWT or API key.
 
+    AuthMiddleware normally resolves the principal once per request and
+    stores it on the request state; this only resolves it itself for
+    paths the middleware skips.
+
     Raises 401 if no valid credential is provided.
     """
     if not auth_settings.enabled:
@@ -189,6 +234,13 @@ async def get_current_user(
             totp_enabled=False,
         )
 
+    auth_user = getattr(request.state, "auth_user", None)
+    if auth_user is not None:
+        return auth_user
+    auth_error = getattr(request.state, "auth_error", None)
+    if auth_error is not None:
+        raise auth_error
+
     token = _extract_bearer_token(request)
     if not token:
         raise HTTPException(
@@ -197,25 +249,7 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # 1. ENGINE_INTERNAL_TOKEN
-    if _is_engine_internal_token(token):
-        return AuthUser.service_user()
-
-    # 2. JWT
-    auth_user = await _resolve_jwt(token, session)
-    if auth_user:
-        return auth_user
-
-    # 3. API key (DB lookup)
-    auth_user = await _resolve_api_key(token, session)
-    if auth_user:
-        return auth_user
-
-    raise HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Invalid or expired token",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+    return await resolve_principal(token)
 
 
 async def get_current_admin(
@@ -230,13 +264,10 @@ async def get_current_admin(
     return user
 
 
-async def get_service_or_user(
-    request: Request,
-    session: AsyncSession = Depends(get_async_session),
-) -> AuthUser:
+async def get_service_or_user(request: Request) -> AuthUser:
     """Accept JWT, API key, or ENGINE_INTERNAL_TOKEN.
 
     Same as get_current_user — kept as a distinct name for semantic clarity
     at call sites that specifically document service-to-service auth.
     """
-    return await get_current_user(request, session)
+    return await get_current_user(request)
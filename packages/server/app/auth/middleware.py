@@ -1,17 +1,24 @@
 """Auth middleware — global route protection with path allowlist.
 
-Applied as Starlette middleware so it runs before FastAPI dependency
-injection and covers every route without per-router Depends().
+Applied as a pure ASGI middleware so it runs before FastAPI dependency
+injection and covers every route without per-router Depends().  Unlike
+BaseHTTPMiddleware it adds no extra task or response-stream wrapping,
+which matters for long-lived SSE responses.
+
+The caller's principal is resolved here exactly once (via the principal
+cache) and stored on the request state, where get_current_user picks it
+up without touching the database again.
 """
 
 import re
-from starlette.middleware.base import BaseHTTPMiddleware
+
+from fastapi import HTTPException
 from starlette.requests import Request
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from app.auth.config import auth_settings
-from app.auth.dependencies import _extract_bearer_token, _is_engine_internal_token
-from app.auth.jwt import decode_token, TOKEN_TYPE_ACCESS
+from app.auth.dependencies import _extract_bearer_token, resolve_principal
 from app.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -49,55 +56,45 @@ def _is_public_path(path: str) -> bool:
     return False
 
 
-class AuthMiddleware(BaseHTTPMiddleware):
+class AuthMiddleware:
     """Reject unauthenticated requests to non-public paths.
 
-    This is a fast pre-check — it validates that a Bearer token is present
-    and superficially valid (JWT signature or ENGINE_INTERNAL_TOKEN match).
-    Full user resolution (DB lookup, API key check) happens in the
-    FastAPI dependency layer (get_current_user).
+    Requests without a token get a 401 here.  Tokens are resolved to an
+    AuthUser once and stored as ``request.state.auth_user``; if resolution
+    fails the error is stored as ``request.state.auth_error`` and raised by
+    get_current_user, so routes keep deciding whether auth is required.
 
     When AUTH_ENABLED=false, this middleware is a no-op.
     """
 
-    async def dispatch(self, request: Request, call_next):
-        # Skip auth entirely when disabled
-        if not auth_settings.enabled:
-            return await call_next(request)
-
-        path = request.url.path
+    def __init__(self, app: ASGIApp):
+        self.app = app
 
-        # Allow public paths
-        if _is_public_path(path):
-            return await call_next(request)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # Skip auth entirely when disabled; WebSockets authenticate themselves
+        if scope["type"] != "http" or not auth_settings.enabled:
+            await self.app(scope, receive, send)
+            return
 
-        # Allow CORS preflight
-        if request.method == "OPTIONS":
-            return await call_next(request)
+        # Allow public paths and CORS preflight
+        if scope["method"] == "OPTIONS" or _is_public_path(scope["path"]):
+            await self.app(scope, receive, send)
+            return
 
-        # Extract token
-        token = _extract_bearer_token(request)
+        token = _extract_bearer_token(Request(scope))
         if not token:
-            return JSONResponse(
+            response = JSONResponse(
                 status_code=401,
                 content={"detail": "Not authenticated"},
                 headers={"WWW-Authenticate": "Bearer"},
             )
+            await response(scope, receive, send)
+            return
 
-        # Quick check: ENGINE_INTERNAL_TOKEN passes immediately
-        if _is_engine_internal_token(token):
-            return await call_next(request)
-
-        # Quick check: try JWT decode (fast, no DB hit)
+        state = scope.setdefault("state", {})
         try:
-            payload = decode_token(token)
-            if payload.get("type") == TOKEN_TYPE_ACCESS:
-                return await call_next(request)
-        except Exception:
-            pass
-
-        # If we got here, the token might be a DB API key.
-        # Let it through — the route's Depends(get_current_user) will
-        # do the full DB lookup and reject if invalid.
-        # This avoids duplicating DB session management in middleware.
-        return await call_next(request)
+            state["auth_user"] = await resolve_principal(token)
+        except HTTPException as e:
+            state["auth_error"] = e
+
+        await self.app(scope, receive, send)
@@ -0,0 +1,209 @@
+"""Short-lived cache of verified principals, keyed by token hash.
+
+Resolving a bearer token costs a JWT decode plus one or two DB queries
+(User, or APIKey + User).  Once resolved, the AuthUser is cached under
+sha256(token) for AUTH_PRINCIPAL_CACHE_TTL_SECONDS (default 30s), never
+past the token's own expiry, so steady-state auth is a dict lookup.
+
+Changes that affect a principal (user deactivated, admin flag changed,
+API key revoked, ...) call ``await principal_cache.invalidate(...)``,
+which drops matching entries locally and publishes on
+``djinnbot:auth:invalidate`` so every API worker does the same.
+
+API key ``last_used_at`` updates are buffered in memory and written in
+one batch every AUTH_LAST_USED_FLUSH_SECONDS instead of on every request.
+"""
+
+import asyncio
+import json
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional
+
+from app.logging_config import get_logger
+
+if TYPE_CHECKING:
+    from app.auth.dependencies import AuthUser
+
+logger = get_logger(__name__)
+
+AUTH_INVALIDATE_CHANNEL = "djinnbot:auth:invalidate"
+
+AUTH_PRINCIPAL_CACHE_TTL_SECONDS = float(
+    os.getenv("AUTH_PRINCIPAL_CACHE_TTL_SECONDS", "30")
+)
+AUTH_PRINCIPAL_CACHE_SIZE = int(os.getenv("AUTH_PRINCIPAL_CACHE_SIZE", "10000"))
+AUTH_LAST_USED_FLUSH_SECONDS = float(os.getenv("AUTH_LAST_USED_FLUSH_SECONDS", "30"))
+
+
+@dataclass
+class _Entry:
+    user: "AuthUser"
+    expires_at: float  # time.monotonic()
+    api_key_id: Optional[str]
+
+
+class PrincipalCache:
+    """LRU of token hash → AuthUser with per-entry expiry."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._last_used: dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    # ── Lookup ──────────────────────────────────────────────────────────
+
+    def get(self, token_hash: str) -> Optional["AuthUser"]:
+        entry = self._entries.get(token_hash)
+        if entry is None or entry.expires_at <= time.monotonic():
+            if entry is not None:
+                del self._entries[token_hash]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(token_hash)
+        self.hits += 1
+        if entry.api_key_id:
+            self.touch_api_key(entry.api_key_id)
+        return entry.user
+
+    def put(
+        self,
+        token_hash: str,
+        user: "AuthUser",
+        credential_expires_at: Optional[float] = None,
+        api_key_id: Optional[str] = None,
+    ) -> None:
+        """Cache *user*.  *credential_expires_at* is a Unix timestamp (seconds)."""
+        ttl = self._ttl
+        if credential_expires_at is not None:
+            ttl = min(ttl, credential_expires_at - time.time())
+        if ttl <= 0:
+            return
+        self._entries[token_hash] = _Entry(
+            user=user, expires_at=time.monotonic() + ttl, api_key_id=api_key_id
+        )
+        self._entries.move_to_end(token_hash)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    # ── Invalidation ────────────────────────────────────────────────────
+
+    def invalidate_local(
+        self, user_id: Optional[str] = None, api_key_id: Optional[str] = None
+    ) -> None:
+        """Drop entries for a user and/or API key (everything if neither given)."""
+        if user_id is None and api_key_id is None:
+            self._entries.clear()
+            return
+        stale = [
+            token_hash
+            for token_hash, entry in self._entries.items()
+            if (user_id is not None and entry.user.id == user_id)
+            or (api_key_id is not None and entry.api_key_id == api_key_id)
+        ]
+        for token_hash in stale:
+            del self._entries[token_hash]
+
+    async def invalidate(
+        self, user_id: Optional[str] = None, api_key_id: Optional[str] = None
+    ) -> None:
+        """Drop matching entries here and on every other API worker.
+
+        Call after committing a change to a user or API key.
+        """
+        self.invalidate_local(user_id, api_key_id)
+        from app import dependencies
+
+        if dependencies.redis_client:
+            try:
+                await dependencies.redis_client.publish(
+                    AUTH_INVALIDATE_CHANNEL,
+                    json.dumps({"userId": user_id, "apiKeyId": api_key_id}),
+                )
+            except Exception as e:
+                logger.warning(f"Failed to publish auth invalidation: {e}")
+
+    async def listen(self) -> None:
+        """Background task: apply invalidations published by other workers."""
+        from app import dependencies
+
+        from app.services.pubsub_listener import listen_forever
+
+        if not dependencies.redis_client:
+            return
+
+        def on_message(_channel: str, raw: str) -> None:
+            try:
+                data = json.loads(raw)
+            except (json.JSONDecodeError, TypeError):
+                data = {}
+            self.invalidate_local(data.get("userId"), data.get("apiKeyId"))
+
+        await listen_forever(
+            "Auth invalidation",
+            on_message,
+            channels=[AUTH_INVALIDATE_CHANNEL],
+            # Anything may have changed while we were unsubscribed
+            on_subscribed=self.invalidate_local,
+        )
+
+    # ── API key last_used_at batching ───────────────────────────────────
+
+    def touch_api_key(self, api_key_id: str) -> None:
+        from app.models.base import now_ms
+
+        self._last_used[api_key_id] = now_ms()
+
+    async def flush_last_used(self) -> int:
+        """Write buffered last_used_at values in one statement."""
+        if not self._last_used:
+            return 0
+        pending, self._last_used = self._last_used, {}
+
+        from sqlalchemy import update
+
+        from app.database import AsyncSessionLocal
+        from app.models.auth import APIKey
+
+        try:
+            async with AsyncSessionLocal() as session:
+                await session.execute(
+                    update(APIKey),
+                    [{"id": key_id, "last_used_at": ts} for key_id, ts in pending.items()],
+                )
+                await session.commit()
+        except Exception as e:
+            logger.warning(f"Failed to flush API key last_used_at: {e}")
+            # Keep the newest value per key for the next attempt
+            for key_id, ts in pending.items():
+                self._last_used[key_id] = max(ts, self._last_used.get(key_id, 0))
+            return 0
+        return len(pending)
+
+    async def run_flusher(self) -> None:
+        """Background task: periodically flush last_used_at updates."""
+        try:
+            while True:
+                await asyncio.sleep(AUTH_LAST_USED_FLUSH_SECONDS)
+                await self.flush_last_used()
+        except asyncio.CancelledError:
+            await self.flush_last_used()
+            raise
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "pendingLastUsed": len(self._last_used),
+        }
+
+
+principal_cache = PrincipalCache(
+    AUTH_PRINCIPAL_CACHE_TTL_SECONDS, AUTH_PRINCIPAL_CACHE_SIZE
+)
@@ -1,13 +1,28 @@
-"""GitHub App installation helper functions."""
+"""GitHub App installation helper functions.
 
+Installation access tokens live for an hour, so they are cached per
+installation and reused until TOKEN_REFRESH_MARGIN_SECONDS before expiry;
+concurrent callers for the same installation share a single refresh.  The
+App JWT is likewise reused for most of its 10-minute lifetime.
+
+All GitHub API calls go through one pooled client (HTTP/2 when the ``h2``
+package is installed).  Repository metadata is fetched with
+``If-None-Match``; GitHub answers unchanged resources with a 304 that does
+not count against the rate limit.
+
+These caches are process-wide, shared by every GitHubHelper instance.
+"""
+
+import asyncio
 import json
 import os
 import secrets
 import hashlib
 import hmac
 import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional, Dict, List, Tuple
+from typing import Any, Optional, Dict, List, Tuple
 
 import jwt
 import httpx
@@ -22,9 +37,73 @@ from app.models.github import (
 )
 from app.logging_config import get_logger
 from app.models.base import now_ms
+from app.services.github_event_router import routing_table
 
 logger = get_logger(__name__)
 
+GITHUB_API_URL = "https://api.github.com"
+GITHUB_API_HEADERS = {
+    "Accept": "application/vnd.github+json",
+    "X-GitHub-Api-Version": "2022-11-28",
+}
+
+# Refresh installation tokens this long before GitHub expires them
+TOKEN_REFRESH_MARGIN_SECONDS = int(
+    os.getenv("GITHUB_TOKEN_REFRESH_MARGIN_SECONDS", "300")
+)
+# App JWTs are issued for 10 minutes; stop handing one out after this long
+_JWT_REUSE_SECONDS = 8 * 60
+# Conditional-request cache entries (ETag + parsed body)
+_ETAG_CACHE_MAX = 256
+
+try:
+    import h2  # noqa: F401
+
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
+
+class _GitHubApiCache:
+    """Process-wide GitHub API state: client, tokens, ETags and counters."""
+
+    def __init__(self) -> None:
+        self.client: Optional[httpx.AsyncClient] = None
+        self.jwt: Optional[Tuple[str, float]] = None
+        self.tokens: Dict[int, Tuple[str, int]] = {}
+        self.token_locks: Dict[int, asyncio.Lock] = {}
+        self.etags: OrderedDict[str, Tuple[str, Any]] = OrderedDict()
+        self.token_hits = 0
+        self.token_fetches = 0
+        self.jwt_reuses = 0
+        self.not_modified = 0
+
+    def get_client(self) -> httpx.AsyncClient:
+        if self.client is None or self.client.is_closed:
+            self.client = httpx.AsyncClient(
+                base_url=GITHUB_API_URL,
+                http2=_HTTP2,
+                timeout=30.0,
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            )
+        return self.client
+
+    def stats(self) -> dict:
+        return {
+            "http2": _HTTP2,
+            "cached_tokens": len(self.tokens),
+            "token_cache_hits": self.token_hits,
+            "token_fetches": self.token_fetches,
+            "jwt_reuses": self.jwt_reuses,
+            "not_modified": self.not_modified,
+            # Each token hit skipped a POST /access_tokens; each 304 was
+            # served from cache and not charged against the rate limit
+            "api_calls_saved": self.token_hits + self.not_modified,
+        }
+
+
+_api_cache = _GitHubApiCache()
+
 
 def _row_to_dict(obj) -> dict:
     """Convert an ORM model instance to a dictionary."""
@@ -74,10 +153,14 @@ class GitHubHelper:
             raise RuntimeError(
                 "GitHub App is not configured. Missing: " + "; ".join(missing)
             )
+        now = int(time.time())
+        if _api_cache.jwt and now - _api_cache.jwt[1] < _JWT_REUSE_SECONDS:
+            _api_cache.jwt_reuses += 1
+            return _api_cache.jwt[0]
+
         logger.debug("Generating new JWT for GitHub App")
         private_key = self._load_private_key()
 
-        now = int(time.time())
         payload = {
             "iat": now - 60,
             "exp": now + 600,
@@ -85,75 +168,137 @@ class GitHubHelper:
         }
 
         encoded = jwt.encode(payload, private_key, algorithm="RS256")
+        _api_cache.jwt = (encoded, now)
         logger.debug("JWT generated successfully")
         return encoded
 
     async def get_installation_token(self, installation_id: int) -> Tuple[str, int]:
-        """Get installation access token."""
+        """Get installation access token (cached until close to expiry)."""
+        token = self._cached_installation_token(installation_id)
+        if token:
+            return token
+
+        lock = _api_cache.token_locks.setdefault(installation_id, asyncio.Lock())
+        async with lock:
+            # Another caller may have refreshed it while we waited
+            token = self._cached_installation_token(installation_id)
+            if token:
+                return token
+            token = await self._fetch_installation_token(installation_id)
+            _api_cache.tokens[installation_id] = token
+            return token
+
+    def _cached_installation_token(
+        self, installation_id: int
+    ) -> Optional[Tuple[str, int]]:
+        cached = _api_cache.tokens.get(installation_id)
+        if cached and cached[1] - now_ms() > TOKEN_REFRESH_MARGIN_SECONDS * 1000:
+            _api_cache.token_hits += 1
+            return cached
+        return None
+
+    async def _fetch_installation_token(self, installation_id: int) -> Tuple[str, int]:
         logger.debug(
             f"Getting installation token for installation_id={installation_id}"
         )
         jwt_token = self.generate_jwt()
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"https://api.github.com/app/installations/{installation_id}/access_tokens",
+        response = await _api_cache.get_client().post(
+            f"/app/installations/{installation_id}/access_tokens",
+            headers={**GITHUB_API_HEADERS, "Authorization": f"Bearer {jwt_token}"},
+        )
+        _api_cache.token_fetches += 1
+
+        if response.status_code != 201:
+            raise Exception(f"Failed to get installation token: {response.text}")
+
+        data = response.json()
+        expires_at = datetime.fromisoformat(data["expires_at"].replace("Z", "+00:00"))
+        return data["token"], int(expires_at.timestamp() * 1000)
+
+    def invalidate_installation_token(self, installation_id: int) -> None:
+        """Forget the cached token (installation removed or token rejected)."""
+        _api_cache.tokens.pop(installation_id, None)
+
+    async def _installation_request(
+        self, installation_id: int, method: str, path: str, **kwargs
+    ) -> httpx.Response:
+        """Call the GitHub API as an installation, retrying once on a 401."""
+        extra_headers = kwargs.pop("headers", {})
+        for attempt in range(2):
+            token, _ = await self.get_installation_token(installation_id)
+            response = await _api_cache.get_client().request(
+                method,
+                path,
                 headers={
-                    "Authorization": f"Bearer {jwt_token}",
-                    "Accept": "application/vnd.github+json",
-                    "X-GitHub-Api-Version": "2022-11-28",
+                    **GITHUB_API_HEADERS,
+                    "Authorization": f"Bearer {token}",
+                    **extra_headers,
                 },
+                **kwargs,
             )
+            if response.status_code != 401 or attempt:
+                return response
+            # Cached token was revoked early — fetch a fresh one
+            self.invalidate_installation_token(installation_id)
+        return response
+
+    async def _get_json_conditional(
+        self, installation_id: int, path: str, error_prefix: str
+    ) -> Any:
+        """GET a JSON resource with If-None-Match, reusing the body on 304."""
+        key = f"{installation_id}:{path}"
+        cached = _api_cache.etags.get(key)
+        headers = {"If-None-Match": cached[0]} if cached else {}
+
+        response = await self._installation_request(
+            installation_id, "GET", path, headers=headers
+        )
 
-            if response.status_code != 201:
-                raise Exception(f"Failed to get installation token: {response.text}")
-
-            data = response.json()
-            expires_at = datetime.fromisoformat(
-                data["expires_at"].replace("Z", "+00:00")
-            )
-            return data["token"], int(expires_at.timestamp() * 1000)
+        if response.status_code == 304 and cached:
+            _api_cache.not_modified += 1
+            _api_cache.etags.move_to_end(key)
+            return cached[1]
+        if response.status_code != 200:
+            raise Exception(f"{error_prefix}: {response.text}")
+
+        data = response.json()
+        etag = response.headers.get("etag")
+        if etag:
+            _api_cache.etags[key] = (etag, data)
+            _api_cache.etags.move_to_end(key)
+            while len(_api_cache.etags) > _ETAG_CACHE_MAX:
+                _api_cache.etags.popitem(last=False)
+        return data
 
     async def get_installation_repositories(self, installation_id: int) -> List[Dict]:
         """Get repositories accessible by an installation."""
-        token, _ = await self.get_installation_token(installation_id)
-
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                "https://api.github.com/installation/repositories",
-                headers={
-                    "Authorization": f"Bearer {token}",
-                    "Accept": "application/vnd.github+json",
-                    "X-GitHub-Api-Version": "2022-11-28",
-                },
-            )
-
-            if response.status_code != 200:
-                raise Exception(f"Failed to get repositories: {response.text}")
-
-            data = response.json()
-            return data.get("repositories", [])
+        data = await self._get_json_conditional(
+            installation_id,
+            "/installation/repositories",
+            "Failed to get repositories",
+        )
+        return data.get("repositories", [])
 
     async def get_repository_info(
         self, installation_id: int, owner: str, repo: str
     ) -> Dict:
         """Get repository information."""
-        token, _ = await self.get_installation_token(installation_id)
-
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"https://api.github.com/repos/{owner}/{repo}",
-                headers={
-                    "Authorization": f"Bearer {token}",
-                    "Accept": "application/vnd.github+json",
-                    "X-GitHub-Api-Version": "2022-11-28",
-                },
-            )
+        return await self._get_json_conditional(
+            installation_id,
+            f"/repos/{owner}/{repo}",
+            "Failed to get repository info",
+        )
 
-            if response.status_code != 200:
-                raise Exception(f"Failed to get repository info: {response.text}")
+    def api_stats(self) -> dict:
+        """Token/ETag cache counters for the GitHub API client."""
+        return _api_cache.stats()
 
-            return response.json()
+    async def aclose(self) -> None:
+        """Close the shared GitHub API client."""
+        if _api_cache.client is not None:
+            await _api_cache.client.aclose()
+            _api_cache.client = None
 
     async def verify_webhook_signature(self, payload: bytes, signature: str) -> bool:
         """Verify webhook signature."""
@@ -324,6 +469,7 @@ class GitHubHelper:
             )
             await session.execute(stmt)
             await session.commit()
+            await routing_table.invalidate()
 
             # Return the connection
             result = await session.execute(
@@ -343,6 +489,8 @@ class GitHubHelper:
                 .values(is_active=0)
             )
             await session.commit()
+        # Stop routing webhooks for the repository to the project's agents
+        await routing_table.invalidate()
 
     async def update_last_push(self, project_id: str) -> None:
         """Update last push timestamp for a project."""
@@ -384,8 +532,6 @@ class GitHubHelper:
         owner = connection["repo_owner"]
         repo = connection["repo_name"]
 
-        token, _expires_at = await self.get_installation_token(installation_id)
-
         payload = {
             "title": title,
             "body": body,
@@ -394,19 +540,15 @@ class GitHubHelper:
             "draft": draft,
         }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"https://api.github.com/repos/{owner}/{repo}/pulls",
-                headers={
-                    "Authorization": f"Bearer {token}",
-                    "Accept": "application/vnd.github+json",
-                    "X-GitHub-Api-Version": "2022-11-28",
-                },
-                json=payload,
-                timeout=30.0,
-            )
-            response.raise_for_status()
-            data = response.json()
+        response = await self._installation_request(
+            installation_id,
+            "POST",
+            f"/repos/{owner}/{repo}/pulls",
+            json=payload,
+            timeout=30.0,
+        )
+        response.raise_for_status()
+        data = response.json()
 
         return {
             "pr_number": data["number"],
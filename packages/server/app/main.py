@@ -395,107 +395,75 @@ async def _run_completion_listener():
             await asyncio.sleep(2)
 
 
-async def _github_webhook_listener():
-    """Background task: listen for GitHub webhook events and route to agents."""
+async def _handle_github_webhook(data: dict):
+    """Process one webhook event from the stream and record the outcome."""
     from app.database import AsyncSessionLocal
 
-    if not dependencies.redis_client:
+    event_id = data.get("event_id")
+    if not event_id:
         return
 
-    pubsub = dependencies.redis_client.pubsub()
-    await pubsub.subscribe("djinnbot:webhooks:github")
-
-    logger.info("Listening for GitHub webhook events")
+    # Fetch full payload from database
+    async with AsyncSessionLocal() as session:
+        payload_json = (
+            await session.execute(
+                select(WebhookEvent.payload).where(WebhookEvent.id == event_id)
+            )
+        ).scalar_one_or_none()
+    if payload_json is None:
+        return
 
+    error = None
     try:
-        async for message in pubsub.listen():
-            if message["type"] != "message":
-                continue
-
-            try:
-                data = json.loads(message["data"])
-                event_id = data.get("event_id")
+        payload = json.loads(payload_json)
 
-                if not event_id:
-                    continue
+        # ── PR lifecycle automation (runs before agent routing) ────────
+        # Handles PR merge → auto-complete task → worktree cleanup
+        # without requiring an agent session.
+        event_type = data.get("event_type")
+        if event_type == "pull_request":
+            from app.services.pr_lifecycle import handle_pr_event
 
-                # Fetch full payload from database
-                async with AsyncSessionLocal() as session:
-                    try:
-                        result = await session.execute(
-                            select(WebhookEvent).where(WebhookEvent.id == event_id)
-                        )
-                        webhook_event = result.scalar_one_or_none()
-
-                        if not webhook_event:
-                            continue
-
-                        payload = json.loads(webhook_event.payload)
-                    except Exception:
-                        await session.rollback()
-                        raise
-
-                # ── PR lifecycle automation (runs before agent routing) ────────
-                # Handles PR merge → auto-complete task → worktree cleanup
-                # without requiring an agent session.
-                event_type = data.get("event_type")
-                if event_type == "pull_request":
-                    from app.services.pr_lifecycle import handle_pr_event
-
-                    try:
-                        result = await handle_pr_event(payload)
-                        if result:
-                            logger.info(f"PR lifecycle: {result}")
-                    except Exception as pr_err:
-                        logger.error(
-                            f"PR lifecycle handler error: {pr_err}",
-                            exc_info=True,
-                        )
+            try:
+                result = await handle_pr_event(payload)
+                if result:
+                    logger.info(f"PR lifecycle: {result}")
+            except Exception as pr_err:
+                logger.error(
+                    f"PR lifecycle handler error: {pr_err}",
+                    exc_info=True,
+                )
 
-                # Process event through agent assignment router
-                from app.services.github_event_router import process_webhook_event
+        # Process event through agent assignment router
+        from app.services.github_event_router import process_webhook_event
 
-                await process_webhook_event(event_id, payload)
+        await process_webhook_event(
+            event_id, payload, event_type, data.get("action")
+        )
+    except Exception as e:
+        logger.error(f"Error processing webhook {event_id}: {e}", exc_info=True)
+        error = str(e) or repr(e)
 
-                # Mark event as processed
-                async with AsyncSessionLocal() as session:
-                    try:
-                        await session.execute(
-                            update(WebhookEvent)
-                            .where(WebhookEvent.id == event_id)
-                            .values(
-                                processed=1,
-                                processed_at=int(
-                                    datetime.now(timezone.utc).timestamp()
-                                ),
-                            )
-                        )
-                        await session.commit()
-                    except Exception:
-                        await session.rollback()
-                        raise
+    # Mark event as processed (or record why it failed, for replay)
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            update(WebhookEvent)
+            .where(WebhookEvent.id == event_id)
+            .values(
+                processed=0 if error else 1,
+                processing_error=error,
+                processed_at=int(datetime.now(timezone.utc).timestamp()),
+            )
+        )
+        await session.commit()
 
-            except Exception as e:
-                logger.error(f"Error processing webhook: {e}", exc_info=True)
 
-                # Mark event as failed
-                try:
-                    async with AsyncSessionLocal() as session:
-                        try:
-                            await session.execute(
-                                update(WebhookEvent)
-                                .where(WebhookEvent.id == event_id)
-                                .values(processing_error=str(e))
-                            )
-                            await session.commit()
-                        except Exception:
-                            await session.rollback()
-                            raise
-                except Exception:
-                    pass
+async def _github_webhook_listener():
+    """Background task: consume GitHub webhook events and route to agents."""
+    from app.services.webhook_stream import consume_webhook_stream
 
-    except Exception as e:
-        logger.critical(f"Fatal error in webhook listener: {e}", exc_info=True)
+    logger.info("Listening for GitHub webhook events")
+    await consume_webhook_stream(_handle_github_webhook)
 
 
 @asynccontextmanager
@@ -551,6 +519,18 @@ async def lifespan(app: FastAPI):
         logger.critical(f"Migration check failed: {e}")
         raise
 
+    # Create upcoming monthly log partitions and apply retention
+    from app.services.partition_manager import (
+        periodic_partition_maintenance,
+        run_partition_maintenance,
+    )
+
+    try:
+        await run_partition_maintenance()
+    except Exception as e:
+        logger.warning(f"Partition maintenance failed at startup: {e}")
+    partition_task = asyncio.create_task(periodic_partition_maintenance())
+
     # Validate GitHub App configuration (non-blocking)
     try:
         from app.routers.github import _validate_github_config
@@ -602,6 +582,22 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"Could not auto-import skills from disk: {e}")
 
+    # Warm the global settings cache and subscribe to invalidations so
+    # hot-path settings reads never touch the database.
+    from app.services.settings_cache import settings_cache
+
+    try:
+        await settings_cache.all()
+    except Exception as e:
+        logger.warning(f"Could not warm settings cache: {e}")
+    settings_listener_task = asyncio.create_task(settings_cache.listen())
+
+    # Cross-worker auth cache invalidation + batched API key last_used_at
+    from app.auth.principal_cache import principal_cache
+
+    auth_listener_task = asyncio.create_task(principal_cache.listen())
+    auth_flusher_task = asyncio.create_task(principal_cache.run_flusher())
+
     # Pre-load faster-whisper model in background so the first voice note
     # doesn't pay the download + load cost.  Model is cached on JuiceFS.
     async def _preload_whisper():
@@ -624,9 +620,23 @@ async def lifespan(app: FastAPI):
     update_checker_task = asyncio.create_task(periodic_update_checker())
     logger.info("Started periodic update checker")
 
+    # Move finished runs' event streams out of Redis into the disk archive
+    from app.services.event_archive import periodic_event_archiver
+
+    event_archiver_task = asyncio.create_task(periodic_event_archiver())
+
+    # Drain queued Dialog ingest jobs (handler is registered by the ingest router)
+    from app.services.ingest_queue import ingest_queue
+
+    ingest_queue.start()
+
     # Start GitHub webhook listener
     github_listener_task = None
+    routing_listener_task = None
     if dependencies.redis_client:
+        from app.services.github_event_router import routing_table
+
+        routing_listener_task = asyncio.create_task(routing_table.listen())
         github_listener_task = asyncio.create_task(_github_webhook_listener())
         logger.info("Started GitHub webhook listener")
 
@@ -634,9 +644,53 @@ async def lifespan(app: FastAPI):
 
     # Cleanup
     listener_task.cancel()
+    settings_listener_task.cancel()
+    auth_listener_task.cancel()
+    auth_flusher_task.cancel()
+    await asyncio.gather(auth_flusher_task, return_exceptions=True)
     update_checker_task.cancel()
+    event_archiver_task.cancel()
+    partition_task.cancel()
     if github_listener_task:
         github_listener_task.cancel()
+        routing_listener_task.cancel()
+
+    from app.services.transcription_pool import transcription_pool
+
+    await transcription_pool.shutdown()
+
+    from app.services.bridge_rpc import bridge_rpc
+
+    await bridge_rpc.shutdown()
+
+    from app.services.git_service import git_service
+
+    await git_service.shutdown()
+
+    await ingest_queue.shutdown()
+
+    from app.services.message_completions import message_completions
+
+    await message_completions.shutdown()
+
+    from app.services.log_tail import log_tails
+
+    await log_tails.shutdown()
+
+    from app.services.event_gateway import event_gateway
+
+    await event_gateway.shutdown()
+
+    from app.github_helper import github_helper
+
+    await github_helper.aclose()
+
+    from app.services.llm_call_buffer import llm_call_buffer
+
+    try:
+        await llm_call_buffer.shutdown()
+    except Exception as e:
+        logger.error(f"Error flushing LLM call buffer: {e}")
 
     # Close async database engine
     try:
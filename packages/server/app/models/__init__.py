@@ -85,6 +85,7 @@ from app.models.telegram import TelegramConfig, TelegramAllowlistEntry
 from app.models.tts_call_log import TtsCallLog
 from app.models.tts_provider import TtsProvider, UserTtsProvider, AdminSharedTtsProvider
 from app.models.agent_tts_settings import AgentTtsSettings
+from app.models.ingest_job import IngestJob
 
 __all__ = [
     # Pydantic models (backward compatibility)
@@ -186,4 +187,6 @@ __all__ = [
     "UserTtsProvider",
     "AdminSharedTtsProvider",
     "AgentTtsSettings",
+    # Dialog ingest queue
+    "IngestJob",
 ]
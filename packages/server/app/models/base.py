@@ -1,10 +1,11 @@
 """SQLAlchemy declarative base and mixins for DjinnBot models."""
 from datetime import datetime
 from typing import Optional
+import json
 import uuid
 
 from sqlalchemy import BigInteger, String, Text, Integer
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, validates
 
 
 class Base(DeclarativeBase):
@@ -25,6 +26,56 @@ class TimestampWithCompletedMixin(TimestampMixin):
     completed_at: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
 
 
+def key_resolution_index(raw: Optional[str]) -> tuple[Optional[str], Optional[str]]:
+    """(user_id, key_sources) extracted from a key_resolution JSON blob.
+
+    key_sources is the set of key source types used (personal,
+    admin_shared, instance, ...) as a comma-wrapped string like
+    ",personal,instance," so one source can be matched with LIKE.  Legacy
+    blobs without providerSources map "executing_user" → personal and
+    "system" → instance.  Returns (None, None) when there is no blob.
+    """
+    if not raw:
+        return None, None
+    try:
+        kr = json.loads(raw)
+    except (json.JSONDecodeError, TypeError):
+        return None, None
+    if not isinstance(kr, dict):
+        return None, None
+
+    provider_sources = kr.get("providerSources") or {}
+    if provider_sources:
+        sources = {
+            ps.get("source")
+            for ps in provider_sources.values()
+            if isinstance(ps, dict) and ps.get("source")
+        }
+    else:
+        legacy = {"executing_user": "personal", "system": "instance"}
+        sources = {legacy[kr["source"]]} if kr.get("source") in legacy else set()
+    user_id = kr.get("userId")
+    return (
+        user_id if isinstance(user_id, str) else None,
+        "," + "".join(f"{s}," for s in sorted(sources)),
+    )
+
+
+class KeyResolutionIndexMixin:
+    """Indexed copies of the key_resolution fields the admin usage view filters on.
+
+    Kept in sync whenever ``key_resolution`` is assigned.
+    """
+
+    key_user_id: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    key_sources: Mapped[Optional[str]] = mapped_column(String(256), nullable=True)
+
+    @validates("key_resolution")
+    def _index_key_resolution(self, _key: str, value: Optional[str]) -> Optional[str]:
+        self.key_user_id, self.key_sources = key_resolution_index(value)
+        return value
+
+
 def generate_prefixed_id(prefix: str) -> str:
     """Generate a prefixed UUID like 'proj_abc123...'."""
     return f"{prefix}{uuid.uuid4().hex[:12]}"
@@ -3,7 +3,7 @@
 from typing import Optional, List
 from sqlalchemy import String, Text, Integer, BigInteger, ForeignKey, Index, JSON
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from app.models.base import Base
+from app.models.base import Base, KeyResolutionIndexMixin
 
 
 # ── Allowed file types for chat attachments ────────────────────────────────────
@@ -54,13 +54,16 @@ ALLOWED_MIME_TYPES = (
 MAX_ATTACHMENT_SIZE = 30 * 1024 * 1024
 
 
-class ChatSession(Base):
+class ChatSession(Base, KeyResolutionIndexMixin):
     """Interactive chat session with an agent."""
 
     __tablename__ = "chat_sessions"
     __table_args__ = (
         Index("idx_chat_sessions_agent_status", "agent_id", "status"),
         Index("idx_chat_sessions_agent_created", "agent_id", "created_at"),
+        # Keyset pagination for the admin usage view
+        Index("idx_chat_sessions_created_id", "created_at", "id"),
+        Index("idx_chat_sessions_key_user_created", "key_user_id", "created_at", "id"),
     )
 
     id: Mapped[str] = mapped_column(
@@ -0,0 +1,47 @@
+"""Ingest job model — durable queue of Dialog payloads for Grace."""
+
+from typing import Optional
+from sqlalchemy import String, Text, Integer, BigInteger, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class IngestJob(Base):
+    """One meeting / note / dictation queued for Grace to process.
+
+    The payload is pre-split into prompts (``chunks``, a JSON list) when the
+    job is enqueued; long transcripts become several overlapping chunks.
+    Workers process a job's chunks in order and record progress after each
+    one, so a job interrupted by a restart resumes at ``chunks_done``.
+
+    Status: queued → running → completed | failed.  A running job whose
+    heartbeat goes stale is put back to queued.
+    """
+
+    __tablename__ = "ingest_jobs"
+    __table_args__ = (
+        Index("idx_ingest_jobs_status_created", "status", "created_at"),
+        Index("idx_ingest_jobs_user_created", "user_id", "created_at"),
+    )
+
+    id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    user_id: Mapped[str] = mapped_column(String(64), nullable=False)
+    kind: Mapped[str] = mapped_column(String(32), nullable=False)
+    title: Mapped[Optional[str]] = mapped_column(String(512), nullable=True)
+    status: Mapped[str] = mapped_column(String(16), nullable=False, default="queued")
+
+    # ── Work ────────────────────────────────────────────────────────────────
+    chunks: Mapped[str] = mapped_column(Text, nullable=False)  # JSON list[str]
+    chunk_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    chunks_done: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    replies: Mapped[str] = mapped_column(Text, nullable=False, default="[]")
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    session_id: Mapped[Optional[str]] = mapped_column(String(256), nullable=True)
+
+    # ── Timing (epoch ms) ───────────────────────────────────────────────────
+    created_at: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    started_at: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+    heartbeat_at: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+    completed_at: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
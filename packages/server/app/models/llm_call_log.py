@@ -20,6 +20,7 @@ class LlmCallLog(Base):
     """
 
     __tablename__ = "llm_call_logs"
+    # Partitioned by month on created_at in PostgreSQL (app.services.partition_manager)
     __table_args__ = (
         Index("idx_llm_call_logs_session", "session_id"),
         Index("idx_llm_call_logs_run", "run_id"),
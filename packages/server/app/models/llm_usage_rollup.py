@@ -0,0 +1,45 @@
+"""Hourly LLM usage rollups — pre-aggregated totals of llm_call_logs."""
+
+from sqlalchemy import String, Integer, BigInteger, Float, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class LlmUsageRollup(Base):
+    """Usage totals for one (hour, user, agent, model, provider, key source).
+
+    Maintained incrementally when LLM calls are ingested (same transaction
+    as the raw rows), so summaries and charts can sum a few hundred rollup
+    rows instead of scanning llm_call_logs.
+
+    Nullable dimensions are stored as "" so they can be part of the
+    primary key.
+    """
+
+    __tablename__ = "llm_usage_rollups"
+    __table_args__ = (
+        Index("idx_llm_usage_rollups_agent_bucket", "agent_id", "bucket_start"),
+        Index("idx_llm_usage_rollups_user_bucket", "user_id", "bucket_start"),
+    )
+
+    # Start of the UTC hour, epoch ms
+    bucket_start: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    user_id: Mapped[str] = mapped_column(String(64), primary_key=True, default="")
+    agent_id: Mapped[str] = mapped_column(String(128), primary_key=True)
+    model: Mapped[str] = mapped_column(String(128), primary_key=True)
+    provider: Mapped[str] = mapped_column(String(64), primary_key=True)
+    key_source: Mapped[str] = mapped_column(String(32), primary_key=True, default="")
+
+    call_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    input_tokens: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    output_tokens: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    cache_read_tokens: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    cache_write_tokens: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    total_tokens: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    cost_input: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    cost_output: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    cost_total: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    # AVG(duration_ms) = duration_ms_sum / duration_count (NULL durations skipped)
+    duration_ms_sum: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    duration_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
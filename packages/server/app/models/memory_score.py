@@ -28,6 +28,7 @@ class MemoryRetrievalLog(Base):
     """
 
     __tablename__ = "memory_retrieval_log"
+    # Partitioned by month on created_at in PostgreSQL (app.services.partition_manager)
     __table_args__ = (
         Index("idx_mrl_agent", "agent_id"),
         Index("idx_mrl_memory", "agent_id", "memory_id"),
@@ -4,13 +4,26 @@ from typing import Optional
 from sqlalchemy import String, Text, Integer, BigInteger, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.models.base import Base, TimestampWithCompletedMixin
+from app.models.base import (
+    Base,
+    KeyResolutionIndexMixin,
+    TimestampWithCompletedMixin,
+)
 
 
-class Run(Base, TimestampWithCompletedMixin):
+class Run(Base, TimestampWithCompletedMixin, KeyResolutionIndexMixin):
     """Pipeline run execution."""
 
     __tablename__ = "runs"
+    __table_args__ = (
+        # Keyset pagination for list_runs: ORDER BY created_at DESC, id DESC
+        Index("idx_runs_created_id", "created_at", "id"),
+        Index("idx_runs_pipeline_created_id", "pipeline_id", "created_at", "id"),
+        Index("idx_runs_status_created_id", "status", "created_at", "id"),
+        Index(
+            "idx_runs_initiator_created_id", "initiated_by_user_id", "created_at", "id"
+        ),
+    )
 
     id: Mapped[str] = mapped_column(String(64), primary_key=True)
     pipeline_id: Mapped[str] = mapped_column(String(128), nullable=False, index=True)
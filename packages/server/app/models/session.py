@@ -49,8 +49,10 @@ class SessionEvent(Base):
     """Individual events within a session."""
 
     __tablename__ = "session_events"
+    # Partitioned by month on timestamp in PostgreSQL (app.services.partition_manager)
     __table_args__ = (
         Index("idx_session_events_session_ts", "session_id", "timestamp"),
+        Index("idx_session_events_timestamp", "timestamp"),
     )
 
     id: Mapped[str] = mapped_column(String(64), primary_key=True)
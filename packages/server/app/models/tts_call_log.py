@@ -1,7 +1,7 @@
 """TTS call log model — tracks Fish Audio API calls for cost tracking."""
 
 from typing import Optional
-from sqlalchemy import String, Text, Integer, BigInteger, Float, Index
+from sqlalchemy import String, Text, Integer, BigInteger, Float, Boolean, Index
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.models.base import Base
@@ -18,9 +18,13 @@ class TtsCallLog(Base):
     - Estimated cost (calculated: utf8_bytes / 1M * price_per_M)
     - Latency
     - Which API key type was used (personal / admin_shared / instance)
+
+    Requests served from the TTS audio cache are logged with cache_hit=True
+    and zero cost — no provider call was made.
     """
 
     __tablename__ = "tts_call_logs"
+    # Partitioned by month on created_at in PostgreSQL (app.services.partition_manager)
     __table_args__ = (
         Index("idx_tts_call_logs_session", "session_id"),
         Index("idx_tts_call_logs_agent", "agent_id"),
@@ -69,5 +73,8 @@ class TtsCallLog(Base):
     # Which channel triggered the TTS (telegram, signal, whatsapp, discord, slack, dashboard)
     channel: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
 
+    # ── Cache ───────────────────────────────────────────────────────────────
+    cache_hit: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+
     # ── Timestamps ──────────────────────────────────────────────────────────
     created_at: Mapped[int] = mapped_column(BigInteger, nullable=False)
@@ -31,24 +31,31 @@ Endpoints:
     GET    /v1/admin/logs/containers                  list tracked containers
     GET    /v1/admin/logs/stream/{container_name}     SSE stream for single container
     GET    /v1/admin/logs/stream/merged               SSE merged stream for all containers
+
+  Background workers:
+    GET    /v1/admin/transcription/metrics            transcription pool queue metrics
+    GET    /v1/admin/llm-calls/buffer/metrics         LLM call write-behind buffer metrics
 """
 
+import base64
 import uuid
 import json
 import asyncio
 import os
+import re
 from typing import Optional, List, AsyncGenerator, Dict
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from sqlalchemy import select, func
+from sqlalchemy import String, and_, func, literal_column, or_, select, union_all
 from sqlalchemy.ext.asyncio import AsyncSession
-import redis.asyncio as aioredis
 
+from app import dependencies
 from app.database import get_async_session
 from app.auth.dependencies import get_current_admin, get_service_or_user, AuthUser
 from app.auth.passwords import hash_password
+from app.auth.principal_cache import principal_cache
 from app.models.auth import User
 from app.models.user_provider import AdminSharedProvider, UserSecretGrant
 from app.models.secret import Secret
@@ -56,6 +63,7 @@ from app.models.skill import Skill
 from app.models.mcp import McpServer
 from app.models.admin_notification import AdminNotification
 from app.models.base import now_ms
+from app.services.log_tail import LogFilter, log_tails
 from app.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -65,6 +73,10 @@ _LOG_STREAM_PREFIX = "djinnbot:logs:"
 _MERGED_LOG_STREAM = "djinnbot:logs:merged"
 _CONTAINER_LIST_KEY = "djinnbot:logs:containers"
 
+# Log SSE frames carry at most this many lines, gathered over this window
+LOG_SSE_BATCH_MAX_LINES = 500
+LOG_SSE_BATCH_WINDOW_SECONDS = float(os.getenv("LOG_SSE_BATCH_WINDOW_SECONDS", "0.1"))
+
 router = APIRouter()
 
 
@@ -250,6 +262,7 @@ async def update_user(
     user.updated_at = now_ms()
 
     await session.commit()
+    await principal_cache.invalidate(user_id=user_id)
     await session.refresh(user)
     logger.info(f"Admin {admin.id} updated user {user_id}")
     return _user_to_response(user)
@@ -272,6 +285,7 @@ async def deactivate_user(
     user.is_active = False
     user.updated_at = now_ms()
     await session.commit()
+    await principal_cache.invalidate(user_id=user_id)
     logger.info(f"Admin {admin.id} deactivated user {user_id}")
     return {"status": "deactivated", "userId": user_id}
 
@@ -729,9 +743,24 @@ async def revoke_instance_secret_from_user(
 # ── Container Logs ────────────────────────────────────────────────────────────
 
 
-def _get_redis_url() -> str:
-    """Return the Redis URL from environment (same as used by the engine)."""
-    return os.environ.get("REDIS_URL", "redis://redis:6379")
+@router.get("/transcription/metrics")
+async def get_transcription_metrics(
+    admin: AuthUser = Depends(get_current_admin),
+):
+    """Queue depth, worker utilisation and latency of the transcription pool."""
+    from app.services.transcription_pool import transcription_pool
+
+    return transcription_pool.metrics()
+
+
+@router.get("/llm-calls/buffer/metrics")
+async def get_llm_call_buffer_metrics(
+    admin: AuthUser = Depends(get_current_admin),
+):
+    """Pending rows, flush throughput and failures of the LLM call buffer."""
+    from app.services.llm_call_buffer import llm_call_buffer
+
+    return llm_call_buffer.metrics()
 
 
 @router.get("/logs/containers")
@@ -742,10 +771,10 @@ async def list_log_containers(
 
     Returns the container list published by the engine's ContainerLogStreamer.
     """
-    redis_url = _get_redis_url()
-    r = aioredis.from_url(redis_url, decode_responses=True)
+    if not dependencies.redis_client:
+        return {"containers": []}
     try:
-        data = await r.get(_CONTAINER_LIST_KEY)
+        data = await dependencies.redis_client.get(_CONTAINER_LIST_KEY)
         if not data:
             return {"containers": []}
         containers = json.loads(data)
@@ -753,86 +782,72 @@ async def list_log_containers(
     except Exception as e:
         logger.warning(f"Failed to read container list: {e}")
         return {"containers": []}
-    finally:
-        await r.aclose()
 
 
-@router.get("/logs/stream/merged")
-async def stream_merged_logs(
-    admin: AuthUser = Depends(get_current_admin),
-    tail: int = Query(
-        200, ge=0, le=5000, description="Number of recent lines to backfill"
-    ),
-):
-    """SSE stream of merged logs from all containers.
+def _parse_log_filter(
+    level: Optional[str], container: Optional[str], q: Optional[str]
+) -> LogFilter:
+    """Build a server-side log filter from comma-separated query params."""
+    pattern = None
+    if q:
+        try:
+            pattern = re.compile(q, re.IGNORECASE)
+        except re.error as e:
+            raise HTTPException(status_code=400, detail=f"Invalid regex: {e}")
+
+    def _split(value: Optional[str]) -> Optional[set[str]]:
+        if not value:
+            return None
+        return {v.strip() for v in value.split(",") if v.strip()} or None
+
+    return LogFilter(levels=_split(level), containers=_split(container), pattern=pattern)
+
 
-    Each container's log lines are interleaved in arrival order.
-    Uses a dedicated Redis connection per SSE client — no impact on engine.
+def _log_stream_response(
+    stream_key: str, log_filter: LogFilter, tail: int, default_container: str = ""
+) -> StreamingResponse:
+    """SSE response fed by the shared tail of *stream_key*.
+
+    Lines arrive as ``event: logs`` frames whose data is a JSON array of
+    log objects, coalesced over LOG_SSE_BATCH_WINDOW_SECONDS.
     """
-    redis_url = _get_redis_url()
+    if not dependencies.redis_client:
+        raise HTTPException(status_code=503, detail="Redis not available")
 
     async def event_generator() -> AsyncGenerator[str, None]:
-        r = aioredis.from_url(redis_url, decode_responses=True)
+        subscription = await log_tails.subscribe(
+            stream_key, log_filter, default_container
+        )
         try:
             # Send initial connected event
             yield "event: connected\ndata: {}\n\n"
 
-            last_id = "$"
-
-            # Backfill: read the last N entries
-            if tail > 0:
-                try:
-                    entries = await r.xrevrange(
-                        _MERGED_LOG_STREAM, "+", "-", count=tail
-                    )
-                    # xrevrange returns newest-first, reverse for chronological order
-                    for msg_id, fields in reversed(entries):
-                        last_id = msg_id
-                        payload = json.dumps(
-                            {
-                                "line": fields.get("line", ""),
-                                "level": fields.get("level", "info"),
-                                "ts": fields.get("ts", ""),
-                                "container": fields.get("container", ""),
-                                "service": fields.get("service", ""),
-                            }
-                        )
-                        yield f"event: log\ndata: {payload}\n\n"
-                except Exception as e:
-                    logger.warning(f"Log backfill failed: {e}")
+            try:
+                backfill = await subscription.backfill(tail)
+            except Exception as e:
+                logger.warning(f"Log backfill failed: {e}")
+                backfill = []
+            for start in range(0, len(backfill), LOG_SSE_BATCH_MAX_LINES):
+                chunk = backfill[start : start + LOG_SSE_BATCH_MAX_LINES]
+                yield f"event: logs\ndata: [{','.join(e.json for e in chunk)}]\n\n"
 
             # Live stream
             while True:
-                try:
-                    messages = await r.xread(
-                        {_MERGED_LOG_STREAM: last_id}, count=50, block=3000
-                    )
-                    if not messages:
-                        yield ": keepalive\n\n"
-                        continue
-
-                    for _stream_name, stream_messages in messages:
-                        for msg_id, fields in stream_messages:
-                            last_id = msg_id
-                            payload = json.dumps(
-                                {
-                                    "line": fields.get("line", ""),
-                                    "level": fields.get("level", "info"),
-                                    "ts": fields.get("ts", ""),
-                                    "container": fields.get("container", ""),
-                                    "service": fields.get("service", ""),
-                                }
-                            )
-                            yield f"event: log\ndata: {payload}\n\n"
-
-                except asyncio.CancelledError:
-                    break
-                except Exception as e:
-                    logger.warning(f"Merged log SSE error: {e}")
-                    yield f"event: error\ndata: {json.dumps({'error': str(e)})}\n\n"
-                    await asyncio.sleep(2)
+                entries, dropped = await subscription.next_batch(
+                    timeout=3.0,
+                    max_lines=LOG_SSE_BATCH_MAX_LINES,
+                    window=LOG_SSE_BATCH_WINDOW_SECONDS,
+                )
+                if dropped:
+                    yield f"event: dropped\ndata: {json.dumps({'count': dropped})}\n\n"
+                if entries:
+                    yield f"event: logs\ndata: [{','.join(e.json for e in entries)}]\n\n"
+                elif not dropped:
+                    yield ": keepalive\n\n"
+        except asyncio.CancelledError:
+            pass
         finally:
-            await r.aclose()
+            await log_tails.unsubscribe(subscription)
 
     return StreamingResponse(
         event_generator(),
@@ -844,6 +859,34 @@ async def stream_merged_logs(
     )
 
 
+@router.get("/logs/metrics")
+async def get_log_stream_metrics(
+    admin: AuthUser = Depends(get_current_admin),
+):
+    """Active shared log tails and their subscriber counts."""
+    return log_tails.stats()
+
+
+@router.get("/logs/stream/merged")
+async def stream_merged_logs(
+    admin: AuthUser = Depends(get_current_admin),
+    tail: int = Query(
+        200, ge=0, le=5000, description="Number of recent lines to backfill"
+    ),
+    level: Optional[str] = Query(None, description="Comma-separated log levels"),
+    container: Optional[str] = Query(None, description="Comma-separated containers"),
+    q: Optional[str] = Query(None, max_length=256, description="Regex on the line"),
+):
+    """SSE stream of merged logs from all containers.
+
+    Each container's log lines are interleaved in arrival order.  All
+    clients share one Redis reader per process; filters apply server-side.
+    """
+    return _log_stream_response(
+        _MERGED_LOG_STREAM, _parse_log_filter(level, container, q), tail
+    )
+
+
 @router.get("/logs/stream/{container_name}")
 async def stream_container_logs(
     container_name: str,
@@ -851,83 +894,19 @@ async def stream_container_logs(
     tail: int = Query(
         200, ge=0, le=5000, description="Number of recent lines to backfill"
     ),
+    level: Optional[str] = Query(None, description="Comma-separated log levels"),
+    q: Optional[str] = Query(None, max_length=256, description="Regex on the line"),
 ):
     """SSE stream of logs for a single container.
 
-    Uses a dedicated Redis connection per SSE client — no impact on engine.
+    All clients share one Redis reader per container; filters apply
+    server-side.
     """
-    redis_url = _get_redis_url()
-    stream_key = f"{_LOG_STREAM_PREFIX}{container_name}"
-
-    async def event_generator() -> AsyncGenerator[str, None]:
-        r = aioredis.from_url(redis_url, decode_responses=True)
-        try:
-            # Send initial connected event
-            yield "event: connected\ndata: {}\n\n"
-
-            last_id = "$"
-
-            # Backfill
-            if tail > 0:
-                try:
-                    entries = await r.xrevrange(stream_key, "+", "-", count=tail)
-                    for msg_id, fields in reversed(entries):
-                        last_id = msg_id
-                        payload = json.dumps(
-                            {
-                                "line": fields.get("line", ""),
-                                "level": fields.get("level", "info"),
-                                "ts": fields.get("ts", ""),
-                                "container": fields.get("container", container_name),
-                                "service": fields.get("service", ""),
-                            }
-                        )
-                        yield f"event: log\ndata: {payload}\n\n"
-                except Exception as e:
-                    logger.warning(f"Container log backfill failed: {e}")
-
-            # Live stream
-            while True:
-                try:
-                    messages = await r.xread(
-                        {stream_key: last_id}, count=50, block=3000
-                    )
-                    if not messages:
-                        yield ": keepalive\n\n"
-                        continue
-
-                    for _stream_name, stream_messages in messages:
-                        for msg_id, fields in stream_messages:
-                            last_id = msg_id
-                            payload = json.dumps(
-                                {
-                                    "line": fields.get("line", ""),
-                                    "level": fields.get("level", "info"),
-                                    "ts": fields.get("ts", ""),
-                                    "container": fields.get(
-                                        "container", container_name
-                                    ),
-                                    "service": fields.get("service", ""),
-                                }
-                            )
-                            yield f"event: log\ndata: {payload}\n\n"
-
-                except asyncio.CancelledError:
-                    break
-                except Exception as e:
-                    logger.warning(f"Container log SSE error: {e}")
-                    yield f"event: error\ndata: {json.dumps({'error': str(e)})}\n\n"
-                    await asyncio.sleep(2)
-        finally:
-            await r.aclose()
-
-    return StreamingResponse(
-        event_generator(),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "X-Accel-Buffering": "no",
-        },
+    return _log_stream_response(
+        f"{_LOG_STREAM_PREFIX}{container_name}",
+        _parse_log_filter(level, None, q),
+        tail,
+        default_container=container_name,
     )
 
 
@@ -1069,8 +1048,39 @@ class UsageItem(BaseModel):
 
 class UsageListResponse(BaseModel):
     items: List[UsageItem]
-    total: int
+    # Only computed for the first page (no cursor)
+    total: Optional[int] = None
     hasMore: bool
+    nextCursor: Optional[str] = None
+
+
+def _encode_usage_cursor(created_at: int, item_type: str, item_id: str) -> str:
+    raw = f"{created_at}:{item_type}:{item_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_usage_cursor(cursor: str) -> tuple[int, str, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, item_type, item_id = (
+            base64.urlsafe_b64decode(padded).decode("utf-8").split(":", 2)
+        )
+        return int(created_at), item_type, item_id
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _usage_after(model, item_type: str, after: tuple[int, str, str]):
+    """Keyset condition for one branch of the (created_at, type, id) ordering."""
+    created_at, after_type, after_id = after
+    if item_type < after_type:
+        return model.created_at <= created_at
+    if item_type > after_type:
+        return model.created_at < created_at
+    return or_(
+        model.created_at < created_at,
+        and_(model.created_at == created_at, model.id < after_id),
+    )
 
 
 @router.get("/usage", response_model=UsageListResponse)
@@ -1089,7 +1099,9 @@ async def list_api_usage(
         None, alias="type", description="Filter by type: chat or run"
     ),
     limit: int = Query(50, ge=1, le=200),
-    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(
+        None, description="nextCursor from the previous page"
+    ),
 ) -> UsageListResponse:
     """List all API usage across all users — chat sessions and pipeline runs.
 
@@ -1098,128 +1110,130 @@ async def list_api_usage(
     - Which API keys were used (personal / admin-shared / instance)
     - Masked key hints per provider
     - Model, status, and timing info
+
+    Filtering happens in SQL on the indexed key_user_id / key_sources
+    columns, and pages are keyset-paginated on (created_at, type, id):
+    pass ``nextCursor`` back as ``cursor`` for the next page.  Rows without
+    a key resolution match any ``key_source``.
     """
     from app.models.chat import ChatSession
     from app.models.run import Run
 
-    items: List[UsageItem] = []
+    after = _decode_usage_cursor(cursor) if cursor else None
 
-    # ── Fetch chat sessions ──────────────────────────────────────────────
+    def key_source_filter(model):
+        return or_(
+            model.key_sources.is_(None),
+            model.key_sources.contains(f",{key_source},", autoescape=True),
+        )
+
+    branches = []  # (model, type, columns, filters)
     if item_type is None or item_type == "chat":
-        chat_query = select(ChatSession).order_by(ChatSession.created_at.desc())
+        filters = []
         if status_filter:
-            chat_query = chat_query.where(ChatSession.status == status_filter)
-
-        chat_result = await session.execute(chat_query)
-        chat_sessions = chat_result.scalars().all()
-
-        for cs in chat_sessions:
-            kr = None
-            cs_user_id = None
-            if cs.key_resolution:
-                try:
-                    kr = json.loads(cs.key_resolution)
-                    cs_user_id = kr.get("userId")
-                except (json.JSONDecodeError, TypeError):
-                    pass
-
-            # Apply user filter
-            if user_id and cs_user_id != user_id:
-                continue
-
-            # Apply key source filter
-            if key_source and kr:
-                provider_sources = kr.get("providerSources", {})
-                if provider_sources and not any(
-                    ps.get("source") == key_source for ps in provider_sources.values()
-                ):
-                    continue
-                elif not provider_sources:
-                    # Legacy format: check top-level source
-                    top_source = kr.get("source", "")
-                    if key_source == "instance" and top_source != "system":
-                        continue
-                    elif key_source == "personal" and top_source != "executing_user":
-                        continue
-                    elif key_source not in ("instance", "personal"):
-                        continue
-
-            items.append(
-                UsageItem(
-                    id=cs.id,
-                    type="chat",
-                    agentId=cs.agent_id,
-                    userId=cs_user_id,
-                    source="dashboard",
-                    model=cs.model,
-                    status=cs.status,
-                    keyResolution=kr,
-                    createdAt=cs.created_at,
-                    completedAt=cs.completed_at,
-                )
-            )
+            filters.append(ChatSession.status == status_filter)
+        if user_id:
+            filters.append(ChatSession.key_user_id == user_id)
+        if key_source:
+            filters.append(key_source_filter(ChatSession))
+        columns = (
+            ChatSession.id.label("id"),
+            literal_column("'chat'", String).label("type"),
+            ChatSession.agent_id.label("agent_id"),
+            ChatSession.key_user_id.label("user_id"),
+            literal_column("'dashboard'", String).label("source"),
+            ChatSession.model.label("model"),
+            ChatSession.status.label("status"),
+            ChatSession.key_resolution.label("key_resolution"),
+            ChatSession.created_at.label("created_at"),
+            ChatSession.completed_at.label("completed_at"),
+        )
+        branches.append((ChatSession, "chat", columns, filters))
 
-    # ── Fetch pipeline runs ──────────────────────────────────────────────
     if item_type is None or item_type == "run":
-        run_query = select(Run).order_by(Run.created_at.desc())
+        filters = []
         if status_filter:
-            run_query = run_query.where(Run.status == status_filter)
+            filters.append(Run.status == status_filter)
         if user_id:
-            run_query = run_query.where(Run.initiated_by_user_id == user_id)
-
-        run_result = await session.execute(run_query)
-        runs = run_result.scalars().all()
+            filters.append(Run.initiated_by_user_id == user_id)
+        if key_source:
+            filters.append(key_source_filter(Run))
+        columns = (
+            Run.id.label("id"),
+            literal_column("'run'", String).label("type"),
+            Run.pipeline_id.label("agent_id"),
+            func.coalesce(Run.initiated_by_user_id, Run.key_user_id).label("user_id"),
+            literal_column("'pipeline'", String).label("source"),
+            Run.model_override.label("model"),
+            Run.status.label("status"),
+            Run.key_resolution.label("key_resolution"),
+            Run.created_at.label("created_at"),
+            Run.completed_at.label("completed_at"),
+        )
+        branches.append((Run, "run", columns, filters))
 
-        for r in runs:
-            kr = None
-            if r.key_resolution:
-                try:
-                    kr = json.loads(r.key_resolution)
-                except (json.JSONDecodeError, TypeError):
-                    pass
+    if not branches:
+        return UsageListResponse(
+            items=[], total=0 if after is None else None, hasMore=False
+        )
 
-            run_user_id = getattr(r, "initiated_by_user_id", None) or (
-                kr.get("userId") if kr else None
+    # ── One page: each branch contributes at most limit + 1 rows ─────────
+    parts = []
+    for model, branch_type, columns, filters in branches:
+        query = select(*columns).where(*filters)
+        if after:
+            query = query.where(_usage_after(model, branch_type, after))
+        query = query.order_by(model.created_at.desc(), model.id.desc()).limit(
+            limit + 1
+        )
+        branch = query.subquery()
+        parts.append(select(*branch.c))
+    combined = (union_all(*parts) if len(parts) > 1 else parts[0]).subquery()
+    rows = (
+        await session.execute(
+            select(combined)
+            .order_by(
+                combined.c.created_at.desc(),
+                combined.c.type.desc(),
+                combined.c.id.desc(),
             )
-
-            # Apply key source filter
-            if key_source and kr:
-                provider_sources = kr.get("providerSources", {})
-                if provider_sources and not any(
-                    ps.get("source") == key_source for ps in provider_sources.values()
-                ):
-                    continue
-                elif not provider_sources:
-                    top_source = kr.get("source", "")
-                    if key_source == "instance" and top_source != "system":
-                        continue
-                    elif key_source == "personal" and top_source != "executing_user":
-                        continue
-                    elif key_source not in ("instance", "personal"):
-                        continue
-
-            items.append(
-                UsageItem(
-                    id=r.id,
-                    type="run",
-                    agentId=r.pipeline_id,
-                    userId=run_user_id,
-                    source="pipeline",
-                    model=getattr(r, "model_override", None),
-                    status=r.status,
-                    keyResolution=kr,
-                    createdAt=r.created_at,
-                    completedAt=r.completed_at,
-                )
+            .limit(limit + 1)
+        )
+    ).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    total = None
+    if after is None:
+        total = 0
+        for model, _, _, filters in branches:
+            count_query = select(func.count()).select_from(model).where(*filters)
+            total += (await session.execute(count_query)).scalar_one()
+
+    page_items: List[UsageItem] = []
+    for row in rows:
+        kr = None
+        if row.key_resolution:
+            try:
+                kr = json.loads(row.key_resolution)
+            except (json.JSONDecodeError, TypeError):
+                pass
+        page_items.append(
+            UsageItem(
+                id=row.id,
+                type=row.type,
+                agentId=row.agent_id,
+                userId=row.user_id,
+                source=row.source,
+                model=row.model,
+                status=row.status,
+                keyResolution=kr,
+                createdAt=row.created_at,
+                completedAt=row.completed_at,
             )
-
-    # ── Sort combined results by created_at desc ─────────────────────────
-    items.sort(key=lambda x: x.createdAt, reverse=True)
-    total = len(items)
+        )
 
     # ── Resolve user emails/names for the page of results ────────────────
-    page_items = items[offset : offset + limit]
-
     user_ids = {i.userId for i in page_items if i.userId}
     user_map: Dict[str, User] = {}
     if user_ids:
@@ -1232,8 +1246,12 @@ async def list_api_usage(
             item.userEmail = u.email
             item.userDisplayName = u.display_name
 
+    last = page_items[-1] if page_items else None
     return UsageListResponse(
         items=page_items,
         total=total,
-        hasMore=(offset + len(page_items)) < total,
+        hasMore=has_more,
+        nextCursor=_encode_usage_cursor(last.createdAt, last.type, last.id)
+        if has_more
+        else None,
     )
@@ -4,7 +4,7 @@ import os
 import re
 import json
 import yaml
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
 from pydantic import BaseModel
 from typing import Optional, Tuple
 from sqlalchemy import select, func
@@ -15,6 +15,11 @@ from app.models import Run, Step, Task
 from app.models.agent import ProjectAgent
 from app.models.project import Project
 from app import dependencies
+from app.services.prompt_bundle import (
+    bump_prompt_version,
+    get_prompt_version,
+    prompt_bundle_cache,
+)
 from app.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -600,10 +605,90 @@ async def update_agent_config(agent_id: str, req: dict):
     logger.debug(f"Writing config.yml for agent: {agent_id}")
     with open(config_path, "w") as f:
         yaml.dump(existing, f, default_flow_style=False)
+    await bump_prompt_version([agent_id])
 
     return {"status": "updated", "config": existing}
 
 
+# ── System prompt bundle ─────────────────────────────────────────────────
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {
+        tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+    }
+    return etag in candidates or "*" in candidates
+
+
+async def _render_prompt_bundle(
+    session: AsyncSession, agent_id: str, version: Optional[int]
+) -> bytes:
+    from app.routers.mcp import build_agent_mcp_manifest
+    from app.routers.skills import build_agent_manifest
+
+    agent_dir = os.path.join(AGENTS_DIR, agent_id)
+    persona = {}
+    for pf in PERSONA_FILES:
+        content = _read_file(os.path.join(agent_dir, pf))
+        if content:
+            persona[pf] = content
+
+    config = {}
+    config_text = _read_file(os.path.join(agent_dir, "config.yml"))
+    if config_text:
+        try:
+            config = yaml.safe_load(config_text) or {}
+        except yaml.YAMLError as e:
+            logger.warning(f"Invalid config.yml for agent {agent_id}: {e}")
+
+    skills = await build_agent_manifest(session, agent_id)
+    mcp = await build_agent_mcp_manifest(session, agent_id)
+    bundle = {
+        "agentId": agent_id,
+        "version": version,
+        "persona": persona,
+        "config": config,
+        "skills": skills.model_dump(),
+        "mcp": mcp.model_dump(),
+    }
+    return json.dumps(bundle, separators=(",", ":"), default=str).encode("utf-8")
+
+
+@router.get("/{agent_id}/prompt-bundle")
+async def get_agent_prompt_bundle(
+    agent_id: str,
+    request: Request,
+    session: AsyncSession = Depends(get_async_session),
+):
+    """Everything an agent runtime needs to build its system prompt.
+
+    Persona files, config.yml, the skills manifest and the MCP manifest in
+    one response, with an ETag that only changes when one of them does.
+    Send it back as ``If-None-Match`` to get a 304 when nothing changed.
+    """
+    agent_dir = os.path.join(AGENTS_DIR, agent_id)
+    if not os.path.isdir(agent_dir):
+        raise HTTPException(status_code=404, detail=f"Agent {agent_id} not found")
+
+    if_none_match = request.headers.get("if-none-match")
+    version = await get_prompt_version(agent_id)
+    cached = prompt_bundle_cache.get(agent_id, version)
+    if cached is not None:
+        body, etag = cached
+    else:
+        body = await _render_prompt_bundle(
+            session, agent_id, version.number if version is not None else None
+        )
+        etag = prompt_bundle_cache.put(agent_id, version, body)
+
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 # ── Work Ledger (live coordination) ──────────────────────────────────────
 
 
@@ -697,6 +782,7 @@ async def update_agent_file(agent_id: str, filename: str, req: FileUpdateRequest
 
     with open(filepath, "w", encoding="utf-8") as f:
         f.write(req.content)
+    await bump_prompt_version([agent_id])
 
     return {"status": "updated", "filename": filename, "size": len(req.content)}
 
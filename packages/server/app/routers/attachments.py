@@ -15,9 +15,10 @@ other document.
 """
 
 import json
-from typing import Optional, List
+import os
+from typing import AsyncIterator, Optional, List
 from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, BackgroundTasks
-from fastapi.responses import Response
+from fastapi.responses import FileResponse
 from pydantic import BaseModel
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -34,7 +35,7 @@ from app.models.chat import (
 )
 from app.services import file_storage
 from app.services.text_extraction import extract_text, extract_pdf_structured
-from app.services.audio_transcription import transcribe_audio
+from app.services.transcription_pool import transcription_pool
 from app.services.pdf_chunker import chunk_pdf, extract_toc
 from app.services.pdf_vault_ingest import ingest_pdf_to_shared_vault_async
 from app.logging_config import get_logger
@@ -126,20 +127,29 @@ async def upload_attachment(
             f"Unsupported file type: {mime}. Allowed: images, PDFs, text, code, audio files.",
         )
 
-    data = await file.read()
-    if len(data) > MAX_ATTACHMENT_SIZE:
+    # ── Store ───────────────────────────────────────────────────────────────
+    # Stream into the content-addressed blob store; identical uploads share
+    # one blob on disk.
+    att_id = gen_id("att_")
+    try:
+        stored = await file_storage.store_stream(
+            session_id, att_id, _iter_upload(file), max_size=MAX_ATTACHMENT_SIZE
+        )
+    except file_storage.FileTooLargeError as e:
         raise HTTPException(
             400,
-            f"File too large ({len(data)} bytes). Maximum: {MAX_ATTACHMENT_SIZE // (1024 * 1024)} MB.",
+            f"File too large ({e.size_bytes}+ bytes). Maximum: {MAX_ATTACHMENT_SIZE // (1024 * 1024)} MB.",
         )
-
-    # ── Store ───────────────────────────────────────────────────────────────
-    att_id = gen_id("att_")
-    storage_path = file_storage.store_file(session_id, att_id, file.filename, data)
+    storage_path = stored.storage_path
 
     # Synchronous text extraction for small files, async for large ones
     is_image = mime in ALLOWED_IMAGE_TYPES
     is_audio = mime in ALLOWED_AUDIO_TYPES
+    # Images are served straight from disk and audio is streamed into
+    # ffmpeg by the transcription pool — only load bytes for text extraction.
+    data = (
+        b"" if is_image or is_audio else (file_storage.read_file(storage_path) or b"")
+    )
     extracted_text: Optional[str] = None
     estimated_tokens: int = 0
     structured_json: Optional[str] = None
@@ -182,7 +192,7 @@ async def upload_attachment(
         session_id=session_id,
         filename=file.filename,
         mime_type=mime,
-        size_bytes=len(data),
+        size_bytes=stored.size_bytes,
         storage_path=storage_path,
         processing_status=processing_status,
         extracted_text=extracted_text,
@@ -199,7 +209,8 @@ async def upload_attachment(
     await db.refresh(attachment)
 
     logger.info(
-        f"upload_attachment: {att_id} ({file.filename}, {mime}, {len(data)} bytes, ~{estimated_tokens} tokens)"
+        f"upload_attachment: {att_id} ({file.filename}, {mime}, {stored.size_bytes} bytes, "
+        f"~{estimated_tokens} tokens, dedup={stored.deduplicated})"
     )
 
     # Trigger async vault ingest for PDFs with structured data
@@ -219,7 +230,11 @@ async def upload_attachment(
     if is_audio:
         import asyncio
 
-        asyncio.create_task(_transcribe_audio_async(att_id, data, mime, file.filename))
+        asyncio.create_task(
+            _transcribe_audio_async(
+                att_id, storage_path, mime, file.filename, stored.size_bytes
+            )
+        )
 
     return _to_response(attachment)
 
@@ -260,12 +275,14 @@ async def get_attachment_content(
     if not att:
         raise HTTPException(404, f"Attachment {attachment_id} not found")
 
-    data = file_storage.read_file(att.storage_path)
-    if data is None:
+    abs_path = file_storage.get_absolute_path(att.storage_path)
+    if not os.path.isfile(abs_path):
         raise HTTPException(404, "Attachment file not found on disk")
 
-    return Response(
-        content=data,
+    # FileResponse streams from disk in chunks and honours Range headers,
+    # so large PDFs / audio never get buffered in API memory.
+    return FileResponse(
+        abs_path,
         media_type=att.mime_type,
         headers={
             "Content-Disposition": f'inline; filename="{att.filename}"',
@@ -333,18 +350,23 @@ async def upload_bytes_internal(
     Unlike the public upload endpoint, this doesn't require agent_id validation
     and accepts session_id as a query parameter.
     """
-    data = await file.read()
-    if len(data) > MAX_ATTACHMENT_SIZE:
-        raise HTTPException(400, "File too large")
-
     if mime_type not in ALLOWED_MIME_TYPES:
         mime_type = _guess_mime(filename)
 
     att_id = gen_id("att_")
-    storage_path = file_storage.store_file(session_id, att_id, filename, data)
+    try:
+        stored = await file_storage.store_stream(
+            session_id, att_id, _iter_upload(file), max_size=MAX_ATTACHMENT_SIZE
+        )
+    except file_storage.FileTooLargeError:
+        raise HTTPException(400, "File too large")
+    storage_path = stored.storage_path
 
     is_image = mime_type in ALLOWED_IMAGE_TYPES
     is_audio = mime_type in ALLOWED_AUDIO_TYPES
+    data = (
+        b"" if is_image or is_audio else (file_storage.read_file(storage_path) or b"")
+    )
     extracted_text = None
     estimated_tokens = 1600 if is_image else 0
     structured_json_str: Optional[str] = None
@@ -380,7 +402,7 @@ async def upload_bytes_internal(
         session_id=session_id,
         filename=filename,
         mime_type=mime_type,
-        size_bytes=len(data),
+        size_bytes=stored.size_bytes,
         storage_path=storage_path,
         processing_status=processing_status,
         extracted_text=extracted_text,
@@ -415,18 +437,32 @@ async def upload_bytes_internal(
     if is_audio:
         import asyncio
 
-        asyncio.create_task(_transcribe_audio_async(att_id, data, mime_type, filename))
+        asyncio.create_task(
+            _transcribe_audio_async(
+                att_id, storage_path, mime_type, filename, stored.size_bytes
+            )
+        )
 
     return {
         "id": att_id,
         "filename": filename,
         "mimeType": mime_type,
-        "sizeBytes": len(data),
+        "sizeBytes": stored.size_bytes,
     }
 
 
 # ── Helpers ────────────────────────────────────────────────────────────────────
 
+
+async def _iter_upload(file: UploadFile) -> AsyncIterator[bytes]:
+    """Yield an UploadFile's body in fixed-size chunks."""
+    while True:
+        chunk = await file.read(file_storage.STREAM_CHUNK_SIZE)
+        if not chunk:
+            break
+        yield chunk
+
+
 _EXTENSION_MIME_MAP = {
     ".jpg": "image/jpeg",
     ".jpeg": "image/jpeg",
@@ -470,8 +506,6 @@ def _normalize_mime(mime: str) -> str:
 
 def _guess_mime(filename: str) -> str:
     """Guess MIME type from file extension."""
-    import os
-
     ext = os.path.splitext(filename)[1].lower()
     return _EXTENSION_MIME_MAP.get(ext, "application/octet-stream")
 
@@ -549,22 +583,24 @@ async def _ingest_pdf_to_vault(
 
 async def _transcribe_audio_async(
     attachment_id: str,
-    data: bytes,
+    storage_path: str,
     mime_type: str,
     filename: str,
+    size_bytes: int,
 ) -> None:
     """Background task (async): transcribe audio and update the attachment record.
 
-    Used by the internal upload endpoint via asyncio.create_task().
-    Runs faster-whisper in a thread pool to avoid blocking the event loop.
+    Used by the upload endpoints via asyncio.create_task().  The job runs on
+    the shared transcription pool, which bounds concurrency and schedules
+    short voice notes ahead of long recordings.
     """
-    import asyncio
-
     try:
-        # Run transcription in thread pool (faster-whisper is CPU-bound)
-        loop = asyncio.get_event_loop()
-        transcript, tokens = await loop.run_in_executor(
-            None, transcribe_audio, data, mime_type, filename
+        transcript, tokens = await transcription_pool.submit(
+            attachment_id,
+            file_storage.get_absolute_path(storage_path),
+            mime_type,
+            filename,
+            size_bytes,
         )
 
         # Wrap transcript so the agent knows it's a voice message
@@ -45,6 +45,7 @@ from app.auth.totp import (
 )
 from app.auth.oidc import OIDCClient, test_oidc_discovery
 from app.auth.dependencies import get_current_user, get_current_admin, AuthUser
+from app.auth.principal_cache import principal_cache
 from app.logging_config import get_logger
 from app import dependencies as app_deps
 
@@ -791,6 +792,9 @@ async def totp_confirm(
             )
         )
 
+    await session.commit()
+    await principal_cache.invalidate(user_id=db_user.id)
+
     plaintext_codes = [c[0] for c in codes]
     return {
         "status": "enabled",
@@ -832,6 +836,8 @@ async def totp_disable(
     await session.execute(
         delete(UserRecoveryCode).where(UserRecoveryCode.user_id == db_user.id)
     )
+    await session.commit()
+    await principal_cache.invalidate(user_id=db_user.id)
 
     return {"status": "disabled"}
 
@@ -1125,6 +1131,8 @@ async def revoke_api_key(
         raise HTTPException(status_code=403, detail="Not authorized")
 
     api_key.is_active = False
+    await session.commit()
+    await principal_cache.invalidate(api_key_id=key_id)
     return {"status": "revoked", "id": key_id}
 
 
@@ -20,6 +20,7 @@ from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
+from app import dependencies
 from app.database import get_async_session
 from app.models.settings import AgentChannelCredential
 from app.models.base import now_ms
@@ -326,13 +327,11 @@ async def upsert_agent_channel(
 
     # Notify the engine so it can hot-reload the channel bridge (fire-and-forget).
     try:
-        import redis.asyncio as aioredis
-
-        redis_url = os.environ.get("REDIS_URL", "redis://localhost:6379")
-        r = aioredis.from_url(redis_url)
-        payload = json.dumps({"agentId": agent_id, "channel": channel})
-        await r.publish("djinnbot:channel:credentials-changed", payload)
-        await r.aclose()
+        if dependencies.redis_client:
+            payload = json.dumps({"agentId": agent_id, "channel": channel})
+            await dependencies.redis_client.publish(
+                "djinnbot:channel:credentials-changed", payload
+            )
     except Exception as e:
         logger.warning(f"Failed to notify engine of channel credential change: {e}")
 
@@ -356,13 +355,11 @@ async def remove_agent_channel(
 
     # Notify the engine so it can stop the channel bridge (fire-and-forget).
     try:
-        import redis.asyncio as aioredis
-
-        redis_url = os.environ.get("REDIS_URL", "redis://localhost:6379")
-        r = aioredis.from_url(redis_url)
-        payload = json.dumps({"agentId": agent_id, "channel": channel, "removed": True})
-        await r.publish("djinnbot:channel:credentials-changed", payload)
-        await r.aclose()
+        if dependencies.redis_client:
+            payload = json.dumps({"agentId": agent_id, "channel": channel, "removed": True})
+            await dependencies.redis_client.publish(
+                "djinnbot:channel:credentials-changed", payload
+            )
     except Exception as e:
         logger.warning(f"Failed to notify engine of channel credential removal: {e}")
 
@@ -19,7 +19,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_async_session
 from app.database import AsyncSessionLocal
 from app.models.chat import ChatSession, ChatMessage
-from app.models.settings import GlobalSetting
+from app.services.settings_cache import settings_cache
 from app import dependencies
 from app.logging_config import get_logger
 from app.utils import gen_id, now_ms
@@ -108,12 +108,7 @@ async def start_chat_session(
             pass
     if not model:
         try:
-            result = await db.execute(
-                select(GlobalSetting).where(GlobalSetting.key == "defaultWorkingModel")
-            )
-            row = result.scalar_one_or_none()
-            if row and row.value and row.value.strip():
-                model = row.value.strip()
+            model = await settings_cache.get_str("defaultWorkingModel") or None
         except Exception:
             pass
     if not model:
@@ -8,6 +8,7 @@ which also signals the Engine to start the container.
 This module handles: list, get, update, delete operations.
 """
 
+import asyncio
 import json
 from typing import Optional, List
 from fastapi import APIRouter, HTTPException, Depends, Query, Request
@@ -18,6 +19,9 @@ from sqlalchemy.orm import selectinload
 
 from app.database import get_async_session
 from app.models.chat import ChatSession, ChatMessage
+from app.services import file_storage
+from app.services.live_events import publish_live
+from app.services.message_completions import notify_message_completed
 from app import dependencies
 from app.logging_config import get_logger
 from app.utils import gen_id, now_ms
@@ -241,18 +245,16 @@ async def update_chat_session(
         # Publish status change
         if dependencies.redis_client and old_status != request.status:
             try:
-                await dependencies.redis_client.publish(
+                await publish_live(
                     "djinnbot:chat:sessions:live",
-                    json.dumps(
-                        {
-                            "type": "status_changed",
-                            "sessionId": session_id,
-                            "agentId": session.agent_id,
-                            "oldStatus": old_status,
-                            "newStatus": request.status,
-                            "timestamp": now_ms(),
-                        }
-                    ),
+                    {
+                        "type": "status_changed",
+                        "sessionId": session_id,
+                        "agentId": session.agent_id,
+                        "oldStatus": old_status,
+                        "newStatus": request.status,
+                        "timestamp": now_ms(),
+                    },
                 )
             except Exception as e:
                 logger.warning(f"Failed to publish status change: {e}")
@@ -323,19 +325,23 @@ async def delete_chat_session(
     await db.delete(session)
     await db.commit()
 
+    # Release this session's references in the attachment blob store
+    try:
+        await asyncio.to_thread(file_storage.delete_session_files, session_id)
+    except Exception as e:
+        logger.warning(f"Failed to release attachment files for {session_id}: {e}")
+
     # Publish deletion event
     if dependencies.redis_client:
         try:
-            await dependencies.redis_client.publish(
+            await publish_live(
                 "djinnbot:chat:sessions:live",
-                json.dumps(
-                    {
-                        "type": "deleted",
-                        "sessionId": session_id,
-                        "agentId": agent_id,
-                        "timestamp": now_ms(),
-                    }
-                ),
+                {
+                    "type": "deleted",
+                    "sessionId": session_id,
+                    "agentId": agent_id,
+                    "timestamp": now_ms(),
+                },
             )
         except Exception as e:
             logger.warning(f"Failed to publish deletion event: {e}")
@@ -596,4 +602,5 @@ async def complete_chat_message(
     message.completed_at = now_ms()
 
     await db.commit()
+    await notify_message_completed(message_id, message.session_id)
     return {"ok": True}
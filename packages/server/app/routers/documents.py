@@ -11,6 +11,7 @@ to pull only the content an agent needs, instead of dumping full PDFs
 into context windows.
 """
 
+import asyncio
 import json
 import os
 from typing import Optional, List
@@ -21,6 +22,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_async_session
 from app.models.chat import ChatAttachment
+from app.services.document_index import load_index
 from app.services.pdf_chunker import extract_toc, format_toc
 from app.logging_config import get_logger
 
@@ -163,40 +165,39 @@ async def get_document_section(
     if not os.path.isdir(doc_dir):
         raise HTTPException(404, "Document vault directory not found")
 
-    chunks = _read_vault_chunks(doc_dir)
-    if not chunks:
+    index = await asyncio.to_thread(load_index, doc_dir)
+    if index is None:
         raise HTTPException(404, "No chunks found for this document")
 
-    # Find matching chunk
+    # Find matching chunk via the ingest-time index
     if chunk_index is not None:
-        # Direct index access
-        matching = [c for c in chunks if c["chunk_index"] == chunk_index]
+        matching = index.by_chunk_index(chunk_index)
     elif heading:
         # Search by heading (case-insensitive partial match)
-        heading_lower = heading.lower()
-        matching = [c for c in chunks if heading_lower in c.get("section", "").lower()]
+        matching = index.by_heading(heading)
     elif page:
-        # Find chunks containing this page
-        matching = [c for c in chunks if page in c.get("pages", [])]
+        matching = index.by_page(page)
     else:
         raise HTTPException(400, "Provide heading, page, or chunk_index")
 
     if not matching:
         return {"results": [], "message": f"No matching section found"}
 
-    results = []
-    for chunk in matching:
-        from app.services.text_extraction import estimate_tokens
+    contents = await asyncio.to_thread(
+        lambda: [index.read_content(chunk) for chunk in matching]
+    )
 
+    results = []
+    for chunk, content in zip(matching, contents):
         results.append(
             DocumentSectionResponse(
                 attachment_id=att.id,
                 filename=att.filename,
-                section_heading=chunk.get("section", ""),
-                content=chunk.get("content", ""),
-                page_numbers=chunk.get("pages", []),
-                chunk_index=chunk.get("chunk_index", 0),
-                estimated_tokens=estimate_tokens(chunk.get("content", "")),
+                section_heading=chunk["section"],
+                content=content,
+                page_numbers=chunk["pages"],
+                chunk_index=chunk["chunk_index"],
+                estimated_tokens=chunk["tokens"],
             )
         )
 
@@ -212,7 +213,8 @@ async def search_document(
 ):
     """Search within a specific document's chunks.
 
-    Performs a simple keyword search across the document's vault chunks.
+    Ranks chunks with BM25 over the term statistics stored in the
+    document's chunk index (section headings weighted double).
     For semantic search, agents should use the recall tool with scope=shared.
     """
     att = await _get_pdf_attachment(attachment_id, db)
@@ -223,40 +225,33 @@ async def search_document(
     if not os.path.isdir(doc_dir):
         raise HTTPException(404, "Document vault directory not found")
 
-    chunks = _read_vault_chunks(doc_dir)
-    query_lower = q.lower()
-
-    # Score chunks by keyword match density
-    scored = []
-    for chunk in chunks:
-        content_lower = chunk.get("content", "").lower()
-        section_lower = chunk.get("section", "").lower()
+    index = await asyncio.to_thread(load_index, doc_dir)
+    if index is None:
+        return {"results": [], "total_matches": 0}
 
-        # Count query word matches
-        words = query_lower.split()
-        score = sum(
-            content_lower.count(word) + section_lower.count(word) * 2 for word in words
-        )
-        if score > 0:
-            scored.append((score, chunk))
-
-    scored.sort(key=lambda x: x[0], reverse=True)
+    top, total_matches = index.search(q, limit)
+    contents = await asyncio.to_thread(
+        lambda: [index.read_content(chunk) for _, chunk in top]
+    )
 
     results = []
-    for score, chunk in scored[:limit]:
+    for (score, chunk), content in zip(top, contents):
         results.append(
             DocumentSearchResult(
                 attachment_id=att.id,
                 filename=att.filename,
-                section_heading=chunk.get("section", ""),
-                content=chunk.get("content", ""),
-                page_numbers=chunk.get("pages", []),
-                chunk_index=chunk.get("chunk_index", 0),
-                score=float(score),
+                section_heading=chunk["section"],
+                content=content,
+                page_numbers=chunk["pages"],
+                chunk_index=chunk["chunk_index"],
+                score=round(score, 4),
             )
         )
 
-    return {"results": [r.model_dump() for r in results], "total_matches": len(scored)}
+    return {
+        "results": [r.model_dump() for r in results],
+        "total_matches": total_matches,
+    }
 
 
 # ── Helpers ────────────────────────────────────────────────────────────────────
@@ -273,38 +268,3 @@ async def _get_pdf_attachment(attachment_id: str, db: AsyncSession) -> ChatAttac
     if att.mime_type != "application/pdf":
         raise HTTPException(400, "Attachment is not a PDF")
     return att
-
-
-def _read_vault_chunks(doc_dir: str) -> list[dict]:
-    """Read chunk metadata and content from vault markdown files.
-
-    Parses frontmatter from each chunk-NN.md file to reconstruct
-    chunk metadata without needing the original structured JSON.
-    """
-    from app.utils import parse_frontmatter as _parse_frontmatter
-
-    chunks = []
-    for entry in sorted(os.listdir(doc_dir)):
-        if not entry.startswith("chunk-") or not entry.endswith(".md"):
-            continue
-
-        filepath = os.path.join(doc_dir, entry)
-        if not os.path.isfile(filepath):
-            continue
-
-        with open(filepath, "r", encoding="utf-8") as f:
-            raw = f.read()
-
-        meta, body = _parse_frontmatter(raw)
-        chunks.append(
-            {
-                "chunk_index": meta.get("chunk_index", 0),
-                "section": meta.get("section", ""),
-                "pages": meta.get("pages", []),
-                "element_types": meta.get("element_types", []),
-                "content": body or "",
-                "filename": entry,
-            }
-        )
-
-    return chunks
@@ -1,15 +1,32 @@
 """SSE streaming endpoints for real-time pipeline events."""
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import (
+    APIRouter,
+    Header,
+    HTTPException,
+    Query,
+    WebSocket,
+    WebSocketDisconnect,
+)
 from fastapi.responses import StreamingResponse
 from sse_starlette.sse import EventSourceResponse
+from typing import Optional
 import asyncio
 import json
 
 from app import dependencies
+from app.auth.config import auth_settings
+from app.auth.dependencies import resolve_principal
+from app.services.event_archive import read_run_events
+from app.services.event_gateway import event_gateway
+from app.services.live_events import live_sse, parse_last_event_id, sse_frame
+from app.services.token_coalescer import TokenCoalescer
 
 router = APIRouter()
 
+# Events per read while replaying a run's history
+REPLAY_PAGE_SIZE = 500
+
 
 @router.get("/stream/{run_id}")
 async def stream_run_events(
@@ -22,9 +39,15 @@ async def stream_run_events(
             "history from /runs/{run_id}/logs). Defaults to '0' (replay all)."
         ),
     ),
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
 ):
     """SSE endpoint — streams pipeline events for a specific run.
 
+    Every event carries its stream ID as the SSE id.  A Last-Event-ID
+    header (sent automatically by a reconnecting EventSource) takes
+    precedence over ``since``, so the stream resumes without gaps or
+    replaying the whole run.
+
     Connect via EventSource:
         const es = new EventSource('/api/events/stream/run_123?since=$');
         es.onmessage = (e) => console.log(JSON.parse(e.data));
@@ -34,9 +57,34 @@ async def stream_run_events(
 
     stream_key = f"djinnbot:events:run:{run_id}"
 
+    since = parse_last_event_id(last_event_id) or since
+
     async def event_generator():
         last_id = since  # '$' = only new events, '0' = replay all
 
+        # Replay phase: finished runs may have been moved to the on-disk
+        # archive, so page through history (archive, then Redis) before
+        # switching to blocking XREAD for live events.
+        if since != "$":
+            while True:
+                messages, has_more = await read_run_events(
+                    run_id, after=last_id, limit=REPLAY_PAGE_SIZE
+                )
+                for msg_id, fields in messages:
+                    last_id = msg_id
+                    data = fields.get("data", "{}")
+                    try:
+                        event_data = json.loads(data)
+                    except json.JSONDecodeError:
+                        event_data = {"raw": data}
+                    yield {
+                        "event": "message",
+                        "id": msg_id,
+                        "data": json.dumps(event_data),
+                    }
+                if not has_more:
+                    break
+
         while True:
             try:
                 # XREAD with BLOCK to wait for new messages
@@ -64,6 +112,7 @@ async def stream_run_events(
 
                             yield {
                                 "event": "message",
+                                "id": last_id,
                                 "data": json.dumps(event_data),
                             }
                 else:
@@ -89,10 +138,13 @@ async def stream_run_events(
 
 
 @router.get("/stream")
-async def stream_all_events():
+async def stream_all_events(
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+):
     """SSE endpoint — streams all pipeline events via the global events stream.
 
-    Starts from the latest position ('$') so only new events are delivered.
+    Starts from the latest position ('$') so only new events are delivered,
+    or after Last-Event-ID when a client reconnects.
     The dashboard fetches current state from /status on load; this stream
     provides real-time updates going forward.
     """
@@ -101,8 +153,10 @@ async def stream_all_events():
 
     stream_key = "djinnbot:events:global"
 
+    resume_id = parse_last_event_id(last_event_id)
+
     async def event_generator():
-        last_id = "$"
+        last_id = resume_id or "$"
 
         while True:
             try:
@@ -128,6 +182,7 @@ async def stream_all_events():
 
                             yield {
                                 "event": "message",
+                                "id": last_id,
                                 "data": json.dumps(event_data),
                             }
                 else:
@@ -208,11 +263,16 @@ async def sse_agent_events():
 
 
 @router.get("/work-locks/{agent_id}")
-async def stream_work_locks(agent_id: str):
+async def stream_work_locks(
+    agent_id: str,
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+):
     """SSE endpoint — streams work lock changes for a specific agent in real-time.
 
-    Subscribes to Redis channel: djinnbot:agent:{agent_id}:work_locks:live
+    Reads the stream behind Redis channel djinnbot:agent:{agent_id}:work_locks:live.
     Events are published by the agent-runtime when locks are acquired or released.
+    Each event carries its stream ID as the SSE id; reconnecting clients
+    resume after the Last-Event-ID they send.
 
     Event types:
     - lock_acquired: A new work lock was acquired
@@ -225,36 +285,8 @@ async def stream_work_locks(agent_id: str):
 
     channel = f"djinnbot:agent:{agent_id}:work_locks:live"
 
-    async def event_generator():
-        pubsub = dependencies.redis_client.pubsub()
-        await pubsub.subscribe(channel)
-
-        try:
-            while True:
-                try:
-                    message = await asyncio.wait_for(
-                        pubsub.get_message(
-                            ignore_subscribe_messages=True, timeout=None
-                        ),
-                        timeout=20.0,
-                    )
-                    if message and message["type"] == "message":
-                        data_str = message["data"]
-                        if isinstance(data_str, bytes):
-                            data_str = data_str.decode()
-                        yield f"data: {data_str}\n\n"
-                    else:
-                        yield ": heartbeat\n\n"
-                except asyncio.TimeoutError:
-                    yield ": heartbeat\n\n"
-                except asyncio.CancelledError:
-                    break
-        finally:
-            await pubsub.unsubscribe(channel)
-            await pubsub.close()
-
     return StreamingResponse(
-        event_generator(),
+        live_sse(channel, parse_last_event_id(last_event_id)),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -265,11 +297,14 @@ async def stream_work_locks(agent_id: str):
 
 
 @router.get("/chat-sessions")
-async def stream_all_chat_sessions():
+async def stream_all_chat_sessions(
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+):
     """SSE endpoint — streams chat session updates for ALL agents.
 
-    Subscribes to Redis channel: djinnbot:chat:sessions:live
-    Forwards all chat session events (status changes, deletions, etc.).
+    Reads the stream behind Redis channel djinnbot:chat:sessions:live and
+    forwards all chat session events (status changes, deletions, etc.),
+    resuming after Last-Event-ID on reconnect.
 
     Test with: curl -N http://localhost:8000/api/events/chat-sessions
     """
@@ -278,36 +313,8 @@ async def stream_all_chat_sessions():
 
     channel = "djinnbot:chat:sessions:live"
 
-    async def event_generator():
-        pubsub = dependencies.redis_client.pubsub()
-        await pubsub.subscribe(channel)
-
-        try:
-            while True:
-                try:
-                    message = await asyncio.wait_for(
-                        pubsub.get_message(
-                            ignore_subscribe_messages=True, timeout=None
-                        ),
-                        timeout=20.0,
-                    )
-                    if message and message["type"] == "message":
-                        data_str = message["data"]
-                        if isinstance(data_str, bytes):
-                            data_str = data_str.decode()
-                        yield f"data: {data_str}\n\n"
-                    else:
-                        yield ": heartbeat\n\n"
-                except asyncio.TimeoutError:
-                    yield ": heartbeat\n\n"
-                except asyncio.CancelledError:
-                    break
-        finally:
-            await pubsub.unsubscribe(channel)
-            await pubsub.close()
-
     return StreamingResponse(
-        event_generator(),
+        live_sse(channel, parse_last_event_id(last_event_id)),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -318,10 +325,13 @@ async def stream_all_chat_sessions():
 
 
 @router.get("/sessions")
-async def stream_all_sessions():
+async def stream_all_sessions(
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+):
     """SSE endpoint — streams session updates for ALL agents.
 
-    Subscribes to Redis channel: djinnbot:sessions:live
+    Reads the stream behind Redis channel djinnbot:sessions:live, resuming
+    after Last-Event-ID on reconnect.
     Does NOT filter by agent — all session events are forwarded.
 
     Use this on the dashboard to get a live merged view of all sessions.
@@ -333,39 +343,8 @@ async def stream_all_sessions():
 
     channel = "djinnbot:sessions:live"
 
-    async def event_generator():
-        pubsub = dependencies.redis_client.pubsub()
-        await pubsub.subscribe(channel)
-
-        try:
-            while True:
-                try:
-                    message = await asyncio.wait_for(
-                        pubsub.get_message(
-                            ignore_subscribe_messages=True, timeout=None
-                        ),
-                        timeout=20.0,
-                    )
-                    if message and message["type"] == "message":
-                        data_str = message["data"]
-                        if isinstance(data_str, bytes):
-                            data_str = data_str.decode()
-                        try:
-                            data = json.loads(data_str)
-                            yield f"data: {json.dumps(data)}\n\n"
-                        except json.JSONDecodeError:
-                            pass
-                except asyncio.TimeoutError:
-                    yield ": heartbeat\n\n"
-
-        except asyncio.CancelledError:
-            raise
-        finally:
-            await pubsub.unsubscribe(channel)
-            await pubsub.close()
-
     return StreamingResponse(
-        event_generator(),
+        live_sse(channel, parse_last_event_id(last_event_id)),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -376,10 +355,14 @@ async def stream_all_sessions():
 
 
 @router.get("/sessions/{agent_id}")
-async def stream_agent_sessions(agent_id: str):
+async def stream_agent_sessions(
+    agent_id: str,
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+):
     """SSE endpoint — streams session updates for a specific agent.
 
-    Subscribes to Redis channel: djinnbot:sessions:live
+    Reads the stream behind Redis channel djinnbot:sessions:live, resuming
+    after Last-Event-ID on reconnect.
     Filters events to only include those for the specified agent_id.
 
     Events:
@@ -395,40 +378,12 @@ async def stream_agent_sessions(agent_id: str):
 
     channel = "djinnbot:sessions:live"
 
-    async def event_generator():
-        pubsub = dependencies.redis_client.pubsub()
-        await pubsub.subscribe(channel)
-
-        try:
-            while True:
-                try:
-                    message = await asyncio.wait_for(
-                        pubsub.get_message(
-                            ignore_subscribe_messages=True, timeout=None
-                        ),
-                        timeout=20.0,
-                    )
-                    if message and message["type"] == "message":
-                        data_str = message["data"]
-                        if isinstance(data_str, bytes):
-                            data_str = data_str.decode()
-                        try:
-                            data = json.loads(data_str)
-                            if data.get("agentId") == agent_id:
-                                yield f"data: {json.dumps(data)}\n\n"
-                        except json.JSONDecodeError:
-                            pass
-                except asyncio.TimeoutError:
-                    yield ": heartbeat\n\n"
-
-        except asyncio.CancelledError:
-            raise
-        finally:
-            await pubsub.unsubscribe(channel)
-            await pubsub.close()
-
     return StreamingResponse(
-        event_generator(),
+        live_sse(
+            channel,
+            parse_last_event_id(last_event_id),
+            match=lambda data: data.get("agentId") == agent_id,
+        ),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -449,6 +404,22 @@ async def stream_session_events(
             "events missed during a disconnect. Defaults to '0-0' (no replay)."
         ),
     ),
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+    coalesce_ms: int = Query(
+        0,
+        ge=0,
+        le=250,
+        description=(
+            "Merge consecutive token deltas (output / thinking / tool_output) "
+            "arriving within this many ms into one frame. 0 = one frame per token."
+        ),
+    ),
+    coalesce_bytes: int = Query(
+        4096,
+        ge=64,
+        le=65536,
+        description="Send a merged token frame once it reaches this many bytes.",
+    ),
 ):
     """SSE endpoint — streams real-time events for a specific chat session.
 
@@ -459,10 +430,18 @@ async def stream_session_events(
       2. Live: subscribe to the pub/sub channel (djinnbot:sessions:{id}) for
          real-time delivery of all events going forward.
 
+    Replayed events carry their stream ID as the SSE id, and a Last-Event-ID
+    header takes precedence over ``since``.  Live token events are not kept
+    in the stream, so they have no id and are not replayed.
+
     Uses StreamingResponse (not EventSourceResponse) with raw SSE string yields
     and get_message(timeout=None) so each message fetch genuinely suspends the
     coroutine — giving the asyncio event loop time to flush the TCP write buffer
     between tokens. This prevents burst delivery of queued messages.
+
+    With ``coalesce_ms`` set, token deltas are merged by TokenCoalescer into
+    frames of the same shape; any other event flushes them and is sent
+    immediately.
     """
     import logging
 
@@ -474,6 +453,7 @@ async def stream_session_events(
     if not dependencies.redis_client:
         raise HTTPException(status_code=503, detail="Redis not connected")
 
+    since = parse_last_event_id(last_event_id) or since
     channel = f"djinnbot:sessions:{session_id}"
     stream_key = f"{channel}:stream"
 
@@ -503,7 +483,7 @@ async def stream_session_events(
                     logger.debug(
                         f"[SSE] Replaying {data.get('type')} ({entry_id}) for {session_id}"
                     )
-                    yield f"data: {json.dumps(data)}\n\n"
+                    yield sse_frame(json.dumps(data), entry_id)
                 except json.JSONDecodeError:
                     pass
         except Exception as e:
@@ -518,6 +498,9 @@ async def stream_session_events(
         yield f"data: {json.dumps({'type': 'connected', 'session_id': session_id})}\n\n"
 
         HEARTBEAT_INTERVAL = 20.0
+        coalescer = (
+            TokenCoalescer(coalesce_ms, coalesce_bytes) if coalesce_ms else None
+        )
 
         try:
             while True:
@@ -526,17 +509,30 @@ async def stream_session_events(
                         pubsub.get_message(
                             ignore_subscribe_messages=True, timeout=None
                         ),
-                        timeout=HEARTBEAT_INTERVAL,
+                        timeout=coalescer.timeout(HEARTBEAT_INTERVAL)
+                        if coalescer
+                        else HEARTBEAT_INTERVAL,
                     )
 
                     if message and message["type"] == "message":
                         data_str = message["data"]
                         if isinstance(data_str, bytes):
                             data_str = data_str.decode()
-                        yield f"data: {data_str}\n\n"
+                        if coalescer is None:
+                            yield f"data: {data_str}\n\n"
+                            continue
+                        payloads = coalescer.add(data_str)
+                        if coalescer.due():
+                            payloads.extend(coalescer.flush())
+                        if payloads:
+                            yield "".join(f"data: {p}\n\n" for p in payloads)
 
                 except asyncio.TimeoutError:
-                    yield ": heartbeat\n\n"
+                    pending = coalescer.flush() if coalescer else []
+                    if pending:
+                        yield f"data: {pending[0]}\n\n"
+                    else:
+                        yield ": heartbeat\n\n"
                 except asyncio.CancelledError:
                     raise
                 except Exception as e:
@@ -750,3 +746,74 @@ async def stream_llm_calls():
             "X-Accel-Buffering": "no",
         },
     )
+
+
+@router.websocket("/ws")
+async def event_gateway_ws(websocket: WebSocket):
+    """Multiplexed event gateway — one WebSocket for all live dashboard topics.
+
+    Authenticate with ``?token=`` (closes with 4401 otherwise).  Send
+    ``{"op": "subscribe", "topic": ..., "since"?: ...}`` and
+    ``{"op": "unsubscribe", "topic": ...}``; the server replies with
+    ``subscribed`` / ``unsubscribed`` / ``error`` control messages.
+
+    Topics: ``global``, ``run:{run_id}``, ``sessions``, ``sessions:{agent_id}``,
+    ``chat-sessions``, ``work-locks:{agent_id}``, ``lifecycle``,
+    ``llm-calls``, ``activity:{agent_id}``.
+
+    Every server message is a binary frame: one header byte (0 = JSON,
+    1 = zlib-compressed JSON) followed by a JSON array of
+    ``{"topic", "id"?, "data"}`` events and ``{"op", ...}`` control messages.
+    See app.services.event_gateway.
+    """
+    await websocket.accept()
+    if auth_settings.enabled:
+        token = websocket.query_params.get("token")
+        try:
+            if not token:
+                raise HTTPException(status_code=401, detail="Not authenticated")
+            await resolve_principal(token)
+        except HTTPException as e:
+            await websocket.close(code=4401, reason=str(e.detail))
+            return
+    if not dependencies.redis_client:
+        await websocket.close(code=1013, reason="Redis not connected")
+        return
+
+    conn = event_gateway.connect()
+
+    async def writer():
+        while True:
+            await websocket.send_bytes(await conn.next_frame())
+
+    writer_task = asyncio.create_task(writer())
+    try:
+        while True:
+            try:
+                request = json.loads(await websocket.receive_text())
+                op, topic = request["op"], request["topic"]
+                since = request.get("since")
+                if not isinstance(topic, str) or (
+                    since is not None and not isinstance(since, str)
+                ):
+                    raise TypeError("topic and since must be strings")
+            except (json.JSONDecodeError, KeyError, TypeError, AttributeError):
+                conn.control({"op": "error", "error": "Invalid message"})
+                continue
+            try:
+                if op == "subscribe":
+                    await event_gateway.subscribe(conn, topic, since)
+                    conn.control({"op": "subscribed", "topic": topic})
+                elif op == "unsubscribe":
+                    await event_gateway.unsubscribe(conn, topic)
+                    conn.control({"op": "unsubscribed", "topic": topic})
+                else:
+                    raise ValueError(f"Unknown op: {op}")
+            except ValueError as e:
+                conn.control({"op": "error", "topic": topic, "error": str(e)})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        writer_task.cancel()
+        await asyncio.gather(writer_task, return_exceptions=True)
+        await event_gateway.disconnect(conn)
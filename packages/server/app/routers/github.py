@@ -792,6 +792,7 @@ async def handle_github_webhook(request: Request):
             logger.warning(f"GitHub App uninstalled: {installation_id}")
             # Mark all projects using this installation as disconnected
             if installation_id:
+                github_helper.invalidate_installation_token(installation_id)
                 projects = await github_helper.get_projects_by_installation(
                     installation_id
                 )
@@ -874,6 +875,7 @@ async def get_setup_status():
         "missing": [str, ...],   # human-readable list of what's absent
         "app_name": str | null,
         "app_id": int | null,
+        "api_cache": {...},      # installation-token / ETag cache counters
       }
     """
     ok, missing = github_helper.is_configured()
@@ -886,6 +888,7 @@ async def get_setup_status():
         "missing": missing,
         "app_name": app_name,
         "app_id": app_id,
+        "api_cache": github_helper.api_stats(),
     }
 
 
@@ -9,6 +9,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_async_session
 from app.models import Project, ProjectGitHubAgent, GitHubAgentTrigger
+from app.services.github_event_router import routing_table
 from app.utils import gen_id, now_ms
 
 router = APIRouter()
@@ -102,7 +103,8 @@ async def create_github_agent_assignment(
         updated_at=now,
     )
     session.add(new_assignment)
-    await session.flush()
+    await session.commit()
+    await routing_table.invalidate()
     
     return GitHubAgentAssignmentResponse(
         id=new_assignment.id,
@@ -231,6 +233,8 @@ async def update_github_agent_assignment(
     existing.filter_authors = serialize_json_field(assignment.filter_authors)
     existing.auto_respond = 1 if assignment.auto_respond else 0
     existing.updated_at = now
+    await session.commit()
+    await routing_table.invalidate()
     
     return GitHubAgentAssignmentResponse(
         id=existing.id,
@@ -266,6 +270,8 @@ async def delete_github_agent_assignment(
         raise HTTPException(status_code=404, detail="Assignment not found")
     
     await session.delete(assignment)
+    await session.commit()
+    await routing_table.invalidate()
     
     return {"status": "deleted", "id": assignment_id}
 
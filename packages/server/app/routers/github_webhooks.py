@@ -11,6 +11,7 @@ from app.database import get_async_session
 from app.models import WebhookEvent, WebhookSecret
 from app.webhook_security import verify_github_signature, get_webhook_secret
 from app import dependencies
+from app.services.webhook_stream import publish_webhook_event
 from app.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -143,19 +144,18 @@ async def receive_github_webhook(
     if not verified:
         raise HTTPException(status_code=401, detail=error_msg or "Invalid signature")
     
-    # Publish event to Redis for async processing (Task 20)
+    # Queue event on the durable webhook stream for async processing
     if dependencies.redis_client:
         try:
-            await dependencies.redis_client.publish(
-                "djinnbot:webhooks:github",
-                json.dumps({
+            await publish_webhook_event(
+                {
                     "event_id": event_id,
                     "delivery_id": x_github_delivery,
                     "event_type": x_github_event,
                     "action": action,
                     "repository": repository_full_name,
                     "installation_id": installation_id,
-                })
+                }
             )
         except Exception as e:
             logger.error(f"Failed to publish to Redis: {e}")
@@ -290,11 +290,12 @@ async def replay_webhook_event(
     event.processing_error = None
     event.processed = 0
     
-    # Re-publish event to Redis for processing
+    # Re-queue event on the webhook stream for processing (after the reset
+    # is committed, so the consumer can't finish before it lands)
     try:
-        await dependencies.redis_client.publish(
-            "djinnbot:webhooks:github",
-            json.dumps({
+        await session.commit()
+        await publish_webhook_event(
+            {
                 "event_id": event_id,
                 "delivery_id": event.delivery_id,
                 "event_type": event.event_type,
@@ -302,9 +303,8 @@ async def replay_webhook_event(
                 "repository": event.repository_full_name,
                 "installation_id": event.installation_id,
                 "replay": True
-            })
+            }
         )
-        await session.commit()
         
         return {
             "status": "replayed",
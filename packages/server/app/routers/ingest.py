@@ -7,6 +7,11 @@ Grace processes each payload using her remember/recall tools to extract
 people, decisions, commitments, action items, and facts into the shared
 knowledge graph.
 
+Meetings, notes and dictations are queued as durable ingest jobs
+(app.services.ingest_queue) and answered with 202 + a job ID; clients poll
+GET /jobs/{job_id}.  Long transcripts are split into overlapping chunks
+that Grace processes in sequence.
+
 Also provides a simplified /chat proxy that the Dialog client uses for
 Grace-powered chat, post-meeting actions, and title generation.
 """
@@ -22,14 +27,24 @@ from pydantic import BaseModel
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_async_session
+from app.auth.dependencies import AuthUser, get_current_user
+from app.database import AsyncSessionLocal, get_async_session
 from app.models.chat import ChatSession, ChatMessage
-from app.models.settings import GlobalSetting
+from app.models.ingest_job import IngestJob
+from app.services.settings_cache import settings_cache
 from app import dependencies
 from app.logging_config import get_logger
 from app.utils import now_ms
 from app.constants import DEFAULT_CHAT_MODEL
 from app.services.agent_config import get_agent_config
+from app.services.message_completions import message_completions
+from app.services.ingest_queue import (
+    enqueue_ingest_job,
+    ingest_queue,
+    job_to_dict,
+    split_transcript,
+    INGEST_CHUNK_CHARS,
+)
 
 logger = get_logger(__name__)
 router = APIRouter()
@@ -38,6 +53,12 @@ GRACE_AGENT_ID = "grace"
 # Maximum time (seconds) to wait for Grace to finish processing before
 # returning a 202 Accepted with partial status.
 GRACE_RESPONSE_TIMEOUT_SECONDS = 120
+# Maximum time (seconds) to wait for a new Grace session to start
+GRACE_SESSION_START_TIMEOUT_SECONDS = 30
+# Maximum time (seconds) a queued ingest job waits for Grace to finish one chunk
+INGEST_CHUNK_TIMEOUT_SECONDS = 600
+# Marks the session IDs of ingest queue lanes
+_LANE_SUFFIX = "-lane-"
 
 # Lock to prevent concurrent session creation races
 _session_creation_lock = asyncio.Lock()
@@ -58,14 +79,11 @@ async def _resolve_grace_model(db: AsyncSession) -> str:
     except Exception:
         pass
 
-    # 2. Instance-level default from GlobalSetting
+    # 2. Instance-level default from global settings (cached)
     try:
-        result = await db.execute(
-            select(GlobalSetting).where(GlobalSetting.key == "defaultWorkingModel")
-        )
-        row = result.scalar_one_or_none()
-        if row and row.value and row.value.strip():
-            return row.value.strip()
+        model = await settings_cache.get_str("defaultWorkingModel")
+        if model:
+            return model
     except Exception:
         pass
 
@@ -166,6 +184,8 @@ async def _get_or_create_grace_session(
             select(ChatSession)
             .where(ChatSession.agent_id == GRACE_AGENT_ID)
             .where(ChatSession.status.in_(["running", "ready", "starting"]))
+            # Ingest queue lanes keep their own sessions
+            .where(ChatSession.id.notlike(f"%{_LANE_SUFFIX}%"))
             .order_by(ChatSession.last_activity_at.desc())
             .limit(1)
         )
@@ -175,49 +195,70 @@ async def _get_or_create_grace_session(
             logger.info(f"Reusing existing Grace session: {existing.id}")
             return existing.id, resolved_model
 
-        # Create a new session
-        now = now_ms()
-        session_id = f"chat_{GRACE_AGENT_ID}_{now}"
+        session_id = await _create_grace_session(db, resolved_model)
 
-        chat_session = ChatSession(
-            id=session_id,
-            agent_id=GRACE_AGENT_ID,
-            status="starting",
-            model=resolved_model,
-            created_at=now,
-            last_activity_at=now,
-        )
-        db.add(chat_session)
-        await db.commit()
+    # Wait for the session to become ready — outside the lock
+    await _wait_for_grace_session(session_id)
+    return session_id, resolved_model
 
-        # Signal Engine to start Grace's container
-        if not dependencies.redis_client:
-            raise HTTPException(status_code=503, detail="Redis not available")
-
-        await dependencies.redis_client.xadd(
-            "djinnbot:events:chat_sessions",
-            {
-                "event": "chat:start",
-                "session_id": session_id,
-                "agent_id": GRACE_AGENT_ID,
-                "model": resolved_model,
-            },
-        )
-        logger.info(
-            f"Created new Grace session: {session_id} with model: {resolved_model}"
-        )
 
-    # Wait for the session to become ready (up to 30s) — outside the lock
-    for _ in range(60):
-        await asyncio.sleep(0.5)
-        await db.refresh(chat_session)
-        if chat_session.status in ("running", "ready"):
-            return session_id, resolved_model
-        if chat_session.status == "failed":
+async def _create_grace_session(
+    db: AsyncSession, resolved_model: str, suffix: str = ""
+) -> str:
+    """Insert a new Grace chat session and ask the engine to start it."""
+    now = now_ms()
+    session_id = f"chat_{GRACE_AGENT_ID}_{now}{suffix}"
+
+    chat_session = ChatSession(
+        id=session_id,
+        agent_id=GRACE_AGENT_ID,
+        status="starting",
+        model=resolved_model,
+        created_at=now,
+        last_activity_at=now,
+    )
+    db.add(chat_session)
+    await db.commit()
+
+    # Signal Engine to start Grace's container
+    if not dependencies.redis_client:
+        raise HTTPException(status_code=503, detail="Redis not available")
+
+    await dependencies.redis_client.xadd(
+        "djinnbot:events:chat_sessions",
+        {
+            "event": "chat:start",
+            "session_id": session_id,
+            "agent_id": GRACE_AGENT_ID,
+            "model": resolved_model,
+        },
+    )
+    logger.info(f"Created new Grace session: {session_id} with model: {resolved_model}")
+    return session_id
+
+
+async def _wait_for_grace_session(session_id: str) -> None:
+    """Wait until a starting session is running or ready.
+
+    Each check uses its own short-lived DB session so no connection is held
+    in between.
+    """
+    for _ in range(GRACE_SESSION_START_TIMEOUT_SECONDS * 2):
+        async with AsyncSessionLocal() as check_db:
+            result = await check_db.execute(
+                select(ChatSession.status, ChatSession.error).where(
+                    ChatSession.id == session_id
+                )
+            )
+            row = result.first()
+        if row and row.status in ("running", "ready"):
+            return
+        if row and row.status == "failed":
             raise HTTPException(
                 status_code=503,
-                detail=f"Grace session failed to start: {chat_session.error}",
+                detail=f"Grace session failed to start: {row.error}",
             )
+        await asyncio.sleep(0.5)
 
     raise HTTPException(
         status_code=504,
@@ -225,20 +266,25 @@ async def _get_or_create_grace_session(
     )
 
 
-async def _send_to_grace(
+async def _dispatch_to_grace(
     session_id: str,
     message: str,
     db: AsyncSession,
-    model: str = DEFAULT_CHAT_MODEL,
-) -> dict:
-    """Send a message to Grace and wait for her response."""
+    model: str,
+    id_prefix: str,
+) -> str:
+    """Persist the user/assistant message pair and publish the prompt to Grace.
+
+    Returns the assistant message ID.  The commit here is the last use of
+    *db*: it returns the connection to the pool before any waiting starts.
+    """
     if not dependencies.redis_client:
         raise HTTPException(status_code=503, detail="Redis not available")
 
     now = now_ms()
     unique_suffix = uuid.uuid4().hex[:8]
-    user_msg_id = f"msg_ingest_{now}_{unique_suffix}"
-    assistant_msg_id = f"msg_ingest_resp_{now}_{unique_suffix}"
+    user_msg_id = f"{id_prefix}_{now}_{unique_suffix}"
+    assistant_msg_id = f"{id_prefix}_resp_{now}_{unique_suffix}"
 
     # Persist user message
     db.add(
@@ -263,38 +309,52 @@ async def _send_to_grace(
     )
     await db.commit()
 
+    # Register before publishing so a fast completion can't be missed
+    await message_completions.expect(assistant_msg_id)
+
     # Publish to Grace's command channel
     command_channel = f"djinnbot:chat:sessions:{session_id}:commands"
-    await dependencies.redis_client.publish(
-        command_channel,
-        json.dumps(
-            {
-                "type": "message",
-                "content": message,
-                "model": model,
-                "message_id": assistant_msg_id,
-                "timestamp": now,
-            }
-        ),
+    try:
+        await dependencies.redis_client.publish(
+            command_channel,
+            json.dumps(
+                {
+                    "type": "message",
+                    "content": message,
+                    "model": model,
+                    "message_id": assistant_msg_id,
+                    "timestamp": now,
+                }
+            ),
+        )
+    except Exception:
+        message_completions.discard(assistant_msg_id)
+        raise
+    return assistant_msg_id
+
+
+async def _send_to_grace(
+    session_id: str,
+    message: str,
+    db: AsyncSession,
+    model: str = DEFAULT_CHAT_MODEL,
+) -> dict:
+    """Send a message to Grace and wait for her response."""
+    assistant_msg_id = await _dispatch_to_grace(
+        session_id, message, db, model, id_prefix="msg_ingest"
     )
 
-    # Wait for Grace's response by polling the assistant message.
-    # Expire cached ORM objects each iteration so we see external DB writes
-    # made by Grace's container (running in a different process/session).
-    for _ in range(GRACE_RESPONSE_TIMEOUT_SECONDS * 2):
-        await asyncio.sleep(0.5)
-        db.expire_all()
-        result = await db.execute(
-            select(ChatMessage).where(ChatMessage.id == assistant_msg_id)
-        )
-        msg = result.scalar_one_or_none()
-        if msg and msg.completed_at and msg.content:
-            return {
-                "status": "processed",
-                "reply": msg.content,
-                "sessionId": session_id,
-                "messageId": assistant_msg_id,
-            }
+    # Woken by the completion notification; no DB connection held meanwhile
+    reply = await message_completions.wait(
+        assistant_msg_id, GRACE_RESPONSE_TIMEOUT_SECONDS
+    )
+    if reply:
+        return {
+            "status": "processed",
+            "reply": reply,
+            "sessionId": session_id,
+            "messageId": assistant_msg_id,
+        }
 
     # Timed out waiting — return partial status
     return {
@@ -311,82 +371,121 @@ async def _send_to_grace_streaming(
     db: AsyncSession,
     model: str = DEFAULT_CHAT_MODEL,
 ):
-    """Send a message to Grace and yield SSE token events as they arrive.
+    """Send a message to Grace and return an SSE generator of her token deltas.
 
-    Polls the assistant message content and yields incremental deltas.
+    Tokens come from the session's Redis channel (``output`` events between
+    the engine's ``response_started`` for this message and ``turn_end``).
+    The dispatch happens here, before the response starts, so the generator
+    itself never touches the database session.
     """
     if not dependencies.redis_client:
         raise HTTPException(status_code=503, detail="Redis not available")
 
-    now = now_ms()
-    unique_suffix = uuid.uuid4().hex[:8]
-    user_msg_id = f"msg_chat_{now}_{unique_suffix}"
-    assistant_msg_id = f"msg_chat_resp_{now}_{unique_suffix}"
+    # Subscribe before dispatching so no early token is missed
+    pubsub = dependencies.redis_client.pubsub()
+    await pubsub.subscribe(f"djinnbot:sessions:{session_id}")
+    try:
+        assistant_msg_id = await _dispatch_to_grace(
+            session_id, message, db, model, id_prefix="msg_chat"
+        )
+    except Exception:
+        await pubsub.aclose()
+        raise
+    return _stream_grace_reply(assistant_msg_id, pubsub)
 
-    # Persist user message
-    db.add(
-        ChatMessage(
-            id=user_msg_id,
-            session_id=session_id,
-            role="user",
-            content=message,
-            created_at=now,
-            completed_at=now,
+
+async def _stream_grace_reply(assistant_msg_id: str, pubsub):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + GRACE_RESPONSE_TIMEOUT_SECONDS
+    streamed = ""
+    # True while the session is generating this message (it may be busy
+    # with an earlier prompt first)
+    active = False
+
+    try:
+        while loop.time() < deadline and not message_completions.completed(
+            assistant_msg_id
+        ):
+            message = await pubsub.get_message(
+                ignore_subscribe_messages=True, timeout=0.5
+            )
+            if not message or message["type"] != "message":
+                continue
+            try:
+                event = json.loads(message["data"])
+            except (json.JSONDecodeError, TypeError):
+                continue
+
+            event_type = event.get("type")
+            data = event.get("data") or {}
+            if event_type == "response_started":
+                active = data.get("message_id") == assistant_msg_id
+            elif active and event_type == "output":
+                token = data.get("content") or ""
+                if token:
+                    streamed += token
+                    yield f"data: {json.dumps({'token': token})}\n\n"
+            elif active and event_type in ("turn_end", "response_aborted"):
+                active = False
+
+        # Yield whatever the persisted reply has beyond the streamed tokens
+        # (all of it, if the engine doesn't announce response_started)
+        final = await message_completions.wait(
+            assistant_msg_id, max(deadline - loop.time(), 0)
         )
-    )
-    db.add(
-        ChatMessage(
-            id=assistant_msg_id,
-            session_id=session_id,
-            role="assistant",
-            content="",
-            model=model,
-            created_at=now,
+        if final and final.startswith(streamed) and len(final) > len(streamed):
+            yield f"data: {json.dumps({'token': final[len(streamed):]})}\n\n"
+        elif final and not streamed:
+            yield f"data: {json.dumps({'token': final})}\n\n"
+    finally:
+        message_completions.discard(assistant_msg_id)
+        try:
+            await pubsub.aclose()
+        except Exception:
+            pass
+
+    yield "data: [DONE]\n\n"
+
+
+async def _process_ingest_chunk(prompt: str, lane: dict) -> str:
+    """Ingest queue handler: run one chunk through this worker's Grace session.
+
+    Each worker keeps a dedicated session in *lane* so independent jobs run
+    in parallel, and a job's chunks share one conversation.
+    """
+    async with AsyncSessionLocal() as db:
+        model = await _resolve_grace_model(db)
+        session_id = lane.get("session_id")
+        if session_id:
+            result = await db.execute(
+                select(ChatSession.status).where(ChatSession.id == session_id)
+            )
+            if result.scalar_one_or_none() not in ("running", "ready", "starting"):
+                session_id = None
+        if not session_id:
+            session_id = await _create_grace_session(
+                db, model, suffix=f"{_LANE_SUFFIX}{uuid.uuid4().hex[:6]}"
+            )
+            lane["session_id"] = session_id
+        await db.commit()
+
+        await _wait_for_grace_session(session_id)
+        assistant_msg_id = await _dispatch_to_grace(
+            session_id, prompt, db, model, id_prefix="msg_ingest"
         )
-    )
-    await db.commit()
 
-    # Publish to Grace's command channel
-    command_channel = f"djinnbot:chat:sessions:{session_id}:commands"
-    await dependencies.redis_client.publish(
-        command_channel,
-        json.dumps(
-            {
-                "type": "message",
-                "content": message,
-                "model": model,
-                "message_id": assistant_msg_id,
-                "timestamp": now,
-            }
-        ),
+    reply = await message_completions.wait(
+        assistant_msg_id, INGEST_CHUNK_TIMEOUT_SECONDS
     )
-
-    # Yield SSE events by polling for content changes
-    previous_content = ""
-    for _ in range(GRACE_RESPONSE_TIMEOUT_SECONDS * 2):
-        await asyncio.sleep(0.3)
-        db.expire_all()
-        result = await db.execute(
-            select(ChatMessage).where(ChatMessage.id == assistant_msg_id)
+    if not reply:
+        raise TimeoutError(
+            f"Grace did not answer within {INGEST_CHUNK_TIMEOUT_SECONDS}s "
+            f"(message {assistant_msg_id})"
         )
-        msg = result.scalar_one_or_none()
-        if not msg:
-            continue
-
-        current_content = msg.content or ""
-        if len(current_content) > len(previous_content):
-            delta = current_content[len(previous_content) :]
-            previous_content = current_content
-            yield f"data: {json.dumps({'token': delta})}\n\n"
-
-        if msg.completed_at:
-            # Yield any final content
-            if len(current_content) > len(previous_content):
-                delta = current_content[len(previous_content) :]
-                yield f"data: {json.dumps({'token': delta})}\n\n"
-            break
+    return reply
 
-    yield "data: [DONE]\n\n"
+
+ingest_queue.set_handler(_process_ingest_chunk)
 
 
 # ============================================================================
@@ -394,8 +493,8 @@ async def _send_to_grace_streaming(
 # ============================================================================
 
 
-def _format_meeting_prompt(req: IngestMeetingRequest) -> str:
-    """Build the structured prompt Grace receives for a meeting."""
+def _meeting_header(req: IngestMeetingRequest) -> list[str]:
+    """Instructions and metadata that open every meeting prompt."""
     parts = [
         "Process this meeting transcript. Extract ALL people, decisions, "
         "commitments, action items, relationships, and facts. Store each as a "
@@ -429,6 +528,13 @@ def _format_meeting_prompt(req: IngestMeetingRequest) -> str:
     if req.tags:
         parts.append(f"**Tags:** {', '.join(req.tags)}")
 
+    return parts
+
+
+def _format_meeting_prompt(req: IngestMeetingRequest) -> str:
+    """Build the structured prompt Grace receives for a meeting."""
+    parts = _meeting_header(req)
+
     # Transcript body
     if req.themTranscript and req.meTranscript:
         parts.append("\n--- THEM TRANSCRIPT ---")
@@ -446,6 +552,40 @@ def _format_meeting_prompt(req: IngestMeetingRequest) -> str:
     return "\n\n".join(parts)
 
 
+def _meeting_prompts(req: IngestMeetingRequest) -> list[str]:
+    """Prompts for a meeting ingest job, one per transcript chunk.
+
+    Short meetings get the single prompt from _format_meeting_prompt.  Long
+    ones are split into overlapping parts of the combined transcript; every
+    part repeats the metadata so Grace can attribute what it reads, and the
+    meeting notes go with the last part.
+    """
+    if req.themTranscript and req.meTranscript:
+        body_len = len(req.themTranscript) + len(req.meTranscript)
+    else:
+        body_len = len(req.transcript)
+    chunks = split_transcript(req.transcript) if body_len > INGEST_CHUNK_CHARS else []
+    if len(chunks) <= 1:
+        return [_format_meeting_prompt(req)]
+
+    total = len(chunks)
+    prompts = []
+    for i, chunk in enumerate(chunks, start=1):
+        parts = _meeting_header(req)
+        parts.append(
+            f"**This is part {i} of {total} of a long transcript.** Consecutive "
+            "parts overlap slightly; do not store a fact twice if it already "
+            "appeared in an earlier part."
+        )
+        parts.append(f"\n--- TRANSCRIPT (PART {i}/{total}) ---")
+        parts.append(chunk)
+        if i == total and req.notes:
+            parts.append("\n--- MEETING NOTES ---")
+            parts.append(req.notes)
+        prompts.append("\n\n".join(parts))
+    return prompts
+
+
 def _format_note_prompt(req: IngestNoteRequest) -> str:
     """Build the structured prompt Grace receives for a standalone note."""
     parts = [
@@ -527,11 +667,12 @@ def _format_briefing_prompt(req: BriefingRequest) -> str:
 async def ingest_meeting(
     request: IngestMeetingRequest,
     db: AsyncSession = Depends(get_async_session),
+    user: AuthUser = Depends(get_current_user),
 ):
-    """Ingest a meeting transcript from Dialog.
+    """Queue a meeting transcript from Dialog for Grace.
 
-    Starts (or reuses) a Grace chat session and sends the meeting data
-    for memory extraction. Returns Grace's processing summary.
+    Returns 202 with the ingest job; long transcripts are processed in
+    several chunks.  Poll GET /jobs/{jobId} for progress and Grace's summary.
     """
     logger.info(
         f"ingest_meeting: title={request.title!r} "
@@ -542,45 +683,43 @@ async def ingest_meeting(
     if not request.transcript.strip():
         raise HTTPException(status_code=400, detail="Transcript is required")
 
-    session_id, model = await _get_or_create_grace_session(db)
-    prompt = _format_meeting_prompt(request)
-    result = await _send_to_grace(session_id, prompt, db, model=model)
-
-    status_code = 200 if result["status"] == "processed" else 202
-    return JSONResponse(content=result, status_code=status_code)
+    job = await enqueue_ingest_job(
+        db, user.id, "meeting", _meeting_prompts(request), title=request.title
+    )
+    return JSONResponse(content=job, status_code=202)
 
 
 @router.post("/note")
 async def ingest_note(
     request: IngestNoteRequest,
     db: AsyncSession = Depends(get_async_session),
+    user: AuthUser = Depends(get_current_user),
 ):
-    """Ingest a standalone note from Dialog.
+    """Queue a standalone note from Dialog for Grace.
 
-    Routes to Grace for memory extraction of any actionable content.
+    Grace extracts any actionable content.  Returns 202 with the ingest job.
     """
     logger.info(f"ingest_note: title={request.title!r} notes_len={len(request.notes)}")
 
     if not request.notes.strip():
         raise HTTPException(status_code=400, detail="Notes content is required")
 
-    session_id, model = await _get_or_create_grace_session(db)
-    prompt = _format_note_prompt(request)
-    result = await _send_to_grace(session_id, prompt, db, model=model)
-
-    status_code = 200 if result["status"] == "processed" else 202
-    return JSONResponse(content=result, status_code=status_code)
+    job = await enqueue_ingest_job(
+        db, user.id, "note", [_format_note_prompt(request)], title=request.title
+    )
+    return JSONResponse(content=job, status_code=202)
 
 
 @router.post("/dictation")
 async def ingest_dictation(
     request: IngestDictationRequest,
     db: AsyncSession = Depends(get_async_session),
+    user: AuthUser = Depends(get_current_user),
 ):
-    """Ingest a substantial dictation from Dialog.
+    """Queue a substantial dictation from Dialog for Grace.
 
     Only called for dictations exceeding a character threshold (client-side).
-    Routes to Grace for context extraction.
+    Returns 202 with the ingest job.
     """
     logger.info(
         f"ingest_dictation: text_len={len(request.text)} "
@@ -590,12 +729,23 @@ async def ingest_dictation(
     if not request.text.strip():
         raise HTTPException(status_code=400, detail="Dictation text is required")
 
-    session_id, model = await _get_or_create_grace_session(db)
-    prompt = _format_dictation_prompt(request)
-    result = await _send_to_grace(session_id, prompt, db, model=model)
+    job = await enqueue_ingest_job(
+        db, user.id, "dictation", [_format_dictation_prompt(request)]
+    )
+    return JSONResponse(content=job, status_code=202)
 
-    status_code = 200 if result["status"] == "processed" else 202
-    return JSONResponse(content=result, status_code=status_code)
+
+@router.get("/jobs/{job_id}")
+async def get_ingest_job(
+    job_id: str,
+    db: AsyncSession = Depends(get_async_session),
+    user: AuthUser = Depends(get_current_user),
+):
+    """Status, progress and (once completed) Grace's reply for an ingest job."""
+    job = await db.get(IngestJob, job_id)
+    if not job or (job.user_id != user.id and not user.is_admin):
+        raise HTTPException(status_code=404, detail="Ingest job not found")
+    return job_to_dict(job)
 
 
 @router.post("/briefing")
@@ -655,7 +805,9 @@ async def chat_proxy(
 
     if request.stream:
         return StreamingResponse(
-            _send_to_grace_streaming(session_id, request.message, db, model=model),
+            await _send_to_grace_streaming(
+                session_id, request.message, db, model=model
+            ),
             media_type="text/event-stream",
             headers={
                 "Cache-Control": "no-cache",
@@ -289,7 +289,7 @@ async def get_agent_activity_stats(
         - errorCount: failed sessions last 24h
     """
     from app.models.session import Session as SessionModel
-    from app.models.llm_call_log import LlmCallLog
+    from app.services.llm_usage_rollups import usage_totals
 
     now = int(time.time() * 1000)
     day_ago = now - 86_400_000
@@ -327,19 +327,9 @@ async def get_agent_activity_stats(
     total_tokens = 0
     total_cost = 0.0
     try:
-        token_result = await session.execute(
-            select(
-                func.coalesce(func.sum(LlmCallLog.total_tokens), 0),
-                func.coalesce(func.sum(LlmCallLog.cost_total), 0.0),
-            ).where(
-                LlmCallLog.agent_id == agent_id,
-                LlmCallLog.created_at >= day_ago,
-            )
-        )
-        row = token_result.one_or_none()
-        if row:
-            total_tokens = int(row[0])
-            total_cost = float(row[1])
+        totals = await usage_totals(session, since=day_ago, agent_id=agent_id)
+        total_tokens = int(totals["total_tokens"])
+        total_cost = float(totals["cost_total"])
     except Exception:
         # LlmCall table may not exist yet
         pass
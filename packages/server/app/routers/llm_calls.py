@@ -1,16 +1,23 @@
 """LLM call log endpoints — record and query per-API-call usage data."""
 
-import json
 from typing import Optional, List
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from pydantic import BaseModel
-from sqlalchemy import select, func, desc
+from pydantic import BaseModel, Field
+from sqlalchemy import select, desc
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_async_session
 from app.auth.dependencies import get_current_admin, get_service_or_user, AuthUser
 from app.models.llm_call_log import LlmCallLog
+from app.services.llm_call_buffer import llm_call_buffer
+from app.services.llm_usage_rollups import (
+    DAY_MS,
+    HOUR_MS,
+    raw_usage_totals,
+    usage_timeseries,
+    usage_totals,
+)
 from app.logging_config import get_logger
 from app.utils import gen_id, now_ms
 
@@ -25,15 +32,17 @@ router = APIRouter()
 class RecordLlmCallRequest(BaseModel):
     """Payload sent by agent runtime after each LLM API call."""
 
-    session_id: Optional[str] = None
-    run_id: Optional[str] = None
-    agent_id: str
-    request_id: Optional[str] = None
-    user_id: Optional[str] = None
-    provider: str
-    model: str
-    key_source: Optional[str] = None
-    key_masked: Optional[str] = None
+    # Lengths match the llm_call_logs columns: a row the database would
+    # reject is refused here instead of failing its whole flush batch
+    session_id: Optional[str] = Field(None, max_length=256)
+    run_id: Optional[str] = Field(None, max_length=256)
+    agent_id: str = Field(..., max_length=128)
+    request_id: Optional[str] = Field(None, max_length=256)
+    user_id: Optional[str] = Field(None, max_length=64)
+    provider: str = Field(..., max_length=64)
+    model: str = Field(..., max_length=128)
+    key_source: Optional[str] = Field(None, max_length=32)
+    key_masked: Optional[str] = Field(None, max_length=64)
     input_tokens: int = 0
     output_tokens: int = 0
     cache_read_tokens: int = 0
@@ -46,7 +55,7 @@ class RecordLlmCallRequest(BaseModel):
     duration_ms: Optional[int] = None
     tool_call_count: int = 0
     has_thinking: bool = False
-    stop_reason: Optional[str] = None
+    stop_reason: Optional[str] = Field(None, max_length=32)
     # Context window usage snapshot (tokens used / limit / %)
     context_used_tokens: Optional[int] = None
     context_window_tokens: Optional[int] = None
@@ -93,86 +102,43 @@ class LlmCallListResponse(BaseModel):
 # ── Internal endpoint (called by agent runtime) ─────────────────────────────
 
 
+# Upper bound on calls accepted in one batch request
+MAX_BATCH_CALLS = 1000
+
+
+def _call_row(body: RecordLlmCallRequest, created_at: int) -> dict:
+    """Column values for one llm_call_logs row."""
+    return {
+        "id": gen_id("llmcall"),
+        **body.model_dump(),
+        "created_at": created_at,
+    }
+
+
 @router.post("/internal/llm-calls")
-async def record_llm_call(
-    body: RecordLlmCallRequest,
-    db: AsyncSession = Depends(get_async_session),
-):
-    """Record an LLM API call.  Called by agent containers after each turn."""
-    call = LlmCallLog(
-        id=gen_id("llmcall"),
-        session_id=body.session_id,
-        run_id=body.run_id,
-        agent_id=body.agent_id,
-        request_id=body.request_id,
-        user_id=body.user_id,
-        provider=body.provider,
-        model=body.model,
-        key_source=body.key_source,
-        key_masked=body.key_masked,
-        input_tokens=body.input_tokens,
-        output_tokens=body.output_tokens,
-        cache_read_tokens=body.cache_read_tokens,
-        cache_write_tokens=body.cache_write_tokens,
-        total_tokens=body.total_tokens,
-        cost_input=body.cost_input,
-        cost_output=body.cost_output,
-        cost_total=body.cost_total,
-        cost_approximate=body.cost_approximate,
-        duration_ms=body.duration_ms,
-        tool_call_count=body.tool_call_count,
-        has_thinking=body.has_thinking,
-        stop_reason=body.stop_reason,
-        context_used_tokens=body.context_used_tokens,
-        context_window_tokens=body.context_window_tokens,
-        context_percent=body.context_percent,
-        created_at=now_ms(),
-    )
-    db.add(call)
-    await db.commit()
-
-    # Publish to Redis for real-time SSE streaming
-    from app import dependencies
-
-    if dependencies.redis_client:
-        try:
-            payload = json.dumps(
-                {
-                    "type": "llm_call",
-                    "id": call.id,
-                    "session_id": call.session_id,
-                    "run_id": call.run_id,
-                    "agent_id": call.agent_id,
-                    "request_id": call.request_id,
-                    "user_id": call.user_id,
-                    "provider": call.provider,
-                    "model": call.model,
-                    "key_source": call.key_source,
-                    "key_masked": call.key_masked,
-                    "input_tokens": call.input_tokens,
-                    "output_tokens": call.output_tokens,
-                    "cache_read_tokens": call.cache_read_tokens,
-                    "cache_write_tokens": call.cache_write_tokens,
-                    "total_tokens": call.total_tokens,
-                    "cost_input": call.cost_input,
-                    "cost_output": call.cost_output,
-                    "cost_total": call.cost_total,
-                    "cost_approximate": call.cost_approximate,
-                    "duration_ms": call.duration_ms,
-                    "tool_call_count": call.tool_call_count,
-                    "has_thinking": call.has_thinking,
-                    "stop_reason": call.stop_reason,
-                    "context_used_tokens": call.context_used_tokens,
-                    "context_window_tokens": call.context_window_tokens,
-                    "context_percent": call.context_percent,
-                    "created_at": call.created_at,
-                }
-            )
-            await dependencies.redis_client.publish("djinnbot:llm-calls:live", payload)
-        except Exception as e:
-            logger.warning(f"Failed to publish LLM call event: {e}")
-
-    return {"ok": True, "id": call.id}
+async def record_llm_call(body: RecordLlmCallRequest):
+    """Record an LLM API call.  Called by agent containers after each turn.
+
+    The row is queued in the write-behind buffer and written (and
+    published to ``djinnbot:llm-calls:live``) with the next batch.
+    """
+    row = _call_row(body, now_ms())
+    await llm_call_buffer.add([row])
+    return {"ok": True, "id": row["id"]}
+
+
+@router.post("/internal/llm-calls/batch")
+async def record_llm_calls_batch(calls: List[RecordLlmCallRequest]):
+    """Record several LLM API calls in one request."""
+    if len(calls) > MAX_BATCH_CALLS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many calls in one batch (max {MAX_BATCH_CALLS})",
+        )
+    now = now_ms()
+    rows = [_call_row(body, now) for body in calls]
+    await llm_call_buffer.add(rows)
+    return {"ok": True, "ids": [row["id"] for row in rows]}
 
 
 # ── Public endpoints ─────────────────────────────────────────────────────────
@@ -210,54 +176,46 @@ def _row_to_response(row: LlmCallLog) -> LlmCallResponse:
     )
 
 
-async def _build_summary(db: AsyncSession, query) -> dict:
+async def _build_summary(
+    db: AsyncSession, conditions: list, rollup_filters: Optional[dict] = None
+) -> dict:
     """Compute aggregated token/cost totals for a set of LLM calls.
 
-    ``query`` is a SELECT against LlmCallLog with WHERE filters already applied.
-    We extract the WHERE clause and apply it to a fresh aggregation query to
-    avoid the cartesian-product issue that arises from select_from(subquery).
+    When every filter is a rollup dimension, pass them as ``rollup_filters``
+    and the totals are read from llm_usage_rollups.  Otherwise (session or
+    run filters) the totals are aggregated from the raw rows matching
+    ``conditions``.
     """
-    sub = query.subquery()
-    summary_query = select(
-        func.count(sub.c.id).label("call_count"),
-        func.sum(sub.c.input_tokens).label("total_input_tokens"),
-        func.sum(sub.c.output_tokens).label("total_output_tokens"),
-        func.sum(sub.c.cache_read_tokens).label("total_cache_read_tokens"),
-        func.sum(sub.c.cache_write_tokens).label("total_cache_write_tokens"),
-        func.sum(sub.c.total_tokens).label("total_tokens"),
-        func.sum(sub.c.cost_total).label("total_cost"),
-        func.sum(sub.c.cost_input).label("total_cost_input"),
-        func.sum(sub.c.cost_output).label("total_cost_output"),
-        func.avg(sub.c.duration_ms).label("avg_duration_ms"),
-    )
-    result = await db.execute(summary_query)
-    row = result.one()
+    if rollup_filters is not None:
+        totals = await usage_totals(db, **rollup_filters)
+    else:
+        totals = await raw_usage_totals(db, conditions)
 
     # Get the latest context snapshot from the most recent call in this set
     latest_ctx_query = (
         select(
-            sub.c.context_used_tokens,
-            sub.c.context_window_tokens,
-            sub.c.context_percent,
+            LlmCallLog.context_used_tokens,
+            LlmCallLog.context_window_tokens,
+            LlmCallLog.context_percent,
         )
-        .where(sub.c.context_used_tokens.isnot(None))
-        .order_by(sub.c.created_at.desc())
+        .where(*conditions, LlmCallLog.context_used_tokens.isnot(None))
+        .order_by(LlmCallLog.created_at.desc())
         .limit(1)
     )
     latest_ctx = await db.execute(latest_ctx_query)
     ctx_row = latest_ctx.first()
 
     return {
-        "callCount": row.call_count or 0,
-        "totalInputTokens": row.total_input_tokens or 0,
-        "totalOutputTokens": row.total_output_tokens or 0,
-        "totalCacheReadTokens": row.total_cache_read_tokens or 0,
-        "totalCacheWriteTokens": row.total_cache_write_tokens or 0,
-        "totalTokens": row.total_tokens or 0,
-        "totalCost": round(row.total_cost or 0, 6),
-        "totalCostInput": round(row.total_cost_input or 0, 6),
-        "totalCostOutput": round(row.total_cost_output or 0, 6),
-        "avgDurationMs": round(row.avg_duration_ms or 0),
+        "callCount": totals["call_count"],
+        "totalInputTokens": totals["input_tokens"],
+        "totalOutputTokens": totals["output_tokens"],
+        "totalCacheReadTokens": totals["cache_read_tokens"],
+        "totalCacheWriteTokens": totals["cache_write_tokens"],
+        "totalTokens": totals["total_tokens"],
+        "totalCost": round(totals["cost_total"], 6),
+        "totalCostInput": round(totals["cost_input"], 6),
+        "totalCostOutput": round(totals["cost_output"], 6),
+        "avgDurationMs": round(totals["avg_duration_ms"]),
         # Latest context window snapshot (from most recent call)
         "contextUsedTokens": ctx_row.context_used_tokens if ctx_row else None,
         "contextWindowTokens": ctx_row.context_window_tokens if ctx_row else None,
@@ -265,46 +223,69 @@ async def _build_summary(db: AsyncSession, query) -> dict:
     }
 
 
-@router.get("/llm-calls", response_model=LlmCallListResponse)
-async def list_llm_calls(
-    session_id: Optional[str] = Query(None),
-    run_id: Optional[str] = Query(None),
-    agent_id: Optional[str] = Query(None),
-    limit: int = Query(50, ge=1, le=200),
-    offset: int = Query(0, ge=0),
-    db: AsyncSession = Depends(get_async_session),
+async def _list_calls(
+    db: AsyncSession,
+    limit: int,
+    offset: int,
+    session_id: Optional[str] = None,
+    run_id: Optional[str] = None,
+    **rollup_filters: Optional[str],
 ) -> LlmCallListResponse:
-    """List LLM calls, filterable by session, run, or agent."""
-    query = select(LlmCallLog)
+    """Page of calls plus summary.
 
+    ``total`` is the summary's call count, which comes from the rollups and
+    still counts calls whose raw rows retention has dropped, so ``hasMore``
+    is decided by the raw query itself (one extra row is fetched).
+    """
+    conditions = []
     if session_id:
-        query = query.where(LlmCallLog.session_id == session_id)
+        conditions.append(LlmCallLog.session_id == session_id)
     if run_id:
-        query = query.where(LlmCallLog.run_id == run_id)
-    if agent_id:
-        query = query.where(LlmCallLog.agent_id == agent_id)
-
-    # Total count
-    count_q = select(func.count()).select_from(query.subquery())
-    total = (await db.execute(count_q)).scalar() or 0
-
-    # Summary
-    summary = await _build_summary(db, query)
+        conditions.append(LlmCallLog.run_id == run_id)
+    rollup_filters = {k: v for k, v in rollup_filters.items() if v}
+    for dim, value in rollup_filters.items():
+        conditions.append(getattr(LlmCallLog, dim) == value)
+
+    summary = await _build_summary(
+        db,
+        conditions,
+        rollup_filters=None if (session_id or run_id) else rollup_filters,
+    )
+    total = summary["callCount"]
 
-    # Paginated results
     result = await db.execute(
-        query.order_by(desc(LlmCallLog.created_at)).limit(limit).offset(offset)
+        select(LlmCallLog)
+        .where(*conditions)
+        .order_by(desc(LlmCallLog.created_at))
+        .limit(limit + 1)
+        .offset(offset)
     )
-    calls = [_row_to_response(r) for r in result.scalars().all()]
+    rows = result.scalars().all()
+    calls = [_row_to_response(r) for r in rows[:limit]]
 
     return LlmCallListResponse(
         calls=calls,
         total=total,
-        hasMore=(offset + len(calls)) < total,
+        hasMore=len(rows) > limit,
         summary=summary,
     )
 
 
+@router.get("/llm-calls", response_model=LlmCallListResponse)
+async def list_llm_calls(
+    session_id: Optional[str] = Query(None),
+    run_id: Optional[str] = Query(None),
+    agent_id: Optional[str] = Query(None),
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_async_session),
+) -> LlmCallListResponse:
+    """List LLM calls, filterable by session, run, or agent."""
+    return await _list_calls(
+        db, limit, offset, session_id=session_id, run_id=run_id, agent_id=agent_id
+    )
+
+
 @router.get("/admin/llm-calls", response_model=LlmCallListResponse)
 async def admin_list_llm_calls(
     admin: AuthUser = Depends(get_current_admin),
@@ -318,32 +299,62 @@ async def admin_list_llm_calls(
     db: AsyncSession = Depends(get_async_session),
 ) -> LlmCallListResponse:
     """Admin: list all LLM calls with additional filters."""
-    query = select(LlmCallLog)
-
-    if session_id:
-        query = query.where(LlmCallLog.session_id == session_id)
-    if run_id:
-        query = query.where(LlmCallLog.run_id == run_id)
-    if agent_id:
-        query = query.where(LlmCallLog.agent_id == agent_id)
-    if provider:
-        query = query.where(LlmCallLog.provider == provider)
-    if key_source:
-        query = query.where(LlmCallLog.key_source == key_source)
-
-    count_q = select(func.count()).select_from(query.subquery())
-    total = (await db.execute(count_q)).scalar() or 0
-
-    summary = await _build_summary(db, query)
-
-    result = await db.execute(
-        query.order_by(desc(LlmCallLog.created_at)).limit(limit).offset(offset)
+    return await _list_calls(
+        db,
+        limit,
+        offset,
+        session_id=session_id,
+        run_id=run_id,
+        agent_id=agent_id,
+        provider=provider,
+        key_source=key_source,
     )
-    calls = [_row_to_response(r) for r in result.scalars().all()]
 
-    return LlmCallListResponse(
-        calls=calls,
-        total=total,
-        hasMore=(offset + len(calls)) < total,
-        summary=summary,
+
+@router.get("/admin/llm-calls/usage")
+async def admin_llm_usage(
+    admin: AuthUser = Depends(get_current_admin),
+    since: Optional[int] = Query(None, description="Start (epoch ms, inclusive)"),
+    until: Optional[int] = Query(None, description="End (epoch ms, exclusive)"),
+    interval: str = Query("hour", pattern="^(hour|day)$"),
+    group_by: Optional[str] = Query(
+        None, pattern="^(user|agent|model|provider|key_source)$"
+    ),
+    user_id: Optional[str] = Query(None),
+    agent_id: Optional[str] = Query(None),
+    model: Optional[str] = Query(None),
+    provider: Optional[str] = Query(None),
+    key_source: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_async_session),
+) -> dict:
+    """Admin: usage totals and a time series for charts, from the rollups."""
+    filters = {
+        "user_id": user_id,
+        "agent_id": agent_id,
+        "model": model,
+        "provider": provider,
+        "key_source": key_source,
+    }
+    totals = await usage_totals(db, since=since, until=until, **filters)
+    series = await usage_timeseries(
+        db,
+        interval_ms=DAY_MS if interval == "day" else HOUR_MS,
+        since=since,
+        until=until,
+        group_by=group_by,
+        **filters,
     )
+    return {
+        "summary": {
+            "callCount": totals["call_count"],
+            "totalInputTokens": totals["input_tokens"],
+            "totalOutputTokens": totals["output_tokens"],
+            "totalCacheReadTokens": totals["cache_read_tokens"],
+            "totalCacheWriteTokens": totals["cache_write_tokens"],
+            "totalTokens": totals["total_tokens"],
+            "totalCost": round(totals["cost_total"], 6),
+            "avgDurationMs": round(totals["avg_duration_ms"]),
+        },
+        "interval": interval,
+        "series": series,
+    }
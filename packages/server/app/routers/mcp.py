@@ -50,6 +50,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_async_session
 from app.models.mcp import McpServer, AgentMcpTool
+from app.services.prompt_bundle import agents_granted_mcp_server, bump_prompt_version
 from app.utils import now_ms
 from app import dependencies
 from app.logging_config import get_logger
@@ -83,7 +84,11 @@ async def _publish_mcp_restart() -> None:
 
 
 async def _publish_grants_changed(agent_id: str) -> None:
-    """Notify running containers that MCP tool grants changed for this agent."""
+    """Notify running containers that MCP tool grants changed for this agent.
+
+    Also bumps the agent's prompt bundle version; call after committing.
+    """
+    await bump_prompt_version([agent_id])
     try:
         if dependencies.redis_client:
             await dependencies.redis_client.publish(
@@ -434,6 +439,16 @@ async def get_agent_mcp_manifest(
 ) -> AgentMcpManifestResponse:
     """Return MCP tool manifest for system prompt injection.
 
+    Prefer /v1/agents/{agent_id}/prompt-bundle, which is versioned and cached.
+    """
+    return await build_agent_mcp_manifest(db, agent_id)
+
+
+async def build_agent_mcp_manifest(
+    db: AsyncSession, agent_id: str
+) -> AgentMcpManifestResponse:
+    """Build the MCP tool manifest for an agent.
+
     Only includes enabled servers with running status.
     """
     result = await db.execute(
@@ -514,7 +529,7 @@ async def grant_server_to_agent(
         )
 
     await _upsert_grant(db, agent_id, server_id, "*", req.granted_by)
-    await db.flush()
+    await db.commit()
     await _publish_grants_changed(agent_id)
     return {"granted": server_id, "tool_name": "*", "agent_id": agent_id}
 
@@ -535,7 +550,7 @@ async def grant_tool_to_agent(
         )
 
     await _upsert_grant(db, agent_id, server_id, tool_name, req.granted_by)
-    await db.flush()
+    await db.commit()
     await _publish_grants_changed(agent_id)
     return {"granted": server_id, "tool_name": tool_name, "agent_id": agent_id}
 
@@ -553,6 +568,7 @@ async def revoke_server_from_agent(
             AgentMcpTool.server_id == server_id,
         )
     )
+    await db.commit()
     await _publish_grants_changed(agent_id)
     return {"revoked": server_id, "agent_id": agent_id}
 
@@ -572,6 +588,7 @@ async def revoke_tool_from_agent(
             AgentMcpTool.tool_name == tool_name,
         )
     )
+    await db.commit()
     await _publish_grants_changed(agent_id)
     return {"revoked": tool_name, "server_id": server_id, "agent_id": agent_id}
 
@@ -812,7 +829,9 @@ async def update_mcp_server(
     server.updated_at = now_ms()
     await db.flush()
     await db.refresh(server)
+    await db.commit()
     logger.info(f"MCP server updated: {server_id}")
+    await bump_prompt_version(await agents_granted_mcp_server(db, server_id))
     # Auto-trigger mcpo hot-reload so config changes take effect immediately
     await _publish_mcp_restart()
     return _row_to_response(server)
@@ -829,7 +848,10 @@ async def delete_mcp_server(
         raise HTTPException(
             status_code=404, detail=f"MCP server '{server_id}' not found"
         )
+    affected_agents = await agents_granted_mcp_server(db, server_id)
     await db.delete(server)
+    await db.commit()
+    await bump_prompt_version(affected_agents)
     logger.info(f"MCP server deleted: {server_id}")
     # Auto-trigger mcpo hot-reload so the removed server is dropped immediately
     await _publish_mcp_restart()
@@ -866,10 +888,15 @@ async def patch_mcp_server_status(
             status_code=422,
             detail=f"Invalid status '{req.status}'. Valid: {valid_statuses}",
         )
+    status_changed = server.status != req.status
     server.status = req.status
     server.updated_at = now_ms()
     await db.flush()
     await db.refresh(server)
+    if status_changed:
+        # Only running servers appear in agents' MCP manifests
+        await db.commit()
+        await bump_prompt_version(await agents_granted_mcp_server(db, server_id))
     return _row_to_response(server)
 
 
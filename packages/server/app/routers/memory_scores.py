@@ -29,6 +29,7 @@ from app.models.memory_score import (
     MemoryScore,
 )
 from app.models.settings import GlobalSetting
+from app.services.settings_cache import settings_cache
 from app.logging_config import get_logger
 from app.utils import gen_id, now_ms
 
@@ -52,8 +53,9 @@ DEFAULTS = {
     "blend_base_factor": 0.70,
 }
 
-# In-memory cache so we don't hit the DB on every score computation.
-# Refreshed on GET /config and PUT /config.
+# Fallback used until the settings cache has loaded.  The live config is
+# read from settings_cache (global_settings key memory_scoring_config), so
+# updates made through any API worker take effect everywhere.
 _config_cache: dict = dict(DEFAULTS)
 
 
@@ -264,8 +266,9 @@ class MemoryGapsListResponse(BaseModel):
 
 
 def _cfg(key: str):
-    """Read a config value from the in-memory cache."""
-    return _config_cache.get(key, DEFAULTS[key])
+    """Read a config value from the in-memory settings cache."""
+    config = settings_cache.peek_json(_SETTINGS_KEY) or _config_cache
+    return config.get(key, DEFAULTS[key])
 
 
 def _days_to_ms(days) -> float:
@@ -641,10 +644,9 @@ _SETTINGS_KEY = "memory_scoring_config"
 
 async def _load_config_from_db(db: AsyncSession) -> MemoryScoringConfig:
     """Load scoring config from global_settings, falling back to defaults."""
-    row = await db.get(GlobalSetting, _SETTINGS_KEY)
-    if row:
+    data = await settings_cache.get_json(_SETTINGS_KEY)
+    if data:
         try:
-            data = json.loads(row.value)
             return MemoryScoringConfig(**data)
         except Exception:
             pass
@@ -685,6 +687,7 @@ async def update_scoring_config(
 
     await db.commit()
     _refresh_cache(body)
+    await settings_cache.invalidate([_SETTINGS_KEY])
 
     return body
 
@@ -707,5 +710,6 @@ async def reset_scoring_config(
 
     await db.commit()
     _refresh_cache(defaults)
+    await settings_cache.invalidate([_SETTINGS_KEY])
 
     return defaults
@@ -10,6 +10,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_async_session
 from app.models import Project, Task, KanbanColumn
 from app.models.project_template import ProjectTemplate
+from app.services.github_event_router import routing_table
+from app.services.run_cache import run_cache
 from app.utils import now_ms, gen_id
 from app.logging_config import get_logger
 
@@ -366,6 +368,8 @@ async def update_project(
     project.updated_at = now
 
     await session.commit()
+    if req.repository is not None:
+        await routing_table.invalidate()
 
     await _publish_event("PROJECT_UPDATED", {"projectId": project_id})
     return {"status": "updated"}
@@ -380,6 +384,7 @@ async def delete_project(
     project = await get_project_or_404(session, project_id)
     await session.delete(project)
     await session.commit()
+    await routing_table.invalidate()
 
     await _publish_event("PROJECT_DELETED", {"projectId": project_id})
     return {"status": "deleted", "project_id": project_id}
@@ -500,6 +505,7 @@ async def set_project_key_user(
     project.key_user_id = req.key_user_id or None
     project.updated_at = now_ms()
     await session.commit()
+    run_cache.invalidate_project(project_id)
     return {"status": "updated", "key_user_id": project.key_user_id}
 
 
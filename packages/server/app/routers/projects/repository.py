@@ -22,6 +22,7 @@ from app.git_utils import (
 )
 from app.logging_config import get_logger
 from app.github_helper import GitHubHelper
+from app.services.github_event_router import routing_table
 
 from ._common import (
     get_project_or_404,
@@ -109,6 +110,7 @@ async def set_project_repository(
             session.add(gh_record)
 
     await session.commit()
+    await routing_table.invalidate()
 
     await _publish_event(
         "PROJECT_REPOSITORY_UPDATED",
@@ -172,6 +174,7 @@ async def remove_project_repository(
     project.repository = None
     project.updated_at = now
     await session.commit()
+    await routing_table.invalidate()
 
     await _publish_event("PROJECT_REPOSITORY_REMOVED", {"projectId": project_id})
 
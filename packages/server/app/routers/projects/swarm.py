@@ -28,6 +28,7 @@ from app.models import Project, Task, DependencyEdge
 from app import dependencies
 from app.utils import now_ms
 from app.logging_config import get_logger
+from app.services import swarm_registry
 from ._common import (
     get_project_or_404,
     _publish_event,
@@ -341,6 +342,7 @@ async def board_swarm_execute(
 
     # Track swarm association with project (for listing)
     try:
+        await swarm_registry.register_swarm(swarm_id)
         await dependencies.redis_client.sadd(
             f"djinnbot:project:{project_id}:swarms", swarm_id
         )
@@ -455,19 +457,9 @@ async def list_project_swarms(
             f"djinnbot:project:{project_id}:swarms"
         )
 
-        swarms = []
-        for swarm_id in swarm_ids:
-            raw = await dependencies.redis_client.get(
-                f"djinnbot:swarm:{swarm_id}:state"
-            )
-            if raw:
-                try:
-                    state = json.loads(
-                        raw if isinstance(raw, str) else raw.decode("utf-8")
-                    )
-                    swarms.append(state)
-                except (json.JSONDecodeError, AttributeError):
-                    pass
+        swarms = list(
+            (await swarm_registry.load_swarm_states(list(swarm_ids))).values()
+        )
 
         # Sort by created_at descending
         swarms.sort(key=lambda s: s.get("created_at", 0), reverse=True)
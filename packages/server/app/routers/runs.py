@@ -1,14 +1,16 @@
 """Run management endpoints."""
 
+import asyncio
+import base64
 import json
 from typing import Any
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
 
 from app.logging_config import get_logger
 
 logger = get_logger(__name__)
 from pydantic import BaseModel
-from sqlalchemy import select, update, delete, func
+from sqlalchemy import select, update, delete, func, or_, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -17,6 +19,8 @@ from app.models.run import Run, Step, LoopState, Output
 from app.models.project import Project, Task
 from app import dependencies
 from app.utils import validate_pipeline_exists, now_ms, gen_id
+from app.services.event_archive import event_archive, read_run_events
+from app.services.run_cache import run_cache
 
 router = APIRouter()
 
@@ -184,129 +188,262 @@ async def start_run(
     }
 
 
+# Columns returned by list_runs.  outputs is opt-in (include_outputs=true)
+# since it is by far the largest field and the list views don't show it.
+_RUN_LIST_COLUMNS = (
+    Run.id,
+    Run.pipeline_id,
+    Run.project_id,
+    Run.task_description,
+    Run.status,
+    Run.current_step_id,
+    Run.created_at,
+    Run.updated_at,
+    Run.completed_at,
+    Run.human_context,
+    Run.key_resolution,
+    Run.initiated_by_user_id,
+)
+
+RUN_LIST_DEFAULT_LIMIT = 50
+RUN_LIST_MAX_LIMIT = 500
+
+
+def _encode_run_cursor(created_at: int, run_id: str) -> str:
+    raw = f"{created_at}:{run_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_run_cursor(cursor: str) -> tuple[int, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, run_id = (
+            base64.urlsafe_b64decode(padded).decode("utf-8").split(":", 1)
+        )
+        return int(created_at), run_id
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
 @router.get("/")
 async def list_runs(
     pipeline_id: str | None = None,
     status: str | None = None,
+    project_id: str | None = None,
+    limit: int = Query(RUN_LIST_DEFAULT_LIMIT, ge=1, le=RUN_LIST_MAX_LIMIT),
+    cursor: str | None = None,
+    include_outputs: bool = False,
     session: AsyncSession = Depends(get_async_session),
 ):
-    """List pipeline runs with optional filters."""
-    logger.debug(f"list_runs: pipeline_id={pipeline_id}, status={status}")
+    """List pipeline runs, newest first, one page at a time.
 
-    query = select(Run)
+    Pages are keyset-paginated on (created_at, id): pass the returned
+    ``next_cursor`` back as ``cursor`` to fetch the next page.  ``counts``
+    holds per-status totals for the pipeline/project filters (ignoring
+    ``status`` so the dashboard can render all its tabs from one response);
+    ``total`` counts the runs matching every filter, ``status`` included.
+    """
+    logger.debug(
+        f"list_runs: pipeline_id={pipeline_id}, status={status}, "
+        f"project_id={project_id}, limit={limit}, cursor={cursor}"
+    )
+
+    columns = _RUN_LIST_COLUMNS + ((Run.outputs,) if include_outputs else ())
+    query = select(*columns)
 
     if pipeline_id:
         query = query.where(Run.pipeline_id == pipeline_id)
     if status:
         query = query.where(Run.status == status)
+    if project_id:
+        query = query.where(Run.project_id == project_id)
+    if cursor:
+        cursor_created_at, cursor_id = _decode_run_cursor(cursor)
+        query = query.where(
+            or_(
+                Run.created_at < cursor_created_at,
+                and_(Run.created_at == cursor_created_at, Run.id < cursor_id),
+            )
+        )
 
-    query = query.order_by(Run.created_at.desc())
+    # Fetch one extra row to learn whether another page exists
+    query = query.order_by(Run.created_at.desc(), Run.id.desc()).limit(limit + 1)
 
     result = await session.execute(query)
-    runs = result.scalars().all()
+    rows = result.all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
 
-    logger.debug(f"list_runs: found {len(runs)} runs")
+    counts_query = select(Run.status, func.count()).group_by(Run.status)
+    if pipeline_id:
+        counts_query = counts_query.where(Run.pipeline_id == pipeline_id)
+    if project_id:
+        counts_query = counts_query.where(Run.project_id == project_id)
+    counts = {row[0]: row[1] for row in (await session.execute(counts_query)).all()}
 
-    return [
-        {
+    logger.debug(f"list_runs: returning {len(rows)} runs (has_more={has_more})")
+
+    runs = []
+    for r in rows:
+        item = {
             "id": r.id,
             "pipeline_id": r.pipeline_id,
             "project_id": r.project_id,
             "task": r.task_description,
             "status": r.status,
             "current_step": r.current_step_id,
-            "outputs": json.loads(r.outputs) if r.outputs else {},
             "created_at": r.created_at,
             "updated_at": r.updated_at,
             "completed_at": r.completed_at,
             "human_context": r.human_context,
             "key_resolution": json.loads(r.key_resolution)
-            if getattr(r, "key_resolution", None)
+            if r.key_resolution
             else None,
-            "initiated_by_user_id": getattr(r, "initiated_by_user_id", None),
+            "initiated_by_user_id": r.initiated_by_user_id,
         }
-        for r in runs
-    ]
+        if include_outputs:
+            item["outputs"] = json.loads(r.outputs) if r.outputs else {}
+        runs.append(item)
 
+    return {
+        "runs": runs,
+        "next_cursor": _encode_run_cursor(rows[-1].created_at, rows[-1].id)
+        if has_more
+        else None,
+        "has_more": has_more,
+        "counts": counts,
+        "total": counts.get(status, 0) if status else sum(counts.values()),
+    }
 
-@router.get("/{run_id}")
-async def get_run(run_id: str, session: AsyncSession = Depends(get_async_session)):
-    """Get run details including step progress."""
-    import os
-    from pathlib import Path
 
-    logger.debug(f"get_run: run_id={run_id}")
+# Top-level keys of the get_run response, selectable with ?fields=
+RUN_DETAIL_FIELDS = (
+    "id",
+    "pipeline_id",
+    "project_id",
+    "key_user_id",
+    "initiated_by_user_id",
+    "model_override",
+    "key_resolution",
+    "task",
+    "status",
+    "current_step",
+    "outputs",
+    "created_at",
+    "updated_at",
+    "completed_at",
+    "human_context",
+    "task_branch",
+    "workspace_type",
+    "workspace_exists",
+    "workspace_has_git",
+    "steps",
+)
+
+
+def _parse_run_fields(fields: str | None) -> set[str]:
+    if not fields:
+        return set(RUN_DETAIL_FIELDS)
+    selected = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = selected - set(RUN_DETAIL_FIELDS)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown run fields: {', '.join(sorted(unknown))}",
+        )
+    return selected
 
-    result = await session.execute(
-        select(Run).options(selectinload(Run.steps)).where(Run.id == run_id)
-    )
-    run = result.scalar_one_or_none()
 
-    if not run:
-        raise HTTPException(status_code=404, detail=f"Run {run_id} not found")
+def _run_workspace_path(run: Run):
+    """The run's workspace; for persistent_directory runs, the project directory."""
+    import os
+    from pathlib import Path
 
-    # Check if workspace exists (helps dashboard show status).
-    # For persistent_directory runs, the workspace is the project directory.
     runs_dir = os.getenv("SHARED_RUNS_DIR", "/jfs/runs")
     workspaces_dir = os.getenv("WORKSPACES_DIR", "/jfs/workspaces")
     ws_type = getattr(run, "workspace_type", None)
     if ws_type == "persistent_directory" and run.project_id:
-        workspace_path = Path(workspaces_dir) / run.project_id
-    else:
-        workspace_path = Path(runs_dir) / run_id
-    workspace_exists = workspace_path.exists()
-    workspace_has_git = (
-        (workspace_path / ".git").exists() if workspace_exists else False
-    )
+        return Path(workspaces_dir) / run.project_id
+    return Path(runs_dir) / run.id
 
-    # Sort steps by rowid
-    sorted_steps = sorted(run.steps, key=lambda s: getattr(s, "rowid", 0) or 0)
 
-    # Resolve the effective key_user_id for per-user key resolution in the engine.
-    # Priority: 1) Run-level initiated_by_user_id (who triggered this run)
-    #           2) Project-level key_user_id (configured in project settings)
-    #           3) None (system-level instance keys)
-    key_user_id = getattr(run, "initiated_by_user_id", None)
-    if not key_user_id and run.project_id:
-        from app.models.project import Project
+@router.get("/{run_id}")
+async def get_run(
+    run_id: str,
+    fields: str | None = Query(
+        None,
+        description="Comma-separated response keys to return (default: all). "
+        "Steps, workspace status and key_user_id are only computed when selected.",
+    ),
+    session: AsyncSession = Depends(get_async_session),
+):
+    """Get run details including step progress.
 
-        proj_result = await session.execute(
-            select(Project.key_user_id).where(Project.id == run.project_id)
-        )
-        proj_row = proj_result.scalar_one_or_none()
-        if proj_row:
-            key_user_id = proj_row
+    Pollers that only need a few keys (e.g. ``?fields=status,outputs``)
+    should select them: steps are then not loaded at all.
+    """
+    logger.debug(f"get_run: run_id={run_id}, fields={fields}")
+    selected = _parse_run_fields(fields)
 
-    return {
+    query = select(Run).where(Run.id == run_id)
+    if "steps" in selected:
+        query = query.options(selectinload(Run.steps))
+    result = await session.execute(query)
+    run = result.scalar_one_or_none()
+
+    if not run:
+        raise HTTPException(status_code=404, detail=f"Run {run_id} not found")
+
+    detail: dict[str, Any] = {
         "id": run.id,
         "pipeline_id": run.pipeline_id,
         "project_id": run.project_id,  # CRITICAL: Engine needs this for worktree creation
-        "key_user_id": key_user_id,  # Multi-user: whose API keys to use for this run
         "initiated_by_user_id": getattr(run, "initiated_by_user_id", None),
         "model_override": getattr(run, "model_override", None),
-        "key_resolution": json.loads(run.key_resolution)
-        if getattr(run, "key_resolution", None)
-        else None,
         "task": run.task_description,
         "status": run.status,
         "current_step": run.current_step_id,
-        "outputs": json.loads(run.outputs) if run.outputs else {},
         "created_at": run.created_at,
         "updated_at": run.updated_at,
         "completed_at": run.completed_at,
         "human_context": run.human_context,
         "task_branch": getattr(run, "task_branch", None),
         "workspace_type": getattr(run, "workspace_type", None),
-        "workspace_exists": workspace_exists,
-        "workspace_has_git": workspace_has_git,
-        "steps": [
+    }
+    if "key_resolution" in selected:
+        detail["key_resolution"] = run_cache.decode(
+            run_id, "key_resolution", getattr(run, "key_resolution", None), None
+        )
+    if "outputs" in selected:
+        detail["outputs"] = run_cache.decode(run_id, "outputs", run.outputs, {})
+
+    if "key_user_id" in selected:
+        # Resolve the effective key_user_id for per-user key resolution in the engine.
+        # Priority: 1) Run-level initiated_by_user_id (who triggered this run)
+        #           2) Project-level key_user_id (configured in project settings)
+        #           3) None (system-level instance keys)
+        key_user_id = getattr(run, "initiated_by_user_id", None)
+        if not key_user_id and run.project_id:
+            key_user_id = await run_cache.project_key_user(session, run.project_id)
+        detail["key_user_id"] = key_user_id  # Multi-user: whose API keys to use for this run
+
+    if "workspace_exists" in selected or "workspace_has_git" in selected:
+        # Check if workspace exists (helps dashboard show status).
+        exists, has_git = run_cache.workspace_state(run_id, _run_workspace_path(run))
+        detail["workspace_exists"] = exists
+        detail["workspace_has_git"] = has_git
+
+    if "steps" in selected:
+        # Sort steps by rowid
+        sorted_steps = sorted(run.steps, key=lambda s: getattr(s, "rowid", 0) or 0)
+        detail["steps"] = [
             {
                 "id": s.id,
                 "step_id": s.step_id,
                 "agent_id": s.agent_id,
                 "status": s.status,
-                "outputs": json.loads(s.outputs) if s.outputs else {},
-                "inputs": json.loads(s.inputs) if s.inputs else {},
+                "outputs": run_cache.decode(run_id, f"{s.id}.outputs", s.outputs, {}),
+                "inputs": run_cache.decode(run_id, f"{s.id}.inputs", s.inputs, {}),
                 "error": s.error,
                 "retry_count": s.retry_count,
                 "max_retries": s.max_retries,
@@ -317,8 +454,9 @@ async def get_run(run_id: str, session: AsyncSession = Depends(get_async_session
                 "model_used": getattr(s, "model_used", None),
             }
             for s in sorted_steps
-        ],
-    }
+        ]
+
+    return {key: detail[key] for key in RUN_DETAIL_FIELDS if key in selected}
 
 
 @router.patch("/{run_id}")
@@ -359,6 +497,7 @@ async def update_run(
     run.updated_at = now_ms()
 
     await session.flush()
+    run_cache.invalidate_run(run_id)
 
     # Publish update event to Redis for dashboard SSE
     if dependencies.redis_client:
@@ -514,6 +653,7 @@ async def restart_run(
     run.human_context = req.context if req else None
 
     await session.flush()
+    run_cache.invalidate_run(run_id)
 
     logger.debug(f"restart_run: run_id={run_id}, status {previous_status} -> pending")
 
@@ -543,7 +683,7 @@ async def restart_run(
         except Exception as e:
             logger.warning(f"Failed to publish restart events: {e}")
 
-    return await get_run(run_id, session)
+    return await get_run(run_id, fields=None, session=session)
 
 
 @router.post("/{run_id}/pause")
@@ -766,38 +906,51 @@ async def restart_step(
             logger.warning(f"Failed to publish restart events: {e}")
 
     # Return updated run
-    return await get_run(run_id, session)
+    return await get_run(run_id, fields=None, session=session)
 
 
 @router.get("/{run_id}/logs")
-async def get_run_logs(run_id: str):
-    """Get event log for a run from Redis stream."""
-    logger.debug(f"get_run_logs: run_id={run_id}")
+async def get_run_logs(
+    run_id: str,
+    response: Response,
+    after: str | None = Query(
+        None, description="Stream ID to start after (exclusive) for paging"
+    ),
+    limit: int | None = Query(None, ge=1, le=10000),
+):
+    """Get event log for a run.
+
+    Reads transparently from the on-disk archive (finished runs) and the
+    Redis stream (hot runs).  When ``limit`` cuts the result short, the
+    ``X-Next-After`` response header holds the ``after`` value for the next
+    page.
+    """
+    logger.debug(f"get_run_logs: run_id={run_id}, after={after}, limit={limit}")
 
     if not dependencies.redis_client:
         raise HTTPException(status_code=503, detail="Redis not connected")
 
-    stream_key = f"djinnbot:events:run:{run_id}"
-
     try:
-        # Read all messages from stream
-        messages = await dependencies.redis_client.xrange(stream_key)
+        messages, has_more = await read_run_events(run_id, after=after, limit=limit)
+    except Exception as e:
+        logger.warning(f"get_run_logs: failed to read events for {run_id}: {e}")
+        return []
 
-        logs = []
-        for msg_id, fields in messages:
-            data = fields.get("data", "{}")
-            try:
-                event = json.loads(data)
-                logs.append(event)
-            except json.JSONDecodeError:
-                logs.append({"raw": data})
+    logs = []
+    for msg_id, fields in messages:
+        data = fields.get("data", "{}")
+        try:
+            event = json.loads(data)
+            logs.append(event)
+        except json.JSONDecodeError:
+            logs.append({"raw": data})
 
-        logger.debug(f"get_run_logs: retrieved {len(logs)} events, run_id={run_id}")
+    if has_more and messages:
+        response.headers["X-Next-After"] = messages[-1][0]
 
-        return logs
-    except Exception as e:
-        # Stream might not exist yet
-        return []
+    logger.debug(f"get_run_logs: retrieved {len(logs)} events, run_id={run_id}")
+
+    return logs
 
 
 @router.delete("/{run_id}")
@@ -815,6 +968,10 @@ async def delete_run(run_id: str, session: AsyncSession = Depends(get_async_sess
     # Delete run (cascade deletes steps)
     await session.delete(run)
     await session.flush()
+    run_cache.invalidate_run(run_id)
+
+    # Drop archived events (finished runs' streams live on disk)
+    await asyncio.to_thread(event_archive.delete, run_id)
 
     # Publish to Redis for dashboard updates
     if dependencies.redis_client:
@@ -864,6 +1021,12 @@ async def bulk_delete_runs(
         delete_query = delete(Run).where(Run.id.in_(run_ids))
         result = await session.execute(delete_query)
         rowcount = result.rowcount
+        for run_id in run_ids:
+            run_cache.invalidate_run(run_id)
+
+        await asyncio.to_thread(
+            lambda: [event_archive.delete(run_id) for run_id in run_ids]
+        )
     else:
         rowcount = 0
 
@@ -1253,6 +1416,7 @@ async def update_step(
         step.human_context = req.human_context
 
     await session.flush()
+    run_cache.invalidate_run(run_id)
 
     # Publish step update event
     if dependencies.redis_client:
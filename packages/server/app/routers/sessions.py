@@ -14,6 +14,7 @@ from app.database import get_async_session
 from app.models.session import Session, SessionEvent
 from app import dependencies
 from app.logging_config import get_logger
+from app.services.live_events import publish_live
 from app.utils import gen_id, now_ms
 
 logger = get_logger(__name__)
@@ -483,18 +484,15 @@ async def stop_session(
             logger.debug(f"stop_session: published stop event to {run_stream}")
 
             # Publish status change for live updates
-            live_channel = "djinnbot:sessions:live"
-            await dependencies.redis_client.publish(
-                live_channel,
-                json.dumps(
-                    {
-                        "type": "status_changed",
-                        "sessionId": session_id,
-                        "agentId": session.agent_id,
-                        "status": "failed",
-                        "timestamp": now,
-                    }
-                ),
+            await publish_live(
+                "djinnbot:sessions:live",
+                {
+                    "type": "status_changed",
+                    "sessionId": session_id,
+                    "agentId": session.agent_id,
+                    "status": "failed",
+                    "timestamp": now,
+                },
             )
 
         except Exception as e:
@@ -11,6 +11,7 @@ from sqlalchemy import select
 
 from app.database import get_async_session
 from app.models.settings import ModelProvider, GlobalSetting
+from app.services.settings_cache import settings_cache
 from app.models.base import now_ms
 from app.logging_config import get_logger
 
@@ -720,12 +721,9 @@ def _build_provider_response(
 
 
 @router.get("/")
-async def get_settings(
-    session: AsyncSession = Depends(get_async_session),
-) -> GlobalSettings:
-    """Get global settings from the database."""
-    result = await session.execute(select(GlobalSetting))
-    rows = {r.key: r.value for r in result.scalars().all()}
+async def get_settings() -> GlobalSettings:
+    """Get global settings (served from the process-local settings cache)."""
+    rows = await settings_cache.all()
 
     def _get(key: str, fallback: str | None = None):
         default = DEFAULT_SETTINGS.get(key, fallback or "")
@@ -827,6 +825,7 @@ async def update_settings(
         else:
             session.add(GlobalSetting(key=key, value=value, updated_at=now))
     await session.commit()
+    await settings_cache.invalidate(list(updates))
 
     # Notify the engine when the pulse master switch changes so it takes
     # effect immediately without requiring an engine restart.
@@ -845,17 +844,10 @@ async def update_settings(
 
 
 @router.get("/favorites")
-async def get_favorites(
-    session: AsyncSession = Depends(get_async_session),
-) -> dict:
+async def get_favorites() -> dict:
     """Get favorited models."""
-    row = await session.get(GlobalSetting, "model_favorites")
-    if not row:
-        return {"favorites": []}
-    try:
-        return {"favorites": json.loads(row.value)}
-    except Exception:
-        return {"favorites": []}
+    favorites = await settings_cache.get_json("model_favorites", [])
+    return {"favorites": favorites if isinstance(favorites, list) else []}
 
 
 @router.put("/favorites")
@@ -877,6 +869,7 @@ async def save_favorites(
             )
         )
     await session.commit()
+    await settings_cache.invalidate(["model_favorites"])
     return {"favorites": favorites}
 
 
@@ -16,8 +16,6 @@ Endpoints (all under /v1/signal):
   POST   /v1/signal/{agent_id}/send     — Send message as agent
 """
 
-import json
-import uuid
 import asyncio
 from typing import Optional, List
 
@@ -29,6 +27,7 @@ from sqlalchemy import select
 from app.database import get_async_session
 from app.models.signal import SignalConfig, SignalAllowlistEntry
 from app.models.base import now_ms
+from app.services.bridge_rpc import BridgeRpcError, bridge_rpc
 from app.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -42,46 +41,19 @@ router = APIRouter()
 async def _signal_rpc(method: str, params: dict, timeout: float = 10.0) -> dict:
     """Send an RPC request to the engine's SignalBridge via Redis pub/sub.
 
-    Publishes to 'signal:rpc:request' and waits for a reply on
-    'signal:rpc:reply:{id}'.
+    Publishes to 'signal:rpc:request'; the reply on
+    'signal:rpc:reply:{id}' is delivered by the shared bridge RPC client.
     """
-    import redis.asyncio as aioredis
-    import os
-
-    redis_url = os.environ.get("REDIS_URL", "redis://localhost:6379")
-    req_id = str(uuid.uuid4())
-
-    pub = aioredis.from_url(redis_url)
-    sub = aioredis.from_url(redis_url)
-
     try:
-        # Subscribe to the reply channel BEFORE publishing the request
-        pubsub = sub.pubsub()
-        reply_channel = f"signal:rpc:reply:{req_id}"
-        await pubsub.subscribe(reply_channel)
-
-        # Publish request
-        request = json.dumps({"id": req_id, "method": method, "params": params})
-        await pub.publish("signal:rpc:request", request)
-
-        # Wait for reply
-        start = asyncio.get_event_loop().time()
-        while (asyncio.get_event_loop().time() - start) < timeout:
-            msg = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
-            if msg and msg["type"] == "message":
-                data = json.loads(msg["data"])
-                if data.get("error"):
-                    raise HTTPException(status_code=502, detail=data["error"])
-                return data.get("result", {})
-
+        data = await bridge_rpc.call("signal", method, params, timeout=timeout)
+    except BridgeRpcError:
         raise HTTPException(
             status_code=504,
             detail="Signal engine did not respond in time. Is the engine running?",
         )
-    finally:
-        await pubsub.unsubscribe(reply_channel)
-        await pub.aclose()
-        await sub.aclose()
+    if data.get("error"):
+        raise HTTPException(status_code=502, detail=data["error"])
+    return data.get("result", {})
 
 
 # ─── Schemas ──────────────────────────────────────────────────────────────────
@@ -39,6 +39,7 @@ import httpx
 
 from app.database import get_async_session
 from app.models.skill import Skill, AgentSkill
+from app.services.prompt_bundle import bump_for_skills, bump_prompt_version
 from app.utils import now_ms
 
 router = APIRouter()
@@ -277,6 +278,9 @@ async def sync_skills_from_disk() -> dict:
                 await db.commit()
                 summary["created"].append(slug)
 
+        if summary["updated"]:
+            await bump_for_skills(db, summary["updated"])
+
     return summary
 
 
@@ -361,6 +365,8 @@ async def update_skill(
 
     await db.flush()
     await db.refresh(skill)
+    await db.commit()
+    await bump_for_skills(db, [skill.id])
     return _row_to_response(skill)
 
 
@@ -373,7 +379,13 @@ async def delete_skill(
     skill = await db.get(Skill, _slug(skill_id))
     if not skill:
         raise HTTPException(status_code=404, detail=f"Skill '{skill_id}' not found")
+    result = await db.execute(
+        select(AgentSkill.agent_id).where(AgentSkill.skill_id == skill.id).distinct()
+    )
+    affected_agents = result.scalars().all()
     await db.delete(skill)
+    await db.commit()
+    await bump_prompt_version(affected_agents)
     return {"deleted": skill_id}
 
 
@@ -423,8 +435,16 @@ async def get_agent_manifest(
     agent_id: str,
     db: AsyncSession = Depends(get_async_session),
 ) -> ManifestResponse:
+    """Return the compact skills manifest for an agent's system prompt.
+
+    Prefer /v1/agents/{agent_id}/prompt-bundle, which is versioned and cached.
+    """
+    return await build_agent_manifest(db, agent_id)
+
+
+async def build_agent_manifest(db: AsyncSession, agent_id: str) -> ManifestResponse:
     """
-    Return the compact skills manifest for an agent's system prompt.
+    Build the compact skills manifest for an agent's system prompt.
 
     Only includes skills that are:
       - granted to this agent (granted=True in agent_skills)
@@ -510,6 +530,8 @@ async def grant_skill_to_agent(
         db.add(existing_grant)
 
     await db.flush()
+    await db.commit()
+    await bump_prompt_version([agent_id])
     return SkillGrantResponse(
         id=skill.id,
         description=skill.description,
@@ -536,6 +558,8 @@ async def revoke_skill_from_agent(
             AgentSkill.skill_id == sid,
         )
     )
+    await db.commit()
+    await bump_prompt_version([agent_id])
     return {"revoked": sid, "agent_id": agent_id}
 
 
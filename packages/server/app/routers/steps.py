@@ -9,6 +9,7 @@ from app.database import get_async_session
 from app.models import Step
 from app import dependencies
 from app.utils import now_ms
+from app.services.event_archive import read_run_events
 from app.logging_config import get_logger
 logger = get_logger(__name__)
 
@@ -104,15 +105,12 @@ async def restart_step(
 
 @router.get("/{run_id}/{step_id}/logs")
 async def get_step_logs(run_id: str, step_id: str):
-    """Get logs for a specific step execution from Redis stream."""
+    """Get logs for a specific step execution (archive + Redis stream)."""
     if not dependencies.redis_client:
         raise HTTPException(status_code=503, detail="Redis not connected")
     
-    stream_key = f"djinnbot:events:run:{run_id}"
-    
     try:
-        # Read all messages from stream
-        messages = await dependencies.redis_client.xrange(stream_key)
+        messages, _ = await read_run_events(run_id)
         
         logs = []
         for msg_id, fields in messages:
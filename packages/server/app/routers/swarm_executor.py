@@ -22,12 +22,13 @@ import json
 import uuid
 from typing import Optional
 
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, HTTPException, Query, Request
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
 from app import dependencies
 from app.logging_config import get_logger
+from app.services import swarm_registry
 
 logger = get_logger(__name__)
 
@@ -190,6 +191,7 @@ async def swarm_execute(
                 {"payload": json.dumps(swarm_payload)},
             )
             logger.info(f"Swarm dispatched: {swarm_id} ({len(req.tasks)} tasks)")
+            await swarm_registry.register_swarm(swarm_id)
         except Exception as e:
             logger.error(f"Failed to dispatch swarm to Redis: {e}")
             raise HTTPException(
@@ -216,40 +218,30 @@ async def swarm_execute(
 
 
 @router.get("/swarms")
-async def list_swarms():
-    """List recent swarm sessions (from Redis).
+async def list_swarms(
+    limit: int = Query(50, ge=1, le=200),
+    status: Optional[str] = Query(
+        None, description="Comma-separated statuses (running, completed, ...)"
+    ),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+):
+    """List recent swarm sessions (from Redis), newest first.
 
-    Scans for djinnbot:swarm:*:state keys. Results are ephemeral
-    (TTL 1 hour) — only active and recently-finished swarms appear.
+    Reads the swarm index sorted set plus one MGET of state keys. Results
+    are ephemeral (TTL 1 hour) — only active and recently-finished swarms
+    appear.
     """
     if not dependencies.redis_client:
         raise HTTPException(status_code=503, detail="Redis not available")
 
+    statuses = {s.strip() for s in status.split(",") if s.strip()} if status else None
     try:
-        swarms = []
-        cursor = 0
-        while True:
-            cursor, keys = await dependencies.redis_client.scan(
-                cursor, match="djinnbot:swarm:*:state", count=100
-            )
-            for key in keys:
-                raw = await dependencies.redis_client.get(key)
-                if raw:
-                    try:
-                        state = json.loads(
-                            raw if isinstance(raw, str) else raw.decode("utf-8")
-                        )
-                        swarms.append(state)
-                    except (json.JSONDecodeError, AttributeError):
-                        pass
-            if cursor == 0:
-                break
-
-        # Sort by created_at descending (most recent first)
-        swarms.sort(key=lambda s: s.get("created_at", 0), reverse=True)
-        return {"swarms": swarms}
-    except HTTPException:
-        raise
+        swarms, next_cursor = await swarm_registry.list_swarms(
+            limit=limit, statuses=statuses, cursor=cursor
+        )
+        return {"swarms": swarms, "next_cursor": next_cursor}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Failed to list swarms: {e}")
         raise HTTPException(status_code=500, detail="Failed to list swarms")
@@ -15,9 +15,6 @@ Endpoints:
   POST   /v1/telegram/{agent_id}/send              - Send message (Redis RPC)
 """
 
-import json
-import uuid
-import asyncio
 from typing import Optional, List
 
 from fastapi import APIRouter, Depends, HTTPException
@@ -25,9 +22,11 @@ from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
+from app import dependencies
 from app.database import get_async_session
 from app.models.telegram import TelegramConfig, TelegramAllowlistEntry
 from app.models.base import now_ms
+from app.services.bridge_rpc import BridgeRpcError, bridge_rpc
 from app.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -39,41 +38,21 @@ router = APIRouter()
 
 
 async def _telegram_rpc(method: str, params: dict, timeout: float = 10.0) -> dict:
-    """Send an RPC request to the engine's TelegramBridgeManager via Redis pub/sub."""
-    import redis.asyncio as aioredis
-    import os
-
-    redis_url = os.environ.get("REDIS_URL", "redis://localhost:6379")
-    req_id = str(uuid.uuid4())
-
-    pub = aioredis.from_url(redis_url)
-    sub = aioredis.from_url(redis_url)
+    """Send an RPC request to the engine's TelegramBridgeManager via Redis pub/sub.
 
+    Publishes to 'telegram:rpc:request'; the reply on
+    'telegram:rpc:reply:{id}' is delivered by the shared bridge RPC client.
+    """
     try:
-        pubsub = sub.pubsub()
-        reply_channel = f"telegram:rpc:reply:{req_id}"
-        await pubsub.subscribe(reply_channel)
-
-        request = json.dumps({"id": req_id, "method": method, "params": params})
-        await pub.publish("telegram:rpc:request", request)
-
-        start = asyncio.get_event_loop().time()
-        while (asyncio.get_event_loop().time() - start) < timeout:
-            msg = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
-            if msg and msg["type"] == "message":
-                data = json.loads(msg["data"])
-                if data.get("error"):
-                    raise HTTPException(status_code=502, detail=data["error"])
-                return data.get("result", {})
-
+        data = await bridge_rpc.call("telegram", method, params, timeout=timeout)
+    except BridgeRpcError:
         raise HTTPException(
             status_code=504,
             detail="Telegram engine did not respond in time. Is the engine running?",
         )
-    finally:
-        await pubsub.unsubscribe(reply_channel)
-        await pub.aclose()
-        await sub.aclose()
+    if data.get("error"):
+        raise HTTPException(status_code=502, detail=data["error"])
+    return data.get("result", {})
 
 
 # --- Schemas ------------------------------------------------------------------
@@ -229,13 +208,10 @@ async def update_telegram_config(
 
     # Notify engine of config change (fire-and-forget)
     try:
-        import redis.asyncio as aioredis
-        import os
-
-        redis_url = os.environ.get("REDIS_URL", "redis://localhost:6379")
-        r = aioredis.from_url(redis_url)
-        await r.publish(f"telegram:config:changed:{agent_id}", "updated")
-        await r.aclose()
+        if dependencies.redis_client:
+            await dependencies.redis_client.publish(
+                f"telegram:config:changed:{agent_id}", "updated"
+            )
     except Exception as e:
         logger.warning(f"Failed to notify engine of Telegram config change: {e}")
 
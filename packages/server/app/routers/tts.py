@@ -19,7 +19,7 @@ from typing import Optional, List, Dict
 from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import Response
 from pydantic import BaseModel
-from sqlalchemy import select, func, desc, or_
+from sqlalchemy import select, func, desc, or_, case
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_async_session
@@ -28,6 +28,7 @@ from app.models.tts_call_log import TtsCallLog
 from app.models.tts_provider import TtsProvider, UserTtsProvider, AdminSharedTtsProvider
 from app.models.agent_tts_settings import AgentTtsSettings
 from app.models.settings import GlobalSetting
+from app.services.settings_cache import settings_cache
 from app.models.base import now_ms
 from app.logging_config import get_logger
 from app.utils import gen_id
@@ -135,6 +136,7 @@ class TtsCallResponse(BaseModel):
     cost_total: Optional[float] = None
     duration_ms: Optional[int] = None
     channel: Optional[str] = None
+    cache_hit: bool = False
     created_at: int
 
 
@@ -436,8 +438,7 @@ async def get_tts_settings(
     session: AsyncSession = Depends(get_async_session),
 ) -> dict:
     """Get TTS admin settings (character threshold, rate limit, enabled, default provider)."""
-    result = await session.execute(select(GlobalSetting))
-    rows = {r.key: r.value for r in result.scalars().all()}
+    rows = await settings_cache.all()
 
     return {
         "ttsEnabled": rows.get("ttsEnabled", "true").lower() == "true",
@@ -478,6 +479,7 @@ async def update_tts_settings(
             session.add(GlobalSetting(key=key, value=value, updated_at=now))
 
     await session.commit()
+    await settings_cache.invalidate(list(updates))
 
     # Reset the TTS semaphore so the new limit takes effect
     from app.services.tts import _tts_semaphore
@@ -716,13 +718,10 @@ async def voicebox_health(
 @router.get("/settings/user-tts-preference")
 async def get_user_tts_preference(
     user_id: str = Query(...),
-    session: AsyncSession = Depends(get_async_session),
 ) -> dict:
     """Get a user's preferred TTS provider."""
-    key = f"userTtsProvider:{user_id}"
-    row = await session.get(GlobalSetting, key)
     return {
-        "defaultTtsProvider": row.value if row else None,
+        "defaultTtsProvider": await settings_cache.get(f"userTtsProvider:{user_id}"),
     }
 
 
@@ -750,6 +749,7 @@ async def set_user_tts_preference(
             GlobalSetting(key=key, value=body.defaultTtsProvider, updated_at=now)
         )
     await session.commit()
+    await settings_cache.invalidate([key])
     return {"status": "ok", "defaultTtsProvider": body.defaultTtsProvider}
 
 
@@ -764,6 +764,7 @@ async def clear_user_tts_preference(
     if row:
         await session.delete(row)
         await session.commit()
+        await settings_cache.invalidate([key])
     return {"status": "ok"}
 
 
@@ -871,6 +872,7 @@ def _row_to_response(row: TtsCallLog) -> TtsCallResponse:
         cost_total=row.cost_total,
         duration_ms=row.duration_ms,
         channel=row.channel,
+        cache_hit=bool(row.cache_hit),
         created_at=row.created_at,
     )
 
@@ -903,6 +905,7 @@ async def list_tts_calls(
         func.sum(sub.c.output_audio_bytes).label("total_output_bytes"),
         func.sum(sub.c.cost_total).label("total_cost"),
         func.avg(sub.c.duration_ms).label("avg_duration_ms"),
+        func.sum(case((sub.c.cache_hit.is_(True), 1), else_=0)).label("cache_hits"),
     )
     summary_result = await db.execute(summary_query)
     srow = summary_result.one()
@@ -913,6 +916,7 @@ async def list_tts_calls(
         "totalOutputBytes": srow.total_output_bytes or 0,
         "totalCost": round(srow.total_cost or 0, 6),
         "avgDurationMs": round(srow.avg_duration_ms or 0),
+        "cacheHits": srow.cache_hits or 0,
     }
 
     result = await db.execute(
@@ -957,6 +961,7 @@ async def admin_list_tts_calls(
         func.sum(sub.c.input_text_bytes).label("total_input_bytes"),
         func.sum(sub.c.cost_total).label("total_cost"),
         func.avg(sub.c.duration_ms).label("avg_duration_ms"),
+        func.sum(case((sub.c.cache_hit.is_(True), 1), else_=0)).label("cache_hits"),
     )
     summary_result = await db.execute(summary_query)
     srow = summary_result.one()
@@ -965,6 +970,7 @@ async def admin_list_tts_calls(
         "totalInputBytes": srow.total_input_bytes or 0,
         "totalCost": round(srow.total_cost or 0, 6),
         "avgDurationMs": round(srow.avg_duration_ms or 0),
+        "cacheHits": srow.cache_hits or 0,
     }
 
     result = await db.execute(
@@ -20,6 +20,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_async_session
 from app.auth.dependencies import get_current_user, AuthUser
+from app.auth.principal_cache import principal_cache
 from app.models.auth import User
 from app.models.settings import ModelProvider
 from app.models.user_provider import (
@@ -124,6 +125,7 @@ async def update_profile(
     db_user.updated_at = now_ms()
 
     await session.commit()
+    await principal_cache.invalidate(user_id=db_user.id)
     await session.refresh(db_user)
     return UserProfile(
         id=db_user.id,
@@ -20,9 +20,6 @@ Endpoints (all under /v1/whatsapp):
   POST   /v1/whatsapp/{agent_id}/send     — Send message as agent
 """
 
-import json
-import uuid
-import asyncio
 from typing import Optional, List
 
 from fastapi import APIRouter, Depends, HTTPException
@@ -33,6 +30,7 @@ from sqlalchemy import select
 from app.database import get_async_session
 from app.models.whatsapp import WhatsAppConfig, WhatsAppAllowlistEntry
 from app.models.base import now_ms
+from app.services.bridge_rpc import BridgeRpcError, bridge_rpc
 from app.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -46,46 +44,19 @@ router = APIRouter()
 async def _whatsapp_rpc(method: str, params: dict, timeout: float = 10.0) -> dict:
     """Send an RPC request to the engine's WhatsAppBridge via Redis pub/sub.
 
-    Publishes to 'whatsapp:rpc:request' and waits for a reply on
-    'whatsapp:rpc:reply:{id}'.
+    Publishes to 'whatsapp:rpc:request'; the reply on
+    'whatsapp:rpc:reply:{id}' is delivered by the shared bridge RPC client.
     """
-    import redis.asyncio as aioredis
-    import os
-
-    redis_url = os.environ.get("REDIS_URL", "redis://localhost:6379")
-    req_id = str(uuid.uuid4())
-
-    pub = aioredis.from_url(redis_url)
-    sub = aioredis.from_url(redis_url)
-
     try:
-        # Subscribe to the reply channel BEFORE publishing the request
-        pubsub = sub.pubsub()
-        reply_channel = f"whatsapp:rpc:reply:{req_id}"
-        await pubsub.subscribe(reply_channel)
-
-        # Publish request
-        request = json.dumps({"id": req_id, "method": method, "params": params})
-        await pub.publish("whatsapp:rpc:request", request)
-
-        # Wait for reply
-        start = asyncio.get_event_loop().time()
-        while (asyncio.get_event_loop().time() - start) < timeout:
-            msg = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
-            if msg and msg["type"] == "message":
-                data = json.loads(msg["data"])
-                if data.get("error"):
-                    raise HTTPException(status_code=502, detail=data["error"])
-                return data.get("result", {})
-
+        data = await bridge_rpc.call("whatsapp", method, params, timeout=timeout)
+    except BridgeRpcError:
         raise HTTPException(
             status_code=504,
             detail="WhatsApp engine did not respond in time. Is the engine running?",
         )
-    finally:
-        await pubsub.unsubscribe(reply_channel)
-        await pub.aclose()
-        await sub.aclose()
+    if data.get("error"):
+        raise HTTPException(status_code=502, detail=data["error"])
+    return data.get("result", {})
 
 
 # ─── Schemas ──────────────────────────────────────────────────────────────────
@@ -1,5 +1,6 @@
 """Git operations for workspace endpoints."""
 
+import asyncio
 import os
 import re
 import subprocess
@@ -10,16 +11,22 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
 from app.logging_config import get_logger
+from app.services.git_service import git_service
 from ._common import RUNS_DIR, _safe_path, _add_credentials
 
 logger = get_logger(__name__)
 router = APIRouter()
 
 
-def _git_push(workspace_path: str, branch: str = "main", force: bool = False) -> dict:
+async def _git_push(
+    workspace_path: str, branch: str = "main", force: bool = False
+) -> dict:
     """
     Push to remote repository with detailed result.
 
+    Holds the repository's lock for the whole sequence, since the remote
+    URL is temporarily rewritten with credentials.
+
     Returns dict with:
         - success: bool
         - commits_pushed: int (optional)
@@ -43,15 +50,16 @@ def _git_push(workspace_path: str, branch: str = "main", force: bool = False) ->
             "auth_error": False,
         }
 
+    async with git_service.repo_lock(workspace):
+        return await _git_push_locked(workspace, branch, force)
+
+
+async def _git_push_locked(workspace: Path, branch: str, force: bool) -> dict:
     try:
         # Check if remote exists
         try:
-            remote_result = subprocess.run(
-                ["git", "remote", "get-url", "origin"],
-                cwd=workspace,
-                capture_output=True,
-                text=True,
-                check=True,
+            remote_result = await git_service.run(
+                workspace, "remote", "get-url", "origin"
             )
             remote_url = remote_result.stdout.strip()
         except subprocess.CalledProcessError:
@@ -62,65 +70,44 @@ def _git_push(workspace_path: str, branch: str = "main", force: bool = False) ->
             }
 
         # Get current commit before push
-        before_commit_result = subprocess.run(
-            ["git", "rev-parse", "HEAD"],
-            cwd=workspace,
-            capture_output=True,
-            text=True,
-            check=True,
-        )
+        before_commit_result = await git_service.run(workspace, "rev-parse", "HEAD")
         before_commit = before_commit_result.stdout.strip()
 
         # Count commits ahead of remote
         commits_ahead = 0
         try:
-            ahead_result = subprocess.run(
-                ["git", "rev-list", "--count", f"origin/{branch}..HEAD"],
-                cwd=workspace,
-                capture_output=True,
-                text=True,
-                stderr=subprocess.DEVNULL,
+            ahead_result = await git_service.run(
+                workspace, "rev-list", "--count", f"origin/{branch}..HEAD", check=False
             )
             if ahead_result.returncode == 0:
                 commits_ahead = int(ahead_result.stdout.strip())
-        except Exception:
-            # Remote might not have branch yet, count all commits
-            try:
-                all_commits_result = subprocess.run(
-                    ["git", "rev-list", "--count", "HEAD"],
-                    cwd=workspace,
-                    capture_output=True,
-                    text=True,
-                    check=True,
+            else:
+                # Remote might not have branch yet, count all commits
+                all_commits_result = await git_service.run(
+                    workspace, "rev-list", "--count", "HEAD"
                 )
                 commits_ahead = int(all_commits_result.stdout.strip())
-            except Exception:
-                commits_ahead = 0
+        except Exception:
+            commits_ahead = 0
 
         logger.debug(f"Commits ahead of remote: {commits_ahead}")
 
         # Add credentials to remote URL temporarily
         authenticated_url = _add_credentials(remote_url)
-        subprocess.run(
-            ["git", "remote", "set-url", "origin", authenticated_url],
-            cwd=workspace,
-            capture_output=True,
-            check=True,
+        await git_service.run(
+            workspace, "remote", "set-url", "origin", authenticated_url
         )
 
         # Perform push
         try:
-            push_cmd = ["git", "push"]
+            push_args = ["push"]
             if force:
-                push_cmd.append("--force")
-            push_cmd.extend(["-u", "origin", branch])
-
-            subprocess.run(
-                push_cmd,
-                cwd=workspace,
-                capture_output=True,
-                text=True,
-                check=True,
+                push_args.append("--force")
+            push_args.extend(["-u", "origin", branch])
+
+            await git_service.run(
+                workspace,
+                *push_args,
                 timeout=30,
                 env={
                     **os.environ,
@@ -129,10 +116,8 @@ def _git_push(workspace_path: str, branch: str = "main", force: bool = False) ->
             )
 
             # Restore original remote URL (without credentials)
-            subprocess.run(
-                ["git", "remote", "set-url", "origin", remote_url],
-                cwd=workspace,
-                capture_output=True,
+            await git_service.run(
+                workspace, "remote", "set-url", "origin", remote_url, check=False
             )
 
             return {
@@ -144,13 +129,11 @@ def _git_push(workspace_path: str, branch: str = "main", force: bool = False) ->
                 "auth_error": False,
             }
 
-        except subprocess.CalledProcessError as push_error:
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as push_error:
             # Restore original remote URL on error
             try:
-                subprocess.run(
-                    ["git", "remote", "set-url", "origin", remote_url],
-                    cwd=workspace,
-                    capture_output=True,
+                await git_service.run(
+                    workspace, "remote", "set-url", "origin", remote_url, check=False
                 )
             except Exception:
                 pass
@@ -217,6 +200,12 @@ def _git_push(workspace_path: str, branch: str = "main", force: bool = False) ->
         }
 
 
+# hash|short|author|timestamp|subject
+_COMMIT_FORMAT = "--format=%H|%h|%an|%at|%s"
+
+_DIFF_START_RE = re.compile(r"^diff ", re.MULTILINE)
+
+
 # Pydantic models
 
 
@@ -267,35 +256,32 @@ async def get_git_status(run_id: str):
         }
 
     try:
-        # Get current branch
-        branch_result = subprocess.run(
-            ["git", "rev-parse", "--abbrev-ref", "HEAD"],
-            cwd=base,
-            capture_output=True,
-            text=True,
-            check=True,
+        # Current branch, tracking branch, working tree and last commit are
+        # independent, so run them concurrently
+        (
+            branch_result,
+            tracking_result,
+            status_result,
+            last_commit_result,
+        ) = await asyncio.gather(
+            git_service.run(base, "rev-parse", "--abbrev-ref", "HEAD"),
+            git_service.run(
+                base,
+                "rev-parse",
+                "--abbrev-ref",
+                "--symbolic-full-name",
+                "@{u}",
+                check=False,
+            ),
+            git_service.run(base, "status", "--porcelain"),
+            git_service.run(base, "log", "-1", "--format=%H|%h|%at|%s", check=False),
         )
         current_branch = branch_result.stdout.strip()
-
-        # Get tracking branch
-        tracking_result = subprocess.run(
-            ["git", "rev-parse", "--abbrev-ref", "--symbolic-full-name", "@{u}"],
-            cwd=base,
-            capture_output=True,
-            text=True,
-        )
         tracking_branch = (
             tracking_result.stdout.strip() if tracking_result.returncode == 0 else None
         )
 
         # Check if working tree is clean
-        status_result = subprocess.run(
-            ["git", "status", "--porcelain"],
-            cwd=base,
-            capture_output=True,
-            text=True,
-            check=True,
-        )
         is_clean = len(status_result.stdout.strip()) == 0
 
         # Count uncommitted changes
@@ -312,18 +298,12 @@ async def get_git_status(run_id: str):
         behind = 0
         if tracking_branch:
             try:
-                rev_list_result = subprocess.run(
-                    [
-                        "git",
-                        "rev-list",
-                        "--left-right",
-                        "--count",
-                        f"{current_branch}...{tracking_branch}",
-                    ],
-                    cwd=base,
-                    capture_output=True,
-                    text=True,
-                    check=True,
+                rev_list_result = await git_service.run(
+                    base,
+                    "rev-list",
+                    "--left-right",
+                    "--count",
+                    f"{current_branch}...{tracking_branch}",
                 )
                 counts = rev_list_result.stdout.strip().split()
                 if len(counts) == 2:
@@ -335,13 +315,7 @@ async def get_git_status(run_id: str):
         # Get last commit info
         last_commit = None
         try:
-            last_commit_result = subprocess.run(
-                ["git", "log", "-1", "--format=%H|%h|%at|%s"],
-                cwd=base,
-                capture_output=True,
-                text=True,
-                check=True,
-            )
+            last_commit_result.check_returncode()
             last_commit_parts = last_commit_result.stdout.strip().split("|")
             if len(last_commit_parts) == 4:
                 last_commit = {
@@ -397,19 +371,13 @@ async def get_git_history(run_id: str, limit: int = 50, offset: int = 0):
 
     try:
         # Format: hash|short|author|email|timestamp|subject
-        result = subprocess.run(
-            [
-                "git",
-                "log",
-                f"--skip={offset}",
-                f"-n{limit}",
-                "--format=%H|%h|%an|%ae|%at|%s",
-                "--shortstat",
-            ],
-            cwd=base,
-            capture_output=True,
-            text=True,
-            check=True,
+        result = await git_service.run(
+            base,
+            "log",
+            f"--skip={offset}",
+            f"-n{limit}",
+            "--format=%H|%h|%an|%ae|%at|%s",
+            "--shortstat",
         )
 
         commits = []
@@ -498,27 +466,15 @@ async def get_file_at_commit(run_id: str, commit_hash: str, file_path: str):
         raise HTTPException(status_code=400, detail="Invalid commit hash")
 
     try:
-        # Get file content at commit
-        result = subprocess.run(
-            ["git", "show", f"{commit_hash}:{file_path}"],
-            cwd=base,
-            capture_output=True,
-            text=True,
-            check=True,
+        # File content and commit info are each cached per commit hash
+        content = await git_service.read_object(
+            base, commit_hash, "show", f"{commit_hash}:{file_path}"
         )
-
-        content = result.stdout
-
-        # Get commit info
-        commit_info_result = subprocess.run(
-            ["git", "show", "--format=%H|%h|%an|%at|%s", "--no-patch", commit_hash],
-            cwd=base,
-            capture_output=True,
-            text=True,
-            check=True,
+        commit_info_output = await git_service.read_object(
+            base, commit_hash, "show", _COMMIT_FORMAT, "--no-patch", commit_hash
         )
 
-        parts = commit_info_result.stdout.strip().split("|")
+        parts = commit_info_output.strip().split("|")
         commit_info = None
         if len(parts) >= 5:
             commit_info = {
@@ -605,12 +561,8 @@ async def get_file_history(run_id: str, file_path: str, limit: int = 20):
 
     try:
         # Get log for specific file
-        result = subprocess.run(
-            ["git", "log", f"-n{limit}", "--format=%H|%h|%an|%at|%s", "--", file_path],
-            cwd=base,
-            capture_output=True,
-            text=True,
-            check=True,
+        result = await git_service.run(
+            base, "log", f"-n{limit}", "--format=%H|%h|%an|%at|%s", "--", file_path
         )
 
         commits = []
@@ -679,41 +631,32 @@ async def get_commit_diff(run_id: str, commit_hash: str):
         raise HTTPException(status_code=400, detail="Invalid commit hash")
 
     try:
-        # Get commit info
-        commit_info = subprocess.run(
-            ["git", "show", "--format=%H|%h|%an|%at|%s", "--no-patch", commit_hash],
-            cwd=base,
-            capture_output=True,
-            text=True,
-            check=True,
+        # Commit info, numstat and patch in a single (cached) git process
+        output = await git_service.read_object(
+            base,
+            commit_hash,
+            "show",
+            _COMMIT_FORMAT,
+            "--numstat",
+            "--patch",
+            "--unified=3",
+            "--no-color",
+            commit_hash,
         )
 
-        parts = commit_info.stdout.strip().split("|")
-        if len(parts) < 5:
+        header, _, body = output.partition("\n")
+        commit_parts = header.strip().split("|")
+        if len(commit_parts) < 5:
             raise HTTPException(status_code=404, detail="Commit not found")
 
-        # Get diff with unified format
-        diff_result = subprocess.run(
-            ["git", "show", "--format=", "--unified=3", "--no-color", commit_hash],
-            cwd=base,
-            capture_output=True,
-            text=True,
-            check=True,
-        )
-
-        # Get list of changed files with stats
-        stat_result = subprocess.run(
-            ["git", "diff-tree", "--no-commit-id", "--numstat", "-r", commit_hash],
-            cwd=base,
-            capture_output=True,
-            text=True,
-            check=True,
-        )
+        diff_match = _DIFF_START_RE.search(body)
+        numstat_output = body[: diff_match.start()] if diff_match else body
+        diff_output = body[diff_match.start() :] if diff_match else ""
 
         # Parse files from numstat output
         # Format: "additions\tdeletions\tfilename"
         files = []
-        for line in stat_result.stdout.strip().split("\n"):
+        for line in numstat_output.strip().split("\n"):
             if not line:
                 continue
             parts = line.split("\t")
@@ -744,16 +687,18 @@ async def get_commit_diff(run_id: str, commit_hash: str):
 
         return {
             "commit": {
-                "hash": parts[0],
-                "short_hash": parts[1],
-                "author": parts[2],
-                "timestamp": int(parts[3]),
-                "subject": parts[4],
+                "hash": commit_parts[0],
+                "short_hash": commit_parts[1],
+                "author": commit_parts[2],
+                "timestamp": int(commit_parts[3]),
+                "subject": commit_parts[4],
             },
             "files": files,
-            "diff": diff_result.stdout,
+            "diff": diff_output,
         }
 
+    except HTTPException:
+        raise
     except subprocess.CalledProcessError as e:
         if e.stderr and "unknown revision" in e.stderr.lower():
             raise HTTPException(status_code=404, detail="Commit not found")
@@ -794,24 +739,20 @@ async def merge_run_to_main(run_id: str, request: MergeRequest = MergeRequest())
             detail="Invalid merge strategy. Use: merge, squash, or rebase",
         )
 
+    # Checkouts and merges must not interleave with another write to this repo
+    async with git_service.repo_lock(base):
+        return await _merge_locked(base, run_id, strategy)
+
+
+async def _merge_locked(base: Path, run_id: str, strategy: str) -> MergeResponse:
     try:
         # Get current branch
-        current_branch = subprocess.run(
-            ["git", "rev-parse", "--abbrev-ref", "HEAD"],
-            cwd=base,
-            capture_output=True,
-            text=True,
-            check=True,
+        current_branch = (
+            await git_service.run(base, "rev-parse", "--abbrev-ref", "HEAD")
         ).stdout.strip()
 
         # Check if main branch exists
-        branches_result = subprocess.run(
-            ["git", "branch", "--list"],
-            cwd=base,
-            capture_output=True,
-            text=True,
-            check=True,
-        )
+        branches_result = await git_service.run(base, "branch", "--list")
 
         if "main" not in branches_result.stdout:
             return MergeResponse(success=False, error="Main branch not found")
@@ -824,12 +765,8 @@ async def merge_run_to_main(run_id: str, request: MergeRequest = MergeRequest())
 
         # Check if there's anything to merge
         try:
-            commits_to_merge = subprocess.run(
-                ["git", "rev-list", f"main..{current_branch}"],
-                cwd=base,
-                capture_output=True,
-                text=True,
-                check=True,
+            commits_to_merge = (
+                await git_service.run(base, "rev-list", f"main..{current_branch}")
             ).stdout.strip()
 
             if not commits_to_merge:
@@ -841,13 +778,7 @@ async def merge_run_to_main(run_id: str, request: MergeRequest = MergeRequest())
             return MergeResponse(success=False, error="Failed to check merge status")
 
         # Switch to main branch
-        subprocess.run(
-            ["git", "checkout", "main"],
-            cwd=base,
-            capture_output=True,
-            text=True,
-            check=True,
-        )
+        await git_service.run(base, "checkout", "main")
 
         # Perform merge based on strategy
         merge_env = {
@@ -861,91 +792,46 @@ async def merge_run_to_main(run_id: str, request: MergeRequest = MergeRequest())
         try:
             if strategy == "squash":
                 # Squash merge
-                subprocess.run(
-                    ["git", "merge", "--squash", current_branch],
-                    cwd=base,
-                    capture_output=True,
-                    text=True,
-                    check=True,
-                    env=merge_env,
+                await git_service.run(
+                    base, "merge", "--squash", current_branch, env=merge_env
                 )
                 # Commit the squashed changes
-                subprocess.run(
-                    ["git", "commit", "-m", f"Squashed merge of run {run_id}"],
-                    cwd=base,
-                    capture_output=True,
-                    text=True,
-                    check=True,
+                await git_service.run(
+                    base,
+                    "commit",
+                    "-m",
+                    f"Squashed merge of run {run_id}",
                     env=merge_env,
                 )
             elif strategy == "rebase":
                 # Rebase strategy: rebase run branch onto main, then fast-forward
-                subprocess.run(
-                    ["git", "checkout", current_branch],
-                    cwd=base,
-                    capture_output=True,
-                    text=True,
-                    check=True,
-                )
-                subprocess.run(
-                    ["git", "rebase", "main"],
-                    cwd=base,
-                    capture_output=True,
-                    text=True,
-                    check=True,
-                    env=merge_env,
-                )
-                subprocess.run(
-                    ["git", "checkout", "main"],
-                    cwd=base,
-                    capture_output=True,
-                    text=True,
-                    check=True,
-                )
-                subprocess.run(
-                    ["git", "merge", "--ff-only", current_branch],
-                    cwd=base,
-                    capture_output=True,
-                    text=True,
-                    check=True,
-                    env=merge_env,
+                await git_service.run(base, "checkout", current_branch)
+                await git_service.run(base, "rebase", "main", env=merge_env)
+                await git_service.run(base, "checkout", "main")
+                await git_service.run(
+                    base, "merge", "--ff-only", current_branch, env=merge_env
                 )
             else:  # merge (default)
                 # Standard merge with merge commit
-                subprocess.run(
-                    [
-                        "git",
-                        "merge",
-                        "--no-ff",
-                        "-m",
-                        f"Merge run {run_id} to main",
-                        current_branch,
-                    ],
-                    cwd=base,
-                    capture_output=True,
-                    text=True,
-                    check=True,
+                await git_service.run(
+                    base,
+                    "merge",
+                    "--no-ff",
+                    "-m",
+                    f"Merge run {run_id} to main",
+                    current_branch,
                     env=merge_env,
                 )
 
             # Get the new commit hash
-            commit_hash = subprocess.run(
-                ["git", "rev-parse", "HEAD"],
-                cwd=base,
-                capture_output=True,
-                text=True,
-                check=True,
-            ).stdout.strip()
+            commit_hash = (await git_service.run(base, "rev-parse", "HEAD")).stdout.strip()
 
             return MergeResponse(success=True, commit_hash=commit_hash)
 
         except subprocess.CalledProcessError as merge_error:
             # Check for conflicts
-            status_result = subprocess.run(
-                ["git", "status", "--porcelain"],
-                cwd=base,
-                capture_output=True,
-                text=True,
+            status_result = await git_service.run(
+                base, "status", "--porcelain", check=False
             )
 
             # Conflict markers: UU, AA, DD, AU, UA, DU, UD
@@ -956,39 +842,22 @@ async def merge_run_to_main(run_id: str, request: MergeRequest = MergeRequest())
                 if line and any(line.startswith(code) for code in conflict_codes):
                     conflict_files.append(line[3:].strip())
 
-            if conflict_files:
-                # Abort the merge/rebase
-                try:
-                    if strategy == "rebase":
-                        subprocess.run(
-                            ["git", "rebase", "--abort"], cwd=base, capture_output=True
-                        )
-                    else:
-                        subprocess.run(
-                            ["git", "merge", "--abort"], cwd=base, capture_output=True
-                        )
-                except:
-                    pass
+            # Abort the merge/rebase
+            try:
+                if strategy == "rebase":
+                    await git_service.run(base, "rebase", "--abort", check=False)
+                else:
+                    await git_service.run(base, "merge", "--abort", check=False)
+            except Exception:
+                pass
 
+            if conflict_files:
                 return MergeResponse(
                     success=False,
                     conflicts=conflict_files,
                     error="Merge conflicts detected",
                 )
 
-            # Other merge error - try to abort
-            try:
-                if strategy == "rebase":
-                    subprocess.run(
-                        ["git", "rebase", "--abort"], cwd=base, capture_output=True
-                    )
-                else:
-                    subprocess.run(
-                        ["git", "merge", "--abort"], cwd=base, capture_output=True
-                    )
-            except:
-                pass
-
             error_msg = merge_error.stderr if merge_error.stderr else merge_error.stdout
             return MergeResponse(success=False, error=f"Merge failed: {error_msg}")
 
@@ -1025,7 +894,7 @@ async def push_to_remote(run_id: str, request: PushRequest = PushRequest()):
 
     # Perform git push operation
     try:
-        result = _git_push(str(base), request.branch, request.force)
+        result = await _git_push(str(base), request.branch, request.force)
         return PushResponse(**result)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Push operation failed: {str(e)}")
@@ -1061,7 +930,7 @@ async def push_project_to_remote(project_id: str, request: PushRequest = PushReq
 
     # Perform git push operation
     try:
-        result = _git_push(str(project_path), request.branch, request.force)
+        result = await _git_push(str(project_path), request.branch, request.force)
         return PushResponse(**result)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Push operation failed: {str(e)}")
@@ -9,24 +9,46 @@ Uses faster-whisper (CTranslate2 backend) which runs ~4x faster than
 OpenAI's Python whisper on CPU.  The 'base' model (~150MB) provides good
 accuracy for voice notes at ~3-5s per 30s clip.
 
+Audio is decoded by ffmpeg reading the stored file by path and writing
+raw PCM to stdout, and transcribed in fixed-size windows, so memory stays
+bounded for hour-long recordings.  Scheduling, concurrency limits and
+partial-transcript publishing live in transcription_pool.py.
+
 Model is loaded lazily on first transcription request and cached in memory.
 """
 
 import os
-import tempfile
 import subprocess
+import tempfile
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Callable, Iterator, Optional
 
 from app.logging_config import get_logger
 from app.services.text_extraction import estimate_tokens
 
+if TYPE_CHECKING:
+    import numpy
+
 logger = get_logger(__name__)
 
 # Model size — 'base' is the default (good accuracy, fast on CPU)
 # Can be overridden via WHISPER_MODEL_SIZE env var
 WHISPER_MODEL_SIZE = os.getenv("WHISPER_MODEL_SIZE", "base")
 
+# Concurrent transcriptions — sizes both the worker pool and the model's
+# CTranslate2 worker count so decodes genuinely run in parallel.
+TRANSCRIBE_WORKERS = max(1, int(os.getenv("TRANSCRIBE_WORKERS", "2")))
+
+# Whisper expects 16kHz mono PCM
+SAMPLE_RATE = 16000
+
+# Long recordings are decoded and transcribed in windows of this many
+# seconds, bounding memory and letting partial transcripts stream out.
+TRANSCRIBE_WINDOW_SECONDS = int(os.getenv("TRANSCRIBE_WINDOW_SECONDS", "300"))
+
+# How long to wait for ffmpeg to exit once its output is drained
+FFMPEG_TIMEOUT_SECONDS = 30
+
 # Model cache directory — persisted on JuiceFS so the model is downloaded
 # once and reused across container restarts.  Falls back to the default
 # huggingface cache dir if JuiceFS is not mounted.
@@ -80,6 +102,7 @@ def _get_model():
             WHISPER_MODEL_SIZE,
             device="cpu",
             compute_type="int8",  # Quantized for fast CPU inference
+            num_workers=TRANSCRIBE_WORKERS,
             download_root=model_dir,
         )
         logger.info(
@@ -100,94 +123,109 @@ def _get_model():
         return None
 
 
-def _convert_to_wav(input_path: str, output_path: str) -> bool:
-    """Convert audio to 16kHz mono WAV using ffmpeg."""
+def _decode_pcm_windows(
+    path: str, window_seconds: int = TRANSCRIBE_WINDOW_SECONDS
+) -> Iterator["numpy.ndarray"]:
+    """Decode audio to 16kHz mono float32 PCM, yielding fixed-size windows.
+
+    ffmpeg reads the file by path and raw s16le samples are read from its
+    stdout — the audio is never copied, and at most one window of PCM is
+    held in memory regardless of recording length.  The input must be a
+    path rather than stdin: ffmpeg treats ``pipe:`` input as non-seekable,
+    which breaks containers like M4A/MOV that keep their moov atom at the
+    end.  stderr goes to a temp file, not a pipe, so a damaged input that
+    makes ffmpeg log heavily cannot fill the pipe and stall the decode.
+    """
+    import numpy as np
+
+    window_bytes = window_seconds * SAMPLE_RATE * 2  # s16le = 2 bytes/sample
+    stderr = tempfile.TemporaryFile()
+    proc = subprocess.Popen(
+        [
+            "ffmpeg",
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-i",
+            path,
+            "-ar",
+            str(SAMPLE_RATE),
+            "-ac",
+            "1",  # mono
+            "-f",
+            "s16le",
+            "pipe:1",
+        ],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=stderr,
+    )
     try:
-        subprocess.run(
-            [
-                "ffmpeg",
-                "-y",
-                "-i",
-                input_path,
-                "-ar",
-                "16000",  # 16kHz sample rate
-                "-ac",
-                "1",  # mono
-                "-f",
-                "wav",
-                output_path,
-            ],
-            capture_output=True,
-            timeout=30,
-            check=True,
-        )
-        return True
-    except (
-        subprocess.CalledProcessError,
-        subprocess.TimeoutExpired,
-        FileNotFoundError,
-    ) as e:
-        logger.warning(f"ffmpeg conversion failed: {e}")
-        return False
+        while True:
+            buf = proc.stdout.read(window_bytes)
+            if not buf:
+                break
+            # Drop a trailing odd byte rather than fail the whole window
+            buf = buf[: len(buf) - (len(buf) % 2)]
+            yield np.frombuffer(buf, dtype=np.int16).astype(np.float32) / 32768.0
+        proc.wait(timeout=FFMPEG_TIMEOUT_SECONDS)
+        if proc.returncode != 0:
+            stderr.seek(0)
+            err = stderr.read(4096).decode("utf-8", errors="replace").strip()
+            raise RuntimeError(f"ffmpeg exited with {proc.returncode}: {err[:500]}")
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+        stderr.close()
 
 
 def transcribe_audio(
-    data: bytes,
+    path: str,
     mime_type: str,
     filename: str,
+    on_partial: Optional[Callable[[int, str], None]] = None,
 ) -> tuple[Optional[str], int]:
-    """Transcribe audio data to text.
+    """Transcribe an audio file on disk to text.
 
-    Returns (transcription_text, estimated_tokens).
-    Returns (None, 0) if transcription fails or is unavailable.
+    Audio is decoded and transcribed window by window.  When *on_partial*
+    is given it is called with (window_index, text_so_far) after each
+    window so long recordings can surface progress before they finish.
+
+    Returns (transcription_text, estimated_tokens), or (None, 0) if the
+    model is unavailable.  Decode and model errors are raised so the
+    transcription pool counts them as failures.
     """
     model = _get_model()
     if model is None:
         logger.warning(f"Skipping transcription for {filename} — model not available")
         return None, 0
 
-    try:
-        with tempfile.TemporaryDirectory(prefix="djinnbot_audio_") as tmpdir:
-            # Write audio to temp file
-            input_path = os.path.join(tmpdir, filename)
-            with open(input_path, "wb") as f:
-                f.write(data)
-
-            # Convert to WAV if not already WAV
-            if "wav" in mime_type:
-                audio_path = input_path
-            else:
-                audio_path = os.path.join(tmpdir, "input.wav")
-                if not _convert_to_wav(input_path, audio_path):
-                    logger.warning(f"Could not convert {filename} to WAV")
-                    return None, 0
-
-            # Transcribe with faster-whisper
-            segments, info = model.transcribe(
-                audio_path,
-                beam_size=5,
-                language=None,  # Auto-detect language
-                vad_filter=True,  # Filter out silence
-            )
-
-            # Collect all segments
-            text_parts = []
-            for segment in segments:
-                text_parts.append(segment.text.strip())
-
-            transcription = " ".join(text_parts).strip()
-
-            if not transcription:
-                logger.info(f"No speech detected in {filename}")
-                return f"[No speech detected in audio file {filename}]", 10
-
+    text_parts: list[str] = []
+    language = None
+    for window_index, samples in enumerate(_decode_pcm_windows(path)):
+        segments, info = model.transcribe(
+            samples,
+            beam_size=5,
+            language=language,  # Auto-detect on the first window only
+            vad_filter=True,  # Filter out silence
+        )
+        for segment in segments:
+            text_parts.append(segment.text.strip())
+        if language is None:
+            language = info.language
             logger.info(
-                f"Transcribed {filename}: {len(transcription)} chars, "
+                f"Transcribing {filename} ({mime_type}): "
                 f"language={info.language} (prob={info.language_probability:.2f})"
             )
+        if on_partial is not None:
+            on_partial(window_index, " ".join(p for p in text_parts if p))
 
-            return transcription, estimate_tokens(transcription)
+    transcription = " ".join(p for p in text_parts if p).strip()
 
-    except Exception as e:
-        logger.error(f"Audio transcription failed for {filename}: {e}")
-        return None, 0
+    if not transcription:
+        logger.info(f"No speech detected in {filename}")
+        return f"[No speech detected in audio file {filename}]", 10
+
+    logger.info(f"Transcribed {filename}: {len(transcription)} chars")
+    return transcription, estimate_tokens(transcription)
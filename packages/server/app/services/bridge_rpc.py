@@ -0,0 +1,123 @@
+"""Shared request/reply RPC over Redis pub/sub for the messaging bridges.
+
+The engine's Telegram, WhatsApp and Signal bridge managers listen on
+``{bridge}:rpc:request`` and answer on ``{bridge}:rpc:reply:{request_id}``.
+Instead of opening fresh Redis connections and a per-request subscription
+for every call, this client keeps one long-lived PSUBSCRIBE on the app's
+Redis pool covering every reply channel, and resolves a future keyed by
+request ID as soon as its reply arrives.
+
+Calls per bridge are capped by BRIDGE_RPC_MAX_CONCURRENCY so a stuck
+engine can't pile up unbounded waiters.
+"""
+
+import asyncio
+import json
+import os
+import uuid
+from typing import Optional
+
+from app import dependencies
+from app.logging_config import get_logger
+from app.services.pubsub_listener import listen_forever
+
+logger = get_logger(__name__)
+
+BRIDGES = ("telegram", "whatsapp", "signal")
+
+BRIDGE_RPC_MAX_CONCURRENCY = int(os.getenv("BRIDGE_RPC_MAX_CONCURRENCY", "16"))
+
+
+class BridgeRpcError(Exception):
+    """The bridge could not be reached or did not reply in time."""
+
+
+class BridgeRpcClient:
+    """Multiplexes bridge RPC replies over a single pattern subscription."""
+
+    def __init__(self, bridges: tuple[str, ...], max_concurrency: int):
+        self._patterns = [f"{bridge}:rpc:reply:*" for bridge in bridges]
+        self._pending: dict[str, asyncio.Future] = {}
+        self._limits = {
+            bridge: asyncio.Semaphore(max_concurrency) for bridge in bridges
+        }
+        self._subscribed = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def _ensure_started(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._listen())
+
+    async def _listen(self) -> None:
+        await listen_forever(
+            "Bridge RPC reply",
+            self._resolve,
+            patterns=self._patterns,
+            on_subscribed=self._subscribed.set,
+            on_disconnected=self._subscribed.clear,
+            retry_seconds=1,
+        )
+
+    def _resolve(self, channel: str, data: str) -> None:
+        req_id = channel.rsplit(":", 1)[-1]
+        future = self._pending.get(req_id)
+        if future is None or future.done():
+            return
+        try:
+            future.set_result(json.loads(data))
+        except (json.JSONDecodeError, TypeError) as e:
+            future.set_exception(BridgeRpcError(f"Malformed reply: {e}"))
+
+    async def call(
+        self, bridge: str, method: str, params: dict, timeout: float = 10.0
+    ) -> dict:
+        """Send ``{id, method, params}`` to a bridge and return its raw reply.
+
+        The reply is the engine's JSON object (``result`` and/or ``error``).
+        Raises BridgeRpcError if Redis is unavailable or the bridge does not
+        reply within *timeout* seconds.
+        """
+        if not dependencies.redis_client:
+            raise BridgeRpcError("Redis not available")
+        self._ensure_started()
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        async with self._limits[bridge]:
+            req_id = str(uuid.uuid4())
+            future = loop.create_future()
+            self._pending[req_id] = future
+            try:
+                # The reply subscription must be live before the request goes out
+                await asyncio.wait_for(
+                    self._subscribed.wait(), max(deadline - loop.time(), 0)
+                )
+                request = json.dumps({"id": req_id, "method": method, "params": params})
+                await dependencies.redis_client.publish(
+                    f"{bridge}:rpc:request", request
+                )
+                return await asyncio.wait_for(
+                    future, max(deadline - loop.time(), 0)
+                )
+            except asyncio.TimeoutError:
+                raise BridgeRpcError(f"{bridge} bridge did not reply to '{method}'")
+            finally:
+                self._pending.pop(req_id, None)
+
+    def stats(self) -> dict:
+        return {
+            "subscribed": self._subscribed.is_set(),
+            "pending": len(self._pending),
+        }
+
+    async def shutdown(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        for future in self._pending.values():
+            if not future.done():
+                future.cancel()
+
+
+bridge_rpc = BridgeRpcClient(BRIDGES, BRIDGE_RPC_MAX_CONCURRENCY)
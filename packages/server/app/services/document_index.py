@@ -0,0 +1,275 @@
+"""Per-document chunk index for ingested PDFs.
+
+Written next to the chunk files at ingest time so the document query
+endpoints never have to list the directory or re-parse chunk frontmatter:
+
+  documents/{slug}/_chunks.idx.json
+    chunks    — per chunk: file, byte offset + length of the body, section,
+                pages, token estimate
+    headings  — lowercased section heading → chunk indexes
+    pages     — page number → chunk indexes
+    bm25      — per-term postings (chunk, content tf, section tf), chunk
+                lengths and average length for BM25 scoring
+
+Lookups by chunk index or page are dict hits and heading lookups only
+scan the distinct headings; only the matching chunk bodies are read from
+disk (seek + read by byte offset).
+Loaded indexes are cached in-process, keyed by path and mtime, so a
+re-ingest is picked up automatically.
+
+Documents ingested before the index existed get one built lazily from
+their chunk files on first access.
+"""
+
+import json
+import math
+import os
+import re
+import threading
+from collections import OrderedDict, defaultdict
+from typing import Optional
+
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+INDEX_FILENAME = "_chunks.idx.json"
+INDEX_VERSION = 2
+
+# BM25 parameters (standard Robertson/Sparck Jones defaults)
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Section-heading matches count double, as in the original keyword scorer
+SECTION_WEIGHT = 2
+
+_MAX_CACHED_INDEXES = 64
+
+_TOKEN_RE = re.compile(r"\w+")
+_CHUNK_FILE_RE = re.compile(r"^chunk-(\d+)\.md$")
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase word tokenizer shared by indexing and querying."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+class DocumentIndex:
+    """In-memory view of a document's _chunks.idx.json."""
+
+    def __init__(self, doc_dir: str, data: dict):
+        self.doc_dir = doc_dir
+        self.chunks: list[dict] = data["chunks"]
+        self.headings: dict[str, list[int]] = data["headings"]
+        self.pages: dict[str, list[int]] = data["pages"]
+        bm25 = data["bm25"]
+        self.postings: dict[str, list[list[int]]] = bm25["postings"]
+        self.chunk_lengths: list[int] = bm25["chunk_lengths"]
+        self.avg_length: float = bm25["avg_length"] or 1.0
+        self._by_chunk_index = {c["chunk_index"]: c for c in self.chunks}
+
+    # ── Lookups ─────────────────────────────────────────────────────────
+
+    def by_chunk_index(self, chunk_index: int) -> list[dict]:
+        chunk = self._by_chunk_index.get(chunk_index)
+        return [chunk] if chunk is not None else []
+
+    def by_page(self, page: int) -> list[dict]:
+        return [self.chunks[i] for i in self.pages.get(str(page), [])]
+
+    def by_heading(self, heading: str) -> list[dict]:
+        """Chunks whose section contains *heading* (case-insensitive).
+
+        Matches over the (small) set of distinct headings, never over chunk
+        bodies; exact matches are included like any other partial match.
+        """
+        heading_lower = heading.lower()
+        idxs = sorted(
+            {i for h, ids in self.headings.items() if heading_lower in h for i in ids}
+        )
+        return [self.chunks[i] for i in idxs]
+
+    def search(self, query: str, limit: int) -> tuple[list[tuple[float, dict]], int]:
+        """BM25-rank chunks for *query*.  Returns (top results, total matches)."""
+        n = len(self.chunks)
+        scores: dict[int, float] = defaultdict(float)
+        for term in set(tokenize(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for chunk_idx, tf_content, tf_section in postings:
+                tf = tf_content + tf_section * SECTION_WEIGHT
+                norm = BM25_K1 * (
+                    1 - BM25_B + BM25_B * self.chunk_lengths[chunk_idx] / self.avg_length
+                )
+                scores[chunk_idx] += idf * tf * (BM25_K1 + 1) / (tf + norm)
+
+        ranked = sorted(scores.items(), key=lambda kv: kv[1], reverse=True)
+        return [(score, self.chunks[i]) for i, score in ranked[:limit]], len(ranked)
+
+    def read_content(self, chunk: dict) -> str:
+        """Read one chunk body straight from its byte range."""
+        with open(os.path.join(self.doc_dir, chunk["file"]), "rb") as f:
+            f.seek(chunk["offset"])
+            return f.read(chunk["length"]).decode("utf-8", errors="replace")
+
+
+# ── Building ───────────────────────────────────────────────────────────────
+
+
+def build_index_data(entries: list[dict]) -> dict:
+    """Build the serialisable index from chunk entries.
+
+    Each entry needs: file, offset, length, section, pages, tokens, content,
+    and may carry its chunk_index (defaults to its position).  The content
+    is used for term statistics and is not stored.
+    """
+    chunks: list[dict] = []
+    headings: dict[str, list[int]] = defaultdict(list)
+    pages: dict[str, list[int]] = defaultdict(list)
+    postings: dict[str, list[list[int]]] = defaultdict(list)
+    chunk_lengths: list[int] = []
+
+    for i, entry in enumerate(entries):
+        section = entry.get("section") or ""
+        chunks.append(
+            {
+                "chunk_index": entry.get("chunk_index", i),
+                "file": entry["file"],
+                "offset": entry["offset"],
+                "length": entry["length"],
+                "section": section,
+                "pages": list(entry.get("pages") or []),
+                "tokens": entry.get("tokens", 0),
+            }
+        )
+        headings[section.lower()].append(i)
+        for page in entry.get("pages") or []:
+            pages[str(page)].append(i)
+
+        content_terms = tokenize(entry.get("content", ""))
+        section_terms = tokenize(section)
+        chunk_lengths.append(len(content_terms) + len(section_terms))
+
+        tf_content: dict[str, int] = defaultdict(int)
+        for term in content_terms:
+            tf_content[term] += 1
+        tf_section: dict[str, int] = defaultdict(int)
+        for term in section_terms:
+            tf_section[term] += 1
+        for term in tf_content.keys() | tf_section.keys():
+            postings[term].append([i, tf_content.get(term, 0), tf_section.get(term, 0)])
+
+    return {
+        "version": INDEX_VERSION,
+        "chunks": chunks,
+        "headings": dict(headings),
+        "pages": dict(pages),
+        "bm25": {
+            "postings": dict(postings),
+            "chunk_lengths": chunk_lengths,
+            "avg_length": (sum(chunk_lengths) / len(chunk_lengths))
+            if chunk_lengths
+            else 0.0,
+        },
+    }
+
+
+def write_index(doc_dir: str, entries: list[dict]) -> None:
+    """Build and atomically write the index for *doc_dir*."""
+    data = build_index_data(entries)
+    path = os.path.join(doc_dir, INDEX_FILENAME)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+def _rebuild_from_chunk_files(doc_dir: str) -> None:
+    """Build an index for a document ingested before indexes existed."""
+    from app.utils import parse_frontmatter
+
+    # chunk-NN.md names are zero-padded to two digits only, so order by the
+    # parsed number (chunk-100.md must not sort before chunk-11.md)
+    numbered = []
+    for entry in os.listdir(doc_dir):
+        match = _CHUNK_FILE_RE.match(entry)
+        if match:
+            numbered.append((int(match.group(1)), entry))
+
+    entries = []
+    for file_number, entry in sorted(numbered):
+        with open(os.path.join(doc_dir, entry), "r", encoding="utf-8") as f:
+            raw = f.read()
+        meta, body = parse_frontmatter(raw)
+        # Body starts after the blank line following the frontmatter and
+        # ends before the "---\nRelated: ..." footer
+        content = body.lstrip("\n")
+        offset = len(raw[: len(raw) - len(content)].encode("utf-8"))
+        content = content.rsplit("\n\n---\nRelated:", 1)[0]
+        chunk_index = str(meta.get("chunk_index", "")).strip()
+        entries.append(
+            {
+                "chunk_index": int(chunk_index)
+                if chunk_index.isdigit()
+                else file_number,
+                "file": entry,
+                "offset": offset,
+                "length": len(content.encode("utf-8")),
+                "section": _unquote(meta.get("section", "")),
+                "pages": _parse_int_list(meta.get("pages", "")),
+                "tokens": max(1, len(content) // 4),
+                "content": content,
+            }
+        )
+    write_index(doc_dir, entries)
+    logger.info(f"Built chunk index for {doc_dir} ({len(entries)} chunks)")
+
+
+def _unquote(value: str) -> str:
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+        return value[1:-1]
+    return value
+
+
+def _parse_int_list(value: str) -> list[int]:
+    return [int(p) for p in re.findall(r"\d+", value)]
+
+
+# ── Loading ────────────────────────────────────────────────────────────────
+
+_cache: "OrderedDict[str, tuple[float, DocumentIndex]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def load_index(doc_dir: str) -> Optional[DocumentIndex]:
+    """Return the (cached) index for *doc_dir*, building it if missing.
+
+    Returns None if the directory has no chunks.
+    """
+    path = os.path.join(doc_dir, INDEX_FILENAME)
+    try:
+        mtime = os.stat(path).st_mtime
+    except FileNotFoundError:
+        _rebuild_from_chunk_files(doc_dir)
+        mtime = os.stat(path).st_mtime
+
+    with _cache_lock:
+        cached = _cache.get(doc_dir)
+        if cached and cached[0] == mtime:
+            _cache.move_to_end(doc_dir)
+            return cached[1] if cached[1].chunks else None
+
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("version") != INDEX_VERSION:
+        _rebuild_from_chunk_files(doc_dir)
+        return load_index(doc_dir)
+
+    index = DocumentIndex(doc_dir, data)
+    with _cache_lock:
+        _cache[doc_dir] = (mtime, index)
+        _cache.move_to_end(doc_dir)
+        while len(_cache) > _MAX_CACHED_INDEXES:
+            _cache.popitem(last=False)
+    return index if index.chunks else None
@@ -0,0 +1,408 @@
+"""Tiered storage for per-run event streams.
+
+Every run appends to the Redis stream ``djinnbot:events:run:{run_id}``.
+Once a run has finished (completed/failed/cancelled) and a grace period
+has passed, the archiver moves its events to disk and trims Redis, so
+Redis only holds hot runs.
+
+On-disk layout (under DATA_DIR/archive/events/{sha1(run_id)[:2]}/):
+
+    {run_id}.seg        — append-only sequence of zlib-compressed blocks;
+                          each block is up to EVENTS_PER_BLOCK JSON lines
+                          of ``[stream_id, fields]``
+    {run_id}.idx.json   — block index: byte offset/length, event count and
+                          first/last stream ID per block
+
+Reads binary-search the index by stream ID and only decompress the
+blocks they need.  ``read_run_events()`` serves a range transparently
+from archive then Redis, so callers (run logs, step logs, SSE replay)
+don't need to know where a run's events live.
+"""
+
+import asyncio
+import bisect
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+import zlib
+from typing import Optional
+
+from app import dependencies
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+EVENT_ARCHIVE_DIR = os.path.join(os.getenv("DATA_DIR", "/jfs"), "archive", "events")
+
+# How long a finished run's stream stays in Redis before archival
+EVENT_ARCHIVE_GRACE_SECONDS = int(os.getenv("EVENT_ARCHIVE_GRACE_SECONDS", "3600"))
+EVENT_ARCHIVE_INTERVAL_SECONDS = int(
+    os.getenv("EVENT_ARCHIVE_INTERVAL_SECONDS", "300")
+)
+# Runs fetched per query while catching up
+EVENT_ARCHIVE_BATCH_RUNS = int(os.getenv("EVENT_ARCHIVE_BATCH_RUNS", "100"))
+# Passes a run whose archival keeps failing is retried in before giving up
+EVENT_ARCHIVE_MAX_ATTEMPTS = int(os.getenv("EVENT_ARCHIVE_MAX_ATTEMPTS", "5"))
+
+EVENTS_PER_BLOCK = 256
+# XRANGE page size when draining a stream
+_XRANGE_COUNT = 1000
+
+_TERMINAL_STATUSES = ("completed", "failed", "cancelled")
+_WATERMARK_KEY = "djinnbot:events:archive:watermark"
+_LOCK_KEY = "djinnbot:events:archive:lock"
+# run_id → failed attempts, for runs the watermark has already passed
+_RETRY_KEY = "djinnbot:events:archive:retry"
+_LOCK_TTL_SECONDS = 600
+
+# Release / extend the archiver lock only while we still own it
+_RELEASE_LOCK = (
+    "if redis.call('GET', KEYS[1]) == ARGV[1] then "
+    "return redis.call('DEL', KEYS[1]) end return 0"
+)
+_REFRESH_LOCK = (
+    "if redis.call('GET', KEYS[1]) == ARGV[1] then "
+    "return redis.call('EXPIRE', KEYS[1], ARGV[2]) end return 0"
+)
+
+# Delete the stream only if nothing was appended after the trim
+_DELETE_IF_EMPTY = (
+    "if redis.call('XLEN', KEYS[1]) == 0 then "
+    "return redis.call('DEL', KEYS[1]) end return 0"
+)
+
+INDEX_VERSION = 1
+
+
+def run_stream_key(run_id: str) -> str:
+    return f"djinnbot:events:run:{run_id}"
+
+
+def _parse_id(stream_id: str) -> tuple[int, int]:
+    ms, _, seq = stream_id.partition("-")
+    return int(ms), int(seq or 0)
+
+
+def _next_id(stream_id: str) -> str:
+    ms, seq = _parse_id(stream_id)
+    return f"{ms}-{seq + 1}"
+
+
+def _max_id(a: Optional[str], b: Optional[str]) -> Optional[str]:
+    if not a or a == "0":
+        return b
+    if not b:
+        return a
+    return a if _parse_id(a) >= _parse_id(b) else b
+
+
+class EventArchive:
+    """Compressed, append-only segment store for run event streams."""
+
+    def __init__(self, root: str):
+        self._root = root
+        self._lock = threading.Lock()
+
+    def _paths(self, run_id: str) -> tuple[str, str]:
+        shard = hashlib.sha1(run_id.encode("utf-8")).hexdigest()[:2]
+        base = os.path.join(self._root, shard, run_id)
+        return f"{base}.seg", f"{base}.idx.json"
+
+    def _load_index(self, run_id: str) -> Optional[dict]:
+        _, idx_path = self._paths(run_id)
+        try:
+            with open(idx_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+        except FileNotFoundError:
+            return None
+        if index.get("version") != INDEX_VERSION:
+            logger.warning(f"Unknown event archive index version for {run_id}")
+            return None
+        return index
+
+    def last_id(self, run_id: str) -> Optional[str]:
+        index = self._load_index(run_id)
+        return index["last_id"] if index else None
+
+    def append(self, run_id: str, messages: list[tuple[str, dict]]) -> None:
+        """Append stream entries (already ordered by ID) as new blocks.
+
+        The segment is written and fsynced before the index is atomically
+        replaced, so a crash can at worst leave unreferenced trailing bytes.
+        """
+        if not messages:
+            return
+        seg_path, idx_path = self._paths(run_id)
+        with self._lock:
+            index = self._load_index(run_id) or {
+                "version": INDEX_VERSION,
+                "count": 0,
+                "last_id": None,
+                "blocks": [],
+            }
+            if index["last_id"]:
+                # Never archive the same entry twice
+                floor = _parse_id(index["last_id"])
+                messages = [m for m in messages if _parse_id(m[0]) > floor]
+                if not messages:
+                    return
+
+            os.makedirs(os.path.dirname(seg_path), exist_ok=True)
+            with open(seg_path, "ab") as f:
+                for start in range(0, len(messages), EVENTS_PER_BLOCK):
+                    block = messages[start : start + EVENTS_PER_BLOCK]
+                    raw = "\n".join(
+                        json.dumps([msg_id, fields], separators=(",", ":"))
+                        for msg_id, fields in block
+                    ).encode("utf-8")
+                    compressed = zlib.compress(raw, 6)
+                    offset = f.tell()
+                    f.write(compressed)
+                    index["blocks"].append(
+                        {
+                            "offset": offset,
+                            "length": len(compressed),
+                            "count": len(block),
+                            "first_id": block[0][0],
+                            "last_id": block[-1][0],
+                        }
+                    )
+                    index["count"] += len(block)
+                f.flush()
+                os.fsync(f.fileno())
+
+            index["last_id"] = messages[-1][0]
+            tmp_path = f"{idx_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(index, f, separators=(",", ":"))
+            os.replace(tmp_path, idx_path)
+
+    def read(
+        self, run_id: str, after: Optional[str] = None, limit: Optional[int] = None
+    ) -> tuple[list[tuple[str, dict]], Optional[str]]:
+        """Return archived entries with ID > *after* (up to *limit*).
+
+        Also returns the archive's last ID so callers know where Redis
+        takes over.
+        """
+        index = self._load_index(run_id)
+        if not index or not index["blocks"]:
+            return [], None
+
+        blocks = index["blocks"]
+        start = 0
+        floor = None
+        if after and after != "0":
+            floor = _parse_id(after)
+            start = bisect.bisect_right(
+                [_parse_id(b["last_id"]) for b in blocks], floor
+            )
+
+        seg_path, _ = self._paths(run_id)
+        events: list[tuple[str, dict]] = []
+        with open(seg_path, "rb") as f:
+            for block in blocks[start:]:
+                f.seek(block["offset"])
+                raw = zlib.decompress(f.read(block["length"]))
+                for line in raw.split(b"\n"):
+                    msg_id, fields = json.loads(line)
+                    if floor is not None and _parse_id(msg_id) <= floor:
+                        continue
+                    events.append((msg_id, fields))
+                    if limit is not None and len(events) >= limit:
+                        return events, index["last_id"]
+        return events, index["last_id"]
+
+    def delete(self, run_id: str) -> None:
+        for path in self._paths(run_id):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+event_archive = EventArchive(EVENT_ARCHIVE_DIR)
+
+
+# ── Reading across tiers ───────────────────────────────────────────────────
+
+
+async def read_run_events(
+    run_id: str, after: Optional[str] = None, limit: Optional[int] = None
+) -> tuple[list[tuple[str, dict]], bool]:
+    """Read a run's events with ID > *after*, archive first then Redis.
+
+    Returns (entries, has_more).  Entries are ``(stream_id, fields)`` just
+    like XRANGE, so existing parsing code works unchanged.
+    """
+    fetch = limit + 1 if limit is not None else None
+    events, archive_last = await asyncio.to_thread(
+        event_archive.read, run_id, after, fetch
+    )
+    if limit is not None and len(events) > limit:
+        return events[:limit], True
+
+    # Continue in Redis strictly after whatever the archive holds — a
+    # stream may still contain entries the archiver hasn't trimmed yet.
+    cursor = _max_id(after, archive_last)
+    if dependencies.redis_client:
+        remaining = fetch - len(events) if fetch is not None else None
+        try:
+            messages = await dependencies.redis_client.xrange(
+                run_stream_key(run_id),
+                min=f"({cursor}" if cursor and cursor != "0" else "-",
+                max="+",
+                count=remaining,
+            )
+        except Exception as e:
+            logger.warning(f"Failed to read event stream for {run_id}: {e}")
+            messages = []
+        events.extend(messages)
+
+    if limit is not None and len(events) > limit:
+        return events[:limit], True
+    return events, False
+
+
+# ── Archiving ──────────────────────────────────────────────────────────────
+
+
+async def archive_run(run_id: str) -> int:
+    """Move a run's Redis stream into the archive and trim it.
+
+    Returns the number of entries archived.  Safe to call repeatedly.
+    """
+    redis = dependencies.redis_client
+    if not redis:
+        return 0
+
+    key = run_stream_key(run_id)
+    cursor = await asyncio.to_thread(event_archive.last_id, run_id)
+    archived = 0
+    while True:
+        messages = await redis.xrange(
+            key,
+            min=f"({cursor}" if cursor else "-",
+            max="+",
+            count=_XRANGE_COUNT,
+        )
+        if not messages:
+            break
+        await asyncio.to_thread(event_archive.append, run_id, messages)
+        archived += len(messages)
+        cursor = messages[-1][0]
+
+    if cursor:
+        # Drop everything up to and including the last archived entry
+        await redis.xtrim(key, minid=_next_id(cursor), approximate=False)
+        await redis.eval(_DELETE_IF_EMPTY, 1, key)
+    return archived
+
+
+async def _archive_one(run_id: str) -> bool:
+    """Archive one run; on failure record it in the retry set."""
+    redis = dependencies.redis_client
+    try:
+        archived = await archive_run(run_id)
+    except Exception as e:
+        # Leave the stream in Redis; reads still work from there
+        attempts = await redis.hincrby(_RETRY_KEY, run_id, 1)
+        if attempts >= EVENT_ARCHIVE_MAX_ATTEMPTS:
+            await redis.hdel(_RETRY_KEY, run_id)
+            logger.error(
+                f"Giving up archiving events for run {run_id} after "
+                f"{attempts} attempts: {e}"
+            )
+        else:
+            logger.warning(f"Failed to archive events for run {run_id}: {e}")
+        return False
+    await redis.hdel(_RETRY_KEY, run_id)
+    if archived:
+        logger.debug(f"Archived {archived} events for run {run_id}")
+    return bool(archived)
+
+
+async def archive_finished_runs() -> int:
+    """Archive streams of runs that finished more than the grace period ago.
+
+    Progress is tracked with a (finished_at, run_id) watermark in Redis so
+    each pass only looks at newly-finished runs.  Runs whose archival
+    failed are kept in a retry set and retried first on later passes.
+    Returns runs archived.
+    """
+    from sqlalchemy import and_, func, or_, select
+
+    from app.database import AsyncSessionLocal
+    from app.models.run import Run
+
+    redis = dependencies.redis_client
+    if not redis:
+        return 0
+    # One archiver across all API workers
+    token = f"{os.getpid()}:{uuid.uuid4().hex}"
+    if not await redis.set(_LOCK_KEY, token, nx=True, ex=_LOCK_TTL_SECONDS):
+        return 0
+
+    async def still_locked() -> bool:
+        return bool(
+            await redis.eval(_REFRESH_LOCK, 1, _LOCK_KEY, token, _LOCK_TTL_SECONDS)
+        )
+
+    try:
+        count = 0
+        for run_id in await redis.hkeys(_RETRY_KEY):
+            if await _archive_one(run_id):
+                count += 1
+            if not await still_locked():
+                return count
+
+        cutoff = int(time.time() * 1000) - EVENT_ARCHIVE_GRACE_SECONDS * 1000
+        finished_at = func.coalesce(Run.completed_at, Run.updated_at)
+        while True:
+            watermark = await redis.get(_WATERMARK_KEY)
+            wm_at, _, wm_id = (watermark or "0:").partition(":")
+            async with AsyncSessionLocal() as session:
+                result = await session.execute(
+                    select(Run.id, finished_at)
+                    .where(Run.status.in_(_TERMINAL_STATUSES))
+                    .where(finished_at <= cutoff)
+                    .where(
+                        or_(
+                            finished_at > int(wm_at),
+                            and_(finished_at == int(wm_at), Run.id > wm_id),
+                        )
+                    )
+                    .order_by(finished_at, Run.id)
+                    .limit(EVENT_ARCHIVE_BATCH_RUNS)
+                )
+                rows = result.all()
+
+            for run_id, run_finished_at in rows:
+                if await _archive_one(run_id):
+                    count += 1
+                # Failed runs are in the retry set, so the watermark can move on
+                await redis.set(_WATERMARK_KEY, f"{run_finished_at}:{run_id}")
+                if not await still_locked():
+                    logger.warning("Event archiver lock lost; stopping this pass")
+                    return count
+
+            if len(rows) < EVENT_ARCHIVE_BATCH_RUNS:
+                return count
+    finally:
+        await redis.eval(_RELEASE_LOCK, 1, _LOCK_KEY, token)
+
+
+async def periodic_event_archiver() -> None:
+    """Background task: archive finished runs' event streams."""
+    await asyncio.sleep(60)
+    while True:
+        try:
+            count = await archive_finished_runs()
+            if count:
+                logger.info(f"Archived event streams for {count} finished runs")
+        except Exception as e:
+            logger.error(f"Event archiver pass failed: {e}")
+        await asyncio.sleep(EVENT_ARCHIVE_INTERVAL_SECONDS)
@@ -0,0 +1,452 @@
+"""Multiplexed event gateway behind the dashboard's single WebSocket.
+
+The dashboard used to hold one SSE connection per live view (global
+pipeline events, a run, sessions, chat sessions, work locks, lifecycle,
+LLM calls, ...), each with its own Redis subscription and heartbeat loop.
+``/v1/events/ws`` replaces them with one WebSocket per client on which
+topics are subscribed and unsubscribed with small JSON messages:
+
+    {"op": "subscribe", "topic": "run:run_123", "since": "1712-0"}
+    {"op": "unsubscribe", "topic": "run:run_123"}
+
+Redis is read once per process, not once per client: EventGateway runs a
+single XREAD over every subscribed stream key and a single pub/sub
+connection for every subscribed channel, and fans each event out to the
+matching subscriptions.  Stream topics accept ``since`` to resume after a
+stream ID without gaps (see GatewaySubscription.hold).
+
+Each connection has a bounded outbound queue: a client that falls more
+than GATEWAY_QUEUE_MESSAGES behind loses its oldest messages and is told
+how many per topic, instead of slowing the readers for everyone.  Queued
+messages are sent in batches as binary frames — a one-byte header
+(FRAME_JSON or FRAME_DEFLATE) followed by a JSON array, zlib-compressed
+when larger than GATEWAY_COMPRESS_MIN_BYTES.  Idle connections are kept
+alive by the server's WebSocket ping, not by per-topic heartbeats.
+"""
+
+import asyncio
+import json
+import os
+import zlib
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from app import dependencies
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+GATEWAY_QUEUE_MESSAGES = int(os.getenv("GATEWAY_QUEUE_MESSAGES", "2000"))
+GATEWAY_BATCH_MAX = int(os.getenv("GATEWAY_BATCH_MAX", "500"))
+GATEWAY_COMPRESS_MIN_BYTES = int(os.getenv("GATEWAY_COMPRESS_MIN_BYTES", "1024"))
+GATEWAY_MAX_TOPICS = int(os.getenv("GATEWAY_MAX_TOPICS", "64"))
+
+FRAME_JSON = b"\x00"
+FRAME_DEFLATE = b"\x01"
+
+_READ_COUNT = 500
+_BLOCK_MS = 1000
+_BACKFILL_PAGE = 500
+
+Match = Optional[Callable[[dict], bool]]
+
+
+@dataclass(frozen=True)
+class TopicSource:
+    kind: str  # "stream" or "channel"
+    key: str
+    match: Match = None
+
+
+def _agent_filter(agent_id: str) -> Callable[[dict], bool]:
+    return lambda data: data.get("agentId") == agent_id
+
+
+def resolve_topic(topic: str) -> Optional[list[TopicSource]]:
+    """Redis sources for a topic name, or None if it is not a known topic."""
+    from app.services.live_events import live_stream_key
+
+    name, _, arg = topic.partition(":")
+    if name == "global" and not arg:
+        return [TopicSource("stream", "djinnbot:events:global")]
+    if name == "run" and arg:
+        return [TopicSource("stream", f"djinnbot:events:run:{arg}")]
+    if name == "sessions":
+        key = live_stream_key("djinnbot:sessions:live")
+        return [TopicSource("stream", key, _agent_filter(arg) if arg else None)]
+    if name == "chat-sessions" and not arg:
+        key = live_stream_key("djinnbot:chat:sessions:live")
+        return [TopicSource("stream", key)]
+    if name == "work-locks" and arg:
+        channel = f"djinnbot:agent:{arg}:work_locks:live"
+        return [TopicSource("stream", live_stream_key(channel))]
+    if name == "lifecycle" and not arg:
+        return [TopicSource("channel", "djinnbot:events:lifecycle")]
+    if name == "llm-calls" and not arg:
+        return [TopicSource("channel", "djinnbot:llm-calls:live")]
+    if name == "activity" and arg:
+        return [
+            TopicSource("channel", f"djinnbot:agent:{arg}:activity:live"),
+            TopicSource("channel", "djinnbot:events:lifecycle", _agent_filter(arg)),
+        ]
+    return None
+
+
+def _stream_id(entry_id: str) -> tuple[int, int]:
+    ms, _, seq = entry_id.partition("-")
+    return int(ms), int(seq or 0)
+
+
+_RUN_STREAM_PREFIX = "djinnbot:events:run:"
+
+
+def _run_id(key: str) -> Optional[str]:
+    """The run ID if *key* is a run's event stream."""
+    if key.startswith(_RUN_STREAM_PREFIX):
+        return key[len(_RUN_STREAM_PREFIX) :]
+    return None
+
+
+def _message(topic: str, event_id: Optional[str], data_json: str) -> str:
+    # data_json is already-validated JSON: embed it without re-encoding
+    if event_id:
+        return f'{{"topic":{json.dumps(topic)},"id":"{event_id}","data":{data_json}}}'
+    return f'{{"topic":{json.dumps(topic)},"data":{data_json}}}'
+
+
+class GatewaySubscription:
+    """One topic source subscribed by one connection."""
+
+    def __init__(self, conn: "GatewayConnection", topic: str, source: TopicSource):
+        self.conn = conn
+        self.topic = topic
+        self.source = source
+        # While a stream backfill is in flight, live entries are held here
+        # and released after the backfill by EventGateway._add_stream_from
+        self.hold: Optional[list[tuple[str, str]]] = None
+
+    def deliver(self, event_id: Optional[str], data_json: str) -> None:
+        if self.hold is not None:
+            self.hold.append((event_id, data_json))
+        else:
+            self.conn.offer(self.topic, _message(self.topic, event_id, data_json))
+
+
+class GatewayConnection:
+    """Outbound queue and batching for one WebSocket client."""
+
+    def __init__(self, max_messages: int = GATEWAY_QUEUE_MESSAGES):
+        self.topics: dict[str, list[GatewaySubscription]] = {}
+        self._queue: deque[tuple[str, str]] = deque()
+        self._max = max_messages
+        self._ready = asyncio.Event()
+        self._dropped: dict[str, int] = {}
+
+    def offer(self, topic: str, message: str) -> None:
+        if len(self._queue) >= self._max:
+            old_topic, _ = self._queue.popleft()
+            if old_topic:
+                self._dropped[old_topic] = self._dropped.get(old_topic, 0) + 1
+        self._queue.append((topic, message))
+        self._ready.set()
+
+    def control(self, payload: dict) -> None:
+        """Queue a control message (never counted as dropped)."""
+        self.offer("", json.dumps(payload))
+
+    async def next_frame(self) -> bytes:
+        """Wait for queued messages and encode up to GATEWAY_BATCH_MAX of them."""
+        while not self._queue and not self._dropped:
+            self._ready.clear()
+            await self._ready.wait()
+        messages = [
+            json.dumps({"op": "dropped", "topic": topic, "count": count})
+            for topic, count in self._dropped.items()
+        ]
+        self._dropped.clear()
+        while self._queue and len(messages) < GATEWAY_BATCH_MAX:
+            messages.append(self._queue.popleft()[1])
+        body = ("[" + ",".join(messages) + "]").encode("utf-8")
+        if len(body) >= GATEWAY_COMPRESS_MIN_BYTES:
+            return FRAME_DEFLATE + zlib.compress(body, 6)
+        return FRAME_JSON + body
+
+
+class EventGateway:
+    """Process-wide shared Redis readers fanned out to gateway connections."""
+
+    def __init__(self) -> None:
+        self._streams: dict[str, set[GatewaySubscription]] = {}
+        self._stream_ids: dict[str, str] = {}
+        self._channels: dict[str, set[GatewaySubscription]] = {}
+        self._pubsub = None
+        self._stream_task: Optional[asyncio.Task] = None
+        self._channel_task: Optional[asyncio.Task] = None
+        self._streams_changed = asyncio.Event()
+        self._channels_changed = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._connections: set[GatewayConnection] = set()
+        self._events_in = 0
+
+    # ── Connections & subscriptions ──────────────────────────────────────
+
+    def connect(self) -> GatewayConnection:
+        conn = GatewayConnection()
+        self._connections.add(conn)
+        return conn
+
+    async def disconnect(self, conn: GatewayConnection) -> None:
+        for topic in list(conn.topics):
+            await self.unsubscribe(conn, topic)
+        self._connections.discard(conn)
+
+    async def subscribe(
+        self, conn: GatewayConnection, topic: str, since: Optional[str] = None
+    ) -> None:
+        """Subscribe *conn* to *topic* (raises ValueError if invalid)."""
+        if topic in conn.topics:
+            return
+        sources = resolve_topic(topic)
+        if sources is None:
+            raise ValueError(f"Unknown topic: {topic}")
+        if len(conn.topics) >= GATEWAY_MAX_TOPICS:
+            raise ValueError("Too many topics")
+        if since is not None:
+            try:
+                _stream_id(since)
+            except ValueError:
+                raise ValueError(f"Invalid since: {since}")
+
+        subs = [GatewaySubscription(conn, topic, source) for source in sources]
+        conn.topics[topic] = subs
+        for sub in subs:
+            if sub.source.kind == "channel":
+                await self._add_channel(sub)
+            elif since is None:
+                await self._add_stream(sub)
+            else:
+                await self._add_stream_from(sub, since)
+        self._ensure_tasks()
+
+    async def unsubscribe(self, conn: GatewayConnection, topic: str) -> None:
+        for sub in conn.topics.pop(topic, []):
+            if sub.source.kind == "channel":
+                await self._remove_channel(sub)
+            else:
+                self._remove_stream(sub)
+
+    async def _add_stream(self, sub: GatewaySubscription) -> Optional[str]:
+        """Register a stream subscription; returns the reader's position."""
+        key = sub.source.key
+        if key not in self._streams:
+            # Pin the starting point so the shared reader misses nothing
+            latest = await dependencies.redis_client.xrevrange(key, "+", "-", count=1)
+            if key not in self._streams:
+                self._streams[key] = set()
+                self._stream_ids[key] = latest[0][0] if latest else "0-0"
+                self._streams_changed.set()
+        self._streams[key].add(sub)
+        return self._stream_ids[key]
+
+    async def _add_stream_from(self, sub: GatewaySubscription, since: str) -> None:
+        """Register a stream subscription and backfill entries after *since*."""
+        sub.hold = []
+        pin = await self._add_stream(sub)
+        run_id = _run_id(sub.source.key)
+        if run_id is not None:
+            # A finished run's stream may already be archived and deleted
+            # (pin "0-0"): backfill up to the archive's last entry too
+            from app.services.event_archive import event_archive
+
+            try:
+                archived = await asyncio.to_thread(event_archive.last_id, run_id)
+            except Exception as e:
+                logger.warning(f"Gateway archive lookup for {run_id} failed: {e}")
+                archived = None
+            if archived and _stream_id(archived) > _stream_id(pin):
+                pin = archived
+        try:
+            async for entry_id, data_json in self._read_range(sub.source, since, pin):
+                sub.conn.offer(sub.topic, _message(sub.topic, entry_id, data_json))
+        except Exception as e:
+            logger.warning(f"Gateway backfill of {sub.source.key} failed: {e}")
+        # No awaits from here on: held live entries follow the backfill
+        held, sub.hold = sub.hold, None
+        for entry_id, data_json in held:
+            sub.deliver(entry_id, data_json)
+
+    async def _read_range(self, source: TopicSource, since: str, until: str):
+        """(id, data) for entries in (since, until], in order."""
+        if _stream_id(since) >= _stream_id(until):
+            return
+        last = _stream_id(until)
+        run_id = _run_id(source.key)
+        after = since
+        while True:
+            if run_id is not None:
+                # Finished runs may have been moved to the on-disk archive
+                from app.services.event_archive import read_run_events
+
+                entries, has_more = await read_run_events(
+                    run_id, after=after, limit=_BACKFILL_PAGE
+                )
+            else:
+                ms, seq = _stream_id(after)
+                entries = await dependencies.redis_client.xrange(
+                    source.key, f"{ms}-{seq + 1}", until, count=_BACKFILL_PAGE
+                )
+                has_more = len(entries) == _BACKFILL_PAGE
+            for entry_id, fields in entries:
+                if _stream_id(entry_id) > last:
+                    return
+                after = entry_id
+                data_json = self._accept(source, fields.get("data", ""))
+                if data_json is not None:
+                    yield entry_id, data_json
+            if not has_more or not entries:
+                return
+
+    def _remove_stream(self, sub: GatewaySubscription) -> None:
+        key = sub.source.key
+        subs = self._streams.get(key)
+        if subs is None:
+            return
+        subs.discard(sub)
+        if not subs:
+            del self._streams[key]
+            self._stream_ids.pop(key, None)
+
+    async def _add_channel(self, sub: GatewaySubscription) -> None:
+        async with self._lock:
+            channel = sub.source.key
+            if channel not in self._channels:
+                if self._pubsub is None:
+                    self._pubsub = dependencies.redis_client.pubsub()
+                await self._pubsub.subscribe(channel)
+                self._channels[channel] = set()
+                self._channels_changed.set()
+            self._channels[channel].add(sub)
+
+    async def _remove_channel(self, sub: GatewaySubscription) -> None:
+        async with self._lock:
+            channel = sub.source.key
+            subs = self._channels.get(channel)
+            if subs is None:
+                return
+            subs.discard(sub)
+            if not subs:
+                del self._channels[channel]
+                try:
+                    await self._pubsub.unsubscribe(channel)
+                except Exception as e:
+                    logger.warning(f"Gateway unsubscribe from {channel} failed: {e}")
+
+    # ── Shared readers ───────────────────────────────────────────────────
+
+    def _ensure_tasks(self) -> None:
+        if self._stream_task is None or self._stream_task.done():
+            self._stream_task = asyncio.create_task(self._read_streams())
+        if self._channel_task is None or self._channel_task.done():
+            self._channel_task = asyncio.create_task(self._read_channels())
+
+    @staticmethod
+    def _accept(source: TopicSource, data_str: str) -> Optional[str]:
+        """data_str if it is a JSON object passing the source's filter."""
+        try:
+            data = json.loads(data_str)
+        except (json.JSONDecodeError, TypeError):
+            return None
+        if not isinstance(data, dict):
+            return None
+        if source.match is not None and not source.match(data):
+            return None
+        return data_str
+
+    def _fan_out(
+        self, subs: set[GatewaySubscription], entry_id: Optional[str], data_str: str
+    ) -> None:
+        # Decoded once per event (not per subscriber) to validate and filter
+        self._events_in += 1
+        try:
+            data = json.loads(data_str)
+        except (json.JSONDecodeError, TypeError):
+            return
+        if not isinstance(data, dict):
+            return
+        for sub in list(subs):
+            if sub.source.match is None or sub.source.match(data):
+                sub.deliver(entry_id, data_str)
+
+    async def _read_streams(self) -> None:
+        while True:
+            if not self._streams:
+                self._streams_changed.clear()
+                await self._streams_changed.wait()
+                continue
+            try:
+                response = await dependencies.redis_client.xread(
+                    dict(self._stream_ids), count=_READ_COUNT, block=_BLOCK_MS
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Gateway stream read error: {e}")
+                await asyncio.sleep(2)
+                continue
+            for key, messages in response or []:
+                subs = self._streams.get(key)
+                if subs is None or not messages:
+                    continue
+                self._stream_ids[key] = messages[-1][0]
+                for entry_id, fields in messages:
+                    self._fan_out(subs, entry_id, fields.get("data", ""))
+
+    async def _read_channels(self) -> None:
+        while True:
+            if not self._channels:
+                self._channels_changed.clear()
+                await self._channels_changed.wait()
+                continue
+            try:
+                message = await self._pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=1.0
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Gateway pub/sub read error: {e}")
+                await asyncio.sleep(2)
+                continue
+            if not message or message["type"] != "message":
+                continue
+            subs = self._channels.get(message["channel"])
+            if subs:
+                self._fan_out(subs, None, message["data"])
+
+    def stats(self) -> dict:
+        return {
+            "connections": len(self._connections),
+            "streams": {key: len(subs) for key, subs in self._streams.items()},
+            "channels": {key: len(subs) for key, subs in self._channels.items()},
+            "eventsIn": self._events_in,
+        }
+
+    async def shutdown(self) -> None:
+        for task in (self._stream_task, self._channel_task):
+            if task is not None:
+                task.cancel()
+        await asyncio.gather(
+            *(t for t in (self._stream_task, self._channel_task) if t),
+            return_exceptions=True,
+        )
+        self._stream_task = self._channel_task = None
+        if self._pubsub is not None:
+            try:
+                await self._pubsub.aclose()
+            except Exception:
+                pass
+            self._pubsub = None
+
+
+event_gateway = EventGateway()
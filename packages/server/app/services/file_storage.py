@@ -1,15 +1,35 @@
 """File storage service for chat attachments.
 
 Stores uploaded files on the local filesystem under DATA_DIR/uploads/.
-Files are organized by session: uploads/{session_id}/{attachment_id}_{filename}
+
+File bytes live in a content-addressed blob store keyed by SHA-256 and
+sharded two levels deep so no single directory grows unbounded:
+
+    uploads/blobs/{sha[0:2]}/{sha[2:4]}/{sha}        — the bytes
+    uploads/blobs/{sha[0:2]}/{sha[2:4]}/{sha}.refs   — reference count
+    uploads/blobs/{sha[0:2]}/{sha[2:4]}/.lock        — refcount lock (never removed)
+
+Each attachment also drops a tiny ref marker in its session directory
+(uploads/{session_id}/{attachment_id}.ref) holding the blob hash, so
+deleting a session releases exactly the blobs it referenced.  Uploading
+the same document to many sessions stores the bytes once.
+
+Legacy rows whose storage_path is uploads/{session_id}/{attachment_id}_{filename}
+are still readable — every read helper resolves storage_path relative to
+UPLOAD_DIR regardless of layout.
 
 A future iteration can swap this for S3-compatible storage via the
 STORAGE_PROVIDER env var without changing the caller interface.
 """
 
+import asyncio
+import fcntl
+import hashlib
 import os
 import shutil
-from typing import Optional
+import tempfile
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional
 
 from app.logging_config import get_logger
 
@@ -21,26 +41,179 @@ UPLOAD_DIR = os.path.join(
     "uploads",
 )
 
+BLOB_DIR_NAME = "blobs"
+BLOB_LOCK_NAME = ".lock"
+
+# Chunk size used when streaming uploads to disk
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+
+class FileTooLargeError(ValueError):
+    """Raised when a streamed upload exceeds the caller's size limit."""
+
+    def __init__(self, size_bytes: int, max_bytes: int):
+        super().__init__(f"File too large ({size_bytes} bytes, max {max_bytes})")
+        self.size_bytes = size_bytes
+        self.max_bytes = max_bytes
+
+
+@dataclass
+class StoredFile:
+    """Result of writing an attachment into the blob store."""
+
+    storage_path: str  # Relative to UPLOAD_DIR (blobs/ab/cd/<sha>)
+    sha256: str
+    size_bytes: int
+    deduplicated: bool  # True if the blob already existed
+
 
 def _ensure_dir(path: str) -> None:
     os.makedirs(path, exist_ok=True)
 
 
+def _blob_rel_path(sha256: str) -> str:
+    return os.path.join(BLOB_DIR_NAME, sha256[:2], sha256[2:4], sha256)
+
+
+def _ref_marker_path(session_id: str, attachment_id: str) -> str:
+    return os.path.join(UPLOAD_DIR, session_id, f"{attachment_id}.ref")
+
+
+def _adjust_refcount(sha256: str, delta: int) -> int:
+    """Atomically add *delta* to a blob's refcount and return the new value.
+
+    Concurrent uploads/deletes of the same content serialize on an flock of
+    the shard's .lock file.  That file is never removed, so the lock can't
+    end up on an unlinked inode; the .refs sidecar and the blob itself are
+    deleted (under the lock) when the count drops to zero.
+    """
+    blob_path = os.path.join(UPLOAD_DIR, _blob_rel_path(sha256))
+    refs_path = f"{blob_path}.refs"
+    shard_dir = os.path.dirname(blob_path)
+    _ensure_dir(shard_dir)
+    with open(os.path.join(shard_dir, BLOB_LOCK_NAME), "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            try:
+                with open(refs_path) as f:
+                    raw = f.read().strip()
+            except FileNotFoundError:
+                raw = ""
+            count = max(0, (int(raw) if raw.isdigit() else 0) + delta)
+            if count == 0:
+                for path in (blob_path, refs_path):
+                    try:
+                        os.remove(path)
+                    except FileNotFoundError:
+                        pass
+            else:
+                with open(refs_path, "w") as f:
+                    f.write(str(count))
+            return count
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _commit_blob(
+    tmp_path: str, sha256: str, size: int, session_id: str, attachment_id: str
+) -> StoredFile:
+    """Move a fully-written temp file into the blob store and take a reference."""
+    rel_path = _blob_rel_path(sha256)
+    abs_path = os.path.join(UPLOAD_DIR, rel_path)
+    _ensure_dir(os.path.dirname(abs_path))
+
+    # Take the reference first so a concurrent release can't delete the
+    # blob between the existence check and the marker write.
+    refcount = _adjust_refcount(sha256, 1)
+    deduplicated = os.path.isfile(abs_path)
+    if deduplicated:
+        os.remove(tmp_path)
+    else:
+        os.replace(tmp_path, abs_path)
+
+    marker = _ref_marker_path(session_id, attachment_id)
+    _ensure_dir(os.path.dirname(marker))
+    with open(marker, "w") as f:
+        f.write(sha256)
+
+    logger.debug(
+        f"Stored attachment {attachment_id} ({size} bytes) at {rel_path} "
+        f"(refs={refcount}, dedup={deduplicated})"
+    )
+    return StoredFile(
+        storage_path=rel_path,
+        sha256=sha256,
+        size_bytes=size,
+        deduplicated=deduplicated,
+    )
+
+
+def _new_temp_file() -> tuple[int, str]:
+    tmp_dir = os.path.join(UPLOAD_DIR, BLOB_DIR_NAME, "tmp")
+    _ensure_dir(tmp_dir)
+    return tempfile.mkstemp(dir=tmp_dir, prefix="upload-")
+
+
+def _discard_temp_file(tmp_path: str) -> None:
+    try:
+        os.remove(tmp_path)
+    except FileNotFoundError:
+        pass
+
+
 def store_file(
     session_id: str,
     attachment_id: str,
     filename: str,
     data: bytes,
 ) -> str:
-    """Write *data* to disk and return the relative storage path."""
-    safe_filename = filename.replace("/", "_").replace("\\", "_").replace("..", "_")
-    rel_path = os.path.join(session_id, f"{attachment_id}_{safe_filename}")
-    abs_path = os.path.join(UPLOAD_DIR, rel_path)
-    _ensure_dir(os.path.dirname(abs_path))
-    with open(abs_path, "wb") as f:
-        f.write(data)
-    logger.debug(f"Stored attachment {attachment_id} ({len(data)} bytes) at {rel_path}")
-    return rel_path
+    """Write *data* to the blob store and return the relative storage path.
+
+    *filename* is kept for interface compatibility; blobs are named by hash.
+    """
+    sha256 = hashlib.sha256(data).hexdigest()
+    fd, tmp_path = _new_temp_file()
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        return _commit_blob(
+            tmp_path, sha256, len(data), session_id, attachment_id
+        ).storage_path
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+async def store_stream(
+    session_id: str,
+    attachment_id: str,
+    chunks: AsyncIterator[bytes],
+    max_size: Optional[int] = None,
+) -> StoredFile:
+    """Stream *chunks* to disk while hashing, then commit into the blob store.
+
+    The body is never held in memory as a whole.  Raises FileTooLargeError
+    (and discards the partial write) as soon as *max_size* is exceeded.
+    Disk writes and the refcount flock run in worker threads.
+    """
+    hasher = hashlib.sha256()
+    size = 0
+    fd, tmp_path = await asyncio.to_thread(_new_temp_file)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            async for chunk in chunks:
+                size += len(chunk)
+                if max_size is not None and size > max_size:
+                    raise FileTooLargeError(size, max_size)
+                hasher.update(chunk)
+                await asyncio.to_thread(f.write, chunk)
+        return await asyncio.to_thread(
+            _commit_blob, tmp_path, hasher.hexdigest(), size, session_id, attachment_id
+        )
+    except BaseException:
+        await asyncio.to_thread(_discard_temp_file, tmp_path)
+        raise
 
 
 def read_file(storage_path: str) -> Optional[bytes]:
@@ -52,8 +225,27 @@ def read_file(storage_path: str) -> Optional[bytes]:
         return f.read()
 
 
+def release_file(session_id: str, attachment_id: str) -> bool:
+    """Drop one attachment's reference to its blob.  Returns True if it had one."""
+    marker = _ref_marker_path(session_id, attachment_id)
+    try:
+        with open(marker) as f:
+            sha256 = f.read().strip()
+        os.remove(marker)
+    except FileNotFoundError:
+        return False
+    if sha256:
+        _adjust_refcount(sha256, -1)
+    return True
+
+
 def delete_file(storage_path: str) -> bool:
-    """Delete a single file.  Returns True if it existed."""
+    """Delete a legacy per-session file.  Returns True if it existed.
+
+    Blob-store paths are shared and must be released via release_file().
+    """
+    if storage_path.startswith(BLOB_DIR_NAME + os.sep):
+        return False
     abs_path = os.path.join(UPLOAD_DIR, storage_path)
     if os.path.isfile(abs_path):
         os.remove(abs_path)
@@ -62,11 +254,17 @@ def delete_file(storage_path: str) -> bool:
 
 
 def delete_session_files(session_id: str) -> int:
-    """Delete all files for a session.  Returns count of files removed."""
+    """Release all blobs and legacy files for a session.  Returns count removed."""
     session_dir = os.path.join(UPLOAD_DIR, session_id)
     if not os.path.isdir(session_dir):
         return 0
-    count = sum(1 for _ in os.scandir(session_dir) if _.is_file())
+    count = 0
+    for entry in os.scandir(session_dir):
+        if not entry.is_file():
+            continue
+        if entry.name.endswith(".ref"):
+            release_file(session_id, entry.name[: -len(".ref")])
+        count += 1
     shutil.rmtree(session_dir, ignore_errors=True)
     return count
 
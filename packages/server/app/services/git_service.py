@@ -0,0 +1,161 @@
+"""Async git runner for the workspace endpoints.
+
+Every git invocation runs on a bounded thread pool (GIT_WORKERS) so the
+event loop never blocks on a ``git`` process, and a burst of dashboard
+viewers can't spawn unbounded processes.
+
+Operations that change a repository (merge, rebase, push) hold that
+repository's lock for their whole sequence of commands, so two requests
+can't interleave checkouts in the same workspace.  Reads don't take the
+lock; they run with ``--no-optional-locks`` so they never hold index.lock
+against a concurrent merge.
+
+Output that is addressed by a commit hash (``git show <hash>``, the diff
+and numstat of a commit, a file at a commit) can never change, so it is
+memoized in an LRU bounded by entry count and total size.  Revisions
+that can move (HEAD, branch names) are never cached.
+"""
+
+import asyncio
+import os
+import re
+import subprocess
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, Union
+
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+GIT_WORKERS = int(os.getenv("GIT_WORKERS", "8"))
+GIT_CACHE_MAX_ENTRIES = int(os.getenv("GIT_CACHE_MAX_ENTRIES", "2048"))
+GIT_CACHE_MAX_BYTES = int(os.getenv("GIT_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+_OBJECT_ID_RE = re.compile(r"^[a-f0-9]{7,40}$")
+
+RepoPath = Union[str, Path]
+
+
+def is_object_id(rev: str) -> bool:
+    """True for an (abbreviated) commit hash, i.e. a revision that can't move."""
+    return bool(_OBJECT_ID_RE.match(rev))
+
+
+class GitService:
+    """Runs git commands off the event loop with per-repo write locks."""
+
+    def __init__(self, workers: int, cache_entries: int, cache_bytes: int):
+        self._workers = workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = (
+            weakref.WeakValueDictionary()
+        )
+        self._cache: OrderedDict[tuple, str] = OrderedDict()
+        self._cache_bytes = 0
+        self._max_entries = cache_entries
+        self._max_bytes = cache_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def _ensure_started(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._workers, thread_name_prefix="git"
+            )
+        return self._executor
+
+    async def run(
+        self,
+        repo: RepoPath,
+        *args: str,
+        check: bool = True,
+        env: Optional[dict] = None,
+        timeout: Optional[float] = None,
+    ) -> subprocess.CompletedProcess:
+        """Run ``git <args>`` in *repo* and return the completed process.
+
+        Output is decoded as text.  With ``check=True`` a non-zero exit
+        raises subprocess.CalledProcessError, like ``subprocess.run``.
+        """
+        cmd = ["git", "--no-optional-locks", *args]
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._ensure_started(),
+            lambda: subprocess.run(
+                cmd,
+                cwd=repo,
+                capture_output=True,
+                text=True,
+                check=check,
+                env=env,
+                timeout=timeout,
+            ),
+        )
+
+    async def read_object(self, repo: RepoPath, rev: str, *args: str) -> str:
+        """stdout of ``git <args>``, memoized when *rev* is a commit hash.
+
+        *rev* is the revision the command is addressed by; it only decides
+        whether the result is immutable and may be cached.
+        """
+        if not is_object_id(rev):
+            return (await self.run(repo, *args)).stdout
+
+        key = (str(Path(repo).resolve()), args)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        output = (await self.run(repo, *args)).stdout
+        self._remember(key, output)
+        return output
+
+    def _remember(self, key: tuple, output: str) -> None:
+        size = len(output)
+        if size > self._max_bytes:
+            return
+        previous = self._cache.pop(key, None)
+        if previous is not None:
+            self._cache_bytes -= len(previous)
+        self._cache[key] = output
+        self._cache_bytes += size
+        while self._cache and (
+            len(self._cache) > self._max_entries or self._cache_bytes > self._max_bytes
+        ):
+            _, evicted = self._cache.popitem(last=False)
+            self._cache_bytes -= len(evicted)
+
+    def repo_lock(self, repo: RepoPath) -> asyncio.Lock:
+        """Lock serialising mutating operations on one repository."""
+        key = str(Path(repo).resolve())
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[key] = lock
+        return lock
+
+    def stats(self) -> dict:
+        return {
+            "workers": self._workers,
+            "cache_entries": len(self._cache),
+            "cache_bytes": self._cache_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "locked_repos": sum(1 for lock in self._locks.values() if lock.locked()),
+        }
+
+    async def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._cache.clear()
+        self._cache_bytes = 0
+
+
+git_service = GitService(GIT_WORKERS, GIT_CACHE_MAX_ENTRIES, GIT_CACHE_MAX_BYTES)
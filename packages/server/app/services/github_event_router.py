@@ -1,17 +1,44 @@
-"""GitHub webhook event router — maps events to agent assignments."""
+"""GitHub webhook event router — maps events to agent assignments.
 
+Routing uses an in-memory table (repository → project → assignments per
+event type) with label sets, author sets and file-pattern regexes compiled
+once at load time, so matching an event is a few dict lookups.  The table
+is reloaded lazily after ``await routing_table.invalidate()`` (called by
+writers after committing, and broadcast on ROUTING_INVALIDATE_CHANNEL to
+every worker) or once it is older than ROUTING_TABLE_TTL_SECONDS.
+"""
+
+import asyncio
 import json
+import os
+import re
+import time
 import uuid
 import fnmatch
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timezone
 
-from app.db import get_db
+from sqlalchemy import select
+
 from app import dependencies
 from app.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+ROUTING_INVALIDATE_CHANNEL = "djinnbot:github:routing:invalidate"
+
+# Upper bound on staleness when an invalidation message is missed
+ROUTING_TABLE_TTL_SECONDS = float(os.getenv("ROUTING_TABLE_TTL_SECONDS", "300"))
+# An unknown repository triggers a reload at most this often (newly linked
+# repositories are picked up without waiting for the TTL)
+_MISS_RELOAD_SECONDS = 10.0
+
+_GITHUB_REPO_RE = re.compile(
+    r"^(?:https?://(?:[^@/]+@)?github\.com/|git@github\.com:|ssh://git@github\.com/)"
+    r"([^/]+/[^/]+?)(?:\.git)?/?$",
+    re.IGNORECASE,
+)
+
 
 # Event type mapping: GitHub event+action -> DjinnBot event type
 EVENT_TYPE_MAP = {
@@ -61,6 +88,220 @@ EVENT_TYPE_MAP = {
 }
 
 
+def repo_key(repository: Optional[str]) -> Optional[str]:
+    """Normalised ``owner/name`` for a GitHub URL or full name, else None."""
+    if not repository:
+        return None
+    repository = repository.strip()
+    match = _GITHUB_REPO_RE.match(repository)
+    if match:
+        return match.group(1).lower()
+    if repository.count("/") == 1 and ":" not in repository:
+        return repository.lower()
+    return None
+
+
+def _json_list(raw: Optional[str]) -> list:
+    if not raw:
+        return []
+    try:
+        value = json.loads(raw)
+    except json.JSONDecodeError:
+        return []
+    return value if isinstance(value, list) else []
+
+
+class CompiledAssignment:
+    """An agent assignment with its filters pre-parsed for fast matching."""
+
+    __slots__ = ("row", "labels", "file_pattern", "include_authors", "exclude_authors")
+
+    def __init__(self, row: Dict[str, Any]):
+        self.row = row
+        self.labels = frozenset(_json_list(row.get("filter_labels")))
+        patterns = _json_list(row.get("filter_file_patterns"))
+        self.file_pattern = (
+            re.compile("|".join(f"(?:{fnmatch.translate(p)})" for p in patterns))
+            if patterns
+            else None
+        )
+        authors = _json_list(row.get("filter_authors"))
+        self.include_authors = frozenset(a for a in authors if not a.startswith("!"))
+        self.exclude_authors = frozenset(a[1:] for a in authors if a.startswith("!"))
+
+    def matches(self, payload: Dict[str, Any]) -> bool:
+        """Whether *payload* passes this assignment's filters."""
+        if self.labels:
+            issue_or_pr = payload.get("issue") or payload.get("pull_request")
+            if not issue_or_pr:
+                return False  # No labels to check
+            if not any(
+                label.get("name") in self.labels
+                for label in issue_or_pr.get("labels", [])
+            ):
+                return False
+
+        if self.file_pattern is not None:
+            match = self.file_pattern.match
+            if not any(match(file) for file in extract_changed_files(payload)):
+                return False
+
+        if self.include_authors or self.exclude_authors:
+            sender_login = (payload.get("sender") or {}).get("login")
+            if sender_login in self.exclude_authors:
+                return False
+            if self.include_authors and sender_login not in self.include_authors:
+                return False
+
+        return True
+
+
+class RoutingTable:
+    """Process-local snapshot of repositories, projects and assignments."""
+
+    def __init__(self, ttl_seconds: float):
+        self._ttl = ttl_seconds
+        self._projects: Optional[dict[str, tuple[str, str]]] = None
+        # (project_id, event_type) → assignments
+        self._assignments: dict[tuple[str, str], list[CompiledAssignment]] = {}
+        self._loaded_at = 0.0
+        self._generation = 0
+        self._lock = asyncio.Lock()
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._projects is not None
+            and time.monotonic() - self._loaded_at < self._ttl
+        )
+
+    async def _ensure_loaded(self, force: bool = False) -> None:
+        if not force and self._is_fresh():
+            return
+        async with self._lock:
+            if not force and self._is_fresh():
+                return
+            if force and time.monotonic() - self._loaded_at < _MISS_RELOAD_SECONDS:
+                return
+            generation = self._generation
+            projects, assignments = await self._load()
+            if generation == self._generation:
+                self._projects = projects
+                self._assignments = assignments
+                self._loaded_at = time.monotonic()
+
+    @staticmethod
+    async def _load():
+        from app.database import AsyncSessionLocal
+        from app.models import Project, ProjectGitHub, ProjectGitHubAgent
+
+        async with AsyncSessionLocal() as session:
+            project_rows = (
+                await session.execute(
+                    select(Project.id, Project.name, Project.repository)
+                    .where(Project.repository.is_not(None))
+                    .order_by(Project.created_at)
+                )
+            ).all()
+            connection_rows = (
+                await session.execute(
+                    select(ProjectGitHub.repo_full_name, Project.id, Project.name)
+                    .join(Project, Project.id == ProjectGitHub.project_id)
+                    .where(ProjectGitHub.is_active == 1)
+                    .order_by(Project.created_at)
+                )
+            ).all()
+            assignment_rows = (
+                (await session.execute(select(ProjectGitHubAgent))).scalars().all()
+            )
+
+        projects: dict[str, tuple[str, str]] = {}
+        for project_id, name, repository in project_rows:
+            key = repo_key(repository)
+            if key:
+                projects.setdefault(key, (project_id, name))
+        for full_name, project_id, name in connection_rows:
+            key = repo_key(full_name)
+            if key:
+                projects.setdefault(key, (project_id, name))
+
+        assignments: dict[tuple[str, str], list[CompiledAssignment]] = {}
+        for a in assignment_rows:
+            row = {
+                "id": a.id,
+                "project_id": a.project_id,
+                "agent_id": a.agent_id,
+                "event_type": a.event_type,
+                "event_action": a.event_action,
+                "filter_labels": a.filter_labels,
+                "filter_file_patterns": a.filter_file_patterns,
+                "filter_authors": a.filter_authors,
+                "auto_respond": a.auto_respond,
+            }
+            assignments.setdefault((a.project_id, a.event_type), []).append(
+                CompiledAssignment(row)
+            )
+        return projects, assignments
+
+    async def project_for(self, repo_full_name: str) -> Optional[tuple[str, str]]:
+        """(project_id, project_name) linked to a repository, if any."""
+        await self._ensure_loaded()
+        key = repo_key(repo_full_name)
+        found = self._projects.get(key)
+        if found is None:
+            await self._ensure_loaded(force=True)
+            found = self._projects.get(key)
+        return found
+
+    async def match(
+        self,
+        project_id: str,
+        event_type: str,
+        event_action: Optional[str],
+        payload: Dict[str, Any],
+    ) -> List[Dict[str, Any]]:
+        """Assignments of *project_id* that should handle this event."""
+        await self._ensure_loaded()
+        return [
+            a.row
+            for a in self._assignments.get((project_id, event_type), ())
+            if (a.row["event_action"] is None or a.row["event_action"] == event_action)
+            and a.matches(payload)
+        ]
+
+    def invalidate_local(self) -> None:
+        self._generation += 1
+        self._projects = None
+
+    async def invalidate(self) -> None:
+        """Drop the table here and in every other worker (call after commit)."""
+        self.invalidate_local()
+        if dependencies.redis_client:
+            try:
+                await dependencies.redis_client.publish(
+                    ROUTING_INVALIDATE_CHANNEL, json.dumps({"pid": os.getpid()})
+                )
+            except Exception as e:
+                logger.warning(f"Failed to publish routing invalidation: {e}")
+
+    async def listen(self) -> None:
+        """Background task: drop the table whenever any worker invalidates it."""
+        from app.services.pubsub_listener import listen_forever
+
+        if not dependencies.redis_client:
+            return
+
+        await listen_forever(
+            "Routing invalidation",
+            lambda _channel, _data: self.invalidate_local(),
+            channels=[ROUTING_INVALIDATE_CHANNEL],
+            # Anything may have changed while we were unsubscribed
+            on_subscribed=self.invalidate_local,
+        )
+
+
+routing_table = RoutingTable(ROUTING_TABLE_TTL_SECONDS)
+
+
 def get_djinnbot_event_type(
     github_event: str, action: Optional[str] = None
 ) -> Optional[str]:
@@ -71,67 +312,39 @@ def get_djinnbot_event_type(
     return event_map.get(action)
 
 
-async def process_webhook_event(event_id: str, payload: Dict[str, Any]) -> List[str]:
+async def process_webhook_event(
+    event_id: str,
+    payload: Dict[str, Any],
+    event_type: str,
+    event_action: Optional[str] = None,
+) -> List[str]:
     """Process a webhook event and trigger assigned agents.
 
     Args:
         event_id: Webhook event ID from database
         payload: GitHub webhook payload
+        event_type: GitHub event name (X-GitHub-Event header)
+        event_action: Payload action, if any
 
     Returns:
         List of trigger IDs created
     """
-    # Extract event metadata
-    action = payload.get("action")
-    repository = payload.get("repository", {})
-    repo_full_name = repository.get("full_name")
-    sender = payload.get("sender", {})
-    sender_login = sender.get("login")
-
+    repo_full_name = (payload.get("repository") or {}).get("full_name")
     if not repo_full_name:
         logger.warning(f"No repository in webhook {event_id}")
         return []
 
-    # Find project by repository URL
-    async with get_db() as db:
-        cursor = await db.execute(
-            "SELECT id, name FROM projects WHERE repository = ? OR repository = ?",
-            (
-                f"https://github.com/{repo_full_name}",
-                f"git@github.com:{repo_full_name}.git",
-            ),
-        )
-        project_row = await cursor.fetchone()
-
-        if not project_row:
-            logger.warning(f"No project found for repository {repo_full_name}")
-            return []
-
-        project_id = project_row["id"]
-        project_name = project_row["name"]
-
-    # Get webhook event details
-    async with get_db() as db:
-        cursor = await db.execute(
-            "SELECT event_type, action FROM webhook_events WHERE id = ?", (event_id,)
-        )
-        event_row = await cursor.fetchone()
-
-        if not event_row:
-            return []
-
-        event_type = event_row["event_type"]
-        event_action = event_row["action"]
+    project = await routing_table.project_for(repo_full_name)
+    if not project:
+        logger.warning(f"No project found for repository {repo_full_name}")
+        return []
+    project_id, project_name = project
 
-    # Find matching agent assignments
     logger.debug(
         f"Routing event {event_id}: {event_type}.{event_action} for project {project_name}"
     )
-    assignments = await find_matching_assignments(
-        project_id=project_id,
-        event_type=event_type,
-        event_action=event_action,
-        payload=payload,
+    assignments = await routing_table.match(
+        project_id, event_type, event_action, payload
     )
 
     if not assignments:
@@ -157,114 +370,6 @@ async def process_webhook_event(event_id: str, payload: Dict[str, Any]) -> List[
     return trigger_ids
 
 
-async def find_matching_assignments(
-    project_id: str,
-    event_type: str,
-    event_action: Optional[str],
-    payload: Dict[str, Any],
-) -> List[Dict[str, Any]]:
-    """Find agent assignments matching event and filters."""
-    async with get_db() as db:
-        # Query assignments for this project and event type
-        query = """
-            SELECT * FROM project_github_agents
-            WHERE project_id = ? AND event_type = ?
-            AND (event_action IS NULL OR event_action = ?)
-        """
-        cursor = await db.execute(query, (project_id, event_type, event_action))
-        rows = await cursor.fetchall()
-
-        if not rows:
-            return []
-
-        logger.debug(
-            f"Found {len(rows)} agent assignments for {event_type}.{event_action}"
-        )
-
-        matched = []
-        for row in rows:
-            assignment = dict(row)
-
-            # Apply filters
-            if not check_filters(assignment, payload):
-                logger.debug(f"Agent {assignment.get('id')} failed filter check")
-                continue
-
-            matched.append(assignment)
-
-        logger.debug(f"Matched {len(matched)} agents after filters")
-        return matched
-
-
-def check_filters(assignment: Dict[str, Any], payload: Dict[str, Any]) -> bool:
-    """Check if webhook payload matches assignment filters."""
-    # Label filter
-    if assignment.get("filter_labels"):
-        try:
-            filter_labels = json.loads(assignment["filter_labels"])
-            if filter_labels:
-                issue_or_pr = payload.get("issue") or payload.get("pull_request")
-                if not issue_or_pr:
-                    return False  # No labels to check
-
-                event_labels = {
-                    label["name"] for label in issue_or_pr.get("labels", [])
-                }
-                if not any(label in event_labels for label in filter_labels):
-                    return False  # No matching labels
-        except (json.JSONDecodeError, KeyError):
-            pass
-
-    # File pattern filter (for PRs and pushes)
-    if assignment.get("filter_file_patterns"):
-        try:
-            filter_patterns = json.loads(assignment["filter_file_patterns"])
-            if filter_patterns:
-                changed_files = extract_changed_files(payload)
-                if not changed_files:
-                    return False  # No files to check
-
-                if not any(
-                    fnmatch.fnmatch(file, pattern)
-                    for file in changed_files
-                    for pattern in filter_patterns
-                ):
-                    return False  # No matching files
-        except (json.JSONDecodeError, KeyError):
-            pass
-
-    # Author filter
-    if assignment.get("filter_authors"):
-        try:
-            filter_authors = json.loads(assignment["filter_authors"])
-            if filter_authors:
-                sender = payload.get("sender", {})
-                sender_login = sender.get("login")
-
-                # Check if sender matches filter (inclusive or exclusive)
-                # If filter starts with "!", exclude that author
-                has_positive_filter = any(not f.startswith("!") for f in filter_authors)
-
-                for author_filter in filter_authors:
-                    if author_filter.startswith("!"):
-                        # Exclude: if sender matches, filter fails
-                        if sender_login == author_filter[1:]:
-                            return False
-                    else:
-                        # Include: sender must match at least one positive filter
-                        if sender_login == author_filter:
-                            has_positive_filter = False  # Found a match, mark it
-                            break
-
-                # If there were positive filters and none matched, fail
-                if has_positive_filter:
-                    return False
-        except (json.JSONDecodeError, KeyError):
-            pass
-
-    return True
-
-
 def extract_changed_files(payload: Dict[str, Any]) -> List[str]:
     """Extract list of changed files from webhook payload."""
     files = []
@@ -314,77 +419,49 @@ async def trigger_agent(
         f"Triggering agent {agent_id} (auto_respond={auto_respond}): {reason[:60]}..."
     )
 
-    async with get_db() as db:
-        if auto_respond:
-            # Trigger agent session immediately
-            session_id = await start_agent_session(
-                agent_id=agent_id,
-                project_id=project_id,
-                webhook_event_id=webhook_event_id,
-                payload=payload,
-            )
+    session_id = None
+    task_id = None
+    if auto_respond:
+        # Trigger agent session immediately
+        session_id = await start_agent_session(
+            agent_id=agent_id,
+            project_id=project_id,
+            webhook_event_id=webhook_event_id,
+            payload=payload,
+        )
+        logger.info(f"Started agent session {session_id} for {agent_id}")
+    else:
+        # Create task for review
+        task_id = await create_agent_task(
+            agent_id=agent_id,
+            project_id=project_id,
+            webhook_event_id=webhook_event_id,
+            payload=payload,
+            reason=reason,
+        )
+        logger.info(f"Created task {task_id} for {agent_id}")
 
-            await db.execute(
-                """
-                INSERT INTO github_agent_triggers (
-                    id, agent_assignment_id, webhook_event_id, project_id,
-                    agent_id, event_type, event_action, repository_full_name,
-                    trigger_reason, session_id, status, triggered_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    trigger_id,
-                    assignment["id"],
-                    webhook_event_id,
-                    project_id,
-                    agent_id,
-                    event_type,
-                    event_action,
-                    payload.get("repository", {}).get("full_name"),
-                    reason,
-                    session_id,
-                    "running",
-                    triggered_at,
-                ),
-            )
+    from app.database import AsyncSessionLocal
+    from app.models import GitHubAgentTrigger
 
-            logger.info(f"Started agent session {session_id} for {agent_id}")
-        else:
-            # Create task for review
-            task_id = await create_agent_task(
-                agent_id=agent_id,
-                project_id=project_id,
+    async with AsyncSessionLocal() as db:
+        db.add(
+            GitHubAgentTrigger(
+                id=trigger_id,
+                agent_assignment_id=assignment["id"],
                 webhook_event_id=webhook_event_id,
-                payload=payload,
-                reason=reason,
-            )
-
-            await db.execute(
-                """
-                INSERT INTO github_agent_triggers (
-                    id, agent_assignment_id, webhook_event_id, project_id,
-                    agent_id, event_type, event_action, repository_full_name,
-                    trigger_reason, task_id, status, triggered_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    trigger_id,
-                    assignment["id"],
-                    webhook_event_id,
-                    project_id,
-                    agent_id,
-                    event_type,
-                    event_action,
-                    payload.get("repository", {}).get("full_name"),
-                    reason,
-                    task_id,
-                    "pending",
-                    triggered_at,
-                ),
+                project_id=project_id,
+                agent_id=agent_id,
+                event_type=event_type,
+                event_action=event_action,
+                repository_full_name=payload.get("repository", {}).get("full_name"),
+                trigger_reason=reason,
+                session_id=session_id,
+                task_id=task_id,
+                status="running" if auto_respond else "pending",
+                triggered_at=triggered_at,
             )
-
-            logger.info(f"Created task {task_id} for {agent_id}")
-
+        )
         await db.commit()
 
     return trigger_id
@@ -461,42 +538,40 @@ async def create_agent_task(
 
     logger.debug(f"Creating task for agent {agent_id}: {reason[:50]}...")
 
+    from app.database import AsyncSessionLocal
+    from app.models import KanbanColumn, Task
+
     # Get default column for project
-    async with get_db() as db:
-        cursor = await db.execute(
-            "SELECT id FROM kanban_columns WHERE project_id = ? ORDER BY position LIMIT 1",
-            (project_id,),
-        )
-        column_row = await cursor.fetchone()
-        column_id = column_row["id"] if column_row else "default"
-
-        await db.execute(
-            """
-            INSERT INTO tasks (
-                id, project_id, title, description, status,
-                created_at, updated_at, metadata, assigned_agent,
-                column_id, column_position
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-            (
-                task_id,
-                project_id,
-                reason,
-                description,
-                "pending",
-                created_at,
-                created_at,
-                json.dumps(
+    async with AsyncSessionLocal() as db:
+        column_id = (
+            await db.execute(
+                select(KanbanColumn.id)
+                .where(KanbanColumn.project_id == project_id)
+                .order_by(KanbanColumn.position)
+                .limit(1)
+            )
+        ).scalar_one_or_none() or "default"
+
+        db.add(
+            Task(
+                id=task_id,
+                project_id=project_id,
+                title=reason,
+                description=description,
+                status="pending",
+                created_at=created_at,
+                updated_at=created_at,
+                task_metadata=json.dumps(
                     {
                         "source": "github_webhook",
                         "webhook_event_id": webhook_event_id,
                         "agent_id": agent_id,
                     }
                 ),
-                agent_id,
-                column_id,
-                0,
-            ),
+                assigned_agent=agent_id,
+                column_id=column_id,
+                column_position=0,
+            )
         )
         await db.commit()
 
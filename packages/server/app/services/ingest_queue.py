@@ -0,0 +1,416 @@
+"""Durable queue of Dialog ingest jobs processed by Grace.
+
+Ingest endpoints store an IngestJob row and return 202 with its ID right
+away; the client polls ``GET /v1/ingest/jobs/{id}`` for progress and the
+final reply.
+
+Long meeting transcripts are split into overlapping chunks when the job is
+enqueued (see split_transcript).  A job's chunks are sent to Grace one
+after another in the same session, so each part is processed with the
+earlier parts in context, and progress is persisted after every chunk.
+
+INGEST_WORKERS workers run independent jobs concurrently, each with its
+own Grace session ("lane").  Jobs are claimed fairly across users: the
+next job comes from the user with the fewest running jobs, then the one
+served least recently, then the oldest job.  Claiming is a conditional
+UPDATE, so several API replicas can share the queue.
+
+A running job whose heartbeat is older than INGEST_JOB_STALE_SECONDS
+(e.g. its replica died) goes back to the queue and resumes at its next
+unprocessed chunk.  Workers refresh the heartbeat every
+INGEST_HEARTBEAT_SECONDS while a chunk is being processed, so a slow chunk
+is not mistaken for a dead worker.  Failed chunks are retried up to
+INGEST_MAX_ATTEMPTS times per job; a stale job that has used all its
+attempts (e.g. one that keeps crashing its worker) is marked failed
+instead of being requeued.
+"""
+
+import asyncio
+import json
+import os
+import time
+import uuid
+from typing import Awaitable, Callable, Optional
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.logging_config import get_logger
+from app.utils import now_ms
+
+logger = get_logger(__name__)
+
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", "2"))
+INGEST_CHUNK_CHARS = int(os.getenv("INGEST_CHUNK_CHARS", "12000"))
+INGEST_CHUNK_OVERLAP_CHARS = int(os.getenv("INGEST_CHUNK_OVERLAP_CHARS", "800"))
+INGEST_POLL_SECONDS = float(os.getenv("INGEST_POLL_SECONDS", "5"))
+INGEST_JOB_STALE_SECONDS = int(os.getenv("INGEST_JOB_STALE_SECONDS", "900"))
+INGEST_MAX_ATTEMPTS = int(os.getenv("INGEST_MAX_ATTEMPTS", "3"))
+INGEST_HEARTBEAT_SECONDS = float(os.getenv("INGEST_HEARTBEAT_SECONDS", "60"))
+
+# Queued jobs considered per claim when picking the fairest one
+_CLAIM_WINDOW = 200
+
+# (prompt, lane state) → Grace's reply.  The lane dict is private to one
+# worker and persists across jobs (e.g. to keep its Grace session).
+ChunkHandler = Callable[[str, dict], Awaitable[str]]
+
+
+def split_transcript(
+    text: str,
+    max_chars: int = INGEST_CHUNK_CHARS,
+    overlap_chars: int = INGEST_CHUNK_OVERLAP_CHARS,
+) -> list[str]:
+    """Split *text* into chunks of at most ~max_chars, breaking on lines.
+
+    Each chunk after the first starts with the last ~overlap_chars of the
+    previous one, so statements cut at a boundary appear whole in at least
+    one chunk.
+    """
+    if len(text) <= max_chars:
+        return [text]
+
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = min(start + max_chars, len(text))
+        if end < len(text):
+            # Prefer to break at a line, then a sentence, in the last third
+            floor = start + max_chars * 2 // 3
+            for sep in ("\n", ". "):
+                cut = text.rfind(sep, floor, end)
+                if cut != -1:
+                    end = cut + len(sep)
+                    break
+        chunks.append(text[start:end])
+        if end >= len(text):
+            break
+        next_start = max(end - overlap_chars, start + 1)
+        # Start the overlap on a line boundary when there is one
+        line_start = text.find("\n", next_start, end)
+        start = line_start + 1 if line_start != -1 else next_start
+    return chunks
+
+
+async def enqueue_ingest_job(
+    db: AsyncSession,
+    user_id: str,
+    kind: str,
+    prompts: list[str],
+    title: Optional[str] = None,
+) -> dict:
+    """Persist a job made of *prompts* and wake the workers."""
+    from app.models.ingest_job import IngestJob
+
+    job = IngestJob(
+        id=f"ingest_{uuid.uuid4().hex[:16]}",
+        user_id=user_id,
+        kind=kind,
+        title=title,
+        status="queued",
+        chunks=json.dumps(prompts),
+        chunk_count=len(prompts),
+        chunks_done=0,
+        replies="[]",
+        attempts=0,
+        created_at=now_ms(),
+    )
+    db.add(job)
+    await db.commit()
+    ingest_queue.wake()
+    return job_to_dict(job)
+
+
+def job_to_dict(job) -> dict:
+    replies = json.loads(job.replies or "[]")
+    return {
+        "jobId": job.id,
+        "kind": job.kind,
+        "title": job.title,
+        "status": job.status,
+        "progress": {"chunksDone": job.chunks_done, "chunkCount": job.chunk_count},
+        "reply": (
+            "\n\n".join(r for r in replies if r) if job.status == "completed" else None
+        ),
+        "error": job.error,
+        "sessionId": job.session_id,
+        "attempts": job.attempts,
+        "createdAt": job.created_at,
+        "startedAt": job.started_at,
+        "completedAt": job.completed_at,
+    }
+
+
+class IngestQueue:
+    """Workers draining ingest_jobs with per-user fair claiming."""
+
+    def __init__(self, workers: int):
+        self._workers = workers
+        self._handler: Optional[ChunkHandler] = None
+        self._tasks: list[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._last_served: dict[str, float] = {}
+        self._current: dict[int, str] = {}
+        self._completed = 0
+        self._failed = 0
+
+    def set_handler(self, handler: ChunkHandler) -> None:
+        self._handler = handler
+
+    def start(self) -> None:
+        if self._tasks or self._handler is None:
+            return
+        self._wakeup = asyncio.Event()
+        self._tasks = [
+            asyncio.create_task(self._worker(i)) for i in range(self._workers)
+        ]
+        logger.info(f"Ingest queue started ({self._workers} workers)")
+
+    def wake(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _worker(self, index: int) -> None:
+        lane: dict = {}
+        while True:
+            try:
+                job_id = await self._claim()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Ingest worker {index} failed to claim a job: {e}")
+                job_id = None
+
+            if job_id is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), INGEST_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            self._current[index] = job_id
+            try:
+                await self._run(job_id, lane)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Ingest job {job_id} crashed: {e}")
+            finally:
+                self._current.pop(index, None)
+
+    async def _claim(self) -> Optional[str]:
+        from app.database import AsyncSessionLocal
+        from app.models.ingest_job import IngestJob
+
+        now = now_ms()
+        async with AsyncSessionLocal() as db:
+            # Requeue jobs whose worker stopped heartbeating, or give up on
+            # them once they have used all their attempts
+            stale_cutoff = now - INGEST_JOB_STALE_SECONDS * 1000
+            exhausted = await db.execute(
+                update(IngestJob)
+                .where(
+                    IngestJob.status == "running",
+                    IngestJob.heartbeat_at < stale_cutoff,
+                    IngestJob.attempts >= INGEST_MAX_ATTEMPTS,
+                )
+                .values(
+                    status="failed",
+                    error="Worker stopped responding while processing this job",
+                    completed_at=now,
+                )
+            )
+            if exhausted.rowcount:
+                self._failed += exhausted.rowcount
+                logger.warning(
+                    f"Gave up on {exhausted.rowcount} stale ingest job(s) "
+                    f"after {INGEST_MAX_ATTEMPTS} attempts"
+                )
+            stale = await db.execute(
+                update(IngestJob)
+                .where(
+                    IngestJob.status == "running",
+                    IngestJob.heartbeat_at < stale_cutoff,
+                )
+                .values(status="queued")
+            )
+            if stale.rowcount:
+                logger.warning(f"Requeued {stale.rowcount} stale ingest job(s)")
+            await db.commit()
+
+            queued = (
+                await db.execute(
+                    select(IngestJob.id, IngestJob.user_id)
+                    .where(IngestJob.status == "queued")
+                    .order_by(IngestJob.created_at)
+                    .limit(_CLAIM_WINDOW)
+                )
+            ).all()
+            if not queued:
+                return None
+            running = dict(
+                (
+                    await db.execute(
+                        select(IngestJob.user_id, func.count())
+                        .where(IngestJob.status == "running")
+                        .group_by(IngestJob.user_id)
+                    )
+                ).all()
+            )
+
+            # Oldest queued job per user, fairest user first
+            oldest: dict[str, str] = {}
+            for job_id, user_id in queued:
+                oldest.setdefault(user_id, job_id)
+            candidates = sorted(
+                oldest.items(),
+                key=lambda item: (
+                    running.get(item[0], 0),
+                    self._last_served.get(item[0], 0.0),
+                ),
+            )
+
+            for user_id, job_id in candidates:
+                claimed = await db.execute(
+                    update(IngestJob)
+                    .where(IngestJob.id == job_id, IngestJob.status == "queued")
+                    .values(
+                        status="running",
+                        started_at=func.coalesce(IngestJob.started_at, now),
+                        heartbeat_at=now,
+                        attempts=IngestJob.attempts + 1,
+                    )
+                )
+                await db.commit()
+                if claimed.rowcount == 1:
+                    self._last_served[user_id] = time.monotonic()
+                    return job_id
+        return None
+
+    async def _run(self, job_id: str, lane: dict) -> None:
+        from app.database import AsyncSessionLocal
+        from app.models.ingest_job import IngestJob
+
+        async with AsyncSessionLocal() as db:
+            job = await db.get(IngestJob, job_id)
+            if job is None:
+                return
+            chunks = json.loads(job.chunks)
+            replies = json.loads(job.replies or "[]")[: job.chunks_done]
+            start, attempts = job.chunks_done, job.attempts
+
+        for index in range(start, len(chunks)):
+            heartbeat = asyncio.create_task(self._heartbeat(job_id))
+            try:
+                reply = await self._handler(chunks[index], lane)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                await self._chunk_failed(job_id, index, attempts, str(e) or repr(e))
+                return
+            finally:
+                heartbeat.cancel()
+
+            replies.append(reply)
+            async with AsyncSessionLocal() as db:
+                await db.execute(
+                    update(IngestJob)
+                    .where(IngestJob.id == job_id)
+                    .values(
+                        chunks_done=index + 1,
+                        replies=json.dumps(replies),
+                        session_id=lane.get("session_id"),
+                        heartbeat_at=now_ms(),
+                    )
+                )
+                await db.commit()
+
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(IngestJob)
+                .where(IngestJob.id == job_id)
+                .values(status="completed", error=None, completed_at=now_ms())
+            )
+            await db.commit()
+        self._completed += 1
+        logger.info(f"Ingest job {job_id} completed ({len(chunks)} chunk(s))")
+
+    async def _heartbeat(self, job_id: str) -> None:
+        """Keep *job_id*'s heartbeat fresh while one of its chunks runs."""
+        from app.database import AsyncSessionLocal
+        from app.models.ingest_job import IngestJob
+
+        while True:
+            await asyncio.sleep(INGEST_HEARTBEAT_SECONDS)
+            try:
+                async with AsyncSessionLocal() as db:
+                    await db.execute(
+                        update(IngestJob)
+                        .where(IngestJob.id == job_id, IngestJob.status == "running")
+                        .values(heartbeat_at=now_ms())
+                    )
+                    await db.commit()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Failed to heartbeat ingest job {job_id}: {e}")
+
+    async def _chunk_failed(
+        self, job_id: str, index: int, attempts: int, error: str
+    ) -> None:
+        from app.database import AsyncSessionLocal
+        from app.models.ingest_job import IngestJob
+
+        give_up = attempts >= INGEST_MAX_ATTEMPTS
+        logger.warning(
+            f"Ingest job {job_id} chunk {index + 1} failed "
+            f"(attempt {attempts}/{INGEST_MAX_ATTEMPTS}): {error}"
+        )
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(IngestJob)
+                .where(IngestJob.id == job_id)
+                .values(
+                    status="failed" if give_up else "queued",
+                    error=error,
+                    completed_at=now_ms() if give_up else None,
+                )
+            )
+            await db.commit()
+        if give_up:
+            self._failed += 1
+
+    def stats(self) -> dict:
+        return {
+            "workers": len(self._tasks),
+            "running": list(self._current.values()),
+            "completed": self._completed,
+            "failed": self._failed,
+        }
+
+    async def shutdown(self) -> None:
+        from app.database import AsyncSessionLocal
+        from app.models.ingest_job import IngestJob
+
+        in_flight = list(self._current.values())
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if not in_flight:
+            return
+        # Hand interrupted jobs straight back instead of waiting to go stale
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(
+                    update(IngestJob)
+                    .where(IngestJob.id.in_(in_flight), IngestJob.status == "running")
+                    .values(status="queued", attempts=IngestJob.attempts - 1)
+                )
+                await db.commit()
+        except Exception as e:
+            logger.warning(f"Failed to requeue in-flight ingest jobs: {e}")
+
+
+ingest_queue = IngestQueue(INGEST_WORKERS)
@@ -0,0 +1,107 @@
+"""Resumable live-update channels for the dashboard SSE endpoints.
+
+Session, chat-session and work-lock updates used to go out only on Redis
+pub/sub, so an SSE client that dropped its connection missed everything
+published until it reconnected.  Publishers now also append each event to
+a capped stream next to the channel (live_stream_key); the SSE endpoints
+read that stream, send each entry's stream ID as the SSE ``id:`` field and
+resume after the ``Last-Event-ID`` a reconnecting client sends.  The
+pub/sub channel is still published for other listeners.
+"""
+
+import asyncio
+import json
+import os
+import re
+from typing import AsyncGenerator, Callable, Optional
+
+from app import dependencies
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+LIVE_STREAM_MAXLEN = int(os.getenv("LIVE_STREAM_MAXLEN", "5000"))
+LIVE_HEARTBEAT_SECONDS = 20.0
+
+_READ_COUNT = 100
+_STREAM_ID_RE = re.compile(r"^\d+-\d+$")
+
+
+def live_stream_key(channel: str) -> str:
+    return f"{channel}:stream"
+
+
+def parse_last_event_id(value: Optional[str]) -> Optional[str]:
+    """The Redis stream ID in a Last-Event-ID header, or None if absent/invalid."""
+    if value and _STREAM_ID_RE.match(value.strip()):
+        return value.strip()
+    return None
+
+
+def sse_frame(data: str, event_id: Optional[str] = None) -> str:
+    if event_id:
+        return f"id: {event_id}\ndata: {data}\n\n"
+    return f"data: {data}\n\n"
+
+
+async def publish_live(channel: str, event: dict) -> None:
+    """Publish *event* on *channel* and append it to the channel's stream."""
+    payload = json.dumps(event)
+    pipe = dependencies.redis_client.pipeline(transaction=False)
+    pipe.xadd(
+        live_stream_key(channel),
+        {"data": payload},
+        maxlen=LIVE_STREAM_MAXLEN,
+        approximate=True,
+    )
+    pipe.publish(channel, payload)
+    await pipe.execute()
+
+
+async def live_sse(
+    channel: str,
+    last_event_id: Optional[str] = None,
+    match: Optional[Callable[[dict], bool]] = None,
+) -> AsyncGenerator[str, None]:
+    """SSE frames for *channel*'s stream, with heartbeats while idle.
+
+    Starts after *last_event_id*, or with new entries only when it is None.
+    With *match*, only events whose decoded JSON it accepts are sent.
+    """
+    stream = live_stream_key(channel)
+    last_id = last_event_id
+    if last_id is None:
+        # Pin the starting point so nothing published between two blocking
+        # reads is skipped (as it would be by re-reading from "$")
+        latest = await dependencies.redis_client.xrevrange(stream, "+", "-", count=1)
+        last_id = latest[0][0] if latest else "0-0"
+
+    while True:
+        try:
+            response = await dependencies.redis_client.xread(
+                {stream: last_id},
+                count=_READ_COUNT,
+                block=int(LIVE_HEARTBEAT_SECONDS * 1000),
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Live stream {stream} read error: {e}")
+            yield ": heartbeat\n\n"
+            await asyncio.sleep(2)
+            continue
+
+        if not response:
+            yield ": heartbeat\n\n"
+            continue
+        for _stream, messages in response:
+            for entry_id, fields in messages:
+                last_id = entry_id
+                data_str = fields.get("data", "")
+                try:
+                    data = json.loads(data_str)
+                except json.JSONDecodeError:
+                    continue
+                if match is not None and not match(data):
+                    continue
+                yield sse_frame(data_str, entry_id)
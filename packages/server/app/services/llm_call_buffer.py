@@ -0,0 +1,208 @@
+"""Write-behind buffer for LLM call telemetry.
+
+Agent containers report every LLM API call to /v1/internal/llm-calls.
+Rather than one INSERT + COMMIT + Redis PUBLISH per call, rows are queued
+in memory and flushed as a single multi-row INSERT when either
+
+  - LLM_CALL_FLUSH_BATCH rows are pending (default 200), or
+  - LLM_CALL_FLUSH_INTERVAL_MS has elapsed (default 500 ms)
+
+followed by one pipelined round-trip publishing each row to
+``djinnbot:llm-calls:live``.  The hourly usage rollups are updated in the
+same transaction as the INSERT.
+
+Memory is bounded by LLM_CALL_BUFFER_MAX rows: once full, producers wait
+for the next flush instead of growing the buffer.  The buffer is flushed
+on shutdown.
+
+If the database rejects a batch's data (e.g. a value too long for its
+column), the batch is bisected until the offending rows are isolated;
+those are logged and dropped so they can't block the rows behind them.
+Other errors (database unreachable, ...) put the unwritten rows back for
+the next flush.
+"""
+
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from typing import Optional
+
+from app import dependencies
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+LLM_CALL_FLUSH_BATCH = int(os.getenv("LLM_CALL_FLUSH_BATCH", "200"))
+LLM_CALL_FLUSH_INTERVAL_MS = int(os.getenv("LLM_CALL_FLUSH_INTERVAL_MS", "500"))
+LLM_CALL_BUFFER_MAX = int(os.getenv("LLM_CALL_BUFFER_MAX", "5000"))
+
+LIVE_CHANNEL = "djinnbot:llm-calls:live"
+
+# Number of recent flushes kept for latency/batch-size averages
+_TIMING_WINDOW = 100
+
+
+class LlmCallBuffer:
+    """Bounded in-memory queue of llm_call_logs rows, flushed in batches."""
+
+    def __init__(self, flush_batch: int, flush_interval_ms: int, max_rows: int):
+        self._flush_batch = flush_batch
+        self._flush_interval = flush_interval_ms / 1000
+        self._max_rows = max_rows
+        self._pending: list[dict] = []
+        self._flush_lock = asyncio.Lock()
+        self._wake = asyncio.Event()
+        self._space = asyncio.Condition()
+        self._task: Optional[asyncio.Task] = None
+        self._rows_written = 0
+        self._flushes = 0
+        self._failures = 0
+        self._dropped = 0
+        self._rejected = 0
+        self._flush_ms: deque[float] = deque(maxlen=_TIMING_WINDOW)
+        self._batch_sizes: deque[int] = deque(maxlen=_TIMING_WINDOW)
+
+    def _ensure_started(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def add(self, rows: list[dict]) -> None:
+        """Queue rows (column dicts for LlmCallLog) for the next flush."""
+        self._ensure_started()
+        async with self._space:
+            while self._pending and len(self._pending) + len(rows) > self._max_rows:
+                # Buffer full — wait for the flusher to drain it
+                self._wake.set()
+                await self._space.wait()
+            self._pending.extend(rows)
+        if len(self._pending) >= self._flush_batch:
+            self._wake.set()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self._flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await self.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"LLM call buffer flush failed: {e}")
+
+    async def flush(self) -> int:
+        """Write all pending rows now.  Returns the number of rows written."""
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+            batch, self._pending = self._pending, []
+            started = time.monotonic()
+            written: list[dict] = []
+            rejected: list[dict] = []
+            try:
+                await self._write_isolating(batch, written, rejected)
+            except Exception as e:
+                self._failures += 1
+                done = {row["id"] for row in written + rejected}
+                unwritten = [row for row in batch if row["id"] not in done]
+                # Put the unwritten rows back for the next attempt if there's room
+                room = max(self._max_rows - len(self._pending), 0)
+                self._pending[:0] = unwritten[:room]
+                self._dropped += max(0, len(unwritten) - room)
+                logger.warning(
+                    f"Failed to write {len(unwritten)} LLM call rows "
+                    f"(requeued {min(len(unwritten), room)}): {e}"
+                )
+            finally:
+                async with self._space:
+                    self._space.notify_all()
+
+            if written:
+                self._flushes += 1
+                self._rows_written += len(written)
+                self._batch_sizes.append(len(written))
+                self._flush_ms.append((time.monotonic() - started) * 1000)
+
+        await self._publish(written)
+        return len(written)
+
+    async def _write_isolating(
+        self, batch: list[dict], written: list[dict], rejected: list[dict]
+    ) -> None:
+        """Write *batch*, bisecting around rows whose data the database rejects.
+
+        Written rows are appended to *written*; rejected rows are logged,
+        dropped and appended to *rejected*.  Other errors propagate.
+        """
+        from sqlalchemy import insert
+        from sqlalchemy.exc import DataError, IntegrityError
+
+        from app.database import AsyncSessionLocal
+        from app.models.llm_call_log import LlmCallLog
+        from app.services.llm_usage_rollups import apply_rollups
+
+        try:
+            async with AsyncSessionLocal() as session:
+                await session.execute(insert(LlmCallLog), batch)
+                await apply_rollups(session, batch)
+                await session.commit()
+        except (DataError, IntegrityError) as e:
+            if len(batch) == 1:
+                self._rejected += 1
+                rejected.append(batch[0])
+                logger.error(
+                    f"Dropping LLM call row {batch[0].get('id')} "
+                    f"rejected by the database: {e}"
+                )
+                return
+            mid = len(batch) // 2
+            await self._write_isolating(batch[:mid], written, rejected)
+            await self._write_isolating(batch[mid:], written, rejected)
+            return
+        written.extend(batch)
+
+    @staticmethod
+    async def _publish(batch: list[dict]) -> None:
+        if not dependencies.redis_client:
+            return
+        try:
+            pipe = dependencies.redis_client.pipeline(transaction=False)
+            for row in batch:
+                pipe.publish(LIVE_CHANNEL, json.dumps({"type": "llm_call", **row}))
+            await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Failed to publish LLM call events: {e}")
+
+    def metrics(self) -> dict:
+        def _avg(values: deque) -> Optional[float]:
+            return round(sum(values) / len(values), 1) if values else None
+
+        return {
+            "pending": len(self._pending),
+            "maxPending": self._max_rows,
+            "flushBatch": self._flush_batch,
+            "flushIntervalMs": int(self._flush_interval * 1000),
+            "flushes": self._flushes,
+            "rowsWritten": self._rows_written,
+            "failures": self._failures,
+            "dropped": self._dropped,
+            "rejected": self._rejected,
+            "avgBatchSize": _avg(self._batch_sizes),
+            "avgFlushMs": _avg(self._flush_ms),
+        }
+
+    async def shutdown(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+
+
+llm_call_buffer = LlmCallBuffer(
+    LLM_CALL_FLUSH_BATCH, LLM_CALL_FLUSH_INTERVAL_MS, LLM_CALL_BUFFER_MAX
+)
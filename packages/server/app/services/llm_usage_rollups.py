@@ -0,0 +1,251 @@
+"""Hourly LLM usage rollups — maintenance and queries.
+
+``apply_rollups()`` is called by the LLM call write-behind buffer in the
+same transaction as the raw INSERT, so llm_usage_rollups is always exactly
+consistent with llm_call_logs: each batch is aggregated in memory and
+upserted with ``ON CONFLICT ... DO UPDATE SET x = x + excluded.x``.
+
+Queries over a time range read whole hours from the rollups and only
+touch the raw table for the partial hours at the edges of the range.
+Filters that are not rollup dimensions (session_id, run_id) must keep
+using the raw table.
+"""
+
+from collections import defaultdict
+from typing import Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.llm_call_log import LlmCallLog
+from app.models.llm_usage_rollup import LlmUsageRollup
+
+HOUR_MS = 3_600_000
+DAY_MS = 24 * HOUR_MS
+
+_DIMENSIONS = ("user_id", "agent_id", "model", "provider", "key_source")
+_SUM_MEASURES = (
+    "input_tokens",
+    "output_tokens",
+    "cache_read_tokens",
+    "cache_write_tokens",
+    "total_tokens",
+    "cost_input",
+    "cost_output",
+    "cost_total",
+)
+_MEASURES = _SUM_MEASURES + ("call_count", "duration_ms_sum", "duration_count")
+
+
+def hour_bucket(ts_ms: int) -> int:
+    return ts_ms - ts_ms % HOUR_MS
+
+
+# ── Maintenance ────────────────────────────────────────────────────────────
+
+
+def aggregate_rows(rows: list[dict]) -> list[dict]:
+    """Collapse raw llm_call_logs rows into rollup increments."""
+    totals: dict[tuple, dict] = defaultdict(lambda: dict.fromkeys(_MEASURES, 0))
+    for row in rows:
+        key = (hour_bucket(row["created_at"]),) + tuple(
+            row.get(dim) or "" for dim in _DIMENSIONS
+        )
+        acc = totals[key]
+        acc["call_count"] += 1
+        for measure in _SUM_MEASURES:
+            acc[measure] += row.get(measure) or 0
+        if row.get("duration_ms") is not None:
+            acc["duration_ms_sum"] += row["duration_ms"]
+            acc["duration_count"] += 1
+    return [
+        {"bucket_start": key[0], **dict(zip(_DIMENSIONS, key[1:])), **acc}
+        for key, acc in totals.items()
+    ]
+
+
+async def apply_rollups(session: AsyncSession, rows: list[dict]) -> None:
+    """Add a batch of raw rows to the rollups (caller commits)."""
+    values = aggregate_rows(rows)
+    if not values:
+        return
+    if session.bind.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+
+    stmt = insert(LlmUsageRollup).values(values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["bucket_start", *_DIMENSIONS],
+        set_={
+            measure: getattr(LlmUsageRollup, measure) + stmt.excluded[measure]
+            for measure in _MEASURES
+        },
+    )
+    await session.execute(stmt)
+
+
+# ── Queries ────────────────────────────────────────────────────────────────
+
+
+def _conditions(model, filters: dict) -> list:
+    conditions = []
+    for dim, value in filters.items():
+        if value is None:
+            continue
+        column = getattr(model, dim)
+        if model is LlmUsageRollup or value != "":
+            conditions.append(column == value)
+        else:
+            conditions.append(column.is_(None))
+    return conditions
+
+
+def _rollup_totals_query(filters: dict, start: Optional[int], end: Optional[int]):
+    query = select(
+        *(
+            func.coalesce(func.sum(getattr(LlmUsageRollup, m)), 0).label(m)
+            for m in _MEASURES
+        )
+    ).where(*_conditions(LlmUsageRollup, filters))
+    if start is not None:
+        query = query.where(LlmUsageRollup.bucket_start >= start)
+    if end is not None:
+        query = query.where(LlmUsageRollup.bucket_start < end)
+    return query
+
+
+def _raw_totals_select(*conditions):
+    return select(
+        func.count(LlmCallLog.id).label("call_count"),
+        *(
+            func.coalesce(func.sum(getattr(LlmCallLog, m)), 0).label(m)
+            for m in _SUM_MEASURES
+        ),
+        func.coalesce(func.sum(LlmCallLog.duration_ms), 0).label("duration_ms_sum"),
+        func.count(LlmCallLog.duration_ms).label("duration_count"),
+    ).where(*conditions)
+
+
+def _raw_totals_query(filters: dict, start: int, end: int):
+    return _raw_totals_select(
+        *_conditions(LlmCallLog, filters),
+        LlmCallLog.created_at >= start,
+        LlmCallLog.created_at < end,
+    )
+
+
+async def _sum_queries(db: AsyncSession, queries: list) -> dict:
+    totals = dict.fromkeys(_MEASURES, 0)
+    for query in queries:
+        row = (await db.execute(query)).one()
+        for measure in _MEASURES:
+            totals[measure] += getattr(row, measure) or 0
+    totals["avg_duration_ms"] = (
+        totals["duration_ms_sum"] / totals["duration_count"]
+        if totals["duration_count"]
+        else 0
+    )
+    return totals
+
+
+async def raw_usage_totals(db: AsyncSession, conditions: list) -> dict:
+    """Same totals as usage_totals(), straight from llm_call_logs.
+
+    For filters the rollups can't answer (session_id, run_id).
+    """
+    return await _sum_queries(db, [_raw_totals_select(*conditions)])
+
+
+async def usage_totals(
+    db: AsyncSession,
+    since: Optional[int] = None,
+    until: Optional[int] = None,
+    **filters: Optional[str],
+) -> dict:
+    """Sum usage over [since, until) for rollup dimensions in *filters*.
+
+    Whole hours come from the rollups; the partial hours at either end of
+    the range are summed from llm_call_logs.
+    """
+    full_start = since
+    if since is not None and since % HOUR_MS:
+        full_start = hour_bucket(since) + HOUR_MS
+    full_end = hour_bucket(until) if until is not None else None
+
+    queries = []
+    if full_start is not None and full_end is not None and full_start >= full_end:
+        # Range lies within a single hour
+        queries.append(_raw_totals_query(filters, since, until))
+    else:
+        queries.append(_rollup_totals_query(filters, full_start, full_end))
+        if since is not None and full_start != since:
+            queries.append(_raw_totals_query(filters, since, full_start))
+        if until is not None and full_end != until:
+            queries.append(_raw_totals_query(filters, full_end, until))
+
+    return await _sum_queries(db, queries)
+
+
+# group_by values accepted by usage_timeseries()
+GROUPABLE_DIMENSIONS = {
+    "user": "user_id",
+    "agent": "agent_id",
+    "model": "model",
+    "provider": "provider",
+    "key_source": "key_source",
+}
+
+
+async def usage_timeseries(
+    db: AsyncSession,
+    interval_ms: int = HOUR_MS,
+    since: Optional[int] = None,
+    until: Optional[int] = None,
+    group_by: Optional[str] = None,
+    **filters: Optional[str],
+) -> list[dict]:
+    """Usage per time bucket (hour or day), optionally split by a dimension.
+
+    Reads only the rollup table, so *since*/*until* are effectively rounded
+    down to the hour.
+    """
+    bucket = LlmUsageRollup.bucket_start - (LlmUsageRollup.bucket_start % interval_ms)
+    columns = [bucket.label("bucket")]
+    group_column = None
+    if group_by:
+        group_column = getattr(LlmUsageRollup, GROUPABLE_DIMENSIONS[group_by])
+        columns.append(group_column.label("group"))
+
+    query = select(
+        *columns,
+        *(func.sum(getattr(LlmUsageRollup, m)).label(m) for m in _MEASURES),
+    ).where(*_conditions(LlmUsageRollup, filters))
+    if since is not None:
+        query = query.where(LlmUsageRollup.bucket_start >= hour_bucket(since))
+    if until is not None:
+        query = query.where(LlmUsageRollup.bucket_start < until)
+    group_cols = [bucket] + ([group_column] if group_column is not None else [])
+    query = query.group_by(*group_cols).order_by(*group_cols)
+
+    series = []
+    for row in (await db.execute(query)).all():
+        point = {"bucketStart": row.bucket}
+        if group_column is not None:
+            point["group"] = row.group
+        point.update(
+            {
+                "callCount": row.call_count or 0,
+                "inputTokens": row.input_tokens or 0,
+                "outputTokens": row.output_tokens or 0,
+                "cacheReadTokens": row.cache_read_tokens or 0,
+                "cacheWriteTokens": row.cache_write_tokens or 0,
+                "totalTokens": row.total_tokens or 0,
+                "totalCost": round(row.cost_total or 0, 6),
+                "avgDurationMs": round(row.duration_ms_sum / row.duration_count)
+                if row.duration_count
+                else 0,
+            }
+        )
+        series.append(point)
+    return series
@@ -0,0 +1,261 @@
+"""Shared tails of the container log streams for the admin log viewer.
+
+Every SSE client of ``/v1/admin/logs/stream/*`` used to open its own Redis
+connection and run its own XREAD loop, re-encoding every line to JSON —
+so N admins watching the logs during an incident cost N readers.
+
+Instead, each log stream has at most one LogTail per process: a single
+reader task that XREADs new entries, encodes each line to JSON once, and
+fans the batch out to every subscriber.  Subscribers apply their own
+level / container / regex filters on the already-decoded fields and
+receive batches of pre-encoded lines, which the SSE endpoint joins into a
+single ``event: logs`` frame (a JSON array) instead of one frame per line.
+
+A subscriber that falls more than LOG_TAIL_QUEUE_BATCHES batches behind
+loses its oldest batches (reported as a ``dropped`` count) rather than
+stalling the reader for everyone.  A tail's reader stops when its last
+subscriber leaves.
+"""
+
+import asyncio
+import json
+import os
+import re
+from typing import Optional
+
+from app import dependencies
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+LOG_TAIL_QUEUE_BATCHES = int(os.getenv("LOG_TAIL_QUEUE_BATCHES", "200"))
+
+_READ_COUNT = 500
+_BLOCK_MS = 3000
+
+
+def _stream_id(entry_id: str) -> tuple[int, int]:
+    ms, _, seq = entry_id.partition("-")
+    return int(ms), int(seq or 0)
+
+
+class LogEntry:
+    """One log line: fields used for filtering plus its JSON encoding."""
+
+    __slots__ = ("id", "level", "container", "line", "json")
+
+    def __init__(self, entry_id: str, fields: dict, default_container: str):
+        self.id = _stream_id(entry_id)
+        self.level = fields.get("level", "info")
+        self.container = fields.get("container", default_container)
+        self.line = fields.get("line", "")
+        self.json = json.dumps(
+            {
+                "line": self.line,
+                "level": self.level,
+                "ts": fields.get("ts", ""),
+                "container": self.container,
+                "service": fields.get("service", ""),
+            }
+        )
+
+
+class LogFilter:
+    """Server-side filter for one subscriber (all criteria must match)."""
+
+    def __init__(
+        self,
+        levels: Optional[set[str]] = None,
+        containers: Optional[set[str]] = None,
+        pattern: Optional[re.Pattern] = None,
+    ):
+        self.levels = levels or None
+        self.containers = containers or None
+        self.pattern = pattern
+
+    @property
+    def passes_all(self) -> bool:
+        return not (self.levels or self.containers or self.pattern)
+
+    def __call__(self, entry: LogEntry) -> bool:
+        if self.levels and entry.level not in self.levels:
+            return False
+        if self.containers and entry.container not in self.containers:
+            return False
+        if self.pattern and not self.pattern.search(entry.line):
+            return False
+        return True
+
+
+class LogSubscription:
+    """A subscriber's queue of entry batches."""
+
+    def __init__(self, tail: "LogTail", log_filter: LogFilter):
+        self.tail = tail
+        self.filter = log_filter
+        self.queue: asyncio.Queue[list[LogEntry]] = asyncio.Queue(
+            maxsize=LOG_TAIL_QUEUE_BATCHES
+        )
+        self.dropped = 0
+        # The tail's read position when this subscriber joined: older
+        # entries come from backfill, newer ones from the live reader
+        self.joined_at = tail.last_id
+        # Entries at or before this ID were already sent as backfill
+        self.after: tuple[int, int] = _stream_id(tail.last_id)
+
+    def _offer(self, batch: list[LogEntry]) -> None:
+        if self.queue.full():
+            self.dropped += len(self.queue.get_nowait())
+        self.queue.put_nowait(batch)
+
+    async def backfill(self, count: int) -> list[LogEntry]:
+        """The last *count* entries up to the point this subscriber joined."""
+        if count <= 0 or self.joined_at == "0-0":
+            return []
+        entries = await dependencies.redis_client.xrevrange(
+            self.tail.key, self.joined_at, "-", count=count
+        )
+        backfill = [
+            LogEntry(entry_id, fields, self.tail.default_container)
+            for entry_id, fields in reversed(entries)
+        ]
+        return [e for e in backfill if self.filter(e)]
+
+    async def next_batch(self, timeout: float, max_lines: int, window: float):
+        """Wait up to *timeout* for entries, then coalesce for up to *window*.
+
+        Returns (entries, dropped_since_last_call); entries is empty on
+        timeout.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            batch = await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            batch = []
+        entries = self._accept(batch)
+        if entries and window > 0:
+            deadline = loop.time() + window
+            while len(entries) < max_lines:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch = await asyncio.wait_for(self.queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                entries.extend(self._accept(batch))
+        dropped, self.dropped = self.dropped, 0
+        return entries, dropped
+
+    def _accept(self, batch: list[LogEntry]) -> list[LogEntry]:
+        if batch and batch[0].id <= self.after:
+            batch = [e for e in batch if e.id > self.after]
+        if self.filter.passes_all:
+            return list(batch)
+        return [e for e in batch if self.filter(e)]
+
+
+class LogTail:
+    """One XREAD reader for a log stream, fanned out to subscribers."""
+
+    def __init__(self, key: str, default_container: str):
+        self.key = key
+        self.default_container = default_container
+        # ID of the last entry handed to subscribers ("0-0": none yet)
+        self.last_id = "0-0"
+        self.subscribers: set[LogSubscription] = set()
+        self._task: Optional[asyncio.Task] = None
+        self.entries_read = 0
+
+    async def start(self) -> None:
+        # Pin the starting point; from then on last_id tracks the reader,
+        # so a subscriber's backfill (XREVRANGE up to last_id when it joins)
+        # and its live batches (everything after) neither overlap nor leave
+        # a gap, however long after the tail started it joins
+        latest = await dependencies.redis_client.xrevrange(self.key, "+", "-", count=1)
+        self.last_id = latest[0][0] if latest else "0-0"
+        self._task = asyncio.create_task(self._read())
+
+    async def _read(self) -> None:
+        while True:
+            try:
+                response = await dependencies.redis_client.xread(
+                    {self.key: self.last_id}, count=_READ_COUNT, block=_BLOCK_MS
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Log tail {self.key} read error: {e}")
+                await asyncio.sleep(2)
+                continue
+            for _stream, messages in response or []:
+                if not messages:
+                    continue
+                batch = [
+                    LogEntry(entry_id, fields, self.default_container)
+                    for entry_id, fields in messages
+                ]
+                self.entries_read += len(batch)
+                # Advance last_id and fan out in one step (no await), so a
+                # subscriber registered in between sees each batch exactly
+                # once: in its backfill or live
+                self.last_id = messages[-1][0]
+                for subscription in list(self.subscribers):
+                    subscription._offer(batch)
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+class LogTailMultiplexer:
+    """Process-wide registry of LogTails, one per stream key."""
+
+    def __init__(self) -> None:
+        self._tails: dict[str, LogTail] = {}
+        self._lock = asyncio.Lock()
+
+    async def subscribe(
+        self, key: str, log_filter: LogFilter, default_container: str = ""
+    ) -> LogSubscription:
+        async with self._lock:
+            tail = self._tails.get(key)
+            if tail is None:
+                tail = LogTail(key, default_container)
+                await tail.start()
+                self._tails[key] = tail
+            # Pin the subscriber to the tail's position and register it in
+            # the same step, so no batch falls between backfill and live
+            subscription = LogSubscription(tail, log_filter)
+            tail.subscribers.add(subscription)
+            return subscription
+
+    async def unsubscribe(self, subscription: LogSubscription) -> None:
+        async with self._lock:
+            tail = subscription.tail
+            tail.subscribers.discard(subscription)
+            if not tail.subscribers and self._tails.get(tail.key) is tail:
+                del self._tails[tail.key]
+                await tail.stop()
+
+    def stats(self) -> dict:
+        return {
+            "tails": {
+                key: {
+                    "subscribers": len(tail.subscribers),
+                    "entriesRead": tail.entries_read,
+                }
+                for key, tail in self._tails.items()
+            }
+        }
+
+    async def shutdown(self) -> None:
+        async with self._lock:
+            for tail in self._tails.values():
+                await tail.stop()
+            self._tails.clear()
+
+
+log_tails = LogTailMultiplexer()
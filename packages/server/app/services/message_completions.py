@@ -0,0 +1,176 @@
+"""Wait for chat assistant messages to complete without polling the DB.
+
+The engine finishes a chat turn by calling
+``PATCH /v1/internal/chat/messages/{id}/complete``; after committing, that
+endpoint publishes the message ID on MESSAGE_COMPLETE_CHANNEL.  Callers
+that need a reply synchronously (the Dialog ingest endpoints) register the
+message ID *before* dispatching the prompt, then await the notification —
+one shared SUBSCRIBE serves every waiter in the process, and no database
+connection is held while waiting.
+
+The content itself is read back with a short-lived session once the
+notification arrives.  If a notification is lost (e.g. the listener was
+reconnecting), the waiter re-checks the row every
+MESSAGE_COMPLETION_RECHECK_SECONDS, so it degrades to slow polling rather
+than hanging until the timeout.
+"""
+
+import asyncio
+import json
+import os
+from typing import Optional
+
+from sqlalchemy import select
+
+from app import dependencies
+from app.logging_config import get_logger
+from app.services.pubsub_listener import listen_forever
+
+logger = get_logger(__name__)
+
+MESSAGE_COMPLETE_CHANNEL = "djinnbot:chat:messages:complete"
+
+MESSAGE_COMPLETION_RECHECK_SECONDS = float(
+    os.getenv("MESSAGE_COMPLETION_RECHECK_SECONDS", "15")
+)
+
+# How long expect() waits for the shared subscription before giving up and
+# relying on the periodic re-check alone
+_SUBSCRIBE_TIMEOUT_SECONDS = 5.0
+
+
+async def notify_message_completed(message_id: str, session_id: str) -> None:
+    """Announce that an assistant message was completed (call after commit)."""
+    if not dependencies.redis_client:
+        return
+    try:
+        await dependencies.redis_client.publish(
+            MESSAGE_COMPLETE_CHANNEL,
+            json.dumps({"message_id": message_id, "session_id": session_id}),
+        )
+    except Exception as e:
+        logger.warning(f"Failed to publish completion for {message_id}: {e}")
+
+
+async def load_completed_content(message_id: str) -> Optional[str]:
+    """Content of a completed, non-empty assistant message, else None."""
+    from app.database import AsyncSessionLocal
+    from app.models.chat import ChatMessage
+
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            select(ChatMessage.content, ChatMessage.completed_at).where(
+                ChatMessage.id == message_id
+            )
+        )
+        row = result.first()
+    if row and row.completed_at and row.content:
+        return row.content
+    return None
+
+
+class MessageCompletionRegistry:
+    """message_id → future, resolved by one shared completion subscription."""
+
+    def __init__(self) -> None:
+        self._waiters: dict[str, asyncio.Future] = {}
+        self._subscribed = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def _ensure_started(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._listen())
+
+    async def _listen(self) -> None:
+        await listen_forever(
+            "Message completion",
+            self._resolve,
+            channels=[MESSAGE_COMPLETE_CHANNEL],
+            on_subscribed=self._subscribed.set,
+            on_disconnected=self._subscribed.clear,
+            retry_seconds=1,
+        )
+
+    def _resolve(self, _channel: str, data: str) -> None:
+        try:
+            message_id = json.loads(data)["message_id"]
+        except (json.JSONDecodeError, KeyError, TypeError):
+            return
+        future = self._waiters.get(message_id)
+        if future is not None and not future.done():
+            future.set_result(None)
+
+    async def expect(self, message_id: str) -> None:
+        """Register interest in *message_id*; call before dispatching the prompt."""
+        self._waiters[message_id] = asyncio.get_running_loop().create_future()
+        if not dependencies.redis_client:
+            return
+        self._ensure_started()
+        try:
+            await asyncio.wait_for(
+                self._subscribed.wait(), _SUBSCRIBE_TIMEOUT_SECONDS
+            )
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Message completion subscription not ready; relying on re-checks"
+            )
+
+    def completed(self, message_id: str) -> bool:
+        """True once a completion notification for *message_id* has arrived."""
+        future = self._waiters.get(message_id)
+        return future is not None and future.done()
+
+    async def wait(self, message_id: str, timeout: float) -> Optional[str]:
+        """Wait for the message's final content; None if it times out.
+
+        Completions with empty content (the engine completes an empty turn
+        before auto-continuing) are ignored, and waiting continues.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        try:
+            while True:
+                future = self._waiters.get(message_id)
+                if future is None:
+                    future = self._waiters[message_id] = loop.create_future()
+                remaining = deadline - loop.time()
+                if remaining > 0:
+                    try:
+                        await asyncio.wait_for(
+                            asyncio.shield(future),
+                            min(remaining, MESSAGE_COMPLETION_RECHECK_SECONDS),
+                        )
+                    except asyncio.TimeoutError:
+                        pass
+                content = await load_completed_content(message_id)
+                if content:
+                    return content
+                if loop.time() >= deadline:
+                    return None
+                if future.done():
+                    # Empty completion — wait for the next one
+                    self._waiters[message_id] = loop.create_future()
+        finally:
+            self.discard(message_id)
+
+    def discard(self, message_id: str) -> None:
+        future = self._waiters.pop(message_id, None)
+        if future is not None and not future.done():
+            future.cancel()
+
+    def stats(self) -> dict:
+        return {
+            "subscribed": self._subscribed.is_set(),
+            "waiting": len(self._waiters),
+        }
+
+    async def shutdown(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        for message_id in list(self._waiters):
+            self.discard(message_id)
+
+
+message_completions = MessageCompletionRegistry()
@@ -0,0 +1,260 @@
+"""Monthly partitions and retention for the append-only log tables.
+
+llm_call_logs, session_events, memory_retrieval_log and tts_call_logs
+grow without bound.  On PostgreSQL the zc4 migration turns each of them
+into a table partitioned by RANGE on its timestamp column:
+
+    {table}_legacy     — the pre-existing rows, attached as-is up to the
+                         end of the month the migration ran in
+    {table}_pYYYYMM    — one partition per UTC month
+    {table}_default    — safety net for rows no partition covers yet
+
+This module keeps PARTITION_PRECREATE_MONTHS months of partitions created
+ahead of time and enforces retention by dropping partitions whose upper
+bound is older than the table's retention window — no large DELETEs, no
+long locks.  Range filters on the timestamp column (dashboards, usage
+queries) let the planner prune everything outside the range.
+
+SQLite has no partitioning; there, retention deletes expired rows in
+small batches instead.
+
+Retention is configured per table in days (0 keeps rows forever):
+
+    LOG_RETENTION_DAYS                    — default for every table
+    LOG_RETENTION_DAYS_<TABLE_NAME>       — e.g. LOG_RETENTION_DAYS_SESSION_EVENTS
+"""
+
+import asyncio
+import os
+import re
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# table → partition key column (epoch milliseconds)
+PARTITIONED_TABLES = {
+    "llm_call_logs": "created_at",
+    "session_events": "timestamp",
+    "memory_retrieval_log": "created_at",
+    "tts_call_logs": "created_at",
+}
+
+PARTITION_PRECREATE_MONTHS = int(os.getenv("PARTITION_PRECREATE_MONTHS", "3"))
+PARTITION_MAINTENANCE_INTERVAL_SECONDS = int(
+    os.getenv("PARTITION_MAINTENANCE_INTERVAL_SECONDS", "21600")
+)
+LOG_RETENTION_DAYS = int(os.getenv("LOG_RETENTION_DAYS", "0"))
+
+# Rows deleted per statement when enforcing retention on SQLite
+_SQLITE_DELETE_BATCH = 5000
+# Arbitrary key for pg_try_advisory_xact_lock — one maintainer at a time
+_ADVISORY_LOCK_KEY = 7_351_208_114
+
+_RANGE_BOUND_RE = re.compile(r"FROM \('?(MINVALUE|-?\d+)'?\) TO \('?(MAXVALUE|-?\d+)'?\)")
+
+
+def retention_days(table: str) -> int:
+    override = os.getenv(f"LOG_RETENTION_DAYS_{table.upper()}")
+    if override not in (None, ""):
+        return int(override)
+    return LOG_RETENTION_DAYS
+
+
+def _month_start(year: int, month: int) -> datetime:
+    year, month = year + (month - 1) // 12, (month - 1) % 12 + 1
+    return datetime(year, month, 1, tzinfo=timezone.utc)
+
+
+def _to_ms(dt: datetime) -> int:
+    return int(dt.timestamp() * 1000)
+
+
+def _parse_bound(bound: Optional[str]) -> Optional[tuple[float, float]]:
+    """(lower, upper) of a range partition bound; None for DEFAULT."""
+    m = _RANGE_BOUND_RE.search(bound or "")
+    if not m:
+        return None
+    lower, upper = m.groups()
+    return (
+        float("-inf") if lower == "MINVALUE" else int(lower),
+        float("inf") if upper == "MAXVALUE" else int(upper),
+    )
+
+
+def month_ranges(now: datetime, months_ahead: int) -> list[tuple[str, int, int]]:
+    """(suffix, start_ms, end_ms) for the current month and *months_ahead* more."""
+    ranges = []
+    for offset in range(months_ahead + 1):
+        start = _month_start(now.year, now.month + offset)
+        end = _month_start(now.year, now.month + offset + 1)
+        ranges.append((start.strftime("p%Y%m"), _to_ms(start), _to_ms(end)))
+    return ranges
+
+
+# ── PostgreSQL ─────────────────────────────────────────────────────────────
+
+
+async def _is_partitioned(conn: AsyncConnection, table: str) -> bool:
+    result = await conn.execute(
+        text(
+            "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table)"
+        ),
+        {"table": table},
+    )
+    return result.first() is not None
+
+
+async def _partitions(conn: AsyncConnection, table: str) -> list[tuple[str, str]]:
+    """(partition name, bound expression) for each partition of *table*."""
+    result = await conn.execute(
+        text(
+            "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) "
+            "FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass(:table)"
+        ),
+        {"table": table},
+    )
+    return [(name, bound) for name, bound in result.all()]
+
+
+async def _ensure_pg_partitions(
+    conn: AsyncConnection, table: str, column: str, now: datetime
+) -> list[str]:
+    existing = await _partitions(conn, table)
+    names = {name for name, _ in existing}
+    ranges = [r for _, bound in existing if (r := _parse_bound(bound))]
+    created = []
+    for suffix, start, end in month_ranges(now, PARTITION_PRECREATE_MONTHS):
+        name = f"{table}_{suffix}"
+        if name in names or any(lo < end and start < hi for lo, hi in ranges):
+            continue
+        try:
+            async with conn.begin_nested():
+                await conn.execute(
+                    text(
+                        f'CREATE TABLE "{name}" PARTITION OF "{table}" '
+                        f"FOR VALUES FROM ({start}) TO ({end})"
+                    )
+                )
+            created.append(name)
+        except Exception as e:
+            # Typically: rows for this month already landed in the default
+            # partition.  They stay readable; the month just isn't prunable.
+            logger.warning(f"Could not create partition {name}: {e}")
+
+    if f"{table}_default" in names:
+        result = await conn.execute(
+            text(f'SELECT EXISTS (SELECT 1 FROM "{table}_default")')
+        )
+        if result.scalar():
+            logger.warning(
+                f"{table}_default holds rows outside every monthly partition "
+                f"(check {column} values / PARTITION_PRECREATE_MONTHS)"
+            )
+    return created
+
+
+async def _drop_expired_pg_partitions(
+    conn: AsyncConnection, table: str, cutoff_ms: int
+) -> list[str]:
+    dropped = []
+    for name, bound in await _partitions(conn, table):
+        bounds = _parse_bound(bound)
+        if bounds is None or bounds[1] > cutoff_ms:
+            continue
+        await conn.execute(text(f'ALTER TABLE "{table}" DETACH PARTITION "{name}"'))
+        await conn.execute(text(f'DROP TABLE "{name}"'))
+        dropped.append(name)
+    return dropped
+
+
+# ── SQLite ─────────────────────────────────────────────────────────────────
+
+
+async def _delete_expired_sqlite_rows(
+    conn: AsyncConnection, table: str, column: str, cutoff_ms: int
+) -> int:
+    deleted = 0
+    while True:
+        result = await conn.execute(
+            text(
+                f'DELETE FROM "{table}" WHERE rowid IN ('
+                f'SELECT rowid FROM "{table}" WHERE "{column}" < :cutoff LIMIT :batch)'
+            ),
+            {"cutoff": cutoff_ms, "batch": _SQLITE_DELETE_BATCH},
+        )
+        await conn.commit()
+        deleted += result.rowcount or 0
+        if (result.rowcount or 0) < _SQLITE_DELETE_BATCH:
+            return deleted
+        # Let other writers at the single connection between batches
+        await asyncio.sleep(0)
+
+
+# ── Maintenance ────────────────────────────────────────────────────────────
+
+
+async def run_partition_maintenance(now: Optional[datetime] = None) -> dict:
+    """Create upcoming partitions and enforce retention on every log table.
+
+    Returns ``{"created": [...], "dropped": [...], "deleted": {table: rows}}``.
+    """
+    from app.database import engine
+
+    now = now or datetime.now(timezone.utc)
+    now_ms = _to_ms(now)
+    summary: dict = {"created": [], "dropped": [], "deleted": {}}
+
+    async with engine.connect() as conn:
+        if conn.dialect.name == "postgresql":
+            async with conn.begin():
+                locked = await conn.execute(
+                    text("SELECT pg_try_advisory_xact_lock(:key)"),
+                    {"key": _ADVISORY_LOCK_KEY},
+                )
+                if not locked.scalar():
+                    return summary
+                for table, column in PARTITIONED_TABLES.items():
+                    if not await _is_partitioned(conn, table):
+                        continue
+                    summary["created"] += await _ensure_pg_partitions(
+                        conn, table, column, now
+                    )
+                    days = retention_days(table)
+                    if days > 0:
+                        summary["dropped"] += await _drop_expired_pg_partitions(
+                            conn, table, now_ms - days * 86_400_000
+                        )
+        elif conn.dialect.name == "sqlite":
+            for table, column in PARTITIONED_TABLES.items():
+                days = retention_days(table)
+                if days > 0:
+                    summary["deleted"][table] = await _delete_expired_sqlite_rows(
+                        conn, table, column, now_ms - days * 86_400_000
+                    )
+
+    if summary["created"]:
+        logger.info(f"Created log partitions: {', '.join(summary['created'])}")
+    if summary["dropped"]:
+        logger.info(f"Dropped expired log partitions: {', '.join(summary['dropped'])}")
+    for table, rows in summary["deleted"].items():
+        if rows:
+            logger.info(f"Deleted {rows} expired rows from {table}")
+    return summary
+
+
+async def periodic_partition_maintenance() -> None:
+    """Background task: keep partitions ahead of time and apply retention."""
+    while True:
+        await asyncio.sleep(PARTITION_MAINTENANCE_INTERVAL_SECONDS)
+        try:
+            await run_partition_maintenance()
+        except Exception as e:
+            logger.error(f"Partition maintenance failed: {e}")
@@ -11,6 +11,8 @@ File layout in shared vault:
     chunk-00.md        — first chunk
     chunk-01.md        — second chunk
     ...
+    _chunks.idx.json   — heading/page maps, BM25 stats and byte offsets
+                         (see document_index.py)
 
 Each chunk is wiki-linked back to the _index.md file and to adjacent chunks,
 building graph edges that ClawVault's graph traversal can follow.
@@ -23,6 +25,7 @@ import time
 from typing import Optional
 
 from app.logging_config import get_logger
+from app.services.document_index import write_index
 from app.services.pdf_chunker import PdfChunk, TableOfContentsEntry, format_toc
 
 logger = get_logger(__name__)
@@ -114,6 +117,7 @@ def ingest_pdf_to_shared_vault(
     files_written += 1
 
     # 2. Write each chunk as a separate file
+    index_entries = []
     for i, chunk in enumerate(chunks):
         chunk_filename = f"chunk-{i:02d}.md"
         chunk_path = os.path.join(doc_dir, chunk_filename)
@@ -142,6 +146,7 @@ def ingest_pdf_to_shared_vault(
                 "tags": ["pdf", "document-chunk"],
             }
         )
+        body_offset = len(chunk_content.encode("utf-8"))
         chunk_content += chunk.content + "\n\n"
         chunk_content += "---\n"
         chunk_content += "Related: " + " ".join(links) + "\n"
@@ -150,11 +155,27 @@ def ingest_pdf_to_shared_vault(
             f.write(chunk_content)
         files_written += 1
 
+        index_entries.append(
+            {
+                "chunk_index": chunk.chunk_index,
+                "file": chunk_filename,
+                "offset": body_offset,
+                "length": len(chunk.content.encode("utf-8")),
+                "section": chunk.section_heading,
+                "pages": chunk.page_numbers,
+                "tokens": chunk.token_estimate,
+                "content": chunk.content,
+            }
+        )
+
+    # 3. Write the chunk index used by the document query endpoints
+    write_index(doc_dir, index_entries)
+
     logger.info(
         f"PDF vault ingest: {filename} → {files_written} files in shared/documents/{doc_slug}/"
     )
 
-    # 3. Signal engine to re-index (single signal for the batch)
+    # 4. Signal engine to re-index (single signal for the batch)
     if redis_client:
         _signal_reindex(redis_client, doc_slug)
 
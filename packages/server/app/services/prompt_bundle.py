@@ -0,0 +1,155 @@
+"""Versioned, in-process cache of each agent's system-prompt bundle.
+
+The bundle (persona files, config.yml, skills manifest, MCP manifest) is
+served by ``GET /v1/agents/{agent_id}/prompt-bundle``.  Every agent has a
+monotonic version counter in Redis (``djinnbot:agent:{id}:prompt_version``)
+that is bumped whenever anything in its bundle changes:
+
+  - skill / MCP grants granted or revoked
+  - skill edits (every agent granted the skill)
+  - MCP server edits or status changes (every agent granted the server)
+  - persona file or config.yml writes
+
+Versions are scoped to an epoch: a random id kept in Redis
+(``djinnbot:prompt_bundle:epoch``) and regenerated whenever it is missing,
+so counters that restart from 0 after a Redis flush can't collide with
+versions cached before it.  The rendered bundle is cached in-process per
+(epoch, version) and rebuilt only after a bump.
+
+The ETag is ``v{version}-{content hash}``.  A request whose
+``If-None-Match`` matches the cached bundle's ETag gets a 304 without a
+re-render; on a cache miss the bundle is rendered and its ETag compared,
+so a 304 always reflects the content actually being served.
+
+Bumps must happen after the change is committed, otherwise a concurrent
+reader could cache pre-commit data under the new version.
+"""
+
+import hashlib
+import uuid
+from typing import Iterable, NamedTuple, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import dependencies
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+_EPOCH_KEY = "djinnbot:prompt_bundle:epoch"
+
+
+class PromptVersion(NamedTuple):
+    epoch: str
+    number: int
+
+
+def _version_key(agent_id: str) -> str:
+    return f"djinnbot:agent:{agent_id}:prompt_version"
+
+
+async def get_prompt_version(agent_id: str) -> Optional[PromptVersion]:
+    """Current bundle version, or None when Redis is unavailable."""
+    redis = dependencies.redis_client
+    if not redis:
+        return None
+    try:
+        epoch, value = await redis.mget(_EPOCH_KEY, _version_key(agent_id))
+        if epoch is None:
+            await redis.set(_EPOCH_KEY, uuid.uuid4().hex, nx=True)
+            epoch, value = await redis.mget(_EPOCH_KEY, _version_key(agent_id))
+    except Exception as e:
+        logger.warning(f"Failed to read prompt version for {agent_id}: {e}")
+        return None
+    if epoch is None:
+        return None
+    return PromptVersion(epoch, int(value) if value else 0)
+
+
+async def bump_prompt_version(agent_ids: Iterable[str]) -> None:
+    """Invalidate the prompt bundle of each agent (call after committing)."""
+    agent_ids = sorted(set(agent_ids))
+    for agent_id in agent_ids:
+        prompt_bundle_cache.discard(agent_id)
+    if not agent_ids or not dependencies.redis_client:
+        return
+    try:
+        pipe = dependencies.redis_client.pipeline(transaction=False)
+        for agent_id in agent_ids:
+            pipe.incr(_version_key(agent_id))
+        await pipe.execute()
+    except Exception as e:
+        logger.warning(f"Failed to bump prompt version for {agent_ids}: {e}")
+
+
+async def bump_for_skills(db: AsyncSession, skill_ids: Iterable[str]) -> None:
+    """Bump every agent that has been granted any of *skill_ids*."""
+    from app.models.skill import AgentSkill
+
+    skill_ids = list(skill_ids)
+    if not skill_ids:
+        return
+    result = await db.execute(
+        select(AgentSkill.agent_id)
+        .where(AgentSkill.skill_id.in_(skill_ids))
+        .distinct()
+    )
+    await bump_prompt_version(result.scalars().all())
+
+
+async def agents_granted_mcp_server(db: AsyncSession, server_id: str) -> list[str]:
+    from app.models.mcp import AgentMcpTool
+
+    result = await db.execute(
+        select(AgentMcpTool.agent_id)
+        .where(AgentMcpTool.server_id == server_id)
+        .distinct()
+    )
+    return list(result.scalars().all())
+
+
+def bundle_etag(version: Optional[PromptVersion], body: bytes) -> str:
+    digest = hashlib.sha1(body).hexdigest()[:20]
+    if version is not None:
+        return f'"v{version.number}-{digest}"'
+    return f'"{digest}"'
+
+
+class PromptBundleCache:
+    """agent_id → (version, rendered JSON body, ETag), valid for one version."""
+
+    def __init__(self) -> None:
+        self._entries: dict[str, tuple[PromptVersion, bytes, str]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self, agent_id: str, version: Optional[PromptVersion]
+    ) -> Optional[tuple[bytes, str]]:
+        """(body, ETag) cached for exactly *version*, or None."""
+        entry = self._entries.get(agent_id)
+        if version is None or entry is None or entry[0] != version:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[1], entry[2]
+
+    def put(
+        self, agent_id: str, version: Optional[PromptVersion], body: bytes
+    ) -> str:
+        """Cache *body* for *version* and return its ETag."""
+        etag = bundle_etag(version, body)
+        if version is not None:
+            self._entries[agent_id] = (version, body, etag)
+        return etag
+
+    def discard(self, agent_id: str) -> None:
+        self._entries.pop(agent_id, None)
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+prompt_bundle_cache = PromptBundleCache()
@@ -0,0 +1,58 @@
+"""Long-lived Redis pub/sub subscriptions that survive disconnects.
+
+Several services keep one subscription per process for its whole lifetime:
+cache invalidation (settings, auth principals, the GitHub routing table),
+bridge RPC replies and chat message completions.  ``listen_forever`` is the
+reconnect loop they share: subscribe, call ``on_subscribed``, dispatch
+messages, and on any error close the connection, wait and start over.
+"""
+
+import asyncio
+from typing import Callable, Optional, Sequence
+
+from app import dependencies
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+async def listen_forever(
+    name: str,
+    on_message: Callable[[str, str], None],
+    *,
+    channels: Sequence[str] = (),
+    patterns: Sequence[str] = (),
+    on_subscribed: Optional[Callable[[], None]] = None,
+    on_disconnected: Optional[Callable[[], None]] = None,
+    retry_seconds: float = 2.0,
+) -> None:
+    """Call ``on_message(channel, data)`` for every message until cancelled.
+
+    ``on_subscribed`` runs each time the subscription is (re)established —
+    e.g. to drop a cache that may have missed messages while disconnected —
+    and ``on_disconnected`` each time it is lost.
+    """
+    while True:
+        pubsub = dependencies.redis_client.pubsub()
+        try:
+            if channels:
+                await pubsub.subscribe(*channels)
+            if patterns:
+                await pubsub.psubscribe(*patterns)
+            if on_subscribed is not None:
+                on_subscribed()
+            async for message in pubsub.listen():
+                if message["type"] in ("message", "pmessage"):
+                    on_message(message["channel"], message["data"])
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"{name} listener error: {e}")
+            await asyncio.sleep(retry_seconds)
+        finally:
+            if on_disconnected is not None:
+                on_disconnected()
+            try:
+                await pubsub.aclose()
+            except Exception:
+                pass
@@ -0,0 +1,136 @@
+"""Process-local caches behind ``GET /v1/runs/{run_id}``.
+
+The engine and executors poll ``get_run`` throughout a run.  Each call
+used to ``json.loads`` every step's inputs and outputs, stat the run
+workspace twice on the shared (JuiceFS) filesystem and look up the
+project's key user — work that rarely changes between two polls.
+
+* Decoded JSON columns are memoised per run, keyed by the raw string, so
+  a changed column is re-decoded even if it was written by another worker.
+* Workspace stat results and project key users are kept for a short TTL.
+
+``update_run``/``update_step`` (and the other run writers) call
+``invalidate_run`` so this worker drops a run's entries immediately;
+other workers converge through the raw-string check and the TTL.
+"""
+
+import json
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional
+
+RUN_CACHE_MAX_RUNS = int(os.getenv("RUN_CACHE_MAX_RUNS", "512"))
+RUN_WORKSPACE_STAT_TTL_SECONDS = float(
+    os.getenv("RUN_WORKSPACE_STAT_TTL_SECONDS", "15")
+)
+PROJECT_KEY_USER_TTL_SECONDS = float(os.getenv("PROJECT_KEY_USER_TTL_SECONDS", "60"))
+
+
+class RunReadCache:
+    """Decoded run/step JSON, workspace stats and project key users."""
+
+    def __init__(self, max_runs: int, stat_ttl: float, key_user_ttl: float):
+        self._max_runs = max_runs
+        self._stat_ttl = stat_ttl
+        self._key_user_ttl = key_user_ttl
+        # run_id → {column key → (raw string, decoded)}; LRU over runs
+        self._json: OrderedDict[str, dict[str, tuple[str, Any]]] = OrderedDict()
+        # run_id → (expires_at, workspace path, exists, has_git)
+        self._workspace: dict[str, tuple[float, str, bool, bool]] = {}
+        # project_id → (expires_at, key_user_id)
+        self._key_users: dict[str, tuple[float, Optional[str]]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    # ── JSON columns ────────────────────────────────────────────────────
+
+    def decode(self, run_id: str, key: str, raw: Optional[str], default: Any) -> Any:
+        """``json.loads(raw)`` memoised under (*run_id*, *key*).
+
+        Returns *default* for empty columns.  The decoded value is shared
+        between callers and must not be mutated.
+        """
+        if not raw:
+            return default
+        columns = self._json.get(run_id)
+        if columns is None:
+            columns = self._json[run_id] = {}
+            if len(self._json) > self._max_runs:
+                self._json.popitem(last=False)
+        else:
+            self._json.move_to_end(run_id)
+        cached = columns.get(key)
+        if cached is not None and cached[0] == raw:
+            self.hits += 1
+            return cached[1]
+        self.misses += 1
+        value = json.loads(raw)
+        columns[key] = (raw, value)
+        return value
+
+    # ── Workspace stat ──────────────────────────────────────────────────
+
+    def workspace_state(self, run_id: str, path: Path) -> tuple[bool, bool]:
+        """(exists, has .git) for *path*, re-checked at most every TTL."""
+        now = time.monotonic()
+        cached = self._workspace.get(run_id)
+        if cached is not None and cached[0] > now and cached[1] == str(path):
+            return cached[2], cached[3]
+        exists = path.exists()
+        has_git = (path / ".git").exists() if exists else False
+        if len(self._workspace) >= self._max_runs:
+            self._prune(self._workspace, now)
+        self._workspace[run_id] = (now + self._stat_ttl, str(path), exists, has_git)
+        return exists, has_git
+
+    # ── Project key user ────────────────────────────────────────────────
+
+    async def project_key_user(self, session, project_id: str) -> Optional[str]:
+        """The project's configured key user, re-read at most every TTL."""
+        now = time.monotonic()
+        cached = self._key_users.get(project_id)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+        from sqlalchemy import select
+
+        from app.models.project import Project
+
+        result = await session.execute(
+            select(Project.key_user_id).where(Project.id == project_id)
+        )
+        key_user_id = result.scalar_one_or_none()
+        if len(self._key_users) >= self._max_runs:
+            self._prune(self._key_users, now)
+        self._key_users[project_id] = (now + self._key_user_ttl, key_user_id)
+        return key_user_id
+
+    # ── Invalidation ────────────────────────────────────────────────────
+
+    def invalidate_run(self, run_id: str) -> None:
+        self._json.pop(run_id, None)
+        self._workspace.pop(run_id, None)
+
+    def invalidate_project(self, project_id: str) -> None:
+        self._key_users.pop(project_id, None)
+
+    def _prune(self, entries: dict, now: float) -> None:
+        for key in [k for k, v in entries.items() if v[0] <= now]:
+            del entries[key]
+        if len(entries) >= self._max_runs:
+            entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "runs": len(self._json),
+            "workspaces": len(self._workspace),
+            "projects": len(self._key_users),
+        }
+
+
+run_cache = RunReadCache(
+    RUN_CACHE_MAX_RUNS, RUN_WORKSPACE_STAT_TTL_SECONDS, PROJECT_KEY_USER_TTL_SECONDS
+)
@@ -0,0 +1,178 @@
+"""Process-local cache of the global_settings table.
+
+Hot paths (TTS synthesis, chat start, ingest, memory scoring) used to
+``select(GlobalSetting)`` on every call.  Instead, the whole table — a few
+dozen small rows — is loaded once per process and reads become dict
+lookups.
+
+Writers call ``await settings_cache.invalidate()`` after committing.  That
+drops the local copy immediately and publishes on
+``djinnbot:settings:invalidate`` so every other API worker drops theirs;
+the next read reloads the table with a single query.  A TTL bounds
+staleness if a pub/sub message is ever missed (e.g. Redis restart).
+"""
+
+import asyncio
+import json
+import os
+import time
+from typing import Any, Optional
+
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+SETTINGS_INVALIDATE_CHANNEL = "djinnbot:settings:invalidate"
+
+# Upper bound on staleness when an invalidation message is missed
+SETTINGS_CACHE_TTL_SECONDS = float(os.getenv("SETTINGS_CACHE_TTL_SECONDS", "300"))
+
+_UNSET = object()
+
+
+class SettingsCache:
+    """Lazily-loaded, pub/sub-invalidated snapshot of global_settings."""
+
+    def __init__(self, ttl_seconds: float):
+        self._ttl = ttl_seconds
+        self._values: Optional[dict[str, str]] = None
+        self._loaded_at = 0.0
+        self._generation = 0
+        self._lock = asyncio.Lock()
+        # Parsed JSON values, keyed by setting key → (raw string, parsed)
+        self._json: dict[str, tuple[str, Any]] = {}
+
+    # ── Loading ─────────────────────────────────────────────────────────
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._values is not None
+            and time.monotonic() - self._loaded_at < self._ttl
+        )
+
+    async def _snapshot(self) -> dict[str, str]:
+        if self._is_fresh():
+            return self._values
+        async with self._lock:
+            if self._is_fresh():
+                return self._values
+            generation = self._generation
+            values = await self._load()
+            # Only install if nothing invalidated us mid-load
+            if generation == self._generation:
+                self._values = values
+                self._loaded_at = time.monotonic()
+            return values
+
+    @staticmethod
+    async def _load() -> dict[str, str]:
+        from sqlalchemy import select
+
+        from app.database import AsyncSessionLocal
+        from app.models.settings import GlobalSetting
+
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(select(GlobalSetting.key, GlobalSetting.value))
+            return {key: value for key, value in result.all()}
+
+    # ── Typed reads ─────────────────────────────────────────────────────
+
+    async def all(self) -> dict[str, str]:
+        """Return the full settings mapping (do not mutate)."""
+        return await self._snapshot()
+
+    async def get(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        return (await self._snapshot()).get(key, default)
+
+    async def get_str(self, key: str, default: str = "") -> str:
+        """Like get(), but treats empty/whitespace values as unset."""
+        value = await self.get(key)
+        return value.strip() if value and value.strip() else default
+
+    async def get_int(self, key: str, default: int) -> int:
+        value = await self.get(key)
+        try:
+            return int(value) if value not in (None, "") else default
+        except ValueError:
+            return default
+
+    async def get_float(self, key: str, default: float) -> float:
+        value = await self.get(key)
+        try:
+            return float(value) if value not in (None, "") else default
+        except ValueError:
+            return default
+
+    async def get_bool(self, key: str, default: bool) -> bool:
+        value = await self.get(key)
+        if value in (None, ""):
+            return default
+        return value.lower() == "true"
+
+    async def get_json(self, key: str, default: Any = None) -> Any:
+        await self._snapshot()
+        return self.peek_json(key, default)
+
+    def peek_json(self, key: str, default: Any = None) -> Any:
+        """Synchronous JSON read from the current snapshot (no DB access).
+
+        Returns *default* if the cache has not been loaded yet.  Parsed
+        values are memoised until the raw string changes.
+        """
+        if self._values is None:
+            return default
+        raw = self._values.get(key)
+        if raw is None:
+            return default
+        cached = self._json.get(key)
+        if cached is not None and cached[0] == raw:
+            return cached[1]
+        try:
+            parsed = json.loads(raw)
+        except (json.JSONDecodeError, TypeError):
+            return default
+        self._json[key] = (raw, parsed)
+        return parsed
+
+    # ── Invalidation ────────────────────────────────────────────────────
+
+    def invalidate_local(self) -> None:
+        self._generation += 1
+        self._values = None
+
+    async def invalidate(self, keys: Optional[list[str]] = None) -> None:
+        """Drop this process's copy and tell every other worker to do the same.
+
+        Call after committing a write to global_settings.
+        """
+        self.invalidate_local()
+        from app import dependencies
+
+        if dependencies.redis_client:
+            try:
+                await dependencies.redis_client.publish(
+                    SETTINGS_INVALIDATE_CHANNEL,
+                    json.dumps({"keys": keys or [], "pid": os.getpid()}),
+                )
+            except Exception as e:
+                logger.warning(f"Failed to publish settings invalidation: {e}")
+
+    async def listen(self) -> None:
+        """Background task: drop the local copy whenever any worker writes."""
+        from app import dependencies
+
+        from app.services.pubsub_listener import listen_forever
+
+        if not dependencies.redis_client:
+            return
+
+        await listen_forever(
+            "Settings invalidation",
+            lambda _channel, _data: self.invalidate_local(),
+            channels=[SETTINGS_INVALIDATE_CHANNEL],
+            # Anything may have changed while we were unsubscribed
+            on_subscribed=self.invalidate_local,
+        )
+
+
+settings_cache = SettingsCache(SETTINGS_CACHE_TTL_SECONDS)
@@ -0,0 +1,168 @@
+"""Index of swarm sessions for listing without SCAN.
+
+The engine keeps each swarm's state in ``djinnbot:swarm:{id}:state`` (a
+JSON string refreshed with a one-hour TTL on every update).  Listing used
+to SCAN the whole keyspace for those keys, which gets slower with every
+run stream, inbox and timeline in Redis.
+
+Swarms are now also registered in the sorted set SWARM_INDEX_KEY, scored
+by creation time in epoch ms — by the API when it dispatches a swarm and
+by the engine when it first persists state.  Listing is a ZREVRANGEBYSCORE
+for one page of IDs plus a single MGET of their state keys.
+
+Index members outlive their state keys, so they are cleaned up lazily: IDs
+whose state is gone are removed when a listing encounters them, and each
+listing also checks a bounded batch of entries older than the state TTL.
+A swarm the API registered but the engine has not written yet also has no
+state, so entries younger than SWARM_REGISTER_GRACE_SECONDS are skipped
+rather than removed.
+"""
+
+import json
+import os
+import time
+from typing import Optional
+
+from app import dependencies
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+SWARM_INDEX_KEY = "djinnbot:swarms:index"
+
+# Must match the TTL the engine sets on swarm state keys (core/src/main.ts)
+SWARM_STATE_TTL_SECONDS = int(os.getenv("SWARM_STATE_TTL_SECONDS", "3600"))
+
+# How long a registered swarm may go without state before it is unindexed
+SWARM_REGISTER_GRACE_SECONDS = int(os.getenv("SWARM_REGISTER_GRACE_SECONDS", "600"))
+
+# Old index entries checked for expired state per listing
+_SWEEP_BATCH = 100
+
+
+def swarm_state_key(swarm_id: str) -> str:
+    return f"djinnbot:swarm:{swarm_id}:state"
+
+
+async def register_swarm(swarm_id: str, created_at_ms: Optional[int] = None) -> None:
+    """Add a swarm to the index (keeps the earliest registration time)."""
+    if created_at_ms is None:
+        created_at_ms = int(time.time() * 1000)
+    await dependencies.redis_client.zadd(
+        SWARM_INDEX_KEY, {swarm_id: created_at_ms}, nx=True
+    )
+
+
+async def load_swarm_states(swarm_ids: list[str]) -> dict[str, dict]:
+    """State dicts for *swarm_ids* via one MGET; missing/invalid ones omitted."""
+    if not swarm_ids:
+        return {}
+    raws = await dependencies.redis_client.mget(
+        [swarm_state_key(swarm_id) for swarm_id in swarm_ids]
+    )
+    states = {}
+    for swarm_id, raw in zip(swarm_ids, raws):
+        if not raw:
+            continue
+        try:
+            states[swarm_id] = json.loads(raw)
+        except json.JSONDecodeError:
+            continue
+    return states
+
+
+async def _sweep_expired() -> None:
+    """Drop a batch of old index entries whose state key has expired."""
+    cutoff = int(time.time() * 1000) - SWARM_STATE_TTL_SECONDS * 1000
+    old = await dependencies.redis_client.zrangebyscore(
+        SWARM_INDEX_KEY, "-inf", cutoff, start=0, num=_SWEEP_BATCH
+    )
+    if not old:
+        return
+    pipe = dependencies.redis_client.pipeline(transaction=False)
+    for swarm_id in old:
+        pipe.exists(swarm_state_key(swarm_id))
+    exists = await pipe.execute()
+    gone = [swarm_id for swarm_id, alive in zip(old, exists) if not alive]
+    if gone:
+        await dependencies.redis_client.zrem(SWARM_INDEX_KEY, *gone)
+
+
+def _parse_cursor(cursor: Optional[str]) -> Optional[tuple[int, str]]:
+    if not cursor:
+        return None
+    score, _, swarm_id = cursor.partition(":")
+    try:
+        return int(score), swarm_id
+    except ValueError:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+
+
+async def list_swarms(
+    limit: int = 50,
+    statuses: Optional[set[str]] = None,
+    cursor: Optional[str] = None,
+) -> tuple[list[dict], Optional[str]]:
+    """One page of swarm states, newest first.
+
+    *cursor* is the ``next_cursor`` of the previous page.  With a status
+    filter, further index pages are read until *limit* matches are found.
+    Returns (swarms, next_cursor); next_cursor is None on the last page.
+    """
+    try:
+        await _sweep_expired()
+    except Exception as e:
+        logger.warning(f"Swarm index sweep failed: {e}")
+
+    after = _parse_cursor(cursor)
+    batch = limit if not statuses else max(limit, 50)
+    swarms: list[dict] = []
+    while True:
+        page = await dependencies.redis_client.zrevrangebyscore(
+            SWARM_INDEX_KEY,
+            after[0] if after else "+inf",
+            "-inf",
+            start=0,
+            num=batch,
+            withscores=True,
+        )
+        exhausted = len(page) < batch
+        if after:
+            # Entries sharing the cursor's millisecond come back again;
+            # within a score, ZREVRANGE orders members descending
+            page = [
+                (swarm_id, int(score))
+                for swarm_id, score in page
+                if score < after[0] or swarm_id < after[1]
+            ]
+        else:
+            page = [(swarm_id, int(score)) for swarm_id, score in page]
+        if not page:
+            if exhausted:
+                return swarms, None
+            # A full batch of same-millisecond entries: step past them
+            after = (after[0] - 1, "\U0010ffff")
+            continue
+
+        states = await load_swarm_states([swarm_id for swarm_id, _ in page])
+        grace_cutoff = int(time.time() * 1000) - SWARM_REGISTER_GRACE_SECONDS * 1000
+        missing = [
+            swarm_id
+            for swarm_id, score in page
+            if swarm_id not in states and score < grace_cutoff
+        ]
+        if missing:
+            await dependencies.redis_client.zrem(SWARM_INDEX_KEY, *missing)
+
+        for swarm_id, score in page:
+            after = (score, swarm_id)
+            state = states.get(swarm_id)
+            if state is None:
+                continue
+            if statuses and state.get("status") not in statuses:
+                continue
+            swarms.append(state)
+            if len(swarms) == limit:
+                return swarms, f"{score}:{swarm_id}"
+        if exhausted:
+            return swarms, None
@@ -0,0 +1,84 @@
+"""Coalescing of token deltas for chat session SSE streams.
+
+The engine publishes every model token as its own pub/sub message
+(``output``, ``thinking`` and ``tool_output`` events), and
+``/v1/events/sessions/{id}/events`` forwarded each one as its own SSE
+frame — one TCP write and client wakeup per token.
+
+Clients that opt in (``?coalesce_ms=``) get consecutive deltas of the same
+kind merged into one frame of the same shape, with the text concatenated.
+A merged frame is sent when the window since its first delta has elapsed,
+when it reaches the byte limit, or right before any other event, so
+structural events are never delayed and ordering is preserved.
+"""
+
+import json
+import time
+from typing import Optional
+
+# event type → field in ``data`` holding the delta text
+TOKEN_FIELDS = {
+    "output": "content",
+    "thinking": "thinking",
+    "tool_output": "content",
+}
+
+
+class TokenCoalescer:
+    """Merges consecutive token events into SSE data payloads."""
+
+    def __init__(self, window_ms: int, max_bytes: int):
+        self.window = window_ms / 1000
+        self.max_bytes = max_bytes
+        self._event: Optional[dict] = None
+        self._key: Optional[tuple] = None
+        self._parts: list[str] = []
+        self._size = 0
+        self._deadline = 0.0
+
+    def add(self, data_str: str) -> list[str]:
+        """Take one published message; returns payloads to send now."""
+        try:
+            event = json.loads(data_str)
+        except json.JSONDecodeError:
+            return self.flush() + [data_str]
+        field = None
+        if isinstance(event, dict):
+            field = TOKEN_FIELDS.get(event.get("type"))
+        data = event.get("data") if field else None
+        if not isinstance(data, dict) or not isinstance(data.get(field), str):
+            # Structural (or unrecognised) event: send what is pending first
+            out = self.flush()
+            out.append(data_str)
+            return out
+
+        key = (event["type"], data.get("stream"))
+        out = self.flush() if key != self._key else []
+        if self._event is None:
+            self._event = event
+            self._key = key
+            self._deadline = time.monotonic() + self.window
+        self._parts.append(data[field])
+        self._size += len(data[field].encode("utf-8"))
+        if self._size >= self.max_bytes:
+            out.extend(self.flush())
+        return out
+
+    def timeout(self, default: float) -> float:
+        """Seconds to wait for the next message before flushing is due."""
+        if self._event is None:
+            return default
+        return max(0.0, min(default, self._deadline - time.monotonic()))
+
+    def due(self) -> bool:
+        return self._event is not None and time.monotonic() >= self._deadline
+
+    def flush(self) -> list[str]:
+        """The pending merged payload (if any), as a list."""
+        if self._event is None:
+            return []
+        event = self._event
+        field = TOKEN_FIELDS[event["type"]]
+        event["data"][field] = "".join(self._parts)
+        self._event, self._key, self._parts, self._size = None, None, [], 0
+        return [json.dumps(event)]
@@ -0,0 +1,204 @@
+"""Bounded, prioritised worker pool for audio transcription.
+
+Voice notes from the messaging bridges and hour-long meeting recordings
+share one pool with a fixed number of workers (TRANSCRIBE_WORKERS).  Jobs
+are ordered shortest-expected-first with aging: each job's sort key is
+
+    enqueued_at + estimated_duration_seconds
+
+so a 10-second voice note jumps ahead of a queued meeting, but a meeting
+is never starved — it runs once it has waited roughly as long as its own
+estimated length.  Duration is estimated from file size.
+
+While a long recording is being transcribed, partial transcripts are
+published after each decode window on ``attachment:transcript:{id}``:
+
+    {"attachmentId": ..., "window": 3, "text": "...so far...", "final": false}
+
+The existing ``attachment:ready:{id}`` notification still marks completion.
+"""
+
+import asyncio
+import itertools
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Optional
+
+from app import dependencies
+from app.logging_config import get_logger
+from app.services.audio_transcription import TRANSCRIBE_WORKERS, transcribe_audio
+
+logger = get_logger(__name__)
+
+# Queue capacity — submitters wait (backpressure) once this many jobs queue
+TRANSCRIBE_MAX_QUEUE = int(os.getenv("TRANSCRIBE_MAX_QUEUE", "200"))
+
+# Rough bitrate of voice-note codecs (opus/AAC ~32 kbps) used to turn file
+# size into an expected duration for scheduling.
+_ASSUMED_BYTES_PER_SECOND = 4_000
+
+# Number of recent jobs kept for wait/run time averages
+_TIMING_WINDOW = 100
+
+
+@dataclass(order=True)
+class _Job:
+    sort_key: float
+    seq: int
+    attachment_id: str = field(compare=False)
+    path: str = field(compare=False)
+    mime_type: str = field(compare=False)
+    filename: str = field(compare=False)
+    size_bytes: int = field(compare=False)
+    enqueued_at: float = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+
+
+class TranscriptionPool:
+    """Priority queue of transcription jobs drained by a fixed worker set."""
+
+    def __init__(self, workers: int, max_queue: int):
+        self._workers = workers
+        self._max_queue = max_queue
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._tasks: list[asyncio.Task] = []
+        self._seq = itertools.count()
+        self._active = 0
+        self._completed = 0
+        self._failed = 0
+        self._wait_ms: deque[float] = deque(maxlen=_TIMING_WINDOW)
+        self._run_ms: deque[float] = deque(maxlen=_TIMING_WINDOW)
+
+    def _ensure_started(self) -> None:
+        if self._queue is not None:
+            return
+        self._queue = asyncio.PriorityQueue(maxsize=self._max_queue)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self._workers, thread_name_prefix="transcribe"
+        )
+        self._tasks = [
+            asyncio.create_task(self._worker(i)) for i in range(self._workers)
+        ]
+        logger.info(f"Transcription pool started ({self._workers} workers)")
+
+    async def submit(
+        self, attachment_id: str, path: str, mime_type: str, filename: str, size_bytes: int
+    ) -> tuple[Optional[str], int]:
+        """Queue a file for transcription and wait for (text, tokens)."""
+        self._ensure_started()
+        now = time.monotonic()
+        job = _Job(
+            sort_key=now + size_bytes / _ASSUMED_BYTES_PER_SECOND,
+            seq=next(self._seq),
+            attachment_id=attachment_id,
+            path=path,
+            mime_type=mime_type,
+            filename=filename,
+            size_bytes=size_bytes,
+            enqueued_at=now,
+            future=asyncio.get_running_loop().create_future(),
+        )
+        await self._queue.put(job)
+        return await job.future
+
+    async def _worker(self, worker_id: int) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            job: _Job = await self._queue.get()
+            started = time.monotonic()
+            self._wait_ms.append((started - job.enqueued_at) * 1000)
+            self._active += 1
+            try:
+                result = await loop.run_in_executor(
+                    self._executor,
+                    transcribe_audio,
+                    job.path,
+                    job.mime_type,
+                    job.filename,
+                    self._partial_publisher(loop, job.attachment_id),
+                )
+                self._completed += 1
+                if not job.future.done():
+                    job.future.set_result(result)
+            except Exception as e:
+                self._failed += 1
+                logger.error(f"Transcription worker {worker_id} failed on {job.filename}: {e}")
+                if not job.future.done():
+                    job.future.set_exception(e)
+            finally:
+                self._active -= 1
+                self._run_ms.append((time.monotonic() - started) * 1000)
+                self._queue.task_done()
+
+    @staticmethod
+    def _partial_publisher(loop: asyncio.AbstractEventLoop, attachment_id: str):
+        """Build an on_partial callback that publishes from the worker thread."""
+
+        def _publish(window: int, text: str) -> None:
+            if not dependencies.redis_client:
+                return
+            payload = json.dumps(
+                {
+                    "attachmentId": attachment_id,
+                    "window": window,
+                    "text": text,
+                    "final": False,
+                }
+            )
+            asyncio.run_coroutine_threadsafe(
+                _publish_quietly(f"attachment:transcript:{attachment_id}", payload),
+                loop,
+            )
+
+        return _publish
+
+    def metrics(self) -> dict:
+        """Snapshot of queue depth, throughput and latency."""
+
+        def _avg(values: deque) -> Optional[float]:
+            return round(sum(values) / len(values), 1) if values else None
+
+        queued = self._queue.qsize() if self._queue is not None else 0
+        oldest_wait_ms = None
+        if self._queue is not None and queued:
+            # PriorityQueue stores a heap list — peek without disturbing order
+            oldest = min(job.enqueued_at for job in self._queue._queue)
+            oldest_wait_ms = round((time.monotonic() - oldest) * 1000, 1)
+        return {
+            "workers": self._workers,
+            "maxQueue": self._max_queue,
+            "queued": queued,
+            "active": self._active,
+            "completed": self._completed,
+            "failed": self._failed,
+            "avgWaitMs": _avg(self._wait_ms),
+            "maxWaitMs": round(max(self._wait_ms), 1) if self._wait_ms else None,
+            "avgRunMs": _avg(self._run_ms),
+            "oldestQueuedMs": oldest_wait_ms,
+        }
+
+    async def shutdown(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._queue = None
+
+
+async def _publish_quietly(channel: str, payload: str) -> None:
+    try:
+        await dependencies.redis_client.publish(channel, payload)
+    except Exception:
+        pass  # Best-effort — the final ready event still fires
+
+
+transcription_pool = TranscriptionPool(TRANSCRIBE_WORKERS, TRANSCRIBE_MAX_QUEUE)
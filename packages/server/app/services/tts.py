@@ -18,6 +18,9 @@ Channel-specific audio format conversion is handled automatically:
 
 Cost calculation (Fish Audio only): $15.00 / 1M UTF-8 bytes.
 Voicebox is local/free — cost is always $0.
+
+Final audio is cached by (provider, voice, text hash, output format) in
+tts_cache.py; repeated phrases skip both the provider and ffmpeg.
 """
 
 import json
@@ -31,6 +34,8 @@ from typing import Optional
 import httpx
 
 from app.logging_config import get_logger
+from app.services.settings_cache import settings_cache
+from app.services.tts_cache import CachedAudio, cache_key as tts_cache_key, tts_cache
 from app.utils import gen_id, now_ms
 
 logger = get_logger(__name__)
@@ -86,45 +91,33 @@ FORMAT_EXT_MAP = {
 
 
 async def get_tts_settings() -> dict:
-    """Fetch TTS-related global settings (character threshold, rate limit, etc.)."""
-    from app.database import AsyncSessionLocal
-    from sqlalchemy import select
-    from app.models.settings import GlobalSetting
-
-    defaults = {
-        "ttsCharacterThreshold": 1000,
-        "ttsMaxConcurrentRequests": 5,
-        "ttsEnabled": True,
-        "defaultTtsProvider": "fish-audio",
-        "voiceboxUrl": DEFAULT_VOICEBOX_URL,
-    }
+    """Fetch TTS-related global settings (character threshold, rate limit, etc.).
 
+    Served from the process-local settings cache — no DB round-trip.
+    """
     try:
-        async with AsyncSessionLocal() as session:
-            result = await session.execute(select(GlobalSetting))
-            rows = {r.key: r.value for r in result.scalars().all()}
-
         return {
-            "ttsCharacterThreshold": int(
-                rows.get(
-                    "ttsCharacterThreshold", str(defaults["ttsCharacterThreshold"])
-                )
+            "ttsCharacterThreshold": await settings_cache.get_int(
+                "ttsCharacterThreshold", 1000
             ),
-            "ttsMaxConcurrentRequests": int(
-                rows.get(
-                    "ttsMaxConcurrentRequests",
-                    str(defaults["ttsMaxConcurrentRequests"]),
-                )
+            "ttsMaxConcurrentRequests": await settings_cache.get_int(
+                "ttsMaxConcurrentRequests", 5
             ),
-            "ttsEnabled": rows.get("ttsEnabled", "true").lower() == "true",
-            "defaultTtsProvider": rows.get(
-                "defaultTtsProvider", defaults["defaultTtsProvider"]
+            "ttsEnabled": await settings_cache.get_bool("ttsEnabled", True),
+            "defaultTtsProvider": await settings_cache.get(
+                "defaultTtsProvider", "fish-audio"
             ),
-            "voiceboxUrl": rows.get("voiceboxUrl", defaults["voiceboxUrl"]),
+            "voiceboxUrl": await settings_cache.get("voiceboxUrl", DEFAULT_VOICEBOX_URL),
         }
     except Exception as e:
         logger.warning(f"Failed to load TTS settings, using defaults: {e}")
-        return defaults
+        return {
+            "ttsCharacterThreshold": 1000,
+            "ttsMaxConcurrentRequests": 5,
+            "ttsEnabled": True,
+            "defaultTtsProvider": "fish-audio",
+            "voiceboxUrl": DEFAULT_VOICEBOX_URL,
+        }
 
 
 # Semaphore for rate limiting — initialized lazily based on admin setting
@@ -259,14 +252,9 @@ async def resolve_tts_provider(
     # 2. User preference
     if user_id:
         try:
-            from app.database import AsyncSessionLocal
-            from sqlalchemy import select
-            from app.models.settings import GlobalSetting
-
-            async with AsyncSessionLocal() as session:
-                row = await session.get(GlobalSetting, f"userTtsProvider:{user_id}")
-                if row and row.value:
-                    return row.value
+            preference = await settings_cache.get(f"userTtsProvider:{user_id}")
+            if preference:
+                return preference
         except Exception:
             pass
 
@@ -452,10 +440,48 @@ async def synthesize_speech(
     # Determine output format for the channel
     output_format = _get_output_format(channel)
 
+    # Cloud synthesis needs the caller's own key even when the audio is
+    # cached — a hit must not hand out audio paid for with someone else's
+    # key to a user who has none (or whose key mode denies them).
+    api_key: Optional[str] = None
+    key_source = "none"
+    if provider != "voicebox":
+        api_key, key_source = await resolve_tts_api_key(user_id)
+        if not api_key:
+            logger.warning(
+                f"TTS unavailable: no Fish Audio API key configured (user={user_id})"
+            )
+            return None
+
+    # Identical (provider, voice, text, format) requests reuse the final,
+    # already-converted audio — no provider round-trip, no ffmpeg.
+    requested_format = output_format
+    cache_key = tts_cache_key(provider, voice_id, requested_format, text)
     start_time = time.monotonic()
+    cached = await tts_cache.get(cache_key)
+    if cached is not None:
+        duration_ms = int((time.monotonic() - start_time) * 1000)
+        return await _finish_synthesis(
+            audio_bytes=cached.audio_bytes,
+            output_format=cached.format,
+            text=text,
+            agent_id=agent_id,
+            voice_id=voice_id,
+            voice_name=voice_name,
+            channel=channel,
+            session_id=session_id,
+            user_id=user_id,
+            provider=provider,
+            model="qwen3-tts" if provider == "voicebox" else DEFAULT_TTS_MODEL,
+            key_source="cache",
+            key_masked="cache",
+            cost=0.0,
+            duration_ms=duration_ms,
+            cache_hit=True,
+        )
+
     audio_bytes: Optional[bytes] = None
     cost = 0.0
-    key_source = "none"
     key_masked = "****"
     model = DEFAULT_TTS_MODEL
 
@@ -500,13 +526,6 @@ async def synthesize_speech(
 
     else:
         # ── Fish Audio (cloud) ───────────────────────────────────────────
-        # Resolve API key
-        api_key, key_source = await resolve_tts_api_key(user_id)
-        if not api_key:
-            logger.warning(
-                f"TTS unavailable: no Fish Audio API key configured (user={user_id})"
-            )
-            return None
         key_masked = _mask_key(api_key)
 
         # Determine what to request from Fish Audio and whether conversion
@@ -552,6 +571,52 @@ async def synthesize_speech(
 
         cost = _calculate_cost(text)
 
+    # Don't cache a conversion fallback: the key is for the requested
+    # format, and a transient ffmpeg failure deserves a fresh attempt.
+    if output_format == requested_format:
+        await tts_cache.put(
+            cache_key, CachedAudio(audio_bytes=audio_bytes, format=output_format)
+        )
+
+    return await _finish_synthesis(
+        audio_bytes=audio_bytes,
+        output_format=output_format,
+        text=text,
+        agent_id=agent_id,
+        voice_id=voice_id,
+        voice_name=voice_name,
+        channel=channel,
+        session_id=session_id,
+        user_id=user_id,
+        provider=provider,
+        model=model,
+        key_source=key_source,
+        key_masked=key_masked,
+        cost=cost,
+        duration_ms=duration_ms,
+        cache_hit=False,
+    )
+
+
+async def _finish_synthesis(
+    audio_bytes: bytes,
+    output_format: str,
+    text: str,
+    agent_id: str,
+    voice_id: Optional[str],
+    voice_name: Optional[str],
+    channel: str,
+    session_id: Optional[str],
+    user_id: Optional[str],
+    provider: str,
+    model: str,
+    key_source: str,
+    key_masked: str,
+    cost: float,
+    duration_ms: int,
+    cache_hit: bool,
+) -> dict:
+    """Log a completed synthesis (fresh or cached) and build the result dict."""
     input_text_bytes = len(text.encode("utf-8"))
     input_characters = len(text)
 
@@ -573,6 +638,7 @@ async def synthesize_speech(
         cost_total=cost,
         duration_ms=duration_ms,
         channel=channel,
+        cache_hit=cache_hit,
     )
 
     ext = FORMAT_EXT_MAP.get(output_format, output_format)
@@ -580,7 +646,8 @@ async def synthesize_speech(
     filename = f"tts_{agent_id}_{gen_id()}.{ext}"
 
     logger.info(
-        f"TTS complete ({provider}): {input_characters} chars -> {len(audio_bytes)} bytes "
+        f"TTS complete ({provider}{', cached' if cache_hit else ''}): "
+        f"{input_characters} chars -> {len(audio_bytes)} bytes "
         f"({output_format}), cost=${cost:.6f}, {duration_ms}ms, "
         f"voice={voice_id or 'default'}, channel={channel}"
     )
@@ -595,6 +662,7 @@ async def synthesize_speech(
         "input_text_bytes": input_text_bytes,
         "input_characters": input_characters,
         "provider": provider,
+        "cache_hit": cache_hit,
     }
 
 
@@ -615,8 +683,13 @@ async def _log_tts_call(
     cost_total: float,
     duration_ms: int,
     channel: str,
+    cache_hit: bool = False,
 ) -> None:
-    """Persist a TTS call log record and publish to Redis for real-time SSE."""
+    """Persist a TTS call log record and publish to Redis for real-time SSE.
+
+    Cache hits are logged too (cache_hit=True, zero cost) so usage views can
+    report them separately from billed provider calls.
+    """
     from app.database import AsyncSessionLocal
     from app.models.tts_call_log import TtsCallLog
     from app import dependencies
@@ -644,6 +717,7 @@ async def _log_tts_call(
                 cost_total=cost_total,
                 duration_ms=duration_ms,
                 channel=channel,
+                cache_hit=cache_hit,
                 created_at=created_at,
             )
             db.add(call)
@@ -669,6 +743,7 @@ async def _log_tts_call(
                     "cost_total": cost_total,
                     "duration_ms": duration_ms,
                     "channel": channel,
+                    "cache_hit": cache_hit,
                     "created_at": created_at,
                 }
             )
@@ -0,0 +1,193 @@
+"""Content-addressed cache for synthesized TTS audio.
+
+Agents re-send many identical phrases ("On it!", canned summaries), and each
+one otherwise costs a provider round-trip plus an ffmpeg transcode.  Final,
+already-converted audio is cached under a key derived from
+
+    (provider, voice, output format, sha256(text))
+
+in two tiers:
+
+- memory: small LRU of hot clips (TTS_CACHE_MEMORY_BYTES, default 16 MB)
+- disk:   DATA_DIR/cache/tts/{key[:2]}/{key}.{ext}, LRU-evicted by last
+          use once TTS_CACHE_MAX_BYTES (default 512 MB) is exceeded
+
+The stored file extension records the *actual* output format, which can
+differ from the requested one when conversion fell back (e.g. OGG → MP3).
+"""
+
+import asyncio
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+TTS_CACHE_DIR = os.path.join(os.getenv("DATA_DIR", "/jfs"), "cache", "tts")
+TTS_CACHE_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+TTS_CACHE_MEMORY_BYTES = int(os.getenv("TTS_CACHE_MEMORY_BYTES", str(16 * 1024 * 1024)))
+
+
+@dataclass
+class CachedAudio:
+    audio_bytes: bytes
+    format: str  # Actual stored format (ogg_opus, mp3, wav, ...)
+
+
+def cache_key(provider: str, voice_id: Optional[str], output_format: str, text: str) -> str:
+    text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    raw = f"{provider}\0{voice_id or 'default'}\0{output_format}\0{text_hash}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class TtsAudioCache:
+    """Two-tier (memory + disk) LRU keyed by cache_key()."""
+
+    def __init__(self, root: str, max_disk_bytes: int, max_memory_bytes: int):
+        self._root = root
+        self._max_disk_bytes = max_disk_bytes
+        self._max_memory_bytes = max_memory_bytes
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, CachedAudio]" = OrderedDict()
+        self._memory_bytes = 0
+        # key -> (path, size); ordered oldest-used first.  Built lazily from
+        # a directory scan so the cap survives restarts.
+        self._disk: Optional["OrderedDict[str, tuple[str, int]]"] = None
+        self._disk_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    # ── Public API ──────────────────────────────────────────────────────
+
+    async def get(self, key: str) -> Optional[CachedAudio]:
+        return await asyncio.to_thread(self._get, key)
+
+    async def put(self, key: str, audio: CachedAudio) -> None:
+        try:
+            await asyncio.to_thread(self._put, key, audio)
+        except Exception as e:
+            logger.warning(f"TTS cache write failed: {e}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "memoryEntries": len(self._memory),
+                "memoryBytes": self._memory_bytes,
+                "diskEntries": len(self._disk) if self._disk is not None else None,
+                "diskBytes": self._disk_bytes if self._disk is not None else None,
+            }
+
+    # ── Internals (run in a worker thread) ──────────────────────────────
+
+    def _load_disk_index(self) -> None:
+        if self._disk is not None:
+            return
+        entries = []
+        if os.path.isdir(self._root):
+            for dirpath, _, files in os.walk(self._root):
+                for name in files:
+                    if name.endswith(".tmp"):
+                        continue
+                    path = os.path.join(dirpath, name)
+                    try:
+                        st = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    entries.append((st.st_mtime, name.split(".", 1)[0], path, st.st_size))
+        entries.sort()
+        self._disk = OrderedDict((key, (path, size)) for _, key, path, size in entries)
+        self._disk_bytes = sum(size for _, size in self._disk.values())
+
+    def _remember(self, key: str, audio: CachedAudio) -> None:
+        size = len(audio.audio_bytes)
+        if size > self._max_memory_bytes:
+            return
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= len(old.audio_bytes)
+        self._memory[key] = audio
+        self._memory_bytes += size
+        while self._memory_bytes > self._max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted.audio_bytes)
+
+    def _get(self, key: str) -> Optional[CachedAudio]:
+        with self._lock:
+            audio = self._memory.get(key)
+            if audio is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return audio
+            self._load_disk_index()
+            entry = self._disk.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._disk.move_to_end(key)
+
+        path, _ = entry
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)  # Persist recency for the post-restart scan
+        except FileNotFoundError:
+            with self._lock:
+                self._drop_disk_entry(key)
+                self.misses += 1
+            return None
+
+        audio = CachedAudio(audio_bytes=data, format=os.path.basename(path).split(".", 1)[1])
+        with self._lock:
+            self._remember(key, audio)
+            self.hits += 1
+        return audio
+
+    def _put(self, key: str, audio: CachedAudio) -> None:
+        # The format name itself is the extension so it round-trips exactly
+        # (FORMAT_EXT_MAP maps ogg_opus → ogg, which is lossy).
+        directory = os.path.join(self._root, key[:2])
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{key}.{audio.format}")
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(audio.audio_bytes)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._remember(key, audio)
+            self._load_disk_index()
+            previous = self._drop_disk_entry(key)
+            self._disk[key] = (path, len(audio.audio_bytes))
+            self._disk_bytes += len(audio.audio_bytes)
+            evict = []
+            while self._disk_bytes > self._max_disk_bytes and len(self._disk) > 1:
+                old_key, (old_path, size) = self._disk.popitem(last=False)
+                self._disk_bytes -= size
+                in_memory = self._memory.pop(old_key, None)
+                if in_memory is not None:
+                    self._memory_bytes -= len(in_memory.audio_bytes)
+                evict.append(old_path)
+            if previous is not None and previous[0] != path:
+                evict.append(previous[0])  # Same key, different stored format
+
+        for old_path in evict:
+            try:
+                os.remove(old_path)
+            except FileNotFoundError:
+                pass
+
+    def _drop_disk_entry(self, key: str) -> Optional[tuple[str, int]]:
+        entry = self._disk.pop(key, None)
+        if entry is not None:
+            self._disk_bytes -= entry[1]
+        return entry
+
+
+tts_cache = TtsAudioCache(TTS_CACHE_DIR, TTS_CACHE_MAX_BYTES, TTS_CACHE_MEMORY_BYTES)
@@ -0,0 +1,123 @@
+"""Durable delivery of GitHub webhook events to the API workers.
+
+The webhook endpoint stores each delivery in ``webhook_events`` and appends
+a small reference (event ID, type, action) to WEBHOOK_STREAM.  API workers
+read the stream through the WEBHOOK_GROUP consumer group, so each event is
+handled by exactly one worker and only acknowledged once it has been
+processed — events published while the API restarts wait in the stream
+instead of being dropped like plain pub/sub messages.
+
+On startup a consumer first re-reads its own unacknowledged entries, and
+periodically claims entries another consumer left pending for longer than
+WEBHOOK_CLAIM_IDLE_MS (e.g. a worker that crashed mid-event).
+"""
+
+import asyncio
+import json
+import os
+import socket
+from typing import Awaitable, Callable
+
+from app import dependencies
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+WEBHOOK_STREAM = "djinnbot:webhooks:github:stream"
+WEBHOOK_GROUP = "djinnbot-api"
+
+WEBHOOK_STREAM_MAXLEN = int(os.getenv("WEBHOOK_STREAM_MAXLEN", "10000"))
+WEBHOOK_CLAIM_IDLE_MS = int(os.getenv("WEBHOOK_CLAIM_IDLE_MS", "60000"))
+
+_READ_COUNT = 50
+_BLOCK_MS = 5000
+# Look for abandoned entries every this many reads
+_CLAIM_EVERY_READS = 12
+
+WebhookHandler = Callable[[dict], Awaitable[None]]
+
+
+async def publish_webhook_event(event: dict) -> None:
+    """Append a webhook event reference to the stream (raises on failure)."""
+    if not dependencies.redis_client:
+        raise RuntimeError("Redis not available")
+    await dependencies.redis_client.xadd(
+        WEBHOOK_STREAM,
+        {"data": json.dumps(event)},
+        maxlen=WEBHOOK_STREAM_MAXLEN,
+        approximate=True,
+    )
+
+
+async def _ensure_group() -> None:
+    try:
+        await dependencies.redis_client.xgroup_create(
+            WEBHOOK_STREAM, WEBHOOK_GROUP, id="0", mkstream=True
+        )
+    except Exception as e:
+        if "BUSYGROUP" not in str(e):
+            raise
+
+
+async def _handle_entries(entries, handler: WebhookHandler) -> None:
+    for entry_id, fields in entries:
+        if fields:
+            try:
+                await handler(json.loads(fields.get("data", "{}")))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # The handler records failures on the webhook_events row
+                # (replayable via the API); don't redeliver poison entries.
+                logger.error(f"Webhook stream entry {entry_id} failed: {e}")
+        await dependencies.redis_client.xack(WEBHOOK_STREAM, WEBHOOK_GROUP, entry_id)
+
+
+async def consume_webhook_stream(handler: WebhookHandler) -> None:
+    """Background task: feed every stream entry to *handler*, then ack it."""
+    consumer = f"{socket.gethostname()}-{os.getpid()}"
+    while True:
+        try:
+            if not dependencies.redis_client:
+                await asyncio.sleep(5)
+                continue
+            await _ensure_group()
+
+            # Entries this consumer read but never acknowledged (restart)
+            pending = await dependencies.redis_client.xreadgroup(
+                WEBHOOK_GROUP, consumer, {WEBHOOK_STREAM: "0"}, count=_READ_COUNT
+            )
+            for _, entries in pending or []:
+                await _handle_entries(entries, handler)
+
+            reads = 0
+            while True:
+                if reads % _CLAIM_EVERY_READS == 0:
+                    claimed = await dependencies.redis_client.xautoclaim(
+                        WEBHOOK_STREAM,
+                        WEBHOOK_GROUP,
+                        consumer,
+                        min_idle_time=WEBHOOK_CLAIM_IDLE_MS,
+                        count=_READ_COUNT,
+                    )
+                    if claimed and claimed[1]:
+                        logger.warning(
+                            f"Claimed {len(claimed[1])} abandoned webhook event(s)"
+                        )
+                        await _handle_entries(claimed[1], handler)
+                reads += 1
+
+                response = await dependencies.redis_client.xreadgroup(
+                    WEBHOOK_GROUP,
+                    consumer,
+                    {WEBHOOK_STREAM: ">"},
+                    count=_READ_COUNT,
+                    block=_BLOCK_MS,
+                )
+                for _, entries in response or []:
+                    await _handle_entries(entries, handler)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Webhook stream error: {e}")
+            await asyncio.sleep(2)
@@ -32,7 +32,7 @@ from typing import Dict, List, Optional, Tuple
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.llm_call_log import LlmCallLog
+from app.models.llm_usage_rollup import LlmUsageRollup
 from app.models.user_provider import AdminSharedProvider
 from app.logging_config import get_logger
 
@@ -154,24 +154,25 @@ async def check_share_limits(
             )
         return result
 
-    # Query today's usage in a single batch:
+    # Query today's usage in a single batch from the hourly rollups
+    # (the UTC day starts on an hour boundary, so no raw rows are needed):
     # GROUP BY provider → (call_count, sum_cost)
     day_start_ms = _start_of_utc_day_ms()
     limited_provider_ids = [s.provider_id for s in limited_shares]
 
     usage_query = (
         select(
-            LlmCallLog.provider,
-            func.count(LlmCallLog.id).label("call_count"),
-            func.coalesce(func.sum(LlmCallLog.cost_total), 0).label("sum_cost"),
+            LlmUsageRollup.provider,
+            func.sum(LlmUsageRollup.call_count).label("call_count"),
+            func.coalesce(func.sum(LlmUsageRollup.cost_total), 0).label("sum_cost"),
         )
         .where(
-            LlmCallLog.user_id == user_id,
-            LlmCallLog.key_source == "admin_shared",
-            LlmCallLog.provider.in_(limited_provider_ids),
-            LlmCallLog.created_at >= day_start_ms,
+            LlmUsageRollup.user_id == user_id,
+            LlmUsageRollup.key_source == "admin_shared",
+            LlmUsageRollup.provider.in_(limited_provider_ids),
+            LlmUsageRollup.bucket_start >= day_start_ms,
         )
-        .group_by(LlmCallLog.provider)
+        .group_by(LlmUsageRollup.provider)
     )
 
     usage_result = await session.execute(usage_query)
@@ -102,3 +102,70 @@ async def client(test_engine):
         yield client
     
     app.dependency_overrides.clear()
+
+
+class FakeStreamRedis:
+    """In-memory stand-in for the Redis stream commands used by services."""
+
+    def __init__(self):
+        self.streams: dict[str, list[tuple[str, dict]]] = {}
+        self._seq = 0
+        self._added = asyncio.Event()
+
+    async def xadd(self, key, fields):
+        self._seq += 1
+        entry_id = f"{self._seq}-0"
+        self.streams.setdefault(key, []).append((entry_id, dict(fields)))
+        self._added.set()
+        return entry_id
+
+    @staticmethod
+    def _id(entry_id):
+        ms, _, seq = entry_id.partition("-")
+        return int(ms), int(seq or 0)
+
+    def _range(self, key, low, high):
+        def bound(value, default):
+            if value in ("-", "+"):
+                return default, False
+            exclusive = value.startswith("(")
+            return self._id(value.lstrip("(")), exclusive
+
+        (lo, lo_ex), (hi, hi_ex) = bound(low, (0, 0)), bound(high, (2**63, 0))
+        return [
+            (entry_id, fields)
+            for entry_id, fields in self.streams.get(key, [])
+            if (self._id(entry_id) > lo if lo_ex else self._id(entry_id) >= lo)
+            and (self._id(entry_id) < hi if hi_ex else self._id(entry_id) <= hi)
+        ]
+
+    async def xrange(self, key, min="-", max="+", count=None):
+        return self._range(key, min, max)[:count]
+
+    async def xrevrange(self, key, max="+", min="-", count=None):
+        return list(reversed(self._range(key, min, max)))[:count]
+
+    async def xread(self, streams, count=None, block=None):
+        while True:
+            response = [
+                [key, self._range(key, f"({last_id}", "+")[:count]]
+                for key, last_id in streams.items()
+            ]
+            response = [item for item in response if item[1]]
+            if response or block is None:
+                return response
+            self._added.clear()
+            try:
+                await asyncio.wait_for(self._added.wait(), block / 1000)
+            except asyncio.TimeoutError:
+                return []
+
+
+@pytest.fixture
+def fake_streams(monkeypatch):
+    """Replace the shared Redis client with an in-memory stream store."""
+    from app import dependencies
+
+    fake = FakeStreamRedis()
+    monkeypatch.setattr(dependencies, "redis_client", fake)
+    return fake
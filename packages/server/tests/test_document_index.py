@@ -0,0 +1,50 @@
+"""Unit tests for the per-document chunk index."""
+import os
+
+from app.services import document_index
+from app.services.document_index import INDEX_FILENAME, load_index
+
+
+def _write_chunk(doc_dir, i: int, section: str, body: str):
+    with open(os.path.join(doc_dir, f"chunk-{i:02d}.md"), "w", encoding="utf-8") as f:
+        f.write(
+            "---\n"
+            f"chunk_index: {i}\n"
+            f"pages: [{i + 1}]\n"
+            f'section: "{section}"\n'
+            "---\n"
+            f"{body}\n\n"
+            "---\n"
+            "Related: [[doc/_index]]\n"
+        )
+
+
+def test_rebuild_orders_chunks_numerically(tmp_path):
+    """chunk-100.md must not be read as chunk 11 once there are 100+ chunks."""
+    document_index._cache.clear()
+    for i in range(120):
+        _write_chunk(tmp_path, i, f"Section {i}", f"Body of chunk number {i}.")
+
+    index = load_index(str(tmp_path))
+    assert os.path.exists(tmp_path / INDEX_FILENAME)
+    assert len(index.chunks) == 120
+
+    for i in (0, 11, 85, 100, 105, 119):
+        [chunk] = index.by_chunk_index(i)
+        assert chunk["chunk_index"] == i
+        assert chunk["file"] == f"chunk-{i:02d}.md"
+        assert index.read_content(chunk) == f"Body of chunk number {i}."
+
+    assert [c["chunk_index"] for c in index.by_page(106)] == [105]
+    assert index.by_chunk_index(120) == []
+
+
+def test_by_heading_includes_exact_and_partial_matches(tmp_path):
+    document_index._cache.clear()
+    _write_chunk(tmp_path, 0, "Results", "a")
+    _write_chunk(tmp_path, 1, "Results and discussion", "b")
+    _write_chunk(tmp_path, 2, "Methods", "c")
+
+    index = load_index(str(tmp_path))
+    assert [c["chunk_index"] for c in index.by_heading("results")] == [0, 1]
+    assert [c["chunk_index"] for c in index.by_heading("Discussion")] == [1]
@@ -0,0 +1,106 @@
+"""Unit tests for the multiplexed event gateway."""
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.routers import events as events_router
+from app.services import event_archive as event_archive_module
+from app.services.event_archive import EventArchive
+from app.services.event_gateway import FRAME_JSON, EventGateway, resolve_topic
+
+GLOBAL_KEY = "djinnbot:events:global"
+
+
+def _decode(frame: bytes) -> list[dict]:
+    assert frame[:1] == FRAME_JSON
+    return json.loads(frame[1:])
+
+
+async def _next_messages(conn) -> list[dict]:
+    return _decode(await asyncio.wait_for(conn.next_frame(), 1))
+
+
+def test_resolve_topic():
+    [source] = resolve_topic("global")
+    assert (source.kind, source.key) == ("stream", GLOBAL_KEY)
+
+    [source] = resolve_topic("run:run_123")
+    assert (source.kind, source.key) == ("stream", "djinnbot:events:run:run_123")
+
+    [source] = resolve_topic("sessions:agent_a")
+    assert source.kind == "stream"
+    assert source.match({"agentId": "agent_a"})
+    assert not source.match({"agentId": "agent_b"})
+    assert resolve_topic("sessions")[0].match is None
+
+    channels = resolve_topic("activity:agent_a")
+    assert [(s.kind, s.key) for s in channels] == [
+        ("channel", "djinnbot:agent:agent_a:activity:live"),
+        ("channel", "djinnbot:events:lifecycle"),
+    ]
+
+    for invalid in ("run", "run:", "global:x", "lifecycle:x", "nope", ""):
+        assert resolve_topic(invalid) is None
+
+
+@pytest.mark.asyncio
+async def test_since_backfills_then_releases_live_entries_in_order(fake_streams):
+    gateway = EventGateway()
+    for i in range(3):
+        await fake_streams.xadd(GLOBAL_KEY, {"data": json.dumps({"n": i})})
+
+    # An entry that the shared reader delivers while the backfill is running
+    # must be held back and sent after it, not before or twice
+    original_xrange = fake_streams.xrange
+
+    async def xrange_with_live_entry(key, *args, **kwargs):
+        entries = await original_xrange(key, *args, **kwargs)
+        entry_id = await fake_streams.xadd(key, {"data": json.dumps({"n": 3})})
+        gateway._fan_out(gateway._streams[key], entry_id, json.dumps({"n": 3}))
+        return entries
+
+    fake_streams.xrange = xrange_with_live_entry
+    conn = gateway.connect()
+    await gateway.subscribe(conn, "global", since="1-0")
+    await gateway.shutdown()
+
+    messages = await _next_messages(conn)
+    assert [m["id"] for m in messages] == ["2-0", "3-0", "4-0"]
+    assert [m["data"]["n"] for m in messages] == [1, 2, 3]
+    assert all(m["topic"] == "global" for m in messages)
+
+
+@pytest.mark.asyncio
+async def test_since_replays_an_archived_run(fake_streams, tmp_path, monkeypatch):
+    archive = EventArchive(str(tmp_path))
+    monkeypatch.setattr(event_archive_module, "event_archive", archive)
+    # The run's stream was archived and deleted: nothing is left in Redis
+    archive.append(
+        "run_1",
+        [(f"{i}-0", {"data": json.dumps({"n": i})}) for i in range(1, 5)],
+    )
+
+    gateway = EventGateway()
+    conn = gateway.connect()
+    await gateway.subscribe(conn, "run:run_1", since="2-0")
+    await gateway.shutdown()
+
+    messages = await _next_messages(conn)
+    assert [m["id"] for m in messages] == ["3-0", "4-0"]
+
+
+def test_ws_rejects_non_string_topic_and_since(fake_streams, monkeypatch):
+    monkeypatch.setattr(events_router.auth_settings, "enabled", False)
+    with TestClient(app).websocket_connect("/v1/events/ws") as ws:
+        for request in (
+            {"op": "subscribe", "topic": 1},
+            {"op": "subscribe", "topic": "global", "since": 5},
+            ["subscribe", "global"],
+        ):
+            ws.send_text(json.dumps(request))
+            assert _decode(ws.receive_bytes()) == [
+                {"op": "error", "error": "Invalid message"}
+            ]
@@ -0,0 +1,157 @@
+"""Unit tests for the Dialog ingest queue."""
+import asyncio
+import json
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+import app.database
+from app.models import Base
+from app.models.ingest_job import IngestJob
+from app.services import ingest_queue as iq
+from app.services.ingest_queue import IngestQueue, split_transcript
+
+
+def test_split_transcript_short_text_is_one_chunk():
+    assert split_transcript("hello\nworld", max_chars=100) == ["hello\nworld"]
+
+
+def test_split_transcript_breaks_on_lines_with_overlap():
+    lines = [f"Speaker {i % 3}: statement number {i}." for i in range(200)]
+    text = "\n".join(lines)
+    chunks = split_transcript(text, max_chars=1000, overlap_chars=200)
+
+    assert len(chunks) > 1
+    assert all(len(c) <= 1000 for c in chunks)
+    # Every chunk starts and (except the last) ends on a line boundary
+    for chunk in chunks:
+        assert chunk.startswith("Speaker ")
+    for chunk in chunks[:-1]:
+        assert chunk.endswith("\n")
+    # Consecutive chunks overlap, and together they cover every line
+    for prev, nxt in zip(chunks, chunks[1:]):
+        assert nxt.splitlines()[0] in prev
+    covered = set(line for c in chunks for line in c.splitlines())
+    assert covered == set(lines)
+
+
+@pytest_asyncio.fixture
+async def queue_db(tmp_path, monkeypatch):
+    # A file database with a connection per session: workers, heartbeats
+    # and the test itself use the database concurrently
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'ingest.db'}", poolclass=NullPool
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False
+    )
+    monkeypatch.setattr(app.database, "AsyncSessionLocal", session_maker)
+    yield session_maker
+    await engine.dispose()
+
+
+async def _add_job(db, job_id, user_id, created_at, **values):
+    db.add(
+        IngestJob(
+            id=job_id,
+            user_id=user_id,
+            kind="meeting",
+            status=values.pop("status", "queued"),
+            chunks=json.dumps(["x"]),
+            chunk_count=1,
+            chunks_done=0,
+            replies="[]",
+            attempts=values.pop("attempts", 0),
+            created_at=created_at,
+            **values,
+        )
+    )
+    await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_claim_is_fair_across_users(queue_db):
+    async with queue_db() as db:
+        # Alice queued three jobs before Bob's first one
+        for i in range(3):
+            await _add_job(db, f"a{i}", "alice", 1000 + i)
+        await _add_job(db, "b0", "bob", 2000)
+        await _add_job(db, "b1", "bob", 2001)
+
+    queue = IngestQueue(workers=2)
+    # Alice's oldest job first, then Bob's (fewest running), then the
+    # least recently served user
+    claimed = [await queue._claim() for _ in range(4)]
+    assert claimed == ["a0", "b0", "a1", "b1"]
+
+    async with queue_db() as db:
+        rows = (
+            await db.execute(select(IngestJob.id, IngestJob.status, IngestJob.attempts))
+        ).all()
+    status = {job_id: (s, attempts) for job_id, s, attempts in rows}
+    assert status["a0"] == ("running", 1)
+    assert status["a2"] == ("queued", 0)
+
+
+@pytest.mark.asyncio
+async def test_claim_requeues_stale_jobs_and_gives_up_after_max_attempts(queue_db):
+    stale = iq.now_ms() - (iq.INGEST_JOB_STALE_SECONDS + 60) * 1000
+    async with queue_db() as db:
+        await _add_job(
+            db, "retry", "alice", 1000, status="running", attempts=1, heartbeat_at=stale
+        )
+        await _add_job(
+            db,
+            "crashing",
+            "bob",
+            1001,
+            status="running",
+            attempts=iq.INGEST_MAX_ATTEMPTS,
+            heartbeat_at=stale,
+        )
+
+    queue = IngestQueue(workers=1)
+    assert await queue._claim() == "retry"
+    assert await queue._claim() is None
+
+    async with queue_db() as db:
+        crashing = await db.get(IngestJob, "crashing")
+        retry = await db.get(IngestJob, "retry")
+    assert crashing.status == "failed"
+    assert crashing.completed_at is not None
+    assert retry.status == "running"
+    assert retry.attempts == 2
+    assert queue.stats()["failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_run_heartbeats_while_a_chunk_is_processed(queue_db, monkeypatch):
+    monkeypatch.setattr(iq, "INGEST_HEARTBEAT_SECONDS", 0.01)
+    async with queue_db() as db:
+        await _add_job(db, "slow", "alice", 1000)
+
+    queue = IngestQueue(workers=1)
+    assert await queue._claim() == "slow"
+    async with queue_db() as db:
+        claimed_at = (await db.get(IngestJob, "slow")).heartbeat_at
+
+    seen = []
+
+    async def handler(prompt, lane):
+        await asyncio.sleep(0.1)
+        async with queue_db() as db:
+            seen.append((await db.get(IngestJob, "slow")).heartbeat_at)
+        return "done"
+
+    queue.set_handler(handler)
+    await queue._run("slow", {})
+
+    assert seen[0] > claimed_at
+    async with queue_db() as db:
+        job = await db.get(IngestJob, "slow")
+    assert job.status == "completed"
@@ -0,0 +1,81 @@
+"""Unit tests for the LLM call write-behind buffer."""
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+import app.database
+from app.models import Base
+from app.models.llm_call_log import LlmCallLog
+from app.services.llm_call_buffer import LlmCallBuffer
+
+
+@pytest_asyncio.fixture
+async def buffer_db(tmp_path, monkeypatch):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'llm_calls.db'}", poolclass=NullPool
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False
+    )
+    monkeypatch.setattr(app.database, "AsyncSessionLocal", session_maker)
+    yield session_maker
+    await engine.dispose()
+
+
+def _row(i: int, **values) -> dict:
+    return {
+        "id": f"llmcall_{i}",
+        "agent_id": "agent",
+        "provider": "anthropic",
+        "model": "claude",
+        "input_tokens": 10,
+        "output_tokens": 5,
+        "total_tokens": 15,
+        "cost_total": 0.01,
+        "created_at": 1_700_000_000_000 + i,
+        **values,
+    }
+
+
+@pytest.mark.asyncio
+async def test_flush_drops_rejected_rows_and_writes_the_rest(buffer_db):
+    buffer = LlmCallBuffer(flush_batch=100, flush_interval_ms=500, max_rows=100)
+    rows = [_row(i) for i in range(7)]
+    rows[4]["agent_id"] = None  # violates NOT NULL
+
+    buffer._pending = list(rows)
+    assert await buffer.flush() == 6
+
+    async with buffer_db() as db:
+        ids = set((await db.execute(select(LlmCallLog.id))).scalars())
+    assert ids == {row["id"] for i, row in enumerate(rows) if i != 4}
+    metrics = buffer.metrics()
+    assert metrics["pending"] == 0
+    assert metrics["rejected"] == 1
+    assert metrics["rowsWritten"] == 6
+
+    # Later rows are not held back by the dropped one
+    buffer._pending = [_row(10)]
+    assert await buffer.flush() == 1
+    async with buffer_db() as db:
+        count = (await db.execute(select(func.count()).select_from(LlmCallLog))).scalar()
+    assert count == 7
+
+
+@pytest.mark.asyncio
+async def test_flush_requeues_rows_when_the_database_is_unavailable(monkeypatch):
+    def unavailable():
+        raise ConnectionError("database is down")
+
+    monkeypatch.setattr(app.database, "AsyncSessionLocal", unavailable)
+    buffer = LlmCallBuffer(flush_batch=100, flush_interval_ms=500, max_rows=100)
+    rows = [_row(i) for i in range(3)]
+    buffer._pending = list(rows)
+
+    assert await buffer.flush() == 0
+    assert buffer._pending == rows
+    assert buffer.metrics()["failures"] == 1
@@ -0,0 +1,65 @@
+"""Unit tests for the shared admin log tails."""
+import asyncio
+
+import pytest
+
+from app.services.log_tail import LogFilter, LogTailMultiplexer
+
+KEY = "djinnbot:logs:test"
+
+
+async def _log(redis, line):
+    return await redis.xadd(KEY, {"line": line, "level": "info"})
+
+
+async def _settle():
+    # Let the tail's reader pick up everything added so far
+    for _ in range(5):
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_late_subscriber_backfills_up_to_where_it_joined(fake_streams):
+    tails = LogTailMultiplexer()
+    for i in range(3):
+        await _log(fake_streams, f"before-{i}")
+
+    first = await tails.subscribe(KEY, LogFilter())
+    assert [e.line for e in await first.backfill(10)] == [
+        "before-0",
+        "before-1",
+        "before-2",
+    ]
+    for i in range(2):
+        await _log(fake_streams, f"during-{i}")
+    await _settle()
+
+    # Joins long after the tail started: its backfill must include the
+    # lines logged since, and its live batches only what comes next
+    late = await tails.subscribe(KEY, LogFilter())
+    backfill = await late.backfill(3)
+    assert [e.line for e in backfill] == ["before-2", "during-0", "during-1"]
+
+    await _log(fake_streams, "after")
+    await _settle()
+    entries, dropped = await late.next_batch(timeout=1, max_lines=100, window=0)
+    assert [e.line for e in entries] == ["after"]
+    assert dropped == 0
+
+    entries, _ = await first.next_batch(timeout=1, max_lines=100, window=0.05)
+    assert [e.line for e in entries] == ["during-0", "during-1", "after"]
+
+    await tails.unsubscribe(first)
+    await tails.unsubscribe(late)
+    assert tails.stats() == {"tails": {}}
+
+
+@pytest.mark.asyncio
+async def test_backfill_applies_the_subscriber_filter(fake_streams):
+    tails = LogTailMultiplexer()
+    await fake_streams.xadd(KEY, {"line": "boom", "level": "error"})
+    await _log(fake_streams, "fine")
+
+    subscription = await tails.subscribe(KEY, LogFilter(levels={"error"}))
+    assert [e.line for e in await subscription.backfill(10)] == ["boom"]
+    await tails.shutdown()
@@ -41,7 +41,7 @@ async def test_list_runs_empty(client: AsyncClient):
     response = await client.get("/api/runs/")
     
     assert response.status_code == 200
-    assert response.json() == []
+    assert response.json()["runs"] == []
 
 
 @pytest.mark.asyncio
@@ -57,7 +57,7 @@ async def test_list_runs_with_filter(client: AsyncClient):
     response = await client.get("/api/runs/?status=pending")
     
     assert response.status_code == 200
-    runs = response.json()
+    runs = response.json()["runs"]
     assert len(runs) == 1
     assert runs[0]["status"] == "pending"
 
@@ -75,7 +75,7 @@ async def test_list_runs_by_pipeline(client: AsyncClient):
     response = await client.get("/api/runs/?pipeline_id=test-pipeline")
     
     assert response.status_code == 200
-    runs = response.json()
+    runs = response.json()["runs"]
     assert len(runs) == 1
     assert runs[0]["pipeline_id"] == "test-pipeline"
 
@@ -134,4 +134,142 @@ async def test_cancel_run(client: AsyncClient):
 async def test_cancel_nonexistent_run(client: AsyncClient):
     """Test cancelling non-existent run."""
     response = await client.post("/api/runs/nonexistent/cancel")
-    assert response.status_code == 404
\ No newline at end of file
+    assert response.status_code == 404
+
+async def _add_run_with_steps(session):
+    from app.models.run import Run, Step
+
+    session.add(
+        Run(
+            id="run_fields",
+            pipeline_id="test-pipeline",
+            task_description="Test",
+            status="running",
+            outputs='{"summary": "done"}',
+            created_at=1000,
+            updated_at=1000,
+        )
+    )
+    for step_id in ("plan", "build"):
+        session.add(
+            Step(
+                id=f"step_{step_id}",
+                run_id="run_fields",
+                step_id=step_id,
+                agent_id="agent",
+                status="pending",
+            )
+        )
+    await session.commit()
+    session.expunge_all()
+
+
+@pytest.mark.asyncio
+async def test_get_run_fields_returns_only_selected_keys(test_session):
+    """?fields= returns just the selected keys and does not load steps."""
+    from sqlalchemy import inspect
+
+    from app.models.run import Run
+    from app.routers.runs import get_run
+
+    await _add_run_with_steps(test_session)
+
+    data = await get_run("run_fields", fields="status, outputs", session=test_session)
+    assert data == {"status": "running", "outputs": {"summary": "done"}}
+
+    run = await test_session.get(Run, "run_fields")
+    assert "steps" in inspect(run).unloaded
+
+
+@pytest.mark.asyncio
+async def test_get_run_without_fields_includes_steps(test_session):
+    from app.routers.runs import RUN_DETAIL_FIELDS, get_run
+
+    await _add_run_with_steps(test_session)
+
+    data = await get_run("run_fields", fields=None, session=test_session)
+    assert list(data) == list(RUN_DETAIL_FIELDS)
+    assert sorted(s["step_id"] for s in data["steps"]) == ["build", "plan"]
+
+
+@pytest.mark.asyncio
+async def test_get_run_unknown_field(test_session):
+    """An unknown field name is a 400, not silently ignored."""
+    from fastapi import HTTPException
+
+    from app.routers.runs import get_run
+
+    await _add_run_with_steps(test_session)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await get_run("run_fields", fields="status,bogus", session=test_session)
+    assert exc_info.value.status_code == 400
+    assert "bogus" in exc_info.value.detail
+
+
+async def _list_runs(session, **params):
+    from app.routers.runs import list_runs
+
+    defaults = dict(
+        pipeline_id=None,
+        status=None,
+        project_id=None,
+        limit=50,
+        cursor=None,
+        include_outputs=False,
+    )
+    return await list_runs(**{**defaults, **params}, session=session)
+
+
+@pytest.mark.asyncio
+async def test_list_runs_cursor_pages_through_created_at_ties(test_session):
+    """Runs sharing created_at across a page boundary are neither lost nor repeated."""
+    from app.models.run import Run
+
+    created = {
+        "run_a": 1000,
+        "run_b": 2000,
+        "run_c": 2000,
+        "run_d": 2000,
+        "run_e": 3000,
+    }
+    for run_id, created_at in created.items():
+        test_session.add(
+            Run(
+                id=run_id,
+                pipeline_id="test-pipeline",
+                task_description="Test",
+                status="failed" if run_id in ("run_b", "run_d") else "completed",
+                created_at=created_at,
+                updated_at=created_at,
+            )
+        )
+    await test_session.commit()
+
+    seen, cursor = [], None
+    while True:
+        page = await _list_runs(test_session, limit=2, cursor=cursor)
+        seen.extend(r["id"] for r in page["runs"])
+        cursor = page["next_cursor"]
+        assert page["has_more"] == (cursor is not None)
+        if cursor is None:
+            break
+    assert seen == ["run_e", "run_d", "run_c", "run_b", "run_a"]
+
+    page = await _list_runs(test_session, status="failed", limit=1)
+    assert [r["id"] for r in page["runs"]] == ["run_d"]
+    assert page["counts"] == {"completed": 3, "failed": 2}
+    assert page["total"] == 2
+    page = await _list_runs(test_session, status="failed", cursor=page["next_cursor"])
+    assert [r["id"] for r in page["runs"]] == ["run_b"]
+    assert page["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_list_runs_invalid_cursor(test_session):
+    from fastapi import HTTPException
+
+    for cursor in ("not-a-cursor", "bm9jb2xvbg"):  # the latter is "nocolon"
+        with pytest.raises(HTTPException) as exc_info:
+            await _list_runs(test_session, cursor=cursor)
+        assert exc_info.value.status_code == 400